@@ -20,10 +20,14 @@ fi
 # --- Start dashboard ---
 echo "[entrypoint] Starting GovProposal Dashboard on port ${FLASK_PORT:-5001}..."
 
+# --preload: the app is imported once in the master and workers fork from it,
+# so a (re)started worker serves immediately. DB pools, the write queue and
+# the change-log tailer are per-process and start fresh after the fork.
 exec gunicorn \
+    --preload \
     --bind "0.0.0.0:${FLASK_PORT:-5001}" \
     --workers "${GUNICORN_WORKERS:-2}" \
-    --threads "${GUNICORN_THREADS:-4}" \
+    --threads "${GUNICORN_THREADS:-16}" \
     --timeout "${GUNICORN_TIMEOUT:-120}" \
     --access-logfile - \
     --error-logfile - \
@@ -28,6 +28,7 @@ def _patch_db_path(db_path):
         "tools.cag.rules_engine",
         "tools.cag.aggregation_monitor",
         "tools.cag.exposure_register",
+        "tools.cag.sweep",
         "tools.proposal.section_parser",
         "tools.proposal.compliance_matrix",
         "tools.proposal.content_drafter",
@@ -42,6 +43,7 @@ def _patch_db_path(db_path):
         "tools.learning.pricing_calibrator",
         "tools.mcp.proposal_server",
         "tools.dashboard.app",
+        "tools.dashboard.common",
     ]
     for mod_name in modules_to_patch:
         if mod_name in sys.modules:
@@ -12,8 +12,10 @@ Usage:
 
 import json
 import os
+import re
 import sqlite3
 import sys
+import time
 from pathlib import Path
 
 import pytest
@@ -65,6 +67,54 @@ class TestDatabaseSchema:
         assert result["status"] == "initialized"
 
 
+class TestQueryAudit:
+    """Test the EXPLAIN QUERY PLAN audit and the indexes it drove."""
+
+    HOT_QUERIES = [
+        "SELECT * FROM proposal_reviews WHERE proposal_id = ? "
+        "AND review_type = 'white' ORDER BY reviewed_at DESC LIMIT 1",
+        "SELECT id FROM cag_data_tags WHERE source_type = ? AND source_id = ? "
+        "ORDER BY position_start",
+        "SELECT id, content FROM rfx_document_chunks "
+        "WHERE document_id = ? AND embedding IS NULL",
+        "SELECT results FROM rfx_research_cache "
+        "WHERE query_hash = ? AND expires_at > datetime('now')",
+        "SELECT * FROM opportunities ORDER BY discovered_at DESC LIMIT 50",
+        "SELECT * FROM kb_entries WHERE is_active = 1 AND entry_type = ? "
+        "ORDER BY updated_at DESC",
+        "SELECT * FROM proposal_sections WHERE proposal_id = ? "
+        "ORDER BY volume, section_number",
+    ]
+
+    def test_hot_queries_use_indexes(self, tmp_path):
+        from tools.db.query_audit import build_scratch_db, findings_for, plan
+        path = tmp_path / "scratch.db"
+        build_scratch_db(path)
+        conn = sqlite3.connect(str(path))
+        try:
+            for sql in self.HOT_QUERIES:
+                assert findings_for(sql, plan(conn, sql)) == [], sql
+        finally:
+            conn.close()
+
+    def test_extracts_and_flags_sources(self, tmp_path, tmp_db):
+        from tools.db.query_audit import audit
+        src = tmp_path / "src"
+        src.mkdir()
+        (src / "mod.py").write_text(
+            '"""Select rows (a docstring, not SQL)."""\n'
+            'A = "SELECT id FROM templates WHERE agency = ?"\n'
+            'B = f"SELECT id FROM opportunities WHERE status = {1} ORDER BY id"\n'
+            '# query-plan: ok\n'
+            'C = "SELECT id FROM templates WHERE format_rules = :rules"\n'
+            'D = "SELECT id FROM no_such_table WHERE x = 1"\n')
+        result = audit(db_path=tmp_db, root=src)
+        assert result["statements"] == 4
+        assert result["skipped"] == 1 and result["accepted"] == 1
+        kinds = {(f["line"], f["kind"]) for f in result["findings"]}
+        assert kinds == {(2, "full-scan"), (3, "temp-btree")}
+
+
 # =========================================================================
 # PIPELINE MANAGEMENT TESTS
 # =========================================================================
@@ -114,6 +164,99 @@ class TestPipelineManager:
         assert result["status"] == "success"
 
 
+class TestSamHarvester:
+    """Test the incremental SAM.gov harvest against a local stub API."""
+
+    @pytest.fixture
+    def sam_stub(self):
+        """Stub /search serving fixture notices; answers 429 on listed calls."""
+        pytest.importorskip("requests")
+        import threading
+        from datetime import datetime, timedelta, timezone
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        from urllib.parse import parse_qs, urlparse
+
+        today = datetime.now(timezone.utc)
+        notices = [{"noticeId": f"N-{i}", "title": f"Notice {i}", "type": "o",
+                    "solicitationNumber": f"SOL-{i}", "naicsCode": "541512",
+                    "department": {"name": "Department of Defense"},
+                    "postedDate": (today - timedelta(days=i)).strftime("%Y-%m-%d")}
+                   for i in range(5)]
+        stub = {"calls": [], "throttle": set()}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                q = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+                stub["calls"].append(q)
+                if len(stub["calls"]) in stub["throttle"]:
+                    self.send_response(429)
+                    self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+                lo, hi = (datetime.strptime(q[k], "%m/%d/%Y").strftime("%Y-%m-%d")
+                          for k in ("postedFrom", "postedTo"))
+                match = [n for n in notices if n["naicsCode"] == q.get("ncode")
+                         and lo <= n["postedDate"] <= hi]
+                offset, limit = int(q["offset"]), int(q["limit"])
+                body = json.dumps({"totalRecords": len(match),
+                                   "opportunitiesData": match[offset:offset + limit]})
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.end_headers()
+                self.wfile.write(body.encode())
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        stub["api_base"] = f"http://127.0.0.1:{server.server_port}"
+        stub["today"] = today.strftime("%m/%d/%Y")
+        yield stub
+        server.shutdown()
+
+    def test_watermark_delta(self, tmp_db, sam_stub):
+        from tools.monitor.sam_scanner import harvest, budget_status
+        opts = dict(naics="541512", api_base=sam_stub["api_base"],
+                    page_size=2, daily_limit=50)
+        result = harvest(**opts)
+        assert result["status"] == "success"
+        assert result["new_count"] == 5 and result["requests_made"] == 3
+        assert [c["offset"] for c in sam_stub["calls"]] == ["0", "2", "4"]
+
+        # Within the poll interval the slice is not queried at all
+        assert harvest(**opts)["requests_made"] == 0
+
+        # Forced, only the watermark day is requested again
+        result = harvest(force=True, **opts)
+        assert result["requests_made"] == 1 and result["new_count"] == 0
+        assert result["duplicate_count"] == 1
+        assert sam_stub["calls"][-1]["postedFrom"] == sam_stub["today"]
+        state = budget_status()["slices"][0]
+        assert state["next_offset"] is None and state["total_records"] == 1
+
+    def test_resume_after_429_within_budget(self, tmp_db, sam_stub):
+        from tools.monitor.sam_scanner import harvest, reset_budget
+        opts = dict(naics="541512", api_base=sam_stub["api_base"],
+                    page_size=2, daily_limit=50)
+        sam_stub["throttle"] = {2}
+        result = harvest(**opts)
+        assert result["status"] == "partial" and "429" in result["errors"][0]
+        assert result["new_count"] == 2
+        assert result["slices"][0]["next_offset"] == 2
+
+        # The 429 emptied the bucket: the next run spends nothing
+        result = harvest(**opts)
+        assert result["budget_exhausted"] and result["requests_made"] == 0
+
+        reset_budget(50)
+        result = harvest(**opts)
+        assert result["status"] == "success" and result["new_count"] == 3
+        resumed = sam_stub["calls"][2]
+        assert resumed["offset"] == "2"
+        assert resumed["postedFrom"] == sam_stub["calls"][0]["postedFrom"]
+
+
 # =========================================================================
 # KNOWLEDGE BASE TESTS
 # =========================================================================
@@ -283,6 +426,169 @@ class TestCAG:
         assert isinstance(result, dict)
         assert "total_alerts" in result or "alert_count" in result
 
+    def test_cag_rescan_diffs_alerts(self, tmp_db, sample_proposal, sample_sections):
+        """Layer 3: Re-scanning an unchanged proposal opens no new alerts."""
+        from tools.cag.data_tagger import tag_proposal_section
+        from tools.cag.rules_engine import load_rules
+        from tools.cag.aggregation_monitor import scan_proposal
+
+        load_rules()
+        for sec_id in sample_sections:
+            tag_proposal_section(sec_id)
+
+        first = scan_proposal(sample_proposal)
+        second = scan_proposal(sample_proposal)
+        assert second["total_alerts"] == first["total_alerts"]
+        assert second["alerts_opened"] == 0
+        assert second["alerts_unchanged"] == first["total_alerts"]
+
+    def test_cag_scan_section_incremental(self, tmp_db, db_conn, sample_proposal,
+                                          sample_sections):
+        """Layer 3: A section edit auto-resolves only the alerts it caused."""
+        from tools.cag.data_tagger import tag_proposal_section
+        from tools.cag.rules_engine import load_rules
+        from tools.cag.aggregation_monitor import scan_proposal, scan_section
+
+        load_rules()
+        for sec_id in sample_sections:
+            tag_proposal_section(sec_id)
+        full = scan_proposal(sample_proposal)
+        assert full["total_alerts"] > 0
+
+        db_conn.execute(
+            "UPDATE proposal_sections SET content = ? WHERE id = ?",
+            ("General IT consulting services.", "SEC-002"),
+        )
+        db_conn.commit()
+        tag_proposal_section("SEC-002", replace=True)
+        result = scan_section("SEC-002")
+        assert result["alerts_resolved"] > 0
+        assert result["categories"] == []
+
+        # Incremental state must agree with a from-scratch evaluation
+        rescan = scan_proposal(sample_proposal)
+        assert rescan["alerts_opened"] == 0
+        assert rescan["alerts_resolved"] == 0
+        assert rescan["cag_status"] == result["cag_status"]
+
+    def test_cag_retag_is_atomic(self, tmp_db, db_conn, sample_sections, monkeypatch):
+        """A failed re-tag leaves the section's previous tags in place."""
+        from tools.cag import data_tagger
+
+        before = len(data_tagger.tag_proposal_section("SEC-002"))
+        assert before > 0
+
+        def failing_store(*args):
+            raise sqlite3.OperationalError("disk I/O error")
+
+        monkeypatch.setattr(data_tagger, "_store_tags", failing_store)
+        with pytest.raises(sqlite3.OperationalError):
+            data_tagger.tag_proposal_section("SEC-002", replace=True)
+        count = db_conn.execute(
+            "SELECT COUNT(*) FROM cag_data_tags WHERE source_id = 'SEC-002'"
+        ).fetchone()[0]
+        assert count == before
+
+    def test_cag_export_gate_cache(self, tmp_db, db_conn, sample_proposal,
+                                   sample_sections):
+        """Export gate: unchanged proposals reuse the cached verdict."""
+        from tools.cag.data_tagger import tag_proposal_section
+        from tools.cag.rules_engine import load_rules, add_org_rule
+        from tools.cag.aggregation_monitor import check_before_export
+
+        load_rules()
+        for sec_id in sample_sections:
+            tag_proposal_section(sec_id)
+
+        first = check_before_export(sample_proposal)
+        assert first["cache_hit"] is False
+        second = check_before_export(sample_proposal)
+        assert second["cache_hit"] is True
+        assert second["fingerprint"] == first["fingerprint"]
+        assert second["export_allowed"] == first["export_allowed"]
+        assert second["blocking_alerts"] == first["blocking_alerts"]
+
+        db_conn.execute(
+            "UPDATE proposal_sections SET content = ? WHERE id = ?",
+            ("General IT consulting services.", "SEC-003"),
+        )
+        db_conn.commit()
+        edited = check_before_export(sample_proposal)
+        assert edited["cache_hit"] is False
+        assert edited["changed_sections"] == ["SEC-003"]
+
+        add_org_rule("org_test", "Test rule", ["PERSONNEL", "LOCATION"],
+                     {"all_of": ["PERSONNEL", "LOCATION"]}, "HIGH",
+                     "CONFIDENTIAL", "alert")
+        reloaded = check_before_export(sample_proposal)
+        assert reloaded["cache_hit"] is False
+        assert reloaded["rules_version"] != edited["rules_version"]
+        assert reloaded.get("changed_sections") == []
+
+    def test_cag_sweep_matches_scan(self, tmp_db, db_conn, sample_proposal,
+                                    sample_sections):
+        """Sweep: pooled re-tag + scan writes the same state as scan_proposal."""
+        from tools.cag.rules_engine import load_rules
+        from tools.cag.aggregation_monitor import scan_proposal
+        from tools.cag.sweep import sweep_portfolio
+
+        load_rules()
+        # A second, benign proposal so the pool has more than one task
+        db_conn.execute(
+            "INSERT INTO proposals (id, opportunity_id, title, status) "
+            "SELECT 'PROP-test-002', opportunity_id, 'Benign', 'draft' "
+            "FROM proposals WHERE id = ?",
+            (sample_proposal,),
+        )
+        db_conn.execute(
+            "INSERT INTO proposal_sections (id, proposal_id, volume, "
+            "section_number, section_title, content) "
+            "VALUES ('SEC-101', 'PROP-test-002', 'technical', 1, 'Approach', "
+            "'General IT consulting services.')"
+        )
+        db_conn.commit()
+
+        seen = []
+        result = sweep_portfolio(
+            workers=2, progress=lambda *args: seen.append(args),
+        )
+        assert result["status"] == "completed"
+        assert result["done"] == result["total"] == 2
+        assert sorted(s[2] for s in seen) == [sample_proposal, "PROP-test-002"]
+        assert [s[0] for s in seen] == [1, 2]
+        assert result["status_counts"].get("clear") == 1
+
+        tags = db_conn.execute(
+            "SELECT COUNT(*) FROM cag_data_tags WHERE source_id = 'SEC-002'"
+        ).fetchone()[0]
+        assert tags > 0
+
+        rescan = scan_proposal(sample_proposal)
+        assert rescan["total_alerts"] > 0
+        assert rescan["alerts_opened"] == 0
+        assert rescan["alerts_resolved"] == 0
+
+    def test_cag_sweep_resume(self, tmp_db, sample_proposal, sample_sections):
+        """Sweep: checkpoints make a re-run skip finished proposals."""
+        from tools.cag.rules_engine import load_rules, add_org_rule
+        from tools.cag.sweep import create_sweep, run_sweep, get_sweep_status
+
+        load_rules()
+        created = create_sweep(retag=False)
+        first = run_sweep(created["sweep_id"], workers=1)
+        assert first["processed"] == 1
+
+        again = run_sweep(created["sweep_id"], workers=1)
+        assert again["processed"] == 0
+        assert again["skipped"] == 1
+        assert get_sweep_status(created["sweep_id"])["pending"] == 0
+
+        add_org_rule("org_test", "Test rule", ["PERSONNEL", "LOCATION"],
+                     {"all_of": ["PERSONNEL", "LOCATION"]}, "HIGH",
+                     "CONFIDENTIAL", "alert")
+        with pytest.raises(ValueError, match="Rules changed"):
+            run_sweep(created["sweep_id"], workers=1)
+
     def test_cag_exposure_register(self, tmp_db, sample_proposal):
         """Layer 4: Cross-proposal exposure tracking."""
         from tools.cag.rules_engine import load_rules
@@ -312,6 +618,58 @@ class TestCAG:
         assert isinstance(result, dict)
         assert "cumulative_categories" in result
 
+    def test_cag_exposure_rollup(self, tmp_db, db_conn, sample_proposal):
+        """Layer 4: Cumulative exposure is served from the daily rollup."""
+        from tools.cag.rules_engine import load_rules
+        from tools.cag.exposure_register import (
+            register_exposure, get_capability_groups, rebuild_exposure_rollup,
+        )
+
+        load_rules()
+        register_exposure(sample_proposal, "defense_ops", ["CAPABILITY"], "public")
+        second = register_exposure(sample_proposal, "defense_ops",
+                                   ["LOCATION"], "DoD")
+        assert second["cumulative_categories"] == ["CAPABILITY", "LOCATION"]
+
+        row = db_conn.execute(
+            "SELECT exposure_count FROM cag_exposure_daily "
+            "WHERE capability_group = 'defense_ops'"
+        ).fetchone()
+        assert row["exposure_count"] == 2
+
+        groups = get_capability_groups()
+        assert len(groups) == 1
+        assert groups[0]["exposure_count"] == 2
+        assert groups[0]["cumulative_categories"] == ["CAPABILITY", "LOCATION"]
+        assert groups[0]["audiences"] == ["DoD", "public"]
+
+        rebuilt = rebuild_exposure_rollup()
+        assert rebuilt["exposures_folded"] == 2
+        assert get_capability_groups() == groups
+
+    def test_cag_exposure_rollup_backfills_once(self, tmp_db, db_conn, sample_proposal,
+                                                monkeypatch):
+        """An expired-out (empty) rollup is not rebuilt on every read."""
+        from tools.cag import exposure_register
+        from tools.cag.rules_engine import load_rules
+
+        load_rules()
+        exposure_register.register_exposure(sample_proposal, "defense_ops",
+                                            ["CAPABILITY"], "public")
+        db_conn.execute("DELETE FROM cag_exposure_rollup_state")
+        db_conn.execute("DELETE FROM cag_exposure_daily")
+        db_conn.execute("UPDATE cag_exposure_register SET exposure_date = '2000-01-01'")
+        db_conn.commit()
+
+        rebuilds = []
+        real_rebuild = exposure_register._rebuild
+        monkeypatch.setattr(exposure_register, "_rebuild",
+                            lambda conn, cutoff: rebuilds.append(cutoff)
+                            or real_rebuild(conn, cutoff))
+        assert exposure_register.get_capability_groups() == []
+        assert exposure_register.get_capability_groups() == []
+        assert len(rebuilds) == 1
+
 
 # =========================================================================
 # OPPORTUNITY SCORING TESTS
@@ -503,6 +861,16 @@ class TestDashboard:
         assert resp.status_code == 200
         assert b"Classification Aggregation Guard" in resp.data
 
+    def test_cag_sweep_rejected_synchronously(self, client, sample_proposal):
+        from tools.cag.sweep import claim_sweep, create_sweep
+        resp = client.post("/api/cag/sweep", json={"sweep_id": "sweep-missing"})
+        assert resp.status_code == 404
+        sweep_id = create_sweep(retag=False)["sweep_id"]
+        claim_sweep(sweep_id)
+        resp = client.post("/api/cag/sweep", json={"sweep_id": sweep_id})
+        assert resp.status_code == 409
+        assert "already running" in resp.get_json()["error"]
+
     def test_knowledge_page(self, client, sample_kb_entries):
         resp = client.get("/knowledge")
         assert resp.status_code == 200
@@ -559,6 +927,276 @@ class TestDashboard:
         resp = client.get("/opportunities?status=discovered")
         assert resp.status_code == 200
 
+    def test_blueprints_registered(self, client):
+        from flask import url_for
+        from tools.dashboard import views
+        from tools.dashboard.app import app
+        assert set(views.BLUEPRINTS) <= set(app.blueprints)
+        with app.test_request_context():
+            assert url_for("pipeline.opportunity_detail", opp_id="X") == "/opportunities/X"
+            assert url_for("rfx.rfx_documents") == "/rfx/documents"
+        html = client.get("/").get_data(as_text=True)
+        assert 'href="/recompetes"' in html and 'href="/ai-proposals"' in html
+
+    def test_import_defers_tool_modules(self):
+        import subprocess
+        code = ("import sys; import tools.dashboard.app; print(' '.join(sorted("
+                "m for m in sys.modules if m.startswith(('tools.rfx', 'tools.monitor', "
+                "'tools.cag', 'tools.llm', 'tools.proposal', 'numpy', 'openai', "
+                "'boto3', 'docx', 'sentence_transformers')))))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=str(BASE_DIR),
+                             capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == ""
+
+
+class TestDashboardMetrics:
+    """Test trigger-maintained dashboard counters and the TTL cache."""
+
+    def test_triggers_match_rebuild(self, tmp_db, db_conn, sample_opportunity):
+        from tools.dashboard import metrics
+        db_conn.executemany(
+            "INSERT INTO opportunities (id, title, agency, status, "
+            "estimated_value_high) VALUES (?, ?, ?, ?, ?)",
+            [(f"OPP-m{i}", "t", "DoD", "qualifying" if i % 2 else "no_bid", 1000.0)
+             for i in range(6)])
+        db_conn.execute("UPDATE opportunities SET status = 'qualifying' "
+                        "WHERE id = 'OPP-m0'")
+        db_conn.execute("DELETE FROM opportunities WHERE id = 'OPP-m1'")
+        db_conn.commit()
+        live = metrics.snapshot(db_conn, tmp_db)
+        assert live["opp_status"] == {"discovered": 1, "qualifying": 3,
+                                      "no_bid": 2}
+        assert live["pipeline_value"] == {"": 50000000 + 3000}
+        assert metrics.rebuild(tmp_db) == live
+
+    def test_cache_invalidated_by_dashboard_writes(self, tmp_db, db_conn,
+                                                   sample_proposal):
+        from tools.dashboard import metrics
+        from tools.dashboard.app import app
+        app.config["TESTING"] = True
+        client = app.test_client()
+        assert client.get("/api/pipeline/stats").get_json() == {"discovered": 1}
+        db_conn.execute("UPDATE opportunities SET status = 'qualifying'")
+        db_conn.commit()
+        # Cached until the TTL expires or a write path invalidates it...
+        assert metrics.cached(tmp_db, "opp_status", dict) == {"discovered": 1}
+        # ...but ETag'd APIs drop it once the table's data version moves
+        assert client.get("/api/pipeline/stats").get_json() == {"qualifying": 1}
+        metrics.invalidate("opportunities")
+        assert metrics.cached(tmp_db, "opp_status", lambda: "reloaded") == "reloaded"
+
+
+class TestPagination:
+    """Test keyset pagination on list APIs and lazy Kanban columns."""
+
+    def test_api_cursor_walk(self, tmp_db, db_conn):
+        from tools.dashboard.app import app
+        db_conn.executemany(
+            "INSERT INTO opportunities (id, title, agency, discovered_at) "
+            "VALUES (?, ?, ?, ?)",
+            # Shared timestamps force the id tie-breaker across page edges
+            [(f"OPP-p{i:02d}", "t", "DoD", f"2026-01-{i // 3 + 1:02d}")
+             for i in range(25)])
+        db_conn.commit()
+        app.config["TESTING"] = True
+        client = app.test_client()
+        seen, url = [], "/api/opportunities?page_size=7"
+        while url:
+            resp = client.get(url)
+            assert resp.status_code == 200
+            seen += [r["id"] for r in resp.get_json()]
+            cursor = resp.headers.get("X-Next-Cursor")
+            url = f"/api/opportunities?page_size=7&cursor={cursor}" if cursor else None
+        assert len(seen) == 25 and len(set(seen)) == 25
+        assert seen == sorted(seen, reverse=True)
+        assert client.get("/api/opportunities?cursor=bogus").status_code == 400
+
+    def test_kanban_counts_and_load_more(self, tmp_db, db_conn, sample_opportunity):
+        from tools.dashboard import app as app_module
+        from tools.dashboard.views.proposals import KANBAN_PAGE_SIZE
+        db_conn.executemany(
+            "INSERT INTO proposals (id, opportunity_id, title, status, due_date) "
+            "VALUES (?, ?, ?, 'draft', ?)",
+            [(f"PROP-k{i:02d}", sample_opportunity, f"Card {i}",
+              None if i % 5 == 0 else f"2026-07-{i % 28 + 1:02d}")
+             for i in range(30)])
+        db_conn.commit()
+        app_module.dash_metrics.invalidate("proposals")
+        client = app_module.app.test_client()
+        html = client.get("/proposals/kanban").get_data(as_text=True)
+        assert html.count('class="kb-card"') == KANBAN_PAGE_SIZE
+        assert "Load more (5 more)" in html
+        cursor = html.split('data-cursor="')[1].split('"')[0]
+        more = client.get(f"/api/proposals/kanban/draft?cursor={cursor}").get_json()
+        assert more["count"] == 5 and more["next_cursor"] is None
+        assert client.get("/api/proposals/kanban/bogus").status_code == 404
+
+class TestHTTPCache:
+    """Test data-version ETags, 304s, compression and static fingerprints."""
+
+    def test_etag_304_until_table_changes(self, tmp_db, db_conn, sample_opportunity):
+        from tools.dashboard.app import app
+        client = app.test_client()
+        first = client.get("/api/opportunities")
+        etag = first.headers["ETag"]
+        assert etag.startswith('W/"') and first.headers["Cache-Control"] == "private, no-cache"
+        again = client.get("/api/opportunities", headers={"If-None-Match": etag})
+        assert again.status_code == 304 and again.data == b""
+        # Writes from any connection bump the data version
+        db_conn.execute("UPDATE opportunities SET fit_score = 0.5")
+        db_conn.commit()
+        changed = client.get("/api/opportunities", headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+
+    def test_gzip_and_fingerprinted_static(self, tmp_db, db_conn, sample_opportunity):
+        import gzip
+        from tools.dashboard import http_cache
+        from tools.dashboard.app import app
+        db_conn.executemany(
+            "INSERT INTO opportunities (id, title, agency) VALUES (?, ?, ?)",
+            [(f"OPP-z{i:03d}", "Cloud migration support " * 4, "DoD")
+             for i in range(60)])
+        db_conn.commit()
+        client = app.test_client()
+        resp = client.get("/api/opportunities", headers={"Accept-Encoding": "gzip"})
+        if http_cache.brotli is None:
+            assert resp.headers["Content-Encoding"] == "gzip"
+            assert len(json.loads(gzip.decompress(resp.data))) == 50
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        plain = client.get("/api/opportunities")
+        assert "Content-Encoding" not in plain.headers
+
+        html = client.get("/").get_data(as_text=True)
+        css_url = "/static/css/style.css?v=" + html.split("style.css?v=")[1].split('"')[0]
+        css = client.get(css_url, headers={"Accept-Encoding": "gzip"})
+        assert css.headers["Cache-Control"] == (
+            "public, max-age=31536000, immutable")
+        if http_cache.brotli is None:
+            assert gzip.decompress(css.data) == (
+                Path(app.static_folder) / "css" / "style.css").read_bytes()
+        stale = client.get("/static/css/style.css?v=0000")
+        assert "immutable" not in stale.headers.get("Cache-Control", "")
+
+
+class TestChangeLog:
+    """Test the change log, its tailer fan-out and the SSE endpoint."""
+
+    def test_commit_from_other_connection_reaches_subscriber(self, tmp_db):
+        from tools.db import change_log
+        sub = change_log.subscribe(["ingest_job"], tmp_db)
+        try:
+            # Another process/worker: a plain connection, not the pool
+            other = sqlite3.connect(str(tmp_db))
+            change_log.publish(other, "cag", {"opened": 1}, "PROP-x")
+            change_log.publish(other, "ingest_job", {"status": "running"}, "job-1")
+            other.commit()
+            other.close()
+            event = sub.get(timeout=5)
+            assert event["channel"] == "ingest_job" and event["entity_id"] == "job-1"
+            assert event["data"] == {"status": "running"}
+            assert event["seq"] > sub.start_seq
+            assert [e["channel"] for e in change_log.since(0, db_path=tmp_db)] == [
+                "cag", "ingest_job"]
+        finally:
+            sub.close()
+
+    def test_tailer_survives_errors(self, tmp_db, monkeypatch):
+        from tools.db import change_log
+        real_pump = change_log.ChangeBroker._pump
+        failures = []
+
+        def flaky_pump(self, conn):
+            if not failures:
+                failures.append(1)
+                raise sqlite3.OperationalError("database is locked")
+            return real_pump(self, conn)
+
+        monkeypatch.setattr(change_log.ChangeBroker, "_pump", flaky_pump)
+        monkeypatch.setattr(change_log, "POLL_INTERVAL", 0.01)
+        sub = change_log.subscribe(None, tmp_db)
+        try:
+            other = sqlite3.connect(str(tmp_db))
+            other.execute(change_log.INSERT_SQL, ("cag", "PROP-x", "not json"))
+            change_log.publish(other, "cag", {"opened": 1}, "PROP-y")
+            other.commit()
+            other.close()
+            first, second = sub.get(timeout=5), sub.get(timeout=5)
+            assert failures
+            assert (first["entity_id"], first["data"]) == ("PROP-x", {})
+            assert second["data"] == {"opened": 1}
+        finally:
+            sub.close()
+
+    def test_sse_replays_after_last_event_id(self, tmp_db, db_conn, sample_proposal):
+        from tools.dashboard.app import app
+        client = app.test_client()
+        resp = client.patch(f"/api/proposals/{sample_proposal}/status",
+                            json={"status": "pink_review"})
+        assert resp.status_code == 200
+        stream = client.get("/api/events?channels=proposal",
+                            headers={"Last-Event-ID": "0"}, buffered=False)
+        assert stream.mimetype == "text/event-stream"
+        chunks = stream.response
+        assert next(chunks).startswith(b"retry:")
+        event = next(chunks).decode()
+        stream.close()
+        assert event.startswith("id: ") and "event: proposal" in event
+        payload = json.loads(event.split("data: ", 1)[1])
+        assert payload["entity_id"] == sample_proposal
+        assert payload["data"] == {"status": "pink_review", "old_status": "draft"}
+        assert client.get("/api/events",
+                          headers={"Last-Event-ID": "x"}).status_code == 400
+
+
+class TestRequestProfiler:
+    """Test opt-in request profiling and the /api/debug/perf endpoints."""
+
+    def test_disabled_by_default(self, tmp_db):
+        from tools.dashboard import profiler
+        from tools.dashboard.app import app
+        assert profiler.ENABLED is False
+        client = app.test_client()
+        resp = client.get("/opportunities")
+        assert resp.status_code == 200 and "Server-Timing" not in resp.headers
+        assert client.get("/api/debug/perf").status_code == 404
+        assert client.get("/api/debug/perf/metrics").status_code == 404
+
+    def test_sampled_request_trace_and_metrics(self, tmp_db, sample_opportunity,
+                                               monkeypatch):
+        from tools.dashboard import profiler
+        from tools.dashboard.app import app
+        monkeypatch.setattr(profiler, "ENABLED", True)
+        monkeypatch.setattr(profiler, "SAMPLE_RATE", 0.0)
+        profiler.reset()
+        client = app.test_client()
+        client.get("/opportunities")
+        resp = client.get("/opportunities", headers={"X-Profile": "1"})
+        assert resp.headers["Server-Timing"].startswith("db;dur=")
+        with profiler.span("llm", "unit:test"):
+            pass
+
+        snap = client.get("/api/debug/perf").get_json()
+        assert snap["requests"] == 2 and snap["sampled"] == 1
+        trace = snap["recent"][0]
+        assert trace["endpoint"] == "pipeline.opportunities" and trace["status"] == 200
+        assert any("FROM opportunities" in q["sql"] and q["rows"] >= 1
+                   for q in trace["queries"])
+        assert trace["templates"][0]["name"] == "opportunities.html"
+        assert snap["spans"][0]["name"] == "unit:test"
+
+        text = client.get("/api/debug/perf/metrics").get_data(as_text=True)
+        assert ('govproposal_http_requests_total{endpoint="pipeline.opportunities",'
+                'method="GET",status="200"} 2') in text
+        assert 'govproposal_http_request_duration_seconds_count{endpoint="pipeline.opportunities"} 2' in text
+        assert 'govproposal_spans_total{kind="llm",name="unit:test"} 1' in text
+        profiler.reset()
+
+        # Connections lose their wrappers once the request is over
+        from tools.db.pool import connect
+        conn = connect(tmp_db)
+        assert "execute" not in conn.__dict__
+        conn.close()
+
 
 # =========================================================================
 # MCP SERVER TESTS
@@ -658,6 +1296,44 @@ class TestContentGeneration:
         assert isinstance(result, dict)
         assert len(result) > 0
 
+    def test_shred_sections_single_scan(self, tmp_db, sample_proposal,
+                                        tmp_path, monkeypatch):
+        from tools.proposal import section_parser
+        text = (
+            "SECTION C - STATEMENT OF WORK\n"
+            "The contractor shall provide help desk support to all users.\n"
+            "SECTION F - DELIVERIES OR PERFORMANCE\n"
+            "Monthly reports shall be delivered within 10 days after month end.\n"
+            "SECTION H - SPECIAL CONTRACT REQUIREMENTS\n"
+            "The contractor must maintain a facility clearance per DFARS 252.204-7012.\n"
+            "SECTION L - INSTRUCTIONS TO OFFERORS\n"
+            "L.1 The offeror shall submit a technical volume of 30 pages.\n"
+            "SECTION M - EVALUATION FACTORS FOR AWARD\n"
+            "Factor 1: Technical Approach is more important than price.\n"
+        )
+        sections = section_parser.sectionize(text)
+        assert sorted(sections) == ["C", "F", "H", "L", "M"]
+        assert text[sections["C"][0]:sections["C"][1]].strip() == \
+            section_parser._find_section(
+                text, section_parser._SECTION_C_PATTERNS,
+                [re.compile(r"(?i)\bSECTION\s+[D-Z][\.\s:\-—]+", re.MULTILINE)])
+
+        rfp = tmp_path / "rfp.txt"
+        rfp.write_text(text)
+        serial = section_parser.shred_solicitation(str(rfp), sample_proposal)
+        monkeypatch.setattr(section_parser, "SHRED_PARALLEL_MIN_CHARS", 0)
+        parallel = section_parser.shred_solicitation(str(rfp))
+        assert serial["section_counts"] == parallel["section_counts"]
+        assert {"section_c", "section_f", "section_h", "section_l",
+                "section_m"} <= set(serial["section_counts"])
+
+        conn = sqlite3.connect(str(tmp_db))
+        stored = conn.execute(
+            "SELECT COUNT(*) FROM shredded_requirements WHERE proposal_id = ?",
+            (sample_proposal,)).fetchone()[0]
+        conn.close()
+        assert stored == serial["total_requirements"]
+
     def test_compliance_coverage(self, tmp_db, sample_proposal):
         from tools.proposal.compliance_matrix import check_coverage
         result = check_coverage(sample_proposal)
@@ -702,6 +1378,633 @@ class TestProductionEngine:
         assert isinstance(result, dict)
         assert "acronyms" in result or "proposal_id" in result
 
+    def test_package_records_cag_fingerprint(self, tmp_db, tmp_path,
+                                             sample_proposal, sample_sections):
+        from tools.cag.rules_engine import load_rules
+        from tools.cag.aggregation_monitor import proposal_fingerprint
+        from tools.production.submission_packager import package_proposal
+
+        load_rules()
+        result = package_proposal(sample_proposal, str(tmp_path / "pkg"))
+        gate = result["cag_gate"]
+        assert gate["fingerprint"] == proposal_fingerprint(sample_proposal)["fingerprint"]
+        checklist = next(f for f in result["files"] if f["volume"] == "admin")
+        assert gate["fingerprint"] in Path(checklist["path"]).read_text()
+
+
+# =========================================================================
+# RFX DOCUMENT PROCESSING TESTS
+# =========================================================================
+def _make_pdf(path, page_texts):
+    """Write a minimal text-only PDF, one page per string."""
+    objs = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+            "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in page_texts:
+        stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET"
+        objs.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objs.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                    f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objs)} 0 R >>")
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objs) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets).encode()
+    out += f"trailer\n<< /Size {len(objs) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    path.write_bytes(out)
+
+
+class TestDocumentProcessor:
+    """Test RFX document extraction and chunking."""
+
+    def test_structured_chunks_follow_sections(self):
+        from tools.rfx.document_processor import chunk_structured
+        sow = "The contractor shall provide cloud hosting services. " * 60
+        pages = [
+            (1, "SECTION C - STATEMENT OF WORK\nC.1 Scope\n" + sow),
+            (2, "SECTION L - INSTRUCTIONS TO OFFERORS\nL.1 General\n"
+                "The offeror shall submit a technical volume.\n\n"
+                "Volume  Pages\nTechnical  30\n"),
+            (3, "SECTION M - EVALUATION FACTORS FOR AWARD\n"
+                "Technical is more important than price.\n"),
+        ]
+        chunks = list(chunk_structured(pages, target_tokens=200, overlap_tokens=40))
+        assert [c["chunk_index"] for c in chunks] == list(range(len(chunks)))
+        assert {c["section"] for c in chunks} == {"sow", "section_l", "section_m"}
+        # No chunk straddles a section boundary
+        for c in chunks:
+            assert c["page_start"] == c["page_end"]
+            assert c["token_count"] <= 200 + 40
+        sow_chunks = [c for c in chunks if c["section"] == "sow"]
+        assert len(sow_chunks) > 1 and all(c["heading"] == "C.1 Scope" for c in sow_chunks)
+        section_l = next(c for c in chunks if c["section"] == "section_l")
+        assert section_l["heading"] == "L.1 General"
+        assert "Technical  30" in section_l["content"]
+
+    def test_stacked_headings_are_kept(self):
+        from tools.rfx.document_processor import chunk_structured
+        text = ("SECTION C - STATEMENT OF WORK\nC.1 Scope\n4.1 Hosting\n"
+                "4.2 Contractor shall provide 24x7 support\n4.3 Security\n"
+                "The contractor shall patch monthly.")
+        content = "\n\n".join(c["content"] for c in chunk_structured([(1, text)]))
+        for line in text.splitlines():
+            assert line in content
+        # A numbered requirement is body text, not a heading
+        chunks = list(chunk_structured([(1, text)]))
+        assert chunks[0]["heading"] == "4.1 Hosting"
+        # A document of nothing but headings still yields its text
+        only = list(chunk_structured([(1, "SECTION C - STATEMENT OF WORK\n"
+                                            "C.1 Scope\n4.1 Hosting")]))
+        assert len(only) == 1 and only[0]["section"] == "sow"
+        assert only[0]["content"].endswith("4.1 Hosting")
+
+    def test_pdf_pages_parallel_in_order(self, tmp_path):
+        from tools.rfx.document_processor import (
+            PDF_PARALLEL_MIN_PAGES, iter_pdf_pages,
+        )
+        count = PDF_PARALLEL_MIN_PAGES + 5
+        pdf = tmp_path / "rfp.pdf"
+        _make_pdf(pdf, [f"page{i} shall comply" for i in range(1, count + 1)])
+        pages = list(iter_pdf_pages(pdf, workers=2, shard_pages=4))
+        assert [n for n, _ in pages] == list(range(1, count + 1))
+        assert pages[-1][1] == f"page{count} shall comply"
+
+    def test_docx_blocks_include_tables_in_order(self, tmp_path):
+        docx = pytest.importorskip("docx")
+        from tools.rfx.document_processor import extract_text, iter_docx_blocks
+        d = docx.Document()
+        d.add_paragraph("SECTION J - LIST OF ATTACHMENTS")
+        table = d.add_table(rows=2, cols=2)
+        for r, (a, b) in enumerate([("CDRL", "Title"), ("A001", "Status Report")]):
+            table.cell(r, 0).text, table.cell(r, 1).text = a, b
+        table.cell(1, 1).add_table(rows=1, cols=2).cell(0, 1).text = "Monthly"
+        d.add_paragraph("")
+        d.add_paragraph("The contractor shall\tdeliver A001.")
+        path = tmp_path / "rfp.docx"
+        d.save(path)
+
+        assert list(iter_docx_blocks(path)) == [
+            "SECTION J - LIST OF ATTACHMENTS",
+            "CDRL | Title\nA001 | Status Report  | Monthly",
+            "The contractor shall\tdeliver A001.",
+        ]
+        text, _ = extract_text(path)
+        assert "A001 | Status Report" in text
+
+
+class TestRequirementExtractor:
+    """Test streaming regex requirement extraction."""
+
+    def test_section_state_and_classification(self):
+        from tools.rfx.requirement_extractor import iter_requirements
+        text = (
+            "SECTION L - INSTRUCTIONS TO OFFERORS\n"
+            "The offeror shall submit a technical volume. "
+            "Offerors may refer to Section M for how proposals are scored. "
+            "The price volume must include all costs.\n"
+            "SECTION M - EVALUATION FACTORS\n"
+            "Past performance should cover three recent contracts. "
+            "This sentence has no modal verb at all in it.\n"
+        )
+        reqs = iter_requirements(text, "doc-1")
+        assert not isinstance(reqs, list)
+        got = [(r["section"], r["req_type"], r["priority"], r["volume"])
+               for r in reqs]
+        assert got == [
+            ("section_l", "shall", "critical", "technical"),
+            # A mid-sentence mention does not switch sections
+            ("section_l", "may", "high", "technical"),
+            ("section_l", "must", "critical", "cost"),
+            ("section_m", "should", "critical", "past_performance"),
+        ]
+
+    def test_failed_bulk_import_keeps_indexes(self, tmp_db, db_conn, sample_proposal,
+                                              monkeypatch):
+        from tools.db import migrate_rfx
+        from tools.rfx import requirement_extractor as rx
+        migrate_rfx.run(tmp_db)
+        monkeypatch.setattr(rx, "DB_PATH", tmp_db)
+        monkeypatch.setattr(rx, "BULK_DEFER_INDEX_MIN", 2)
+        reqs = rx.extract_regex("The offeror shall submit a volume. "
+                                "The contractor must report monthly.",
+                                "no-such-doc", sample_proposal)
+        with pytest.raises(sqlite3.IntegrityError):
+            rx.store_requirements(reqs, sample_proposal)
+        names = {r[0] for r in db_conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'rfx_requirements'")}
+        assert set(rx._DEFERRABLE_INDEXES) <= names
+        assert db_conn.execute("SELECT COUNT(*) FROM rfx_requirements").fetchone()[0] == 0
+
+    def test_amended_reimport_keeps_status(self, tmp_db, db_conn, sample_proposal, monkeypatch):
+        from tools.db import migrate_rfx
+        from tools.rfx import requirement_extractor as rx
+        migrate_rfx.run(tmp_db)
+        monkeypatch.setattr(rx, "DB_PATH", tmp_db)
+        v1 = ("The offeror shall submit a technical volume. "
+              "The contractor must provide monthly status reports. "
+              "The contractor shall maintain a staffing plan.")
+        # Amendment: reworded punctuation/case, one dropped, one added
+        v2 = ("The offeror shall submit a technical volume. "
+              "the contractor MUST provide monthly status-reports. "
+              "The contractor shall host quarterly reviews.")
+        for doc_id, content in (("doc-v1", v1), ("doc-v2", v2)):
+            db_conn.execute(
+                "INSERT INTO rfx_documents (id, filename, doc_type, file_path, "
+                "file_hash, mime_type, content, created_at, updated_at) "
+                "VALUES (?, ?, 'rfp', '/dev/null', ?, 'text/plain', ?, 'now', 'now')",
+                (doc_id, doc_id + ".txt", doc_id, content))
+        db_conn.commit()
+
+        reqs = rx.extract_regex(v1, "doc-v1", sample_proposal)
+        # Large imports into an empty table take the deferred-index path;
+        # the same import over a larger table does not
+        monkeypatch.setattr(rx, "BULK_DEFER_INDEX_MIN", 2)
+        assert rx.store_requirements(reqs, sample_proposal) == 3
+        conn = rx._conn()
+        assert not rx._drop_deferred_indexes(conn, 2)
+        conn.close()
+        assert rx.store_requirements(reqs, sample_proposal) == 0
+        kept_id = reqs[1]["id"]
+        rx.update_requirement_status(kept_id, sample_proposal, "addressed")
+
+        result = rx.extract_and_store("doc-v2", sample_proposal, prior_doc_id="doc-v1")
+        assert {k: result[k] for k in ("kept", "added", "removed", "unchanged")} == {
+            "kept": 2, "added": 1, "removed": 1, "unchanged": 0}
+        # Same summary keys as a first extraction
+        assert result["total_extracted"] == 3 and result["stored"] == 1
+        assert sum(result["by_priority"].values()) == 3
+
+        rows = db_conn.execute(
+            "SELECT r.id, r.document_id, rs.status FROM rfx_requirements r "
+            "JOIN rfx_requirement_status rs ON rs.requirement_id = r.id "
+            "WHERE r.removed_at IS NULL ORDER BY r.req_number").fetchall()
+        assert [r["document_id"] for r in rows] == ["doc-v2"] * 3
+        assert {r["id"]: r["status"] for r in rows}[kept_id] == "addressed"
+        assert [r["status"] for r in rows].count("not_addressed") == 2
+        # The dropped requirement is marked removed, not deleted
+        assert [r["req_text"] for r in rx.get_requirements(doc_id="doc-v1",
+                                                           include_removed=True)] == [
+            "The contractor shall maintain a staffing plan."]
+        assert rx.get_compliance_status(sample_proposal)["total_requirements"] == 3
+        indexes = {r[0] for r in db_conn.execute(
+            "SELECT name FROM sqlite_master WHERE tbl_name = 'rfx_requirements'")}
+        assert set(rx._DEFERRABLE_INDEXES) <= indexes
+
+
+class TestIngestQueue:
+    """Test the staged RFX ingestion job queue."""
+
+    @pytest.fixture
+    def rfx_env(self, tmp_db, tmp_path, monkeypatch):
+        from tools.db import migrate_rfx
+        from tools.rfx import document_processor, ingest_queue, requirement_extractor
+        migrate_rfx.run(tmp_db)
+        upload_dir = tmp_path / "data" / "rfx_uploads"
+        upload_dir.mkdir(parents=True)
+        for mod in (document_processor, ingest_queue):
+            monkeypatch.setattr(mod, "BASE_DIR", tmp_path)
+            monkeypatch.setattr(mod, "UPLOAD_DIR", upload_dir)
+        monkeypatch.setattr(ingest_queue, "INCOMING_DIR", upload_dir / ".incoming")
+        monkeypatch.setattr(ingest_queue, "WORK_DIR", upload_dir / ".work")
+        for mod in (document_processor, ingest_queue, requirement_extractor):
+            monkeypatch.setattr(mod, "DB_PATH", tmp_db)
+        monkeypatch.setattr(ingest_queue, "RETRY_BASE_SECONDS", 0)
+        return ingest_queue
+
+    def test_upload_job_runs_all_stages_with_retry(self, rfx_env, tmp_path, monkeypatch):
+        iq = rfx_env
+        src = tmp_path / "rfp.txt"
+        src.write_text("SECTION L\nThe offeror shall submit a technical volume. "
+                       "The contractor must provide monthly status reports.\n")
+        job_id = iq.enqueue_upload(src, doc_type="rfp")
+        assert iq.get_job(job_id)["status"] == "queued"
+
+        # The tag stage fails once; the retry resumes at tag, not upload
+        real_tag = iq.STAGE_FUNCS["tag"]
+        calls = []
+
+        def flaky_tag(conn, job):
+            calls.append(job["stage"])
+            if len(calls) == 1:
+                raise RuntimeError("transient")
+            return real_tag(conn, job)
+
+        monkeypatch.setitem(iq.STAGE_FUNCS, "tag", flaky_tag)
+        assert iq.run_worker(exit_when_idle=0, poll_seconds=0) == 2
+
+        job = iq.get_job(job_id)
+        assert job["status"] == "done"
+        assert job["progress_pct"] == 100.0
+        assert job["attempts"] == 0
+        assert set(job["results"]) == set(iq.STAGES)
+        assert not src.exists()
+
+        conn = sqlite3.connect(str(iq.DB_PATH))
+        chunks = conn.execute(
+            "SELECT COUNT(*) FROM rfx_document_chunks WHERE document_id = ?",
+            (job["document_id"],)).fetchone()[0]
+        reqs = conn.execute(
+            "SELECT COUNT(*) FROM rfx_requirements WHERE document_id = ?",
+            (job["document_id"],)).fetchone()[0]
+        conn.close()
+        assert chunks == job["results"]["chunk"]["chunk_count"] == 1
+        assert reqs == 2
+
+    def test_lease_renewed_and_lost_job_dropped(self, rfx_env, tmp_path, monkeypatch):
+        iq = rfx_env
+        monkeypatch.setattr(iq, "HEARTBEAT_SECONDS", 0.05)
+        src = tmp_path / "rfp.txt"
+        src.write_text("The contractor shall deliver.")
+        job_id = iq.enqueue_upload(src, doc_type="rfp")
+        db = sqlite3.connect(str(iq.DB_PATH), isolation_level=None)
+        leases = []
+
+        def slow_upload(conn, job):
+            for _ in range(2):
+                leases.append(db.execute("SELECT lease_expires FROM rfx_ingest_jobs "
+                                         "WHERE id = ?", (job_id,)).fetchone()[0])
+                time.sleep(0.2)
+            # The lease lapsed anyway and another worker claimed the job
+            db.execute("UPDATE rfx_ingest_jobs SET worker_id = 'other' WHERE id = ?",
+                       (job_id,))
+            time.sleep(0.2)
+            return {"status": "ok", "document_id": job["document_id"]}
+
+        monkeypatch.setitem(iq.STAGE_FUNCS, "upload", slow_upload)
+        conn = iq._conn()
+        try:
+            job = iq.process_job(conn, iq.claim_job(conn, "worker-a"))
+        finally:
+            conn.close()
+        db.close()
+        assert leases[1] > leases[0]
+        # The stale worker wrote nothing over the new owner's row
+        assert job["worker_id"] == "other" and job["status"] == "running"
+        assert job["stage"] == "upload" and job["results"] == {}
+
+    def test_content_streamed_into_document_row(self, rfx_env, tmp_path, monkeypatch):
+        from tools.rfx import document_processor as dp
+        monkeypatch.setattr(dp, "HASH_BLOCK", 7)  # many blocks, split mid-character
+        pdf = tmp_path / "rfp.pdf"
+        _make_pdf(pdf, ["page one shall", "page two must", "page three"])
+        txt = tmp_path / "notes.txt"
+        txt.write_text("Déploiement à İzmir — the contractor shall comply.\n",
+                       encoding="utf-8")
+        conn = sqlite3.connect(str(rfx_env.DB_PATH))
+        for src, expected, pages in (
+                (pdf, "page one shall\n\npage two must\n\npage three", 3),
+                (txt, txt.read_text(encoding="utf-8"), 1)):
+            doc = dp.store_upload(src, doc_type="rfp")
+            row = conn.execute(
+                "SELECT content, typeof(content), page_count FROM rfx_documents "
+                "WHERE id = ?", (doc["document_id"],)).fetchone()
+            assert row == (expected, "text", pages)
+        conn.close()
+
+    def test_duplicate_upload_job(self, rfx_env, tmp_path):
+        iq = rfx_env
+        for name in ("a.txt", "b.txt"):
+            (tmp_path / name).write_text("The contractor shall deliver.")
+        first = iq.enqueue_upload(tmp_path / "a.txt")
+        second = iq.enqueue_upload(tmp_path / "b.txt")
+        iq.run_worker(exit_when_idle=0, poll_seconds=0)
+        assert iq.get_job(first)["status"] == "done"
+        dup = iq.get_job(second)
+        assert dup["status"] == "duplicate"
+        assert dup["document_id"] == iq.get_job(first)["document_id"]
+        assert not (tmp_path / "b.txt").exists()
+        stored = [p for p in iq.UPLOAD_DIR.rglob("*") if p.is_file()]
+        assert len(stored) == 1
+
+    def test_upload_is_content_addressed_rename(self, rfx_env, tmp_path):
+        from tools.rfx.document_processor import content_path, hash_stream
+        iq = rfx_env
+        iq.INCOMING_DIR.mkdir()
+        src = iq.INCOMING_DIR / "incoming.txt"
+        with open(tmp_path / "body.txt", "wb") as out:
+            out.write(b"The offeror shall comply.")
+        with open(tmp_path / "body.txt", "rb") as body, open(src, "wb") as out:
+            fhash, size = hash_stream(body, out)
+        inode = src.stat().st_ino
+
+        job_id = iq.enqueue_upload(src, filename="rfp.TXT", fhash=fhash)
+        iq.run_worker(exit_when_idle=0, poll_seconds=0)
+        assert iq.get_job(job_id)["status"] == "done"
+        dest = content_path(fhash, ".txt")
+        assert dest.parent.name == fhash[:2] and dest.name == fhash[2:] + ".txt"
+        # Renamed, not copied
+        assert dest.stat().st_ino == inode and dest.stat().st_size == size
+        assert not src.exists()
+
+    def test_amendment_reuses_chunks_and_requirements(self, rfx_env, tmp_path, db_conn):
+        iq = rfx_env
+        sec_l = "SECTION L\n\nThe offeror shall submit a technical volume."
+        sec_c = ("SECTION C\n\nThe contractor must provide monthly status reports.\n\n"
+                 "The contractor shall maintain a staffing plan.")
+        (tmp_path / "v1.txt").write_text(sec_l + "\n\n" + sec_c)
+        v1 = iq.enqueue_upload(tmp_path / "v1.txt")
+        iq.run_worker(exit_when_idle=0, poll_seconds=0)
+        v1_doc = iq.get_job(v1)["document_id"]
+        db_conn.execute("UPDATE rfx_document_chunks SET embedding = X'00' "
+                        "WHERE document_id = ?", (v1_doc,))
+        # Keyed on the last line: a heading without a full stop joins the sentence
+        reqs = {r["req_text"].splitlines()[-1]: r["id"] for r in db_conn.execute(
+            "SELECT id, req_text FROM rfx_requirements WHERE document_id = ?", (v1_doc,))}
+        db_conn.commit()
+
+        # Amendment 1 edits both Section C paragraphs and leaves Section L alone
+        (tmp_path / "v2.txt").write_text(
+            sec_l + "\n\nSECTION C\n\nThe contractor must provide monthly status reports. "
+            "Reports are due by the fifth business day.\n\n"
+            "The contractor shall host quarterly program reviews.")
+        job_id = iq.enqueue_upload(tmp_path / "v2.txt", supersedes_id=v1_doc)
+        iq.run_worker(exit_when_idle=0, poll_seconds=0)
+        job = iq.get_job(job_id)
+        assert job["status"] == "done"
+        assert job["results"]["chunk"]["reused_embeddings"] >= 1
+        diff = job["results"]["extract_requirements"]
+        assert (diff["unchanged"], diff["kept"], diff["added"], diff["removed"]) == (1, 1, 1, 1)
+        assert diff["reextracted"] == 2
+        assert diff["total_extracted"] == 3 and diff["stored"] == 1
+        assert sum(diff["by_section"].values()) == 3
+
+        rows = {r["req_text"].splitlines()[-1]: r for r in db_conn.execute(
+            "SELECT id, document_id, removed_at, req_text FROM rfx_requirements")}
+        for text in ("The offeror shall submit a technical volume.",
+                     "The contractor must provide monthly status reports."):
+            assert rows[text]["id"] == reqs[text]
+            assert rows[text]["document_id"] == job["document_id"]
+        gone = rows["The contractor shall maintain a staffing plan."]
+        assert gone["removed_at"] and gone["document_id"] == v1_doc
+        assert rows["The contractor shall host quarterly program reviews."]["removed_at"] is None
+
+
+class TestExclusionService:
+    """Test the compiled, version-cached exclusion masker."""
+
+    @pytest.fixture
+    def excl(self, tmp_db, monkeypatch):
+        from tools.db import migrate_rfx
+        from tools.rfx import exclusion_service
+        migrate_rfx.run(tmp_db)
+        monkeypatch.setattr(exclusion_service, "DB_PATH", tmp_db)
+        monkeypatch.setattr(exclusion_service, "_masker", None)
+        return exclusion_service
+
+    def test_mask_round_trip_per_class(self, excl):
+        excl.add_term("Project Falcon", "program")
+        excl.add_term("Falcon", "program")
+        excl.add_term("Jane Doe", "person")
+        excl.add_term("NSWC", "organization", case_sensitive=True)
+        excl.add_term("xyz", "custom", whole_word=False)
+        text = ("Project Falcon and falcon lead; JANE DOE reviews. "
+                "nswc is not NSWC. abcXYZdef. Falconry is untouched.")
+        masked, mapping = excl.apply_mask(text)
+        assert masked == ("[PROGRAM_1] and [PROGRAM_2] lead; [PERSON_1] reviews. "
+                          "nswc is not [ORG_1]. abc[TERM_1]def. Falconry is untouched.")
+        assert mapping["[PROGRAM_2]"] == "Falcon"
+        restored = excl.merge_back(masked, mapping)
+        assert "Project Falcon and Falcon lead; Jane Doe" in restored
+        # Without a mapping the cached masker's placeholders are used
+        assert excl.merge_back("[ORG_1] and [PERSON_9]") == "NSWC and [PERSON_9]"
+
+    def test_masker_cached_until_list_changes(self, excl):
+        entry = excl.add_term("Falcon", "program")
+        first = excl.get_masker()
+        assert excl.get_masker() is first
+        excl.add_term("Osprey", "program")
+        second = excl.get_masker()
+        assert second is not first and second.version == first.version + 1
+        assert excl.apply_mask("Osprey")[0] == "[PROGRAM_2]"
+        assert excl.remove_term(entry["id"])
+        assert excl.apply_mask("Falcon")[0] == "Falcon"
+        assert excl.get_masker().version == second.version + 1
+        assert not excl.remove_term("missing-id")
+
+    def test_scales_to_many_terms(self, excl):
+        terms = [{"sensitive_term": f"Codename{i:05d}", "placeholder": f"[TERM_{i}]",
+                  "case_sensitive": 0, "whole_word": 1} for i in range(5000)]
+        masker = excl._Masker(1, terms)
+        masked, mapping = masker.mask("see codename04321 and Codename00007.")
+        assert masked == "see [TERM_4321] and [TERM_7]."
+        assert len(mapping) == 2
+
+    def test_longest_term_wins_across_classes(self, excl):
+        excl.add_term("Falcon", "program", case_sensitive=True)
+        excl.add_term("Falcon Ridge Station", "program")
+        masked, mapping = excl.apply_mask(
+            "Deploy to Falcon Ridge Station now; FALCON RIDGE STATION; Falcon.")
+        assert masked == "Deploy to [PROGRAM_2] now; [PROGRAM_2]; [PROGRAM_1]."
+        assert mapping == {"[PROGRAM_1]": "Falcon",
+                           "[PROGRAM_2]": "Falcon Ridge Station"}
+
+    def test_non_ascii_term(self, excl):
+        excl.add_term("İzmir Depot", "location")
+        masked, mapping = excl.apply_mask("Ship to İzmir Depot, then İZMIR DEPOT.")
+        assert "zmir" not in masked.lower() and masked.count("[") == 2
+        assert set(mapping.values()) == {"İzmir Depot"}
+
+
+class TestConnectionPool:
+    """Test the shared thread-local SQLite connection pool."""
+
+    def test_reuse_nesting_and_pragmas(self, tmp_db):
+        from tools.db.pool import connect
+        outer = connect(tmp_db, foreign_keys=True)
+        inner = connect(tmp_db)
+        assert inner is not outer
+        assert outer.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        assert inner.execute("PRAGMA foreign_keys").fetchone()[0] == 0
+        assert outer.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert outer.execute("PRAGMA synchronous").fetchone()[0] == 1
+        inner.close()
+        outer.close()
+        again = connect(tmp_db)
+        assert again is outer
+        assert again.execute("PRAGMA foreign_keys").fetchone()[0] == 0
+        again.close()
+
+    def test_close_rolls_back_uncommitted_work(self, tmp_db):
+        from tools.db.pool import connect
+        conn = connect(tmp_db)
+        conn.execute("CREATE TABLE pool_probe (v INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO pool_probe VALUES (1)")
+        conn.close()
+        conn.close()  # double close is a no-op
+        conn = connect(tmp_db)
+        assert conn.execute("SELECT COUNT(*) FROM pool_probe").fetchone()[0] == 0
+        conn.close()
+
+    def test_bench_detail_hits_proposal_route(self, tmp_db, sample_proposal):
+        from tools.dashboard import common
+        from tools.db import pool
+        result = pool.bench_detail(5, db_path=tmp_db)
+        assert result["path"] == f"/proposals/{sample_proposal}"
+        assert result["fresh_req_per_sec"] > 0 and result["pooled_req_per_sec"] > 0
+        assert common.DB_PATH == tmp_db and pool.POOL_ENABLED
+
+
+class TestWriteQueue:
+    """Test the batched single-writer queue."""
+
+    def test_failed_unit_does_not_poison_batch(self, tmp_db, db_conn):
+        from tools.db.write_queue import get_queue, submit, write
+        write("CREATE TABLE wq_probe (v INTEGER UNIQUE)", tmp_db)
+        tickets = [submit(("INSERT INTO wq_probe VALUES (?)", (i % 3,)), tmp_db)
+                   for i in range(6)]
+        failures = 0
+        for ticket in tickets:
+            try:
+                assert ticket.wait() == [1]
+            except sqlite3.IntegrityError:
+                failures += 1
+        assert failures == 3
+        # Read-your-writes: a unit is visible as soon as write() returns
+        assert write([("INSERT INTO wq_probe VALUES (?)", (7,)),
+                      ("DELETE FROM wq_probe WHERE v = ?", (0,))], tmp_db) == [1, 1]
+        values = [r[0] for r in db_conn.execute("SELECT v FROM wq_probe ORDER BY v")]
+        assert values == [1, 2, 7]
+        stats = get_queue(tmp_db).stats()
+        assert stats["failed"] == 3 and stats["p99_ms"] >= stats["p50_ms"]
+
+    def test_200_concurrent_requests(self, tmp_db, db_conn, sample_proposal):
+        import threading
+        from tools.dashboard.app import app
+        from tools.security.ai_telemetry_logger import AITelemetryLogger
+        telemetry = AITelemetryLogger(tmp_db)
+        app.config["TESTING"] = True
+        statuses = ["draft", "pink_review", "red_review", "gold_review"]
+        codes = []
+        gate = threading.Barrier(200)
+
+        def _request(i):
+            client = app.test_client()
+            gate.wait()
+            resp = client.patch(f"/api/proposals/{sample_proposal}/status",
+                                json={"status": statuses[i % 4]})
+            assert telemetry.log_ai_interaction("stress-model", "test", f"h{i}")
+            codes.append(resp.status_code)
+
+        threads = [threading.Thread(target=_request, args=(i,)) for i in range(200)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert codes == [200] * 200
+        count = db_conn.execute(
+            "SELECT COUNT(*) FROM ai_telemetry WHERE model_id = 'stress-model'"
+        ).fetchone()[0]
+        assert count == 200
+        health = json.loads(app.test_client().get("/api/health").data)
+        assert health["write_queue"]["failed"] == 0
+        assert health["write_queue"]["units"] >= 400
+
+
+class TestAuditSink:
+    """Test buffered audit writes and spool recovery."""
+
+    def test_transactional_rows_follow_commit(self, tmp_db, db_conn):
+        from tools.audit.audit_sink import record_event
+        from tools.db.pool import connect
+        row = ("sink.test", "tester", "buffered", None, None, None, "2026-01-01")
+        conn = connect(tmp_db)
+        for _ in range(3):
+            record_event(conn, row)
+        conn.rollback()
+        record_event(conn, row)
+        record_event(conn, row)
+        with conn:
+            pass
+        conn.close()
+        count = db_conn.execute(
+            "SELECT COUNT(*) FROM audit_trail WHERE event_type = 'sink.test'"
+        ).fetchone()[0]
+        assert count == 2
+
+    def test_log_event_and_crash_recovery(self, tmp_db, db_conn, monkeypatch):
+        from tools.audit import audit_logger, audit_sink
+        monkeypatch.setattr(audit_logger, "DB_PATH", tmp_db)
+        audit_logger.log_event("proposal.draft", "tester", "Drafted", "PROP-1")
+        audit_sink.flush_all()
+        row = db_conn.execute(
+            "SELECT actor, entity_type, entity_id FROM audit_trail "
+            "WHERE event_type = 'proposal.draft'").fetchone()
+        assert tuple(row) == ("tester", "project", "PROP-1")
+
+        # A dead process's spool: seq 1-2 committed, 3-4 not, torn last line
+        spool = tmp_db.parent / "audit_spool" / "audit-1-1.spool"
+        lines = [json.dumps({"seq": n, "row": ["crash.test", "x", f"e{n}",
+                                               None, None, None, "t"]})
+                 for n in range(1, 5)]
+        spool.write_text("\n".join(lines) + '\n{"seq": 5, "ro')
+        db_conn.execute("INSERT INTO audit_spool_checkpoint VALUES "
+                        "('audit-1-1.spool', 2, 't')")
+        db_conn.commit()
+        assert audit_sink.recover(tmp_db) == {"spools": 1, "rows": 2}
+        actions = [r[0] for r in db_conn.execute(
+            "SELECT action FROM audit_trail WHERE event_type = 'crash.test' "
+            "ORDER BY id")]
+        assert actions == ["e3", "e4"]
+        assert not spool.exists()
+        assert audit_sink.recover(tmp_db)["rows"] == 0
+
+    def test_bench_leaves_live_trail_alone(self, tmp_db, db_conn, monkeypatch):
+        from tools.audit import audit_sink
+        monkeypatch.setattr(audit_sink, "DB_PATH", tmp_db)
+        result = audit_sink.bench(50)
+        assert result["events"] == 50 and result["sink_per_sec"] > 0
+        count = db_conn.execute(
+            "SELECT COUNT(*) FROM audit_trail WHERE event_type = 'bench.event'"
+        ).fetchone()[0]
+        assert count == 0
+
 
 # =========================================================================
 # INTEGRATION TESTS
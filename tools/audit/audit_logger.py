@@ -4,6 +4,8 @@
 
 Logs all actions to the audit_trail table in govproposal.db.
 Satisfies NIST 800-53 AU controls. No UPDATE/DELETE operations.
+Events are spooled and batch-inserted by tools/audit/audit_sink.py; call
+audit_sink.flush_all() when a reader needs them immediately.
 
 Usage:
     python tools/audit/audit_logger.py \
@@ -16,7 +18,6 @@ Usage:
 
 import argparse
 import json
-import sqlite3
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
@@ -40,21 +41,12 @@ def log_event(event_type: str, actor: str, action: str,
 
     db_path = Path(DB_PATH)
     if db_path.exists():
-        conn = sqlite3.connect(str(db_path))
-        try:
-            conn.execute(
-                """INSERT INTO audit_trail
-                   (id, timestamp, event_type, actor, action, project_id, metadata)
-                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
-                (entry["id"], entry["timestamp"], entry["event_type"],
-                 entry["actor"], entry["action"], entry["project_id"],
-                 entry["metadata"]),
-            )
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass  # Table may not exist yet
-        finally:
-            conn.close()
+        from tools.audit.audit_sink import get_sink
+        get_sink(db_path).log((
+            entry["event_type"], entry["actor"], entry["action"],
+            "project" if project_id else None, project_id or None,
+            entry["metadata"], entry["timestamp"],
+        ))
 
     return entry
 
@@ -69,6 +61,8 @@ def main():
     args = parser.parse_args()
 
     result = log_event(args.event_type, args.actor, args.action, args.project_id)
+    from tools.audit.audit_sink import flush_all
+    flush_all()
 
     if args.json:
         print(json.dumps(result, indent=2))
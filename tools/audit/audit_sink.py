@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+"""Audit Sink — buffered, batched writer for the audit_trail table.
+
+Two paths, both append-only (INSERT only, never UPDATE/DELETE of audit rows):
+
+record_event(conn, row)
+    Used by every tool's _audit() helper. The row joins the caller's
+    transaction: it is held on the pooled connection and written with one
+    executemany when the caller commits (or when AUDIT_TXN_MAX rows are
+    pending), and it disappears with the transaction on rollback — exactly
+    as the old per-event INSERT behaved, minus N-1 statement executions.
+
+AuditSink.log(row)
+    Used by audit_logger.log_event() for standalone events that have no
+    transaction of their own. The row is appended to a per-process spool
+    file (one JSON line with a sequence number) and buffered in memory; a
+    flusher thread writes the buffer in one transaction when it reaches
+    FLUSH_MAX rows, after FLUSH_INTERVAL seconds, or at exit. The same
+    transaction advances audit_spool_checkpoint for that spool, so after a
+    crash the next process replays exactly the spooled rows past the
+    checkpoint — no loss, no duplicates. A spool file is only replayed once
+    no live process holds its lock.
+
+Set GOVPROPOSAL_AUDIT_FSYNC=1 to fsync the spool on every event (survives
+power loss as well as process crashes, at the cost of one fsync per event).
+
+Usage:
+    python tools/audit/audit_sink.py --recover [--json]
+    python tools/audit/audit_sink.py --bench 20000 [--db PATH] [--json]
+"""
+
+import argparse
+import atexit
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX
+    fcntl = None
+
+DB_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "govproposal.db"
+
+AUDIT_COLUMNS = ("event_type", "actor", "action", "entity_type",
+                 "entity_id", "details", "created_at")
+AUDIT_INSERT_SQL = (
+    "INSERT INTO audit_trail (event_type, actor, action, entity_type, "
+    "entity_id, details, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+CHECKPOINT_DDL = (
+    "CREATE TABLE IF NOT EXISTS audit_spool_checkpoint ("
+    "spool TEXT PRIMARY KEY, seq INTEGER NOT NULL, updated_at TEXT NOT NULL)"
+)
+
+AUDIT_TXN_MAX = 500          # rows held on a connection before an early write
+FLUSH_MAX = 256              # spooled rows per flush
+FLUSH_INTERVAL = 1.0         # seconds a spooled row may wait
+SPOOL_FSYNC = os.environ.get("GOVPROPOSAL_AUDIT_FSYNC", "0") == "1"
+
+_sinks: Dict[str, "AuditSink"] = {}
+_sinks_lock = threading.Lock()
+_sinks_pid = os.getpid()
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ── transactional path ──────────────────────────────────────────────────
+
+def record_event(conn, row: Sequence) -> None:
+    """Record one audit row in the caller's transaction.
+
+    Args:
+        conn: Connection the caller will commit.
+        row: Values in AUDIT_COLUMNS order.
+    """
+    pending = getattr(conn, "_audit_rows", None)
+    if pending is None:
+        # Not a pooled connection: nothing flushes on commit, write now
+        conn.execute(AUDIT_INSERT_SQL, tuple(row))
+        return
+    pending.append(tuple(row))
+    if len(pending) >= AUDIT_TXN_MAX:
+        conn._flush_audit()
+
+
+# ── spooled path ────────────────────────────────────────────────────────
+
+def _lock(fd: int, blocking: bool) -> bool:
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        return True
+    except OSError:
+        return False
+
+
+def _read_spool(path: Path) -> List[dict]:
+    """Parse spool lines; a torn final line (crash mid-write) is ignored."""
+    entries = []
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(entry, dict) and "seq" in entry and "row" in entry:
+                entries.append(entry)
+    return entries
+
+
+def _commit_rows(conn, spool: str, rows: List[tuple], seq: int) -> None:
+    """Insert rows and advance the spool checkpoint in one transaction."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(AUDIT_INSERT_SQL, rows)
+        conn.execute(
+            "INSERT INTO audit_spool_checkpoint (spool, seq, updated_at) "
+            "VALUES (?, ?, ?) ON CONFLICT(spool) DO UPDATE SET "
+            "seq = excluded.seq, updated_at = excluded.updated_at",
+            (spool, seq, _now()),
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def _forget_checkpoint(conn, spool: str) -> None:
+    conn.execute("DELETE FROM audit_spool_checkpoint WHERE spool = ?", (spool,))
+    conn.commit()
+
+
+def recover(db_path: Optional[Path] = None) -> dict:
+    """Replay orphaned spool files (no live owner) into audit_trail.
+
+    Returns:
+        dict with spools replayed and rows restored.
+    """
+    from tools.db.pool import connect
+    db_path = Path(db_path or DB_PATH)
+    spool_dir = db_path.parent / "audit_spool"
+    result = {"spools": 0, "rows": 0}
+    if not db_path.exists() or not spool_dir.is_dir():
+        return result
+    conn = connect(db_path, row_factory=None)
+    try:
+        conn.execute(CHECKPOINT_DDL)
+        for path in sorted(spool_dir.glob("*.spool")):
+            fd = os.open(path, os.O_RDWR)
+            try:
+                if not _lock(fd, blocking=False):
+                    continue  # owner still running
+                row = conn.execute(
+                    "SELECT seq FROM audit_spool_checkpoint WHERE spool = ?",
+                    (path.name,)).fetchone()
+                done = row[0] if row else 0
+                todo = [e for e in _read_spool(path) if e["seq"] > done]
+                if todo:
+                    _commit_rows(conn, path.name, [tuple(e["row"]) for e in todo],
+                                 todo[-1]["seq"])
+                    result["rows"] += len(todo)
+                # Unlink before forgetting the checkpoint, never the reverse
+                path.unlink()
+                _forget_checkpoint(conn, path.name)
+                result["spools"] += 1
+            finally:
+                os.close(fd)
+    finally:
+        conn.close()
+    return result
+
+
+class AuditSink:
+    """Per-process spool + buffer for standalone audit events."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.spool_dir = self.db_path.parent / "audit_spool"
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        recover(self.db_path)
+        while True:
+            self.spool_name = f"audit-{os.getpid()}-{time.time_ns()}.spool"
+            self.spool_path = self.spool_dir / self.spool_name
+            self._fd = os.open(self.spool_path,
+                               os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            _lock(self._fd, blocking=True)
+            if os.fstat(self._fd).st_nlink:
+                break
+            os.close(self._fd)  # another process's recover() took it first
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._buffer: List[tuple] = []
+        self._seq = 0
+        self._wake = threading.Event()
+        self._closed = False
+        self._stats = {"logged": 0, "flushed": 0, "flushes": 0, "failed_flushes": 0}
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="audit-sink")
+        self._thread.start()
+
+    def log(self, row: Sequence) -> int:
+        """Spool and buffer one row (AUDIT_COLUMNS order). Returns its seq."""
+        row = tuple(row)
+        with self._lock:
+            self._seq += 1
+            line = json.dumps({"seq": self._seq, "row": row}) + "\n"
+            os.write(self._fd, line.encode("utf-8"))
+            if SPOOL_FSYNC:
+                os.fsync(self._fd)
+            self._buffer.append(row)
+            self._stats["logged"] += 1
+            seq, full = self._seq, len(self._buffer) >= FLUSH_MAX
+        if full:
+            self._wake.set()
+        return seq
+
+    def flush(self) -> int:
+        """Write buffered rows now. Returns the number written."""
+        from tools.db.pool import connect
+        with self._flush_lock:
+            with self._lock:
+                rows, self._buffer = self._buffer, []
+                seq = self._seq
+            if not rows:
+                return 0
+            conn = connect(self.db_path, row_factory=None)
+            try:
+                conn.execute(CHECKPOINT_DDL)
+                _commit_rows(conn, self.spool_name, rows, seq)
+            except Exception:
+                # Put them back in order; the spool still has them either way
+                with self._lock:
+                    self._buffer[:0] = rows
+                    self._stats["failed_flushes"] += 1
+                raise
+            finally:
+                conn.close()
+            with self._lock:
+                self._stats["flushed"] += len(rows)
+                self._stats["flushes"] += 1
+                if not self._buffer:
+                    # Everything spooled is committed; reclaim the file
+                    os.ftruncate(self._fd, 0)
+            return len(rows)
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._wake.wait(FLUSH_INTERVAL)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                time.sleep(FLUSH_INTERVAL)  # DB busy or missing; spool keeps rows
+
+    def stats(self) -> dict:
+        with self._lock:
+            data = dict(self._stats)
+            data["buffered"] = len(self._buffer)
+        return data
+
+    def close(self) -> None:
+        """Final flush; the spool file is removed once fully committed."""
+        self._closed = True
+        self._wake.set()
+        self._thread.join(FLUSH_INTERVAL * 2)
+        try:
+            self.flush()
+        except Exception:
+            os.close(self._fd)  # leave the spool for recover()
+            return
+        with self._lock:
+            empty = not self._buffer
+        os.close(self._fd)
+        if empty:
+            from tools.db.pool import connect
+            self.spool_path.unlink(missing_ok=True)
+            conn = connect(self.db_path, row_factory=None)
+            try:
+                _forget_checkpoint(conn, self.spool_name)
+            except Exception:
+                pass  # a stale checkpoint row for a deleted spool is harmless
+            finally:
+                conn.close()
+
+
+def get_sink(db_path: Optional[Path] = None) -> AuditSink:
+    """Sink for db_path, created (with spool recovery) on first use."""
+    global _sinks_pid
+    key = os.path.abspath(str(db_path or DB_PATH))
+    with _sinks_lock:
+        if _sinks_pid != os.getpid():
+            _sinks.clear()  # inherited sinks belong to the parent
+            _sinks_pid = os.getpid()
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = _sinks[key] = AuditSink(Path(key))
+        return sink
+
+
+def flush_all() -> None:
+    with _sinks_lock:
+        sinks = list(_sinks.values()) if _sinks_pid == os.getpid() else []
+    for sink in sinks:
+        sink.flush()
+
+
+def shutdown() -> None:
+    with _sinks_lock:
+        sinks = list(_sinks.values()) if _sinks_pid == os.getpid() else []
+        _sinks.clear()
+    for sink in sinks:
+        sink.close()
+
+
+atexit.register(shutdown)
+
+
+# ── benchmark ───────────────────────────────────────────────────────────
+
+def bench(events: int = 20000, db_path: Optional[Path] = None) -> dict:
+    """Compare one INSERT+commit per event with the spooled sink.
+
+    Without db_path the benchmark runs against a throwaway database in a
+    temporary directory (removed afterwards), never the live audit trail.
+    The audit rows it writes are never deleted: the trail is append-only.
+    """
+    from tools.db.init_db import init_db
+    from tools.db.pool import close_all, connect
+    tmp_dir = None
+    if db_path is None:
+        tmp_dir = tempfile.mkdtemp(prefix="audit-bench-")
+        db_path = Path(tmp_dir) / "bench.db"
+        init_db(str(db_path))
+    db_path = Path(db_path)
+    row = ("bench.event", "audit_sink", "benchmark", None, None, None, _now())
+
+    try:
+        conn = connect(db_path, row_factory=None)
+        start = time.perf_counter()
+        try:
+            for _ in range(events):
+                conn.execute(AUDIT_INSERT_SQL, row)
+                conn.commit()
+        finally:
+            conn.close()
+        per_event = time.perf_counter() - start
+
+        sink = get_sink(db_path)
+        start = time.perf_counter()
+        for _ in range(events):
+            sink.log(row)
+        sink.flush()
+        sunk = time.perf_counter() - start
+    finally:
+        if tmp_dir:
+            with _sinks_lock:
+                sink = _sinks.pop(os.path.abspath(str(db_path)), None)
+            if sink is not None:
+                sink.close()
+            close_all()
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    return {
+        "events": events,
+        "per_event_commit_per_sec": round(events / per_event, 1),
+        "sink_per_sec": round(events / sunk, 1),
+        "speedup": round(per_event / sunk, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit Sink")
+    parser.add_argument("--recover", action="store_true",
+                        help="Replay orphaned spool files")
+    parser.add_argument("--bench", type=int, metavar="EVENTS")
+    parser.add_argument("--db-path", "--db", dest="db_path", default=None,
+                        help="Database (--bench defaults to a temporary one)")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    if args.recover:
+        result = recover(args.db_path)
+    elif args.bench:
+        result = bench(args.bench, args.db_path)
+    else:
+        parser.print_help()
+        return
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for k, v in result.items():
+            print(f"{k}: {v}")
+
+
+if __name__ == "__main__":
+    main()
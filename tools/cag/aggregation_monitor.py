@@ -16,21 +16,33 @@ Proximity scoring:
     - Same volume:     0.4 multiplier
     - Cross-volume:    0.2 multiplier
 
-When a rule triggers, a cag_alerts record is created and the proposal's
-cag_status is updated accordingly.
+Category bitmasks per paragraph, section and volume are persisted in
+cag_aggregation_state, and active alerts are keyed by (rule, source set) in
+cag_alert_state. A full scan rebuilds that state; --scan-section refreshes a
+single section and re-evaluates only the pairs it participates in. Either
+way the result is diffed against the active alerts: new combinations open a
+cag_alerts record, persisting ones are left alone, and combinations that
+disappeared are auto-resolved. The proposal's cag_status is updated
+accordingly.
+
+The pre-export gate caches its scan verdict under a proposal fingerprint: a
+Merkle root over per-section hashes (content plus tags) bound to the active
+rules version. An unchanged proposal passes the gate without rescanning;
+any edit, retag or rule reload invalidates the verdict.
 
 Usage:
     python tools/cag/aggregation_monitor.py --scan --proposal-id "prop-1" [--json]
     python tools/cag/aggregation_monitor.py --scan-section --section-id "sec-1" [--json]
-    python tools/cag/aggregation_monitor.py --check-export --proposal-id "prop-1" [--json]
+    python tools/cag/aggregation_monitor.py --check-export --proposal-id "prop-1" [--no-cache] [--json]
+    python tools/cag/aggregation_monitor.py --fingerprint --proposal-id "prop-1" [--json]
     python tools/cag/aggregation_monitor.py --history [--proposal-id "prop-1"] [--json]
     python tools/cag/aggregation_monitor.py --matrix --proposal-id "prop-1" [--json]
 """
 
 import argparse
+import hashlib
 import json
 import os
-import sqlite3
 import sys
 import uuid
 from datetime import datetime, timezone
@@ -81,12 +93,8 @@ ACTION_TO_STATUS = {
 
 def _get_db(db_path=None):
     """Open a database connection with WAL mode and foreign keys."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -97,10 +105,9 @@ def _now():
 def _audit(conn, event_type, actor, action, entity_type=None,
            entity_id=None, details=None):
     """Write an append-only audit trail record."""
-    conn.execute(
-        "INSERT INTO audit_trail "
-        "(event_type, actor, action, entity_type, entity_id, details, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, actor, action, entity_type, entity_id, details, _now()),
     )
 
@@ -146,12 +153,12 @@ def _get_tags_for_source(conn, source_type, source_id):
     return [dict(row) for row in rows]
 
 
-def _compute_proximity_score(tags_a, tags_b, relationship, proximity_config):
-    """Compute proximity score between two sets of tags.
+def _compute_proximity_score(state_a, state_b, relationship, proximity_config):
+    """Compute proximity score between two sections' aggregation state.
 
     Args:
-        tags_a: list of tag dicts from source A.
-        tags_b: list of tag dicts from source B.
+        state_a: section state dict (tag_count, confidence_sum) for source A.
+        state_b: section state dict (tag_count, confidence_sum) for source B.
         relationship: one of same_paragraph, same_section, same_volume,
                       cross_volume.
         proximity_config: dict of proximity multipliers.
@@ -161,297 +168,545 @@ def _compute_proximity_score(tags_a, tags_b, relationship, proximity_config):
     """
     base = proximity_config.get(relationship, 0.2)
 
-    # Boost based on confidence of contributing tags
-    confidences_a = [t.get("confidence", 0.5) for t in tags_a] if tags_a else [0.5]
-    confidences_b = [t.get("confidence", 0.5) for t in tags_b] if tags_b else [0.5]
-    avg_confidence = (
-        (sum(confidences_a) / len(confidences_a))
-        + (sum(confidences_b) / len(confidences_b))
-    ) / 2.0
+    # Boost based on average confidence of contributing tags
+    def _avg(state):
+        if not state["tag_count"]:
+            return 0.5
+        return state["confidence_sum"] / state["tag_count"]
 
+    avg_confidence = (_avg(state_a) + _avg(state_b)) / 2.0
     return round(base * avg_confidence, 4)
 
 
 # ---------------------------------------------------------------------------
-# Core scanning
+# Aggregation state
 # ---------------------------------------------------------------------------
 
-def scan_proposal(proposal_id, db_path=None):
-    """Full aggregation scan of an entire proposal.
-
-    For each section, retrieves tags. Builds a document-level category matrix.
-    Checks within-section, cross-section, and cross-volume combinations
-    against the rules engine. Creates cag_alerts for triggered rules.
+def _build_section_state(section, tags):
+    """Fold a section's tags into category bitmasks.
 
     Args:
-        proposal_id: ID of the proposals record.
-        db_path: Optional database path override.
+        section: dict with id, volume (section_number, section_title optional).
+        tags: list of tag dicts from _get_tags_for_source.
 
     Returns:
-        dict with scan results: proposal_id, alerts, category_matrix,
-        scan_summary, cag_status.
+        dict with section_id, volume, category_mask, paragraphs
+        (paragraph_index -> mask), tag_count, confidence_sum.
     """
-    # Import rules engine locally to avoid circular imports
-    from tools.cag.rules_engine import evaluate_tags, get_active_rules
+    from tools.cag.rules_engine import CATEGORY_BITS
+
+    mask = 0
+    paragraphs = {}
+    confidence_sum = 0.0
+    for tag in tags:
+        bit = CATEGORY_BITS.get(tag["category"], 0)
+        pidx = tag.get("paragraph_index")
+        if pidx is None:
+            pidx = -1  # Manual tags carry no position
+        paragraphs[pidx] = paragraphs.get(pidx, 0) | bit
+        mask |= bit
+        confidence_sum += tag.get("confidence", 0.5)
 
-    proximity_config = _load_proximity_config()
-    conn = _get_db(db_path)
-
-    try:
-        # Verify proposal exists
-        prop = conn.execute(
-            "SELECT id, title, cag_status FROM proposals WHERE id = ?",
-            (proposal_id,),
-        ).fetchone()
-        if not prop:
-            raise ValueError(f"Proposal not found: {proposal_id}")
+    return {
+        "section_id": section["id"],
+        "volume": section["volume"],
+        "section_number": section.get("section_number"),
+        "section_title": section.get("section_title"),
+        "category_mask": mask,
+        "paragraphs": paragraphs,
+        "tag_count": len(tags),
+        "confidence_sum": confidence_sum,
+    }
 
-        # Get all sections grouped by volume
-        sections = conn.execute(
-            "SELECT id, volume, section_number, section_title "
-            "FROM proposal_sections WHERE proposal_id = ? "
-            "ORDER BY volume, section_number",
-            (proposal_id,),
-        ).fetchall()
-        sections = [dict(s) for s in sections]
 
-        # Build document-level category matrix
-        # matrix[section_id] = {tags: [...], categories: set(), volume: str}
-        matrix = {}
-        volume_categories = {}  # volume -> set of categories
-        all_categories = set()
+def _load_state(conn, proposal_id):
+    """Load persisted section/paragraph state for a proposal.
 
-        for section in sections:
-            sid = section["id"]
-            vol = section["volume"]
-            tags = _get_tags_for_source(conn, "proposal_section", sid)
-            cats = set(t["category"] for t in tags)
+    Returns:
+        dict mapping section_id -> section state dict.
+    """
+    rows = conn.execute(
+        "SELECT scope, section_id, volume, paragraph_index, category_mask, "
+        "tag_count, confidence_sum "
+        "FROM cag_aggregation_state "
+        "WHERE proposal_id = ? AND scope IN ('section', 'paragraph')",
+        (proposal_id,),
+    ).fetchall()
 
-            matrix[sid] = {
-                "section_id": sid,
-                "volume": vol,
-                "section_number": section["section_number"],
-                "section_title": section["section_title"],
-                "tags": tags,
-                "categories": cats,
+    state = {}
+    paragraphs = {}
+    for row in rows:
+        if row["scope"] == "section":
+            state[row["section_id"]] = {
+                "section_id": row["section_id"],
+                "volume": row["volume"],
+                "section_number": None,
+                "section_title": None,
+                "category_mask": row["category_mask"],
+                "paragraphs": {},
+                "tag_count": row["tag_count"],
+                "confidence_sum": row["confidence_sum"],
             }
+        else:
+            paragraphs.setdefault(row["section_id"], {})[
+                row["paragraph_index"]
+            ] = row["category_mask"]
 
-            if vol not in volume_categories:
-                volume_categories[vol] = set()
-            volume_categories[vol].update(cats)
-            all_categories.update(cats)
+    for sid, paras in paragraphs.items():
+        if sid in state:
+            state[sid]["paragraphs"] = paras
+    return state
 
-    finally:
-        conn.close()
 
-    # Load active rules
-    active_rules = get_active_rules(db_path=db_path)
+def _delete_section_state(conn, proposal_id, section_id):
+    """Remove the section and paragraph state rows for one section."""
+    conn.execute(
+        "DELETE FROM cag_aggregation_state "
+        "WHERE proposal_id = ? AND section_id = ? "
+        "AND scope IN ('section', 'paragraph')",
+        (proposal_id, section_id),
+    )
 
-    alerts = []
 
-    # 1. Within-section checks
-    for sid, sec_data in matrix.items():
-        if not sec_data["categories"]:
+def _write_section_state(conn, proposal_id, sec_state):
+    """Replace the persisted state rows for one section."""
+    sid = sec_state["section_id"]
+    now = _now()
+    _delete_section_state(conn, proposal_id, sid)
+    conn.execute(
+        "INSERT INTO cag_aggregation_state "
+        "(proposal_id, scope, scope_key, section_id, volume, "
+        "category_mask, tag_count, confidence_sum, updated_at) "
+        "VALUES (?, 'section', ?, ?, ?, ?, ?, ?, ?)",
+        (
+            proposal_id, sid, sid, sec_state["volume"],
+            sec_state["category_mask"], sec_state["tag_count"],
+            sec_state["confidence_sum"], now,
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO cag_aggregation_state "
+        "(proposal_id, scope, scope_key, section_id, volume, "
+        "paragraph_index, category_mask, updated_at) "
+        "VALUES (?, 'paragraph', ?, ?, ?, ?, ?, ?)",
+        [
+            (proposal_id, f"{sid}:{pidx}", sid, sec_state["volume"],
+             pidx, pmask, now)
+            for pidx, pmask in sec_state["paragraphs"].items()
+        ],
+    )
+
+
+def _write_volume_state(conn, proposal_id, state, volumes):
+    """Recompute and persist the volume-level masks for the given volumes."""
+    now = _now()
+    for vol in volumes:
+        members = [s for s in state.values() if s["volume"] == vol]
+        conn.execute(
+            "DELETE FROM cag_aggregation_state "
+            "WHERE proposal_id = ? AND scope = 'volume' AND scope_key = ?",
+            (proposal_id, vol),
+        )
+        if not members:
             continue
+        mask = 0
+        for s in members:
+            mask |= s["category_mask"]
+        conn.execute(
+            "INSERT INTO cag_aggregation_state "
+            "(proposal_id, scope, scope_key, volume, category_mask, "
+            "tag_count, confidence_sum, updated_at) "
+            "VALUES (?, 'volume', ?, ?, ?, ?, ?, ?)",
+            (
+                proposal_id, vol, vol, mask,
+                sum(s["tag_count"] for s in members),
+                sum(s["confidence_sum"] for s in members),
+                now,
+            ),
+        )
 
-        # Check paragraph-level proximity within the section
-        para_groups = {}
-        for tag in sec_data["tags"]:
-            pidx = tag.get("paragraph_index", 0)
-            if pidx not in para_groups:
-                para_groups[pidx] = {"tags": [], "categories": set()}
-            para_groups[pidx]["tags"].append(tag)
-            para_groups[pidx]["categories"].add(tag["category"])
-
-        # Check each paragraph
-        for pidx, pdata in para_groups.items():
-            if len(pdata["categories"]) < 2:
-                continue
-            triggered = evaluate_tags(
-                list(pdata["categories"]), rule_set=active_rules, db_path=db_path
-            )
-            for rule_result in triggered:
-                prox = proximity_config["same_paragraph"]
-                alerts.append({
-                    "rule_id": rule_result["rule_id"],
-                    "rule_name": rule_result["rule_name"],
-                    "severity": rule_result["severity"],
-                    "action": rule_result["action"],
-                    "resulting_classification": rule_result["resulting_classification"],
-                    "remediation": rule_result["remediation"],
-                    "categories_triggered": rule_result["triggered_categories"],
-                    "source_elements": [sid],
-                    "proximity_type": "same_paragraph",
-                    "proximity_score": prox,
-                    "paragraph_index": pidx,
-                })
-
-        # Check section-level combination
-        if len(sec_data["categories"]) >= 2:
-            triggered = evaluate_tags(
-                list(sec_data["categories"]), rule_set=active_rules, db_path=db_path
+
+def _alert_key(rule_id, source_elements):
+    """Stable identity of an alert: the rule plus the set of sources."""
+    return f"{rule_id}|{','.join(sorted(source_elements))}"
+
+
+def _evaluate_state(state, active_rules, proximity_config,
+                    focus_section=None, focus_volumes=None):
+    """Evaluate the category matrix held in ``state`` against active rules.
+
+    With no focus, every within-section, cross-section and cross-volume
+    combination is evaluated. With ``focus_section`` set, only combinations
+    that involve that section (or, for cross-volume checks, one of
+    ``focus_volumes``) are produced.
+
+    Rule evaluation is memoized per bitmask, so repeated masks cost a dict
+    lookup.
+
+    Returns:
+        list of alert dicts, deduplicated by (rule_id, source set) and
+        sorted by severity.
+    """
+    from tools.cag.rules_engine import (
+        categories_to_mask, evaluate_tags, mask_to_categories,
+    )
+
+    memo = {}
+
+    def _triggered(mask):
+        if bin(mask).count("1") < 2:
+            return []
+        if mask not in memo:
+            memo[mask] = evaluate_tags(
+                mask_to_categories(mask), rule_set=active_rules
             )
-            for rule_result in triggered:
-                # Only add if not already found at paragraph level
-                already = any(
-                    a["rule_id"] == rule_result["rule_id"]
-                    and set(a["source_elements"]) == {sid}
-                    for a in alerts
-                )
-                if not already:
-                    prox = proximity_config["same_section"]
-                    alerts.append({
-                        "rule_id": rule_result["rule_id"],
-                        "rule_name": rule_result["rule_name"],
-                        "severity": rule_result["severity"],
-                        "action": rule_result["action"],
-                        "resulting_classification": rule_result["resulting_classification"],
-                        "remediation": rule_result["remediation"],
-                        "categories_triggered": rule_result["triggered_categories"],
-                        "source_elements": [sid],
-                        "proximity_type": "same_section",
-                        "proximity_score": prox,
-                    })
+        return memo[mask]
+
+    def _alert(rule_result, sources, volumes, prox_type, prox_score, **extra):
+        alert = {
+            "rule_id": rule_result["rule_id"],
+            "rule_name": rule_result["rule_name"],
+            "severity": rule_result["severity"],
+            "action": rule_result["action"],
+            "resulting_classification": rule_result["resulting_classification"],
+            "remediation": rule_result["remediation"],
+            "categories_triggered": rule_result["triggered_categories"],
+            "source_elements": sources,
+            "volumes": sorted(volumes),
+            "proximity_type": prox_type,
+            "proximity_score": prox_score,
+        }
+        alert.update(extra)
+        return alert
+
+    def _in_focus(sid):
+        return focus_section is None or sid == focus_section
+
+    alerts = []
+    volume_masks = {}
+    for sec in state.values():
+        volume_masks[sec["volume"]] = (
+            volume_masks.get(sec["volume"], 0) | sec["category_mask"]
+        )
+
+    # 1. Within-section checks (paragraph first, then whole section).
+    # within_rules is needed for every section the focus may pair with.
+    within_rules = {}
+    for sid, sec in state.items():
+        para_rules = set()
+        section_alerts = []
+        for pidx, pmask in sec["paragraphs"].items():
+            for rule_result in _triggered(pmask):
+                para_rules.add(rule_result["rule_id"])
+                section_alerts.append(_alert(
+                    rule_result, [sid], [sec["volume"]], "same_paragraph",
+                    proximity_config["same_paragraph"], paragraph_index=pidx,
+                ))
+        rules = set(para_rules)
+        for rule_result in _triggered(sec["category_mask"]):
+            rules.add(rule_result["rule_id"])
+            if rule_result["rule_id"] in para_rules:
+                continue
+            section_alerts.append(_alert(
+                rule_result, [sid], [sec["volume"]], "same_section",
+                proximity_config["same_section"],
+            ))
+        within_rules[sid] = rules
+        if _in_focus(sid):
+            alerts.extend(section_alerts)
 
     # 2. Cross-section (same volume) checks
-    section_ids = list(matrix.keys())
+    section_ids = list(state.keys())
     for i, sid_a in enumerate(section_ids):
         for sid_b in section_ids[i + 1:]:
-            sec_a = matrix[sid_a]
-            sec_b = matrix[sid_b]
-            if sec_a["volume"] != sec_b["volume"]:
+            if focus_section is not None and focus_section not in (sid_a, sid_b):
                 continue
-            combined_cats = sec_a["categories"] | sec_b["categories"]
-            if len(combined_cats) < 2:
+            sec_a = state[sid_a]
+            sec_b = state[sid_b]
+            if sec_a["volume"] != sec_b["volume"]:
                 continue
-
-            triggered = evaluate_tags(
-                list(combined_cats), rule_set=active_rules, db_path=db_path
-            )
-            for rule_result in triggered:
+            combined = sec_a["category_mask"] | sec_b["category_mask"]
+            for rule_result in _triggered(combined):
+                trig = categories_to_mask(rule_result["triggered_categories"])
                 # Only add if the combination requires both sections
-                a_has = set(rule_result["triggered_categories"]) & sec_a["categories"]
-                b_has = set(rule_result["triggered_categories"]) & sec_b["categories"]
-                if not (a_has and b_has):
+                if not (trig & sec_a["category_mask"]
+                        and trig & sec_b["category_mask"]):
                     continue
-
                 # Skip if already detected within a single section
-                already = any(
-                    a["rule_id"] == rule_result["rule_id"]
-                    and len(a["source_elements"]) == 1
-                    and a["source_elements"][0] in (sid_a, sid_b)
-                    for a in alerts
-                )
-                if already:
+                rid = rule_result["rule_id"]
+                if rid in within_rules[sid_a] or rid in within_rules[sid_b]:
                     continue
-
-                prox = _compute_proximity_score(
-                    sec_a["tags"], sec_b["tags"],
-                    "same_volume", proximity_config,
-                )
-                alerts.append({
-                    "rule_id": rule_result["rule_id"],
-                    "rule_name": rule_result["rule_name"],
-                    "severity": rule_result["severity"],
-                    "action": rule_result["action"],
-                    "resulting_classification": rule_result["resulting_classification"],
-                    "remediation": rule_result["remediation"],
-                    "categories_triggered": rule_result["triggered_categories"],
-                    "source_elements": sorted([sid_a, sid_b]),
-                    "proximity_type": "same_volume",
-                    "proximity_score": prox,
-                })
+                alerts.append(_alert(
+                    rule_result, sorted([sid_a, sid_b]), [sec_a["volume"]],
+                    "same_volume",
+                    _compute_proximity_score(
+                        sec_a, sec_b, "same_volume", proximity_config
+                    ),
+                ))
 
     # 3. Cross-volume checks
-    volumes = list(volume_categories.keys())
+    volumes = list(volume_masks.keys())
     for i, vol_a in enumerate(volumes):
         for vol_b in volumes[i + 1:]:
-            combined_cats = volume_categories[vol_a] | volume_categories[vol_b]
-            if len(combined_cats) < 2:
+            if focus_volumes is not None and not (
+                {vol_a, vol_b} & set(focus_volumes)
+            ):
                 continue
-
-            triggered = evaluate_tags(
-                list(combined_cats), rule_set=active_rules, db_path=db_path
-            )
-            for rule_result in triggered:
-                a_has = set(rule_result["triggered_categories"]) & volume_categories[vol_a]
-                b_has = set(rule_result["triggered_categories"]) & volume_categories[vol_b]
-                if not (a_has and b_has):
+            mask_a = volume_masks[vol_a]
+            mask_b = volume_masks[vol_b]
+            for rule_result in _triggered(mask_a | mask_b):
+                trig = categories_to_mask(rule_result["triggered_categories"])
+                if not (trig & mask_a and trig & mask_b):
                     continue
 
                 # Find contributing section IDs
-                source_sids = []
-                for sid, sec_data in matrix.items():
-                    if sec_data["volume"] in (vol_a, vol_b):
-                        if sec_data["categories"] & set(rule_result["triggered_categories"]):
-                            source_sids.append(sid)
-
-                prox = proximity_config["cross_volume"]
-                alerts.append({
-                    "rule_id": rule_result["rule_id"],
-                    "rule_name": rule_result["rule_name"],
-                    "severity": rule_result["severity"],
-                    "action": rule_result["action"],
-                    "resulting_classification": rule_result["resulting_classification"],
-                    "remediation": rule_result["remediation"],
-                    "categories_triggered": rule_result["triggered_categories"],
-                    "source_elements": sorted(set(source_sids)),
-                    "proximity_type": "cross_volume",
-                    "proximity_score": prox,
-                })
-
-    # Deduplicate alerts by (rule_id, frozenset(source_elements))
-    seen = set()
+                source_sids = sorted(
+                    sid for sid, sec in state.items()
+                    if sec["volume"] in (vol_a, vol_b)
+                    and sec["category_mask"] & trig
+                )
+                alerts.append(_alert(
+                    rule_result, source_sids, [vol_a, vol_b], "cross_volume",
+                    proximity_config["cross_volume"],
+                ))
+
+    # Deduplicate alerts by (rule_id, source set)
     unique_alerts = []
+    seen = set()
     for alert in alerts:
-        key = (alert["rule_id"], frozenset(alert["source_elements"]))
-        if key not in seen:
-            seen.add(key)
-            unique_alerts.append(alert)
-    alerts = unique_alerts
+        key = _alert_key(alert["rule_id"], alert["source_elements"])
+        if key in seen:
+            continue
+        seen.add(key)
+        alert["alert_key"] = key
+        unique_alerts.append(alert)
 
-    # Sort by severity
     severity_order = {"CRITICAL": 0, "HIGH": 1, "MEDIUM": 2, "LOW": 3}
-    alerts.sort(key=lambda a: severity_order.get(a["severity"], 99))
+    unique_alerts.sort(key=lambda a: severity_order.get(a["severity"], 99))
+    return unique_alerts
 
-    # Store alerts and update proposal status
-    conn = _get_db(db_path)
-    try:
-        new_cag_status = "clear"
 
-        for alert in alerts:
-            alert_id = _gen_id()
-            alert["alert_id"] = alert_id
+def _reconcile_alerts(conn, proposal_id, desired, in_scope):
+    """Diff desired alerts against the active alert state.
+
+    New combinations open a cag_alerts row, combinations that persist keep
+    their existing alert, and in-scope combinations that disappeared are
+    auto-resolved. Alerts a reviewer has already closed are left as-is.
+
+    Args:
+        conn: Open database connection (caller commits).
+        proposal_id: ID of the proposals record.
+        desired: list of alert dicts from _evaluate_state.
+        in_scope: predicate over cag_alert_state rows selecting which
+                  existing alerts the evaluation was responsible for.
+
+    Returns:
+        dict with opened, unchanged and resolved counts.
+    """
+    rows = conn.execute(
+        "SELECT s.alert_key, s.alert_id, s.proximity_type, s.source_elements, "
+        "s.volumes, a.status "
+        "FROM cag_alert_state s LEFT JOIN cag_alerts a ON a.id = s.alert_id "
+        "WHERE s.proposal_id = ?",
+        (proposal_id,),
+    ).fetchall()
+    existing = {}
+    for row in rows:
+        entry = dict(row)
+        entry["source_elements"] = json.loads(entry["source_elements"])
+        entry["volumes"] = json.loads(entry["volumes"])
+        if in_scope(entry):
+            existing[entry["alert_key"]] = entry
+
+    now = _now()
+    opened = unchanged = resolved = 0
+
+    for alert in desired:
+        prior = existing.pop(alert["alert_key"], None)
+        if prior is not None and prior["status"] is not None:
+            alert["alert_id"] = prior["alert_id"]
+            unchanged += 1
+            continue
+
+        alert_id = _gen_id()
+        alert["alert_id"] = alert_id
+        conn.execute(
+            "INSERT INTO cag_alerts "
+            "(id, proposal_id, rule_id, severity, status, "
+            "categories_triggered, source_elements, proximity_score, "
+            "resulting_classification, remediation_suggestion, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                alert_id, proposal_id, alert["rule_id"],
+                alert["severity"], "open",
+                json.dumps(alert["categories_triggered"]),
+                json.dumps(alert["source_elements"]),
+                alert.get("proximity_score"),
+                alert["resulting_classification"],
+                alert.get("remediation", ""),
+                now,
+            ),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO cag_alert_state "
+            "(proposal_id, alert_key, alert_id, rule_id, action, "
+            "proximity_type, source_elements, volumes, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                proposal_id, alert["alert_key"], alert_id, alert["rule_id"],
+                alert["action"], alert["proximity_type"],
+                json.dumps(alert["source_elements"]),
+                json.dumps(alert["volumes"]), now,
+            ),
+        )
+        opened += 1
 
+    for key, prior in existing.items():
+        if prior["status"] in ("open", "acknowledged", "quarantined"):
             conn.execute(
-                "INSERT INTO cag_alerts "
-                "(id, proposal_id, rule_id, severity, status, "
-                "categories_triggered, source_elements, proximity_score, "
-                "resulting_classification, remediation_suggestion, created_at) "
-                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                "UPDATE cag_alerts SET status = 'resolved', "
+                "resolved_by = 'cag-auto', resolved_at = ?, "
+                "resolution_notes = ? WHERE id = ?",
                 (
-                    alert_id, proposal_id, alert["rule_id"],
-                    alert["severity"], "open",
-                    json.dumps(alert["categories_triggered"]),
-                    json.dumps(alert["source_elements"]),
-                    alert.get("proximity_score"),
-                    alert["resulting_classification"],
-                    alert.get("remediation", ""),
-                    _now(),
+                    now,
+                    "Auto-resolved: combination no longer present",
+                    prior["alert_id"],
                 ),
             )
+            resolved += 1
+        conn.execute(
+            "DELETE FROM cag_alert_state WHERE proposal_id = ? AND alert_key = ?",
+            (proposal_id, key),
+        )
 
-            # Determine highest status
-            alert_status = ACTION_TO_STATUS.get(alert["action"], "alert")
-            if STATUS_PRIORITY.get(alert_status, 0) > STATUS_PRIORITY.get(new_cag_status, 0):
-                new_cag_status = alert_status
+    if opened or resolved:
+        from tools.db import change_log
+        change_log.publish(conn, "cag", {"opened": opened, "resolved": resolved},
+                           proposal_id)
+    return {"opened": opened, "unchanged": unchanged, "resolved": resolved}
 
-        # Update proposal cag_status
-        conn.execute(
-            "UPDATE proposals SET cag_status = ?, cag_last_scan = ?, updated_at = ? "
-            "WHERE id = ?",
-            (new_cag_status, _now(), _now(), proposal_id),
+
+def _update_cag_status(conn, proposal_id):
+    """Derive the proposal cag_status from its active alerts and persist it."""
+    rows = conn.execute(
+        "SELECT s.action FROM cag_alert_state s "
+        "JOIN cag_alerts a ON a.id = s.alert_id "
+        "WHERE s.proposal_id = ? "
+        "AND a.status NOT IN ('resolved', 'overridden', 'false_positive')",
+        (proposal_id,),
+    ).fetchall()
+
+    new_cag_status = "clear"
+    for row in rows:
+        alert_status = ACTION_TO_STATUS.get(row["action"], "alert")
+        if STATUS_PRIORITY.get(alert_status, 0) > STATUS_PRIORITY.get(new_cag_status, 0):
+            new_cag_status = alert_status
+
+    prior = conn.execute(
+        "SELECT cag_status FROM proposals WHERE id = ?", (proposal_id,)
+    ).fetchone()
+    conn.execute(
+        "UPDATE proposals SET cag_status = ?, cag_last_scan = ?, updated_at = ? "
+        "WHERE id = ?",
+        (new_cag_status, _now(), _now(), proposal_id),
+    )
+    if prior is not None and prior[0] != new_cag_status:
+        from tools.db import change_log
+        change_log.publish(conn, "proposal", {"cag_status": new_cag_status},
+                           proposal_id)
+    return new_cag_status
+
+
+def _apply_full_scan(conn, proposal_id, state, alerts):
+    """Replace a proposal's persisted state and reconcile all its alerts.
+
+    Shared by scan_proposal and the portfolio sweep writer, which receives
+    ``state`` and ``alerts`` already computed by a worker.
+
+    Args:
+        conn: Open database connection (caller commits).
+        proposal_id: ID of the proposals record.
+        state: dict mapping section_id -> section state dict.
+        alerts: list of alert dicts from _evaluate_state.
+
+    Returns:
+        tuple of (diff counts dict, new cag_status).
+    """
+    conn.execute(
+        "DELETE FROM cag_aggregation_state WHERE proposal_id = ?",
+        (proposal_id,),
+    )
+    for sec_state in state.values():
+        _write_section_state(conn, proposal_id, sec_state)
+    volumes = sorted({s["volume"] for s in state.values()})
+    _write_volume_state(conn, proposal_id, state, volumes)
+
+    diff = _reconcile_alerts(conn, proposal_id, alerts, lambda row: True)
+    return diff, _update_cag_status(conn, proposal_id)
+
+
+# ---------------------------------------------------------------------------
+# Core scanning
+# ---------------------------------------------------------------------------
+
+def scan_proposal(proposal_id, db_path=None):
+    """Full aggregation scan of an entire proposal.
+
+    For each section, retrieves tags and rebuilds the persisted category
+    bitmasks (paragraph, section, volume). Checks within-section,
+    cross-section, and cross-volume combinations against the rules engine,
+    then diffs the result against the active alerts: new combinations are
+    opened, persisting ones are kept, vanished ones are auto-resolved.
+
+    Args:
+        proposal_id: ID of the proposals record.
+        db_path: Optional database path override.
+
+    Returns:
+        dict with scan results: proposal_id, alerts, category_matrix,
+        scan_summary, cag_status.
+    """
+    # Import rules engine locally to avoid circular imports
+    from tools.cag.rules_engine import get_active_rules, mask_to_categories
+
+    proximity_config = _load_proximity_config()
+    active_rules = get_active_rules(db_path=db_path)
+    conn = _get_db(db_path)
+
+    try:
+        # Verify proposal exists
+        prop = conn.execute(
+            "SELECT id, title, cag_status FROM proposals WHERE id = ?",
+            (proposal_id,),
+        ).fetchone()
+        if not prop:
+            raise ValueError(f"Proposal not found: {proposal_id}")
+
+        # Get all sections grouped by volume
+        sections = conn.execute(
+            "SELECT id, volume, section_number, section_title "
+            "FROM proposal_sections WHERE proposal_id = ? "
+            "ORDER BY volume, section_number",
+            (proposal_id,),
+        ).fetchall()
+        sections = [dict(s) for s in sections]
+
+        # Rebuild the document-level category matrix from tags
+        state = {}
+        for section in sections:
+            tags = _get_tags_for_source(conn, "proposal_section", section["id"])
+            state[section["id"]] = _build_section_state(section, tags)
+
+        alerts = _evaluate_state(state, active_rules, proximity_config)
+        diff, new_cag_status = _apply_full_scan(
+            conn, proposal_id, state, alerts
         )
+        volumes = sorted({s["volume"] for s in state.values()})
+
+        all_mask = 0
+        for sec_state in state.values():
+            all_mask |= sec_state["category_mask"]
+        all_categories = mask_to_categories(all_mask)
 
         _audit(
             conn, "cag.scan_proposal", "auto",
@@ -460,8 +715,10 @@ def scan_proposal(proposal_id, db_path=None):
             entity_type="proposal", entity_id=proposal_id,
             details=json.dumps({
                 "alert_count": len(alerts),
+                "alerts_opened": diff["opened"],
+                "alerts_resolved": diff["resolved"],
                 "cag_status": new_cag_status,
-                "categories_found": sorted(all_categories),
+                "categories_found": all_categories,
             }),
         )
         conn.commit()
@@ -470,13 +727,13 @@ def scan_proposal(proposal_id, db_path=None):
 
     # Build category matrix output
     category_matrix = {}
-    for sid, sec_data in matrix.items():
+    for sid, sec_state in state.items():
         category_matrix[sid] = {
-            "volume": sec_data["volume"],
-            "section_number": sec_data["section_number"],
-            "section_title": sec_data["section_title"],
-            "categories": sorted(sec_data["categories"]),
-            "tag_count": len(sec_data["tags"]),
+            "volume": sec_state["volume"],
+            "section_number": sec_state["section_number"],
+            "section_title": sec_state["section_title"],
+            "categories": mask_to_categories(sec_state["category_mask"]),
+            "tag_count": sec_state["tag_count"],
         }
 
     return {
@@ -484,29 +741,43 @@ def scan_proposal(proposal_id, db_path=None):
         "cag_status": new_cag_status,
         "total_alerts": len(alerts),
         "alerts": alerts,
+        "alerts_opened": diff["opened"],
+        "alerts_resolved": diff["resolved"],
+        "alerts_unchanged": diff["unchanged"],
         "category_matrix": category_matrix,
-        "categories_found": sorted(all_categories),
+        "categories_found": all_categories,
         "sections_scanned": len(sections),
-        "volumes_scanned": sorted(volume_categories.keys()),
+        "volumes_scanned": volumes,
         "scanned_at": _now(),
     }
 
 
 def scan_section(section_id, db_path=None):
-    """Scan a single proposal section for aggregation risks.
+    """Incrementally re-scan a single proposal section after it changed.
 
-    Evaluates the section's tags against active rules. This is useful
-    for real-time checking as content is being written.
+    Refreshes the section's persisted bitmasks from its current tags and
+    re-evaluates only the combinations that involve it: its paragraphs and
+    the section itself, its pairings within the volume, and the cross-volume
+    pairs of its (old and new) volume. Alerts in that scope are diffed
+    against the active alert state; everything else is left untouched. This
+    keeps continuous monitoring cheap enough to run on every save.
+
+    Sections of the proposal with no persisted state yet are bootstrapped
+    from their tags, so this works without a prior full scan.
 
     Args:
         section_id: ID of the proposal_sections record.
         db_path: Optional database path override.
 
     Returns:
-        dict with section scan results.
+        dict with section scan results and the alert diff.
     """
-    from tools.cag.rules_engine import evaluate_tags, get_active_rules
+    from tools.cag.rules_engine import (
+        evaluate_tags, get_active_rules, mask_to_categories,
+    )
 
+    proximity_config = _load_proximity_config()
+    active_rules = get_active_rules(db_path=db_path)
     conn = _get_db(db_path)
     try:
         section = conn.execute(
@@ -517,53 +788,270 @@ def scan_section(section_id, db_path=None):
         if not section:
             raise ValueError(f"Section not found: {section_id}")
         section = dict(section)
+        proposal_id = section["proposal_id"]
+
+        state = _load_state(conn, proposal_id)
+        old_volume = state[section_id]["volume"] if section_id in state else None
+
+        # Reconcile persisted state with the sections that exist now
+        current = conn.execute(
+            "SELECT id, volume FROM proposal_sections WHERE proposal_id = ?",
+            (proposal_id,),
+        ).fetchall()
+        current_ids = {row["id"] for row in current}
+        stale_volumes = set()
+        for sid in [s for s in state if s not in current_ids]:
+            stale_volumes.add(state[sid]["volume"])
+            _delete_section_state(conn, proposal_id, sid)
+            del state[sid]
+        for row in current:
+            if row["id"] not in state and row["id"] != section_id:
+                tags = _get_tags_for_source(conn, "proposal_section", row["id"])
+                state[row["id"]] = _build_section_state(dict(row), tags)
+                _write_section_state(conn, proposal_id, state[row["id"]])
+                stale_volumes.add(row["volume"])
 
         tags = _get_tags_for_source(conn, "proposal_section", section_id)
+        state[section_id] = _build_section_state(section, tags)
+        _write_section_state(conn, proposal_id, state[section_id])
+
+        focus_volumes = {section["volume"]}
+        if old_volume is not None:
+            focus_volumes.add(old_volume)
+        _write_volume_state(
+            conn, proposal_id, state, focus_volumes | stale_volumes
+        )
+
+        alerts = _evaluate_state(
+            state, active_rules, proximity_config,
+            focus_section=section_id, focus_volumes=focus_volumes,
+        )
+
+        def _in_scope(row):
+            if section_id in row["source_elements"]:
+                return True
+            return (row["proximity_type"] == "cross_volume"
+                    and bool(focus_volumes & set(row["volumes"])))
+
+        diff = _reconcile_alerts(conn, proposal_id, alerts, _in_scope)
+        new_cag_status = _update_cag_status(conn, proposal_id)
+
+        _audit(
+            conn, "cag.scan_section", "auto",
+            f"Scanned section {section_id}: {diff['opened']} opened, "
+            f"{diff['resolved']} resolved, status={new_cag_status}",
+            entity_type="proposal", entity_id=proposal_id,
+            details=json.dumps({
+                "section_id": section_id,
+                "alerts_in_scope": len(alerts),
+                "alerts_opened": diff["opened"],
+                "alerts_resolved": diff["resolved"],
+                "cag_status": new_cag_status,
+            }),
+        )
+        conn.commit()
     finally:
         conn.close()
 
-    categories = set(t["category"] for t in tags)
-    active_rules = get_active_rules(db_path=db_path)
-    triggered = evaluate_tags(list(categories), rule_set=active_rules, db_path=db_path)
+    categories = mask_to_categories(state[section_id]["category_mask"])
+    triggered = evaluate_tags(categories, rule_set=active_rules)
 
     return {
         "section_id": section_id,
-        "proposal_id": section["proposal_id"],
+        "proposal_id": proposal_id,
         "volume": section["volume"],
         "section_number": section["section_number"],
-        "categories": sorted(categories),
+        "categories": categories,
         "tag_count": len(tags),
         "rules_triggered": len(triggered),
         "triggered_rules": triggered,
+        "cag_status": new_cag_status,
+        "alerts": alerts,
+        "alerts_opened": diff["opened"],
+        "alerts_resolved": diff["resolved"],
+        "alerts_unchanged": diff["unchanged"],
         "scanned_at": _now(),
     }
 
 
-def check_before_export(proposal_id, db_path=None):
+# ---------------------------------------------------------------------------
+# Export gate
+# ---------------------------------------------------------------------------
+
+def _sha256(*parts):
+    """Hex SHA-256 over the given string parts, NUL separated."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _merkle_root(leaves):
+    """Fold leaf hashes pairwise into a single root (odd leaf is paired with itself)."""
+    if not leaves:
+        return _sha256("")
+    level = list(leaves)
+    while len(level) > 1:
+        if len(level) % 2:
+            level.append(level[-1])
+        level = [
+            _sha256(level[i], level[i + 1]) for i in range(0, len(level), 2)
+        ]
+    return level[0]
+
+
+def _section_hashes(conn, proposal_id):
+    """Hash each section's content and CAG tags (the inputs to a scan).
+
+    Returns:
+        dict mapping section_id -> leaf hash, in section_id order.
+    """
+    sections = conn.execute(
+        "SELECT id, volume, content FROM proposal_sections "
+        "WHERE proposal_id = ? ORDER BY id",
+        (proposal_id,),
+    ).fetchall()
+    tag_rows = conn.execute(
+        "SELECT t.source_id, t.category, t.confidence, t.paragraph_index "
+        "FROM cag_data_tags t JOIN proposal_sections s ON s.id = t.source_id "
+        "WHERE t.source_type = 'proposal_section' AND s.proposal_id = ? "
+        "ORDER BY t.source_id, t.category, t.paragraph_index, t.confidence",
+        (proposal_id,),
+    ).fetchall()
+    tags = {}
+    for row in tag_rows:
+        tags.setdefault(row["source_id"], []).append(
+            f"{row['category']}:{row['confidence']}:{row['paragraph_index']}"
+        )
+
+    return {
+        sec["id"]: _sha256(
+            sec["id"], sec["volume"],
+            _sha256(sec["content"] or ""),
+            _sha256(*tags.get(sec["id"], [])),
+        )
+        for sec in sections
+    }
+
+
+def proposal_fingerprint(proposal_id, db_path=None):
+    """Content fingerprint a pre-export verdict is tied to.
+
+    A Merkle root over per-section hashes (content plus CAG tags), combined
+    with the active rules version. Any section edit, retag or rule reload
+    yields a new fingerprint.
+
+    Args:
+        proposal_id: ID of the proposals record.
+        db_path: Optional database path override.
+
+    Returns:
+        dict with fingerprint, merkle_root, rules_version, section_hashes.
+    """
+    from tools.cag.rules_engine import get_active_rules, rules_version
+
+    version = rules_version(get_active_rules(db_path=db_path))
+    conn = _get_db(db_path)
+    try:
+        leaves = _section_hashes(conn, proposal_id)
+    finally:
+        conn.close()
+
+    root = _merkle_root(list(leaves.values()))
+    return {
+        "fingerprint": _sha256(root, version),
+        "merkle_root": root,
+        "rules_version": version,
+        "section_hashes": leaves,
+    }
+
+
+def check_before_export(proposal_id, use_cache=True, db_path=None):
     """Pre-export aggregation check for a proposal.
 
     Runs a full scan and returns pass/fail with any blocking alerts.
     A proposal passes only if there are no open CRITICAL or HIGH alerts
     with block_and_alert or quarantine actions.
 
+    The scan verdict is cached in cag_export_verdicts under the proposal
+    fingerprint (see proposal_fingerprint). While the fingerprint is
+    unchanged the scan is skipped; unresolved alerts and cag_status are
+    always read live, so reviewer actions take effect immediately.
+
     Args:
         proposal_id: ID of the proposals record.
+        use_cache: Set False to force a full scan.
         db_path: Optional database path override.
 
     Returns:
-        dict with export_allowed (bool), blocking_alerts list,
-        and cag_status.
+        dict with export_allowed (bool), blocking_alerts list, cag_status,
+        fingerprint, rules_version, cache_hit and, on a cache miss after a
+        previous verdict, the changed_sections.
     """
-    scan_result = scan_proposal(proposal_id, db_path=db_path)
+    fp = proposal_fingerprint(proposal_id, db_path=db_path)
 
-    blocking_alerts = [
-        alert for alert in scan_result.get("alerts", [])
-        if alert.get("action") in ("block_and_alert", "quarantine")
-    ]
+    conn = _get_db(db_path)
+    try:
+        prop = conn.execute(
+            "SELECT id FROM proposals WHERE id = ?", (proposal_id,)
+        ).fetchone()
+        if not prop:
+            raise ValueError(f"Proposal not found: {proposal_id}")
+        cached = conn.execute(
+            "SELECT fingerprint, section_hashes, blocking_alerts, total_alerts "
+            "FROM cag_export_verdicts WHERE proposal_id = ?",
+            (proposal_id,),
+        ).fetchone()
+    finally:
+        conn.close()
+
+    cache_hit = bool(
+        use_cache and cached and cached["fingerprint"] == fp["fingerprint"]
+    )
+    changed_sections = None
+    if cache_hit:
+        blocking_alerts = json.loads(cached["blocking_alerts"])
+        total_alerts = cached["total_alerts"]
+    else:
+        scan_result = scan_proposal(proposal_id, db_path=db_path)
+        blocking_alerts = [
+            alert for alert in scan_result.get("alerts", [])
+            if alert.get("action") in ("block_and_alert", "quarantine")
+        ]
+        total_alerts = scan_result.get("total_alerts", 0)
+        if cached:
+            previous = json.loads(cached["section_hashes"])
+            current = fp["section_hashes"]
+            changed_sections = sorted(
+                sid for sid in set(previous) | set(current)
+                if previous.get(sid) != current.get(sid)
+            )
 
     # Also check existing unresolved alerts
     conn = _get_db(db_path)
     try:
+        if not cache_hit:
+            conn.execute(
+                "INSERT INTO cag_export_verdicts "
+                "(proposal_id, fingerprint, merkle_root, rules_version, "
+                "section_hashes, blocking_alerts, total_alerts, checked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(proposal_id) DO UPDATE SET "
+                "fingerprint = excluded.fingerprint, "
+                "merkle_root = excluded.merkle_root, "
+                "rules_version = excluded.rules_version, "
+                "section_hashes = excluded.section_hashes, "
+                "blocking_alerts = excluded.blocking_alerts, "
+                "total_alerts = excluded.total_alerts, "
+                "checked_at = excluded.checked_at",
+                (
+                    proposal_id, fp["fingerprint"], fp["merkle_root"],
+                    fp["rules_version"], json.dumps(fp["section_hashes"]),
+                    json.dumps(blocking_alerts), total_alerts, _now(),
+                ),
+            )
+            conn.commit()
         existing_open = conn.execute(
             "SELECT id, rule_id, severity, categories_triggered, "
             "resulting_classification, remediation_suggestion "
@@ -574,6 +1062,9 @@ def check_before_export(proposal_id, db_path=None):
             (proposal_id,),
         ).fetchall()
         existing_blocking = [dict(row) for row in existing_open]
+        cag_status = conn.execute(
+            "SELECT cag_status FROM proposals WHERE id = ?", (proposal_id,)
+        ).fetchone()["cag_status"]
     finally:
         conn.close()
 
@@ -581,19 +1072,29 @@ def check_before_export(proposal_id, db_path=None):
         len(blocking_alerts) == 0 and len(existing_blocking) == 0
     )
 
-    return {
+    result = {
         "proposal_id": proposal_id,
         "export_allowed": export_allowed,
-        "cag_status": scan_result.get("cag_status", "pending"),
+        "cag_status": cag_status or "pending",
         "blocking_alerts_new": len(blocking_alerts),
         "blocking_alerts_existing": len(existing_blocking),
         "blocking_alerts": blocking_alerts,
         "existing_unresolved": existing_blocking,
-        "total_alerts": scan_result.get("total_alerts", 0),
+        "total_alerts": total_alerts,
+        "fingerprint": fp["fingerprint"],
+        "rules_version": fp["rules_version"],
+        "cache_hit": cache_hit,
         "checked_at": _now(),
     }
+    if changed_sections is not None:
+        result["changed_sections"] = changed_sections
+    return result
 
 
+# ---------------------------------------------------------------------------
+# History and reporting
+# ---------------------------------------------------------------------------
+
 def get_scan_history(proposal_id=None, db_path=None):
     """Retrieve scan history from the audit trail.
 
@@ -740,6 +1241,10 @@ def main():
         "--check-export", action="store_true",
         help="Pre-export aggregation check (pass/fail)",
     )
+    group.add_argument(
+        "--fingerprint", action="store_true",
+        help="Show the proposal content fingerprint used by the export gate",
+    )
     group.add_argument(
         "--history", action="store_true",
         help="Show scan history",
@@ -751,6 +1256,10 @@ def main():
 
     parser.add_argument("--proposal-id", help="Proposal ID")
     parser.add_argument("--section-id", help="Section ID (for --scan-section)")
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Ignore the cached export verdict (for --check-export)",
+    )
     parser.add_argument("--db-path", help="Override database path")
     parser.add_argument("--json", action="store_true", help="JSON output")
 
@@ -773,9 +1282,18 @@ def main():
         elif args.check_export:
             if not args.proposal_id:
                 parser.error("--check-export requires --proposal-id")
-            output = check_before_export(args.proposal_id, db_path=db)
+            output = check_before_export(
+                args.proposal_id, use_cache=not args.no_cache, db_path=db
+            )
             output["status"] = "checked"
 
+        elif args.fingerprint:
+            if not args.proposal_id:
+                parser.error("--fingerprint requires --proposal-id")
+            output = proposal_fingerprint(args.proposal_id, db_path=db)
+            output["proposal_id"] = args.proposal_id
+            output["status"] = "fingerprinted"
+
         elif args.history:
             history = get_scan_history(
                 proposal_id=args.proposal_id, db_path=db
@@ -877,6 +1395,10 @@ def _print_human(output):
         print(f"  CAG Status:     {output.get('cag_status', '?')}")
         print(f"  Total alerts:   {total}")
         print(f"  Blocking:       {blocking}")
+        print(f"  Fingerprint:    {output.get('fingerprint', '?')}")
+        print(f"  Cached verdict: {'YES' if output.get('cache_hit') else 'NO'}")
+        if output.get("changed_sections"):
+            print(f"  Changed:        {', '.join(output['changed_sections'])}")
 
         if not allowed:
             print()
@@ -889,6 +1411,13 @@ def _print_human(output):
                 if rem:
                     print(f"      Fix: {rem}")
 
+    elif status == "fingerprinted":
+        print(f"  Proposal:       {output.get('proposal_id', '?')}")
+        print(f"  Fingerprint:    {output.get('fingerprint', '?')}")
+        print(f"  Merkle root:    {output.get('merkle_root', '?')}")
+        print(f"  Rules version:  {output.get('rules_version', '?')}")
+        print(f"  Sections:       {len(output.get('section_hashes', {}))}")
+
     elif status == "retrieved":
         count = output.get("scan_count", 0)
         print(f"  Scan history: {count} entries")
@@ -35,7 +35,6 @@ import argparse
 import json
 import os
 import re
-import sqlite3
 import sys
 import uuid
 from datetime import datetime, timezone
@@ -76,12 +75,8 @@ MODERATE_CONFIDENCE = 0.6
 
 def _get_db(db_path=None):
     """Open a database connection with WAL mode and foreign keys."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -92,10 +87,9 @@ def _now():
 def _audit(conn, event_type, actor, action, entity_type=None,
            entity_id=None, details=None):
     """Write an append-only audit trail record."""
-    conn.execute(
-        "INSERT INTO audit_trail "
-        "(event_type, actor, action, entity_type, entity_id, details, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, actor, action, entity_type, entity_id, details, _now()),
     )
 
@@ -171,22 +165,18 @@ def _find_indicators(content, indicators_list, case_sensitive=False):
 # Core tagging function
 # ---------------------------------------------------------------------------
 
-def tag_content(content, source_type, source_id, db_path=None):
-    """Analyze text and tag with security-relevant categories.
-
-    Scans content for indicator keywords defined in args/cag_rules.yaml.
-    Strong indicators receive 0.9 confidence; moderate get 0.6.
-    Tags are stored in the cag_data_tags table.
+def _detect_tags(content, source_type, source_id, indicators=None):
+    """Scan text for indicator keywords without touching the database.
 
     Args:
         content: Text to analyze.
         source_type: One of VALID_SOURCE_TYPES.
         source_id: ID of the source entity.
-        db_path: Optional database path override.
+        indicators: Optional pre-loaded result of _load_rules_yaml(), so
+                    callers tagging many sources parse the YAML once.
 
     Returns:
-        list of dicts, each with: id, category, confidence, indicator_text,
-        indicator_type, position_start, position_end, paragraph_index.
+        list of tag dicts ready for _store_tags.
     """
     if not content or not content.strip():
         return []
@@ -197,7 +187,8 @@ def tag_content(content, source_type, source_id, db_path=None):
             f"Must be one of: {VALID_SOURCE_TYPES}"
         )
 
-    indicators = _load_rules_yaml()
+    if indicators is None:
+        indicators = _load_rules_yaml()
     detected_tags = []
 
     for category, cat_indicators in indicators.items():
@@ -239,36 +230,66 @@ def tag_content(content, source_type, source_id, db_path=None):
                 "section_context": content[max(0, start - 40):end + 40].strip(),
             })
 
-    # 3. Store in database
+    return detected_tags
+
+
+def _store_tags(conn, detected_tags, source_type, source_id):
+    """Insert detected tags and audit the tagging (caller commits)."""
+    now = _now()
+    conn.executemany(
+        "INSERT INTO cag_data_tags "
+        "(id, source_type, source_id, category, confidence, "
+        "indicator_text, indicator_type, position_start, position_end, "
+        "paragraph_index, section_context, tagged_by, "
+        "classification_at_tag, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                tag["id"], tag["source_type"], tag["source_id"],
+                tag["category"], tag["confidence"],
+                tag["indicator_text"], tag["indicator_type"],
+                tag["position_start"], tag["position_end"],
+                tag["paragraph_index"], tag["section_context"],
+                "auto", "UNCLASSIFIED", now,
+            )
+            for tag in detected_tags
+        ],
+    )
+    _audit(
+        conn, "cag.tag", "auto",
+        f"Tagged {len(detected_tags)} elements in {source_type}/{source_id}",
+        entity_type=source_type, entity_id=source_id,
+        details=json.dumps({
+            "tag_count": len(detected_tags),
+            "categories": list(set(t["category"] for t in detected_tags)),
+        }),
+    )
+
+
+def tag_content(content, source_type, source_id, db_path=None):
+    """Analyze text and tag with security-relevant categories.
+
+    Scans content for indicator keywords defined in args/cag_rules.yaml.
+    Strong indicators receive 0.9 confidence; moderate get 0.6.
+    Tags are stored in the cag_data_tags table.
+
+    Args:
+        content: Text to analyze.
+        source_type: One of VALID_SOURCE_TYPES.
+        source_id: ID of the source entity.
+        db_path: Optional database path override.
+
+    Returns:
+        list of dicts, each with: id, category, confidence, indicator_text,
+        indicator_type, position_start, position_end, paragraph_index.
+    """
+    detected_tags = _detect_tags(content, source_type, source_id)
+
+    # Store in database
     if detected_tags:
         conn = _get_db(db_path)
         try:
-            for tag in detected_tags:
-                conn.execute(
-                    "INSERT INTO cag_data_tags "
-                    "(id, source_type, source_id, category, confidence, "
-                    "indicator_text, indicator_type, position_start, position_end, "
-                    "paragraph_index, section_context, tagged_by, "
-                    "classification_at_tag, created_at) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
-                    (
-                        tag["id"], tag["source_type"], tag["source_id"],
-                        tag["category"], tag["confidence"],
-                        tag["indicator_text"], tag["indicator_type"],
-                        tag["position_start"], tag["position_end"],
-                        tag["paragraph_index"], tag["section_context"],
-                        "auto", "UNCLASSIFIED", _now(),
-                    ),
-                )
-            _audit(
-                conn, "cag.tag", "auto",
-                f"Tagged {len(detected_tags)} elements in {source_type}/{source_id}",
-                entity_type=source_type, entity_id=source_id,
-                details=json.dumps({
-                    "tag_count": len(detected_tags),
-                    "categories": list(set(t["category"] for t in detected_tags)),
-                }),
-            )
+            _store_tags(conn, detected_tags, source_type, source_id)
             conn.commit()
         finally:
             conn.close()
@@ -320,11 +341,14 @@ def tag_kb_entry(entry_id, db_path=None):
     return tags
 
 
-def tag_proposal_section(section_id, db_path=None):
+def tag_proposal_section(section_id, replace=False, db_path=None):
     """Tag a proposal section by reading its content from the database.
 
     Args:
         section_id: ID of the proposal_sections record.
+        replace: If True, drop the section's existing auto tags first so
+                 edited content does not accumulate stale tags. Manual
+                 tags are kept.
         db_path: Optional database path override.
 
     Returns:
@@ -338,27 +362,28 @@ def tag_proposal_section(section_id, db_path=None):
         ).fetchone()
         if not row:
             raise ValueError(f"Proposal section not found: {section_id}")
-        content = row["content"] or ""
-    finally:
-        conn.close()
+        tags = _detect_tags(row["content"] or "", "proposal_section", section_id)
 
-    tags = tag_content(
-        content, "proposal_section", section_id, db_path=db_path
-    )
-
-    # Update the section cag_categories field
-    if tags:
-        categories = json.dumps(sorted(set(t["category"] for t in tags)))
-        conn = _get_db(db_path)
-        try:
+        # Old auto tags go in the same transaction that stores the new
+        # ones, so no reader ever sees the section untagged
+        if replace:
+            conn.execute(
+                "DELETE FROM cag_data_tags WHERE source_type = 'proposal_section' "
+                "AND source_id = ? AND tagged_by = 'auto'",
+                (section_id,),
+            )
+        if tags:
+            _store_tags(conn, tags, "proposal_section", section_id)
+        if tags or replace:
             conn.execute(
                 "UPDATE proposal_sections SET cag_categories = ?, updated_at = ? "
                 "WHERE id = ?",
-                (categories, _now(), section_id),
+                (json.dumps(sorted(set(t["category"] for t in tags))), _now(),
+                 section_id),
             )
-            conn.commit()
-        finally:
-            conn.close()
+        conn.commit()
+    finally:
+        conn.close()
 
     return tags
 
@@ -24,12 +24,17 @@ Usage:
     python tools/cag/exposure_register.py --report [--capability-group "SIGINT_collection"] [--json]
     python tools/cag/exposure_register.py --scan-cross --proposal-id "prop-1" [--json]
     python tools/cag/exposure_register.py --groups [--json]
+    python tools/cag/exposure_register.py --rebuild-rollup [--json]
+
+Cumulative state is materialized in cag_exposure_daily as a category
+bitmask per (capability_group, day). Cumulative lookups OR the masks over
+the lookback window in a single aggregate; days that fall out of the
+window are pruned as new exposures are registered.
 """
 
 import argparse
 import json
 import os
-import sqlite3
 import sys
 import uuid
 from datetime import datetime, timedelta, timezone
@@ -63,12 +68,8 @@ VALID_CATEGORIES = [
 
 def _get_db(db_path=None):
     """Open a database connection with WAL mode and foreign keys."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -79,10 +80,9 @@ def _now():
 def _audit(conn, event_type, actor, action, entity_type=None,
            entity_id=None, details=None):
     """Write an append-only audit trail record."""
-    conn.execute(
-        "INSERT INTO audit_trail "
-        "(event_type, actor, action, entity_type, entity_id, details, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, actor, action, entity_type, entity_id, details, _now()),
     )
 
@@ -125,6 +125,183 @@ def _lookback_cutoff(lookback_days=None):
     return cutoff.isoformat()
 
 
+# ---------------------------------------------------------------------------
+# Materialized rollup (cag_exposure_daily)
+# ---------------------------------------------------------------------------
+
+def _mask_or_sql():
+    """SQL expression OR-ing category_mask across a GROUP BY.
+
+    SQLite has no bitwise-OR aggregate, but with a fixed set of category
+    bits MAX(mask & bit) per bit, OR'd together, is exact.
+    """
+    from tools.cag.rules_engine import CATEGORY_BITS
+    return " | ".join(
+        f"MAX(category_mask & {bit})" for bit in CATEGORY_BITS.values()
+    )
+
+
+def _fold_exposure(conn, capability_group, categories, exposure_date,
+                   audience=None, alert_generated=False):
+    """Fold one exposure into its (capability_group, day) rollup row."""
+    from tools.cag.rules_engine import categories_to_mask
+
+    day = exposure_date[:10]
+    row = conn.execute(
+        "SELECT category_mask, audiences, latest_exposure "
+        "FROM cag_exposure_daily "
+        "WHERE capability_group = ? AND exposure_day = ?",
+        (capability_group, day),
+    ).fetchone()
+
+    audiences = set()
+    latest = exposure_date
+    mask = categories_to_mask(categories)
+    if row:
+        mask |= row["category_mask"]
+        if row["audiences"]:
+            audiences.update(json.loads(row["audiences"]))
+        latest = max(latest, row["latest_exposure"] or "")
+    if audience:
+        audiences.add(audience)
+
+    conn.execute(
+        "INSERT INTO cag_exposure_daily "
+        "(capability_group, exposure_day, category_mask, exposure_count, "
+        "alert_count, audiences, latest_exposure) "
+        "VALUES (?, ?, ?, 1, ?, ?, ?) "
+        "ON CONFLICT(capability_group, exposure_day) DO UPDATE SET "
+        "category_mask = excluded.category_mask, "
+        "exposure_count = exposure_count + 1, "
+        "alert_count = alert_count + excluded.alert_count, "
+        "audiences = excluded.audiences, "
+        "latest_exposure = excluded.latest_exposure",
+        (
+            capability_group, day, mask, 1 if alert_generated else 0,
+            json.dumps(sorted(audiences)), latest,
+        ),
+    )
+
+
+def _expire_rollup(conn, cutoff):
+    """Slide the window: drop rollup days older than the lookback cutoff."""
+    conn.execute(
+        "DELETE FROM cag_exposure_daily WHERE exposure_day < ?",
+        (cutoff[:10],),
+    )
+
+
+def _mark_rollup_built(conn, cutoff):
+    """Record that the rollup reflects the register from cutoff onward."""
+    conn.execute(
+        "INSERT OR REPLACE INTO cag_exposure_rollup_state (id, built_at, cutoff) "
+        "VALUES (1, ?, ?)",
+        (_now(), cutoff),
+    )
+
+
+def _ensure_rollup(conn):
+    """Backfill the rollup once, on first use against a pre-existing register.
+
+    The built marker is what is checked afterwards: a rollup left empty
+    because every day slid out of the window is not rebuilt on each call.
+    """
+    if conn.execute("SELECT 1 FROM cag_exposure_rollup_state").fetchone():
+        return
+    cutoff = _lookback_cutoff()
+    if conn.execute("SELECT 1 FROM cag_exposure_daily LIMIT 1").fetchone():
+        # Populated before the marker existed; register_exposure kept it current
+        _mark_rollup_built(conn, cutoff)
+    else:
+        _rebuild(conn, cutoff)
+
+
+def _rebuild(conn, cutoff):
+    """Recompute every rollup row inside the window from the register."""
+    conn.execute("DELETE FROM cag_exposure_daily")
+    rows = conn.execute(
+        "SELECT capability_group, categories_exposed, audience, "
+        "exposure_date, alert_generated "
+        "FROM cag_exposure_register WHERE exposure_date >= ? "
+        "ORDER BY exposure_date",
+        (cutoff,),
+    ).fetchall()
+    folded = 0
+    for row in rows:
+        try:
+            cats = json.loads(row["categories_exposed"] or "[]")
+        except (json.JSONDecodeError, TypeError):
+            continue
+        _fold_exposure(
+            conn, row["capability_group"], cats, row["exposure_date"],
+            audience=row["audience"],
+            alert_generated=bool(row["alert_generated"]),
+        )
+        folded += 1
+    _mark_rollup_built(conn, cutoff)
+    return folded
+
+
+def _cumulative_masks(conn, cutoff, capability_group=None):
+    """Cumulative category bitmask per group inside the lookback window.
+
+    One aggregate over the rollup rows in the date range.
+
+    Returns:
+        dict mapping capability_group -> category bitmask.
+    """
+    sql = (
+        f"SELECT capability_group, {_mask_or_sql()} AS category_mask "
+        "FROM cag_exposure_daily WHERE exposure_day >= ?"
+    )
+    params = [cutoff[:10]]
+    if capability_group:
+        sql += " AND capability_group = ?"
+        params.append(capability_group)
+    sql += " GROUP BY capability_group"
+    return {
+        row["capability_group"]: row["category_mask"] or 0
+        for row in conn.execute(sql, params).fetchall()
+    }
+
+
+def rebuild_exposure_rollup(db_path=None):
+    """Rebuild cag_exposure_daily from cag_exposure_register.
+
+    Needed only after the lookback window is widened or the register is
+    edited out-of-band; register_exposure keeps the rollup current.
+
+    Args:
+        db_path: Optional database path override.
+
+    Returns:
+        dict with exposures_folded, groups and days in the rollup.
+    """
+    conn = _get_db(db_path)
+    try:
+        folded = _rebuild(conn, _lookback_cutoff())
+        stats = conn.execute(
+            "SELECT COUNT(DISTINCT capability_group) AS groups, "
+            "COUNT(*) AS days FROM cag_exposure_daily"
+        ).fetchone()
+        _audit(
+            conn, "cag.rebuild_exposure_rollup", "system",
+            f"Rebuilt exposure rollup from {folded} exposures",
+            entity_type="cag_exposure_daily",
+            details=json.dumps({"exposures_folded": folded}),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "exposures_folded": folded,
+        "groups": stats["groups"],
+        "days": stats["days"],
+        "rebuilt_at": _now(),
+    }
+
+
 # ---------------------------------------------------------------------------
 # Core functions
 # ---------------------------------------------------------------------------
@@ -173,26 +350,19 @@ def register_exposure(proposal_id, capability_group, categories_exposed,
             raise ValueError(f"Proposal not found: {proposal_id}")
 
         # Compute cumulative categories within lookback window
-        prior_rows = conn.execute(
-            "SELECT categories_exposed FROM cag_exposure_register "
-            "WHERE capability_group = ? AND exposure_date >= ? "
-            "ORDER BY exposure_date",
-            (capability_group, cutoff),
-        ).fetchall()
-
-        cumulative = set(categories_exposed)
-        for row in prior_rows:
-            prior_cats = row["categories_exposed"]
-            if prior_cats:
-                try:
-                    cumulative.update(json.loads(prior_cats))
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
-        cumulative_sorted = sorted(cumulative)
+        from tools.cag.rules_engine import (
+            categories_to_mask, check_combination, mask_to_categories,
+        )
+        _ensure_rollup(conn)
+        _expire_rollup(conn, cutoff)
+        prior_mask = _cumulative_masks(
+            conn, cutoff, capability_group
+        ).get(capability_group, 0)
+        cumulative_sorted = mask_to_categories(
+            prior_mask | categories_to_mask(categories_exposed)
+        )
 
         # Check if cumulative triggers any aggregation rule
-        from tools.cag.rules_engine import check_combination
         combo_result = check_combination(cumulative_sorted, db_path=db_path)
         alert_generated = combo_result.get("triggered", False)
 
@@ -222,6 +392,10 @@ def register_exposure(proposal_id, capability_group, categories_exposed,
                 now,
             ),
         )
+        _fold_exposure(
+            conn, capability_group, categories_exposed, now,
+            audience=audience, alert_generated=alert_generated,
+        )
 
         # If alert generated, create a cag_alert record
         alert_details = None
@@ -255,6 +429,11 @@ def register_exposure(proposal_id, capability_group, categories_exposed,
                 "classification": cumulative_classification,
                 "risk_score": combo_result.get("risk_score", 0),
             }
+            from tools.db import change_log
+            change_log.publish(conn, "cag", {
+                "opened": 1, "alert_id": alert_id,
+                "severity": alert_details["severity"],
+            }, proposal_id)
 
         _audit(
             conn, "cag.register_exposure", "auto",
@@ -288,12 +467,62 @@ def register_exposure(proposal_id, capability_group, categories_exposed,
     }
 
 
+def _cumulative_result(capability_group, existing_mask, new_categories,
+                       rule_set, memo, lookback_days):
+    """Evaluate existing vs. existing+new exposure for one group.
+
+    check_combination results are memoized per bitmask in ``memo`` so a
+    scan over many groups evaluates each distinct mask once.
+    """
+    from tools.cag.rules_engine import (
+        categories_to_mask, check_combination, mask_to_categories,
+    )
+
+    proposed_mask = existing_mask | categories_to_mask(new_categories)
+    existing = mask_to_categories(existing_mask)
+    proposed = mask_to_categories(proposed_mask)
+
+    for mask, cats in ((proposed_mask, proposed), (existing_mask, existing)):
+        if mask not in memo:
+            memo[mask] = check_combination(cats, rule_set=rule_set)
+    combo_result = memo[proposed_mask]
+
+    # Also check existing alone to see if the NEW categories cause the trigger
+    existing_result = memo[existing_mask]
+
+    newly_triggered = []
+    if combo_result.get("triggered", False):
+        old_rule_ids = set(
+            r["rule_id"] for r in existing_result.get("rules", [])
+        )
+        for rule in combo_result.get("rules", []):
+            if rule["rule_id"] not in old_rule_ids:
+                newly_triggered.append(rule)
+
+    return {
+        "capability_group": capability_group,
+        "existing_categories": existing,
+        "new_categories": sorted(new_categories),
+        "cumulative_categories": proposed,
+        "would_trigger": len(newly_triggered) > 0,
+        "newly_triggered_rules": newly_triggered,
+        "all_triggered_rules": combo_result.get("rules", []),
+        "max_severity": combo_result.get("max_severity"),
+        "resulting_classification": combo_result.get("resulting_classification"),
+        "risk_score": combo_result.get("risk_score", 0),
+        "lookback_days": lookback_days,
+        "checked_at": _now(),
+    }
+
+
 def check_cumulative(capability_group, new_categories, db_path=None):
     """Check if adding new categories triggers an aggregation rule.
 
     Looks back over the configured lookback period (default 730 days)
     to compute what the cumulative exposure would be if the new
-    categories were added.
+    categories were added. The existing exposure is a single aggregate
+    over the cag_exposure_daily rollup rather than a re-read of every
+    register row.
 
     Args:
         capability_group: Logical grouping to check.
@@ -315,64 +544,25 @@ def check_cumulative(capability_group, new_categories, db_path=None):
                 f"Invalid category '{cat}'. Must be one of: {VALID_CATEGORIES}"
             )
 
-    cutoff = _lookback_cutoff()
+    from tools.cag.rules_engine import get_active_rules
+
+    lookback_days = _get_lookback_days()
+    cutoff = _lookback_cutoff(lookback_days)
 
     conn = _get_db(db_path)
     try:
-        prior_rows = conn.execute(
-            "SELECT categories_exposed FROM cag_exposure_register "
-            "WHERE capability_group = ? AND exposure_date >= ? "
-            "ORDER BY exposure_date",
-            (capability_group, cutoff),
-        ).fetchall()
+        _ensure_rollup(conn)
+        conn.commit()
+        existing_mask = _cumulative_masks(
+            conn, cutoff, capability_group
+        ).get(capability_group, 0)
     finally:
         conn.close()
 
-    # Build cumulative set
-    existing = set()
-    for row in prior_rows:
-        cats = row["categories_exposed"]
-        if cats:
-            try:
-                existing.update(json.loads(cats))
-            except (json.JSONDecodeError, TypeError):
-                pass
-
-    proposed = existing | set(new_categories)
-
-    # Check against rules
-    from tools.cag.rules_engine import check_combination
-    combo_result = check_combination(sorted(proposed), db_path=db_path)
-
-    # Also check existing alone to see if the NEW categories cause the trigger
-    existing_result = check_combination(sorted(existing), db_path=db_path)
-
-    newly_triggered = []
-    if combo_result.get("triggered", False):
-        new_rule_ids = set(
-            r["rule_id"] for r in combo_result.get("rules", [])
-        )
-        old_rule_ids = set(
-            r["rule_id"] for r in existing_result.get("rules", [])
-        )
-        for rule in combo_result.get("rules", []):
-            if rule["rule_id"] not in old_rule_ids:
-                newly_triggered.append(rule)
-
-    return {
-        "capability_group": capability_group,
-        "existing_categories": sorted(existing),
-        "new_categories": sorted(new_categories),
-        "cumulative_categories": sorted(proposed),
-        "would_trigger": len(newly_triggered) > 0,
-        "newly_triggered_rules": newly_triggered,
-        "all_triggered_rules": combo_result.get("rules", []),
-        "max_severity": combo_result.get("max_severity"),
-        "resulting_classification": combo_result.get("resulting_classification"),
-        "risk_score": combo_result.get("risk_score", 0),
-        "lookback_days": _get_lookback_days(),
-        "checked_at": _now(),
-    }
+    return _cumulative_result(
+        capability_group, existing_mask, new_categories,
+        get_active_rules(db_path=db_path), {}, lookback_days,
+    )
 
 
 def get_exposure_report(capability_group=None, db_path=None):
@@ -478,7 +668,9 @@ def scan_cross_proposal(proposal_id, db_path=None):
 
     For each capability group mentioned in the proposal's existing
     exposure records, checks whether the cumulative exposure across
-    all prior proposals triggers any aggregation rule.
+    all prior proposals triggers any aggregation rule. Cumulative masks
+    for every group come from one aggregate over the rollup, and rule
+    results are memoized per mask, so each group costs constant time.
 
     Args:
         proposal_id: ID of the proposals record.
@@ -487,6 +679,11 @@ def scan_cross_proposal(proposal_id, db_path=None):
     Returns:
         dict with cross-proposal scan results per capability group.
     """
+    from tools.cag.rules_engine import get_active_rules
+
+    lookback_days = _get_lookback_days()
+    cutoff = _lookback_cutoff(lookback_days)
+
     conn = _get_db(db_path)
     try:
         prop = conn.execute(
@@ -515,54 +712,49 @@ def scan_cross_proposal(proposal_id, db_path=None):
             (proposal_id,),
         ).fetchall()
         proposal_categories = sorted(set(t["category"] for t in section_tags))
-    finally:
-        conn.close()
 
-    # If no registered groups, check all known groups for overlap
-    if not group_names:
-        conn = _get_db(db_path)
-        try:
-            all_groups = conn.execute(
-                "SELECT DISTINCT capability_group FROM cag_exposure_register"
-            ).fetchall()
-            group_names = [g["capability_group"] for g in all_groups]
-        finally:
-            conn.close()
+        _ensure_rollup(conn)
+        group_masks = _cumulative_masks(conn, cutoff)
 
-    results = []
-    overall_risk = 0.0
+        # If no registered groups, check all groups active in the window
+        if not group_names:
+            group_names = sorted(group_masks.keys())
 
-    for group_name in group_names:
-        if proposal_categories:
-            check_result = check_cumulative(
-                group_name, proposal_categories, db_path=db_path
-            )
-        else:
-            check_result = {
+        results = []
+        overall_risk = 0.0
+        rule_set = get_active_rules(db_path=db_path) if proposal_categories else []
+        memo = {}
+
+        for group_name in group_names:
+            if proposal_categories:
+                check_result = _cumulative_result(
+                    group_name, group_masks.get(group_name, 0),
+                    proposal_categories, rule_set, memo, lookback_days,
+                )
+            else:
+                check_result = {
+                    "capability_group": group_name,
+                    "would_trigger": False,
+                    "newly_triggered_rules": [],
+                    "risk_score": 0.0,
+                }
+
+            results.append({
                 "capability_group": group_name,
-                "would_trigger": False,
-                "newly_triggered_rules": [],
-                "risk_score": 0.0,
-            }
-
-        results.append({
-            "capability_group": group_name,
-            "would_trigger": check_result.get("would_trigger", False),
-            "existing_categories": check_result.get("existing_categories", []),
-            "proposal_categories": proposal_categories,
-            "cumulative_categories": check_result.get("cumulative_categories", []),
-            "newly_triggered_rules": check_result.get("newly_triggered_rules", []),
-            "risk_score": check_result.get("risk_score", 0),
-            "max_severity": check_result.get("max_severity"),
-            "resulting_classification": check_result.get("resulting_classification"),
-        })
-
-        if check_result.get("risk_score", 0) > overall_risk:
-            overall_risk = check_result["risk_score"]
-
-    # Audit the cross-proposal scan
-    conn = _get_db(db_path)
-    try:
+                "would_trigger": check_result.get("would_trigger", False),
+                "existing_categories": check_result.get("existing_categories", []),
+                "proposal_categories": proposal_categories,
+                "cumulative_categories": check_result.get("cumulative_categories", []),
+                "newly_triggered_rules": check_result.get("newly_triggered_rules", []),
+                "risk_score": check_result.get("risk_score", 0),
+                "max_severity": check_result.get("max_severity"),
+                "resulting_classification": check_result.get("resulting_classification"),
+            })
+
+            if check_result.get("risk_score", 0) > overall_risk:
+                overall_risk = check_result["risk_score"]
+
+        # Audit the cross-proposal scan
         triggered_groups = [r for r in results if r.get("would_trigger")]
         _audit(
             conn, "cag.scan_cross_proposal", "auto",
@@ -584,7 +776,7 @@ def scan_cross_proposal(proposal_id, db_path=None):
         "proposal_id": proposal_id,
         "proposal_categories": proposal_categories,
         "groups_checked": len(group_names),
-        "groups_triggered": len([r for r in results if r["would_trigger"]]),
+        "groups_triggered": len(triggered_groups),
         "overall_risk_score": round(overall_risk, 3),
         "group_results": results,
         "scanned_at": _now(),
@@ -594,58 +786,52 @@ def scan_cross_proposal(proposal_id, db_path=None):
 def get_capability_groups(db_path=None):
     """List all tracked capability groups with cumulative status.
 
+    Served entirely from the cag_exposure_daily rollup: one grouped
+    aggregate, bounded by the number of days in the lookback window.
+
     Args:
         db_path: Optional database path override.
 
     Returns:
         list of capability group summaries.
     """
+    from tools.cag.rules_engine import mask_to_categories
+
     cutoff = _lookback_cutoff()
     conn = _get_db(db_path)
     try:
+        _ensure_rollup(conn)
+        conn.commit()
         groups = conn.execute(
             "SELECT capability_group, "
-            "COUNT(*) AS exposure_count, "
-            "SUM(CASE WHEN alert_generated = 1 THEN 1 ELSE 0 END) AS alert_count, "
-            "MAX(exposure_date) AS latest_exposure, "
-            "GROUP_CONCAT(DISTINCT audience) AS audiences "
-            "FROM cag_exposure_register "
-            "WHERE exposure_date >= ? "
+            "SUM(exposure_count) AS exposure_count, "
+            "SUM(alert_count) AS alert_count, "
+            "MAX(latest_exposure) AS latest_exposure, "
+            "GROUP_CONCAT(audiences, '\n') AS audiences, "
+            f"{_mask_or_sql()} AS category_mask "
+            "FROM cag_exposure_daily "
+            "WHERE exposure_day >= ? "
             "GROUP BY capability_group "
             "ORDER BY capability_group",
-            (cutoff,),
+            (cutoff[:10],),
         ).fetchall()
-
-        results = []
-        for group in groups:
-            group = dict(group)
-
-            # Get cumulative categories
-            cat_rows = conn.execute(
-                "SELECT categories_exposed FROM cag_exposure_register "
-                "WHERE capability_group = ? AND exposure_date >= ?",
-                (group["capability_group"], cutoff),
-            ).fetchall()
-
-            cumulative = set()
-            for row in cat_rows:
-                cats = row["categories_exposed"]
-                if cats:
-                    try:
-                        cumulative.update(json.loads(cats))
-                    except (json.JSONDecodeError, TypeError):
-                        pass
-
-            group["cumulative_categories"] = sorted(cumulative)
-            group["cumulative_count"] = len(cumulative)
-            group["audiences"] = (
-                group["audiences"].split(",") if group.get("audiences") else []
-            )
-            results.append(group)
-
     finally:
         conn.close()
 
+    results = []
+    for group in groups:
+        group = dict(group)
+        cumulative = mask_to_categories(group.pop("category_mask") or 0)
+        audiences = set()
+        for chunk in (group.get("audiences") or "").split("\n"):
+            if chunk:
+                audiences.update(json.loads(chunk))
+
+        group["cumulative_categories"] = cumulative
+        group["cumulative_count"] = len(cumulative)
+        group["audiences"] = sorted(audiences)
+        results.append(group)
+
     return results
 
 
@@ -679,6 +865,10 @@ def main():
         "--groups", action="store_true",
         help="List all tracked capability groups",
     )
+    group.add_argument(
+        "--rebuild-rollup", action="store_true",
+        help="Rebuild the materialized per-day exposure rollup",
+    )
 
     parser.add_argument("--proposal-id", help="Proposal ID")
     parser.add_argument("--capability-group", help="Capability group name")
@@ -737,6 +927,10 @@ def main():
                 "groups": groups,
             }
 
+        elif args.rebuild_rollup:
+            output = rebuild_exposure_rollup(db_path=db)
+            output["status"] = "rebuilt"
+
         else:
             parser.print_help()
             sys.exit(1)
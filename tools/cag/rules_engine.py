@@ -31,9 +31,9 @@ Usage:
 """
 
 import argparse
+import hashlib
 import json
 import os
-import sqlite3
 import sys
 import uuid
 from datetime import datetime, timezone
@@ -72,6 +72,9 @@ SEVERITY_WEIGHT = {
     "CRITICAL": 1.00,
 }
 
+# Bit assigned to each category in a category bitmask (VALID_CATEGORIES order)
+CATEGORY_BITS = {cat: 1 << i for i, cat in enumerate(VALID_CATEGORIES)}
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -79,12 +82,8 @@ SEVERITY_WEIGHT = {
 
 def _get_db(db_path=None):
     """Open a database connection with WAL mode and foreign keys."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -95,10 +94,9 @@ def _now():
 def _audit(conn, event_type, actor, action, entity_type=None,
            entity_id=None, details=None):
     """Write an append-only audit trail record."""
-    conn.execute(
-        "INSERT INTO audit_trail "
-        "(event_type, actor, action, entity_type, entity_id, details, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, actor, action, entity_type, entity_id, details, _now()),
     )
 
@@ -108,6 +106,26 @@ def _gen_id(prefix="rule"):
     return f"{prefix}-{uuid.uuid4().hex[:12]}"
 
 
+# ---------------------------------------------------------------------------
+# Category bitmasks
+# ---------------------------------------------------------------------------
+
+def categories_to_mask(categories):
+    """Fold a collection of category strings into an integer bitmask.
+
+    Unknown categories are ignored.
+    """
+    mask = 0
+    for cat in categories:
+        mask |= CATEGORY_BITS.get(cat, 0)
+    return mask
+
+
+def mask_to_categories(mask):
+    """Expand a category bitmask into a sorted list of category strings."""
+    return sorted(cat for cat, bit in CATEGORY_BITS.items() if mask & bit)
+
+
 # ---------------------------------------------------------------------------
 # Rule loading
 # ---------------------------------------------------------------------------
@@ -355,7 +373,8 @@ def evaluate_tags(tags, rule_set=None, db_path=None):
     return triggered
 
 
-def check_combination(categories, proximity_scores=None, db_path=None):
+def check_combination(categories, proximity_scores=None, rule_set=None,
+                      db_path=None):
     """Quick check if a set of categories triggers any rule.
 
     Applies proximity multipliers to severity scoring if provided.
@@ -366,13 +385,15 @@ def check_combination(categories, proximity_scores=None, db_path=None):
                          proximity scores (0.0 to 1.0). If provided,
                          severity scores are multiplied by the average
                          proximity of triggered category pairs.
+        rule_set: optional list of rule dicts; callers checking many
+                  combinations load the active rules once and pass them in.
         db_path: Optional database path override.
 
     Returns:
         dict with triggered (bool), rules (list), max_severity,
         resulting_classification, and risk_score.
     """
-    rules = get_active_rules(db_path=db_path)
+    rules = rule_set if rule_set is not None else get_active_rules(db_path=db_path)
     triggered = evaluate_tags(categories, rule_set=rules, db_path=db_path)
 
     if not triggered:
@@ -483,6 +504,28 @@ def get_active_rules(rule_type=None, db_path=None):
     return [dict(row) for row in rows]
 
 
+def rules_version(rule_set):
+    """Fingerprint a rule set so verdicts can be tied to the rules they used.
+
+    Only the fields that affect evaluation are hashed, so a reload that
+    leaves every rule unchanged keeps the same version.
+
+    Args:
+        rule_set: list of rule dicts as returned by get_active_rules.
+
+    Returns:
+        str hex SHA-256 digest.
+    """
+    digest = hashlib.sha256()
+    for rule in sorted(rule_set, key=lambda r: r["id"]):
+        digest.update(json.dumps([
+            rule["id"], rule["severity"], rule["trigger_categories"],
+            rule["trigger_logic"], rule["resulting_classification"],
+            rule["action"],
+        ]).encode("utf-8"))
+    return digest.hexdigest()
+
+
 def add_org_rule(name, description, trigger_categories, trigger_logic,
                  severity, resulting_classification, action,
                  remediation=None, db_path=None):
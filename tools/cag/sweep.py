@@ -0,0 +1,747 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""CAG portfolio sweep -- re-scan every active proposal after a rule change.
+
+When rules are reloaded (rules_engine --load, --add-rule, or a new SCG),
+every in-flight proposal must be re-evaluated before its next export. A
+sweep fans the work out over a process pool:
+
+    - Each worker opens its own read-only SQLite connection, re-tags the
+      proposal's sections (optional) and evaluates the category matrix
+      against the active rules. Workers never write.
+    - The parent process is the single writer. Worker results are applied
+      in batches, one transaction per batch: tags, aggregation state,
+      alert reconciliation and cag_status, exactly as scan_proposal does.
+    - Per-proposal progress is checkpointed in cag_sweep_checkpoints in
+      the same transaction, so an interrupted sweep resumes where it
+      stopped. A sweep is pinned to the rules version it started with;
+      if the rules change again, start a new sweep.
+    - A run claims its sweep first (claim_sweep). Only one runner holds a
+      sweep at a time; the runner refreshes heartbeat_at with every batch,
+      and a claim older than SWEEP_LEASE_SECONDS (a crashed runner) can be
+      taken over by a resume.
+
+Usage:
+    python tools/cag/sweep.py --run [--proposal-id "prop-1" ...] \\
+        [--workers 4] [--batch-size 25] [--no-retag] [--json]
+    python tools/cag/sweep.py --resume --sweep-id "sweep-abc" [--workers 4] [--json]
+    python tools/cag/sweep.py --status --sweep-id "sweep-abc" [--json]
+    python tools/cag/sweep.py --list [--json]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# --- Path setup ---
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = Path(os.environ.get(
+    "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
+))
+
+# Proposals still being worked (submitted/awarded/lost are frozen)
+ACTIVE_STATUSES = (
+    "draft", "pink_review", "red_review", "gold_review",
+    "white_review", "final",
+)
+
+DEFAULT_BATCH_SIZE = 25
+SWEEP_LEASE_SECONDS = 600
+
+# Per-process worker state, populated by _init_worker
+_WORKER = {}
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def _get_db(db_path=None):
+    """Open a database connection with WAL mode and foreign keys."""
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
+
+
+def _now():
+    """Return current UTC ISO-8601 timestamp."""
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _audit(conn, event_type, actor, action, entity_type=None,
+           entity_id=None, details=None):
+    """Write an append-only audit trail record."""
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
+        (event_type, actor, action, entity_type, entity_id, details, _now()),
+    )
+
+
+def _gen_id(prefix="sweep"):
+    """Generate a unique ID."""
+    return f"{prefix}-{uuid.uuid4().hex[:12]}"
+
+
+def _pool_size(pending, requested=None):
+    """Pick a pool size: one per CPU by default, never more than the CPU
+    count or than there is work, whatever the caller asked for."""
+    cpus = os.cpu_count() or 1
+    return max(1, min(requested or cpus, cpus, pending))
+
+
+def _ensure_columns(conn):
+    """Add heartbeat_at to cag_sweeps if missing (migration-safe)."""
+    cols = {r["name"] for r in conn.execute("PRAGMA table_info(cag_sweeps)")}
+    if "heartbeat_at" not in cols:
+        conn.execute("ALTER TABLE cag_sweeps ADD COLUMN heartbeat_at TEXT")
+        conn.commit()
+
+
+class SweepConflict(ValueError):
+    """The sweep cannot run now: another runner holds it, or the rules
+    changed since it started."""
+
+
+# ---------------------------------------------------------------------------
+# Worker side (read-only)
+# ---------------------------------------------------------------------------
+
+def _init_worker(db_path, active_rules, proximity_config, retag):
+    """Pool initializer: open this worker's connection, cache rules."""
+    from tools.cag.data_tagger import _load_rules_yaml
+
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA query_only=ON")
+    _WORKER.clear()
+    _WORKER.update({
+        "conn": conn,
+        "rules": active_rules,
+        "proximity": proximity_config,
+        "retag": retag,
+        "indicators": _load_rules_yaml() if retag else None,
+    })
+
+
+def _scan_worker(proposal_id):
+    """Evaluate one proposal without writing.
+
+    Returns:
+        dict with proposal_id and either error, or state, alerts and the
+        freshly detected auto tags per section (None when not re-tagging).
+    """
+    from tools.cag.aggregation_monitor import (
+        _build_section_state, _evaluate_state, _get_tags_for_source,
+    )
+    from tools.cag.data_tagger import _detect_tags
+
+    conn = _WORKER["conn"]
+    try:
+        sections = conn.execute(
+            "SELECT id, volume, section_number, section_title, content "
+            "FROM proposal_sections WHERE proposal_id = ? "
+            "ORDER BY volume, section_number",
+            (proposal_id,),
+        ).fetchall()
+
+        state = {}
+        new_tags = {} if _WORKER["retag"] else None
+        for row in sections:
+            section = dict(row)
+            content = section.pop("content") or ""
+            if _WORKER["retag"]:
+                detected = _detect_tags(
+                    content, "proposal_section", section["id"],
+                    indicators=_WORKER["indicators"],
+                )
+                kept = conn.execute(
+                    "SELECT category, confidence, paragraph_index "
+                    "FROM cag_data_tags WHERE source_type = 'proposal_section' "
+                    "AND source_id = ? AND tagged_by != 'auto'",
+                    (section["id"],),
+                ).fetchall()
+                tags = [dict(t) for t in kept] + detected
+                new_tags[section["id"]] = detected
+            else:
+                tags = _get_tags_for_source(
+                    conn, "proposal_section", section["id"]
+                )
+            state[section["id"]] = _build_section_state(section, tags)
+
+        alerts = _evaluate_state(state, _WORKER["rules"], _WORKER["proximity"])
+    except Exception as exc:
+        return {"proposal_id": proposal_id, "error": str(exc)}
+
+    return {
+        "proposal_id": proposal_id,
+        "state": state,
+        "alerts": alerts,
+        "tags": new_tags,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Writer side
+# ---------------------------------------------------------------------------
+
+def _apply_result(conn, sweep_id, result):
+    """Persist one worker result and checkpoint it (caller commits)."""
+    from tools.cag.aggregation_monitor import _apply_full_scan
+    from tools.cag.data_tagger import _store_tags
+
+    proposal_id = result["proposal_id"]
+    now = _now()
+
+    if "error" in result:
+        conn.execute(
+            "UPDATE cag_sweep_checkpoints SET status = 'error', error = ?, "
+            "updated_at = ? WHERE sweep_id = ? AND proposal_id = ?",
+            (result["error"], now, sweep_id, proposal_id),
+        )
+        return None
+
+    for section_id, tags in (result["tags"] or {}).items():
+        conn.execute(
+            "DELETE FROM cag_data_tags WHERE source_type = 'proposal_section' "
+            "AND source_id = ? AND tagged_by = 'auto'",
+            (section_id,),
+        )
+        if tags:
+            _store_tags(conn, tags, "proposal_section", section_id)
+        conn.execute(
+            "UPDATE proposal_sections SET cag_categories = ?, updated_at = ? "
+            "WHERE id = ?",
+            (json.dumps(sorted(set(t["category"] for t in tags))), now,
+             section_id),
+        )
+
+    diff, cag_status = _apply_full_scan(
+        conn, proposal_id, result["state"], result["alerts"]
+    )
+    conn.execute(
+        "UPDATE cag_sweep_checkpoints SET status = 'done', cag_status = ?, "
+        "alert_count = ?, error = NULL, updated_at = ? "
+        "WHERE sweep_id = ? AND proposal_id = ?",
+        (cag_status, len(result["alerts"]), now, sweep_id, proposal_id),
+    )
+    _audit(
+        conn, "cag.scan_proposal", "cag-sweep",
+        f"Sweep {sweep_id} scanned proposal {proposal_id}: "
+        f"{len(result['alerts'])} alerts, status={cag_status}",
+        entity_type="proposal", entity_id=proposal_id,
+        details=json.dumps({
+            "sweep_id": sweep_id,
+            "alert_count": len(result["alerts"]),
+            "alerts_opened": diff["opened"],
+            "alerts_resolved": diff["resolved"],
+            "cag_status": cag_status,
+        }),
+    )
+    return cag_status
+
+
+def _flush(conn, sweep_id, batch):
+    """Apply a batch of worker results in a single transaction."""
+    statuses = [_apply_result(conn, sweep_id, r) for r in batch]
+    conn.execute(
+        "UPDATE cag_sweeps SET "
+        "done_count = (SELECT COUNT(*) FROM cag_sweep_checkpoints "
+        "  WHERE sweep_id = ? AND status = 'done'), "
+        "error_count = (SELECT COUNT(*) FROM cag_sweep_checkpoints "
+        "  WHERE sweep_id = ? AND status = 'error'), "
+        "heartbeat_at = ? "
+        "WHERE id = ?",
+        (sweep_id, sweep_id, _now(), sweep_id),
+    )
+    conn.commit()
+    return statuses
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def create_sweep(proposal_ids=None, retag=True, actor="system", db_path=None):
+    """Register a sweep and checkpoint every proposal it will cover.
+
+    Args:
+        proposal_ids: Optional explicit list; default is every proposal in
+                      an active (pre-submission) status.
+        retag: Re-run keyword tagging before evaluation. Needed when the
+               indicator lists changed; rule-only changes can skip it.
+        actor: Who started the sweep (audit trail).
+        db_path: Optional database path override.
+
+    Returns:
+        dict with sweep_id, total, rules_version.
+    """
+    from tools.cag.rules_engine import get_active_rules, rules_version
+
+    version = rules_version(get_active_rules(db_path=db_path))
+    conn = _get_db(db_path)
+    try:
+        if proposal_ids:
+            placeholders = ",".join("?" for _ in proposal_ids)
+            rows = conn.execute(
+                f"SELECT id FROM proposals WHERE id IN ({placeholders}) "
+                "ORDER BY id",
+                list(proposal_ids),
+            ).fetchall()
+            found = {r["id"] for r in rows}
+            missing = sorted(set(proposal_ids) - found)
+            if missing:
+                raise ValueError(f"Proposal not found: {', '.join(missing)}")
+        else:
+            placeholders = ",".join("?" for _ in ACTIVE_STATUSES)
+            rows = conn.execute(
+                f"SELECT id FROM proposals WHERE status IN ({placeholders}) "
+                "ORDER BY id",
+                ACTIVE_STATUSES,
+            ).fetchall()
+        ids = [r["id"] for r in rows]
+
+        sweep_id = _gen_id()
+        conn.execute(
+            "INSERT INTO cag_sweeps "
+            "(id, status, rules_version, retag, total, started_by, started_at) "
+            "VALUES (?, 'running', ?, ?, ?, ?, ?)",
+            (sweep_id, version, 1 if retag else 0, len(ids), actor, _now()),
+        )
+        conn.executemany(
+            "INSERT INTO cag_sweep_checkpoints (sweep_id, proposal_id, updated_at) "
+            "VALUES (?, ?, ?)",
+            [(sweep_id, pid, _now()) for pid in ids],
+        )
+        _audit(
+            conn, "cag.sweep_started", actor,
+            f"CAG sweep {sweep_id} queued {len(ids)} proposals",
+            entity_type="cag_sweep", entity_id=sweep_id,
+            details=json.dumps({
+                "total": len(ids),
+                "retag": bool(retag),
+                "rules_version": version,
+            }),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {"sweep_id": sweep_id, "total": len(ids), "rules_version": version}
+
+
+def claim_sweep(sweep_id, db_path=None):
+    """Check that a sweep can run and mark it running for this caller.
+
+    Called by run_sweep; the dashboard calls it before starting the run in
+    a background thread, so a bad request is rejected synchronously.
+
+    Args:
+        sweep_id: ID from create_sweep.
+        db_path: Optional database path override.
+
+    Raises:
+        ValueError: The sweep does not exist.
+        SweepConflict: The rules changed since the sweep started, or
+                       another runner claimed it less than
+                       SWEEP_LEASE_SECONDS ago.
+    """
+    from tools.cag.rules_engine import get_active_rules, rules_version
+
+    version = rules_version(get_active_rules(db_path=db_path))
+    conn = _get_db(db_path)
+    try:
+        _ensure_columns(conn)
+        sweep = conn.execute(
+            "SELECT rules_version FROM cag_sweeps WHERE id = ?", (sweep_id,)
+        ).fetchone()
+        if not sweep:
+            raise ValueError(f"Sweep not found: {sweep_id}")
+        if sweep["rules_version"] != version:
+            raise SweepConflict(
+                f"Rules changed since sweep {sweep_id} started; "
+                "start a new sweep"
+            )
+        stale = (datetime.now(timezone.utc)
+                 - timedelta(seconds=SWEEP_LEASE_SECONDS)).isoformat()
+        # A new sweep is 'running' with no heartbeat until its first claim
+        cur = conn.execute(
+            "UPDATE cag_sweeps SET status = 'running', completed_at = NULL, "
+            "heartbeat_at = ? WHERE id = ? AND (status != 'running' "
+            "OR heartbeat_at IS NULL OR heartbeat_at < ?)",
+            (_now(), sweep_id, stale),
+        )
+        if cur.rowcount == 0:
+            raise SweepConflict(f"Sweep {sweep_id} is already running")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def run_sweep(sweep_id, workers=None, batch_size=DEFAULT_BATCH_SIZE,
+              progress=None, db_path=None, claimed=False):
+    """Process the pending checkpoints of a sweep; also used to resume.
+
+    Args:
+        sweep_id: ID from create_sweep.
+        workers: Process pool size (default: CPU count, and never more).
+                 1 runs inline.
+        batch_size: Worker results applied per writer transaction.
+        progress: Optional callable(done, total, proposal_id, cag_status)
+                  invoked after each result is committed.
+        db_path: Optional database path override.
+        claimed: The caller already holds the sweep (see claim_sweep).
+
+    Returns:
+        dict with sweep_id, status, total, processed, done, errors,
+        skipped (already checkpointed), status_counts, duration_seconds.
+    """
+    from tools.cag.aggregation_monitor import _load_proximity_config
+    from tools.cag.rules_engine import get_active_rules, rules_version
+
+    if not claimed:
+        claim_sweep(sweep_id, db_path=db_path)
+    started = time.monotonic()
+    path = str(db_path or DB_PATH)
+    active_rules = get_active_rules(db_path=db_path)
+
+    conn = _get_db(db_path)
+    try:
+        sweep = conn.execute(
+            "SELECT * FROM cag_sweeps WHERE id = ?", (sweep_id,)
+        ).fetchone()
+        if sweep["rules_version"] != rules_version(active_rules):
+            # Rules reloaded since the claim: release the sweep
+            conn.execute(
+                "UPDATE cag_sweeps SET status = 'failed' WHERE id = ?",
+                (sweep_id,),
+            )
+            conn.commit()
+            raise SweepConflict(
+                f"Rules changed since sweep {sweep_id} started; "
+                "start a new sweep"
+            )
+        pending = [
+            r["proposal_id"] for r in conn.execute(
+                "SELECT proposal_id FROM cag_sweep_checkpoints "
+                "WHERE sweep_id = ? AND status != 'done' ORDER BY proposal_id",
+                (sweep_id,),
+            ).fetchall()
+        ]
+        total = sweep["total"]
+        skipped = total - len(pending)
+
+        init_args = (
+            path, active_rules, _load_proximity_config(), bool(sweep["retag"]),
+        )
+        workers = _pool_size(len(pending), workers)
+        status_counts = {}
+        done = skipped
+        batch = []
+
+        def _drain():
+            nonlocal done
+            for result, cag_status in zip(batch, _flush(conn, sweep_id, batch)):
+                done += 1
+                if cag_status:
+                    status_counts[cag_status] = status_counts.get(cag_status, 0) + 1
+                if progress:
+                    progress(done, total, result["proposal_id"], cag_status)
+            batch.clear()
+
+        try:
+            if workers <= 1 or len(pending) <= 1:
+                _init_worker(*init_args)
+                try:
+                    for proposal_id in pending:
+                        batch.append(_scan_worker(proposal_id))
+                        if len(batch) >= batch_size:
+                            _drain()
+                finally:
+                    _WORKER.pop("conn").close()
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers, initializer=_init_worker,
+                    initargs=init_args,
+                ) as pool:
+                    futures = [pool.submit(_scan_worker, pid) for pid in pending]
+                    for future in as_completed(futures):
+                        batch.append(future.result())
+                        if len(batch) >= batch_size:
+                            _drain()
+            _drain()
+        except BaseException:
+            conn.rollback()
+            conn.execute(
+                "UPDATE cag_sweeps SET status = 'failed' WHERE id = ?",
+                (sweep_id,),
+            )
+            conn.commit()
+            raise
+
+        counts = conn.execute(
+            "SELECT done_count, error_count FROM cag_sweeps WHERE id = ?",
+            (sweep_id,),
+        ).fetchone()
+        final_status = "completed" if counts["error_count"] == 0 else "failed"
+        conn.execute(
+            "UPDATE cag_sweeps SET status = ?, completed_at = ? WHERE id = ?",
+            (final_status, _now(), sweep_id),
+        )
+        _audit(
+            conn, "cag.sweep", "cag-sweep",
+            f"CAG sweep {sweep_id} {final_status}: "
+            f"{counts['done_count']}/{total} proposals, "
+            f"{counts['error_count']} errors",
+            entity_type="cag_sweep", entity_id=sweep_id,
+            details=json.dumps({
+                "processed": len(pending),
+                "skipped": skipped,
+                "workers": workers,
+                "status_counts": status_counts,
+            }),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "sweep_id": sweep_id,
+        "status": final_status,
+        "total": total,
+        "processed": len(pending),
+        "done": counts["done_count"],
+        "errors": counts["error_count"],
+        "skipped": skipped,
+        "workers": workers,
+        "status_counts": status_counts,
+        "duration_seconds": round(time.monotonic() - started, 3),
+    }
+
+
+def sweep_portfolio(proposal_ids=None, retag=True, workers=None,
+                    batch_size=DEFAULT_BATCH_SIZE, progress=None,
+                    actor="system", db_path=None):
+    """Create a sweep and run it to completion.
+
+    See create_sweep and run_sweep for the arguments.
+
+    Returns:
+        dict from run_sweep plus rules_version.
+    """
+    created = create_sweep(
+        proposal_ids=proposal_ids, retag=retag, actor=actor, db_path=db_path,
+    )
+    result = run_sweep(
+        created["sweep_id"], workers=workers, batch_size=batch_size,
+        progress=progress, db_path=db_path,
+    )
+    result["rules_version"] = created["rules_version"]
+    return result
+
+
+def get_sweep_status(sweep_id, db_path=None):
+    """Return a sweep record with checkpoint counts and errors.
+
+    Args:
+        sweep_id: ID of the cag_sweeps record.
+        db_path: Optional database path override.
+
+    Returns:
+        dict with the sweep fields, pending count and error list.
+    """
+    conn = _get_db(db_path)
+    try:
+        sweep = conn.execute(
+            "SELECT * FROM cag_sweeps WHERE id = ?", (sweep_id,)
+        ).fetchone()
+        if not sweep:
+            raise ValueError(f"Sweep not found: {sweep_id}")
+        pending = conn.execute(
+            "SELECT COUNT(*) AS cnt FROM cag_sweep_checkpoints "
+            "WHERE sweep_id = ? AND status = 'pending'",
+            (sweep_id,),
+        ).fetchone()["cnt"]
+        errors = conn.execute(
+            "SELECT proposal_id, error FROM cag_sweep_checkpoints "
+            "WHERE sweep_id = ? AND status = 'error' ORDER BY proposal_id",
+            (sweep_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+
+    result = dict(sweep)
+    result["retag"] = bool(result["retag"])
+    result["pending"] = pending
+    result["error_details"] = [dict(e) for e in errors]
+    return result
+
+
+def list_sweeps(limit=20, db_path=None):
+    """List recent sweeps, newest first.
+
+    Args:
+        limit: Maximum number of sweeps to return.
+        db_path: Optional database path override.
+
+    Returns:
+        list of sweep dicts.
+    """
+    conn = _get_db(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT * FROM cag_sweeps ORDER BY started_at DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(r) for r in rows]
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def _print_progress(done, total, proposal_id, cag_status):
+    """Progress line on stderr so --json output stays clean."""
+    label = cag_status or "ERROR"
+    print(f"  [{done}/{total}] {proposal_id}: {label}", file=sys.stderr)
+
+
+def main():
+    """CLI entry point for CAG portfolio sweeps."""
+    parser = argparse.ArgumentParser(
+        description="CAG: Portfolio-wide re-scan after rule changes"
+    )
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument(
+        "--run", action="store_true",
+        help="Start a new sweep over active proposals",
+    )
+    group.add_argument(
+        "--resume", action="store_true",
+        help="Resume an interrupted sweep",
+    )
+    group.add_argument(
+        "--status", action="store_true",
+        help="Show a sweep's progress",
+    )
+    group.add_argument(
+        "--list", action="store_true",
+        help="List recent sweeps",
+    )
+
+    parser.add_argument("--sweep-id", help="Sweep ID (for --resume/--status)")
+    parser.add_argument(
+        "--proposal-id", action="append",
+        help="Limit the sweep to a proposal (repeatable)",
+    )
+    parser.add_argument("--workers", type=int, help="Worker processes")
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+        help=f"Results per write transaction (default {DEFAULT_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--no-retag", action="store_true",
+        help="Reuse existing tags; only re-evaluate rules",
+    )
+    parser.add_argument("--db-path", help="Override database path")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+
+    args = parser.parse_args()
+    db = args.db_path
+
+    try:
+        if args.run:
+            output = sweep_portfolio(
+                proposal_ids=args.proposal_id, retag=not args.no_retag,
+                workers=args.workers, batch_size=args.batch_size,
+                progress=_print_progress, actor="cli", db_path=db,
+            )
+
+        elif args.resume:
+            if not args.sweep_id:
+                parser.error("--resume requires --sweep-id")
+            output = run_sweep(
+                args.sweep_id, workers=args.workers,
+                batch_size=args.batch_size, progress=_print_progress,
+                db_path=db,
+            )
+
+        elif args.status:
+            if not args.sweep_id:
+                parser.error("--status requires --sweep-id")
+            output = get_sweep_status(args.sweep_id, db_path=db)
+
+        elif args.list:
+            sweeps = list_sweeps(db_path=db)
+            output = {
+                "status": "listed",
+                "sweep_count": len(sweeps),
+                "sweeps": sweeps,
+            }
+
+        else:
+            parser.print_help()
+            sys.exit(1)
+
+        if args.json:
+            print(json.dumps(output, indent=2, default=str))
+        else:
+            _print_human(output)
+
+    except Exception as exc:
+        error_out = {"status": "error", "error": str(exc)}
+        if args.json:
+            print(json.dumps(error_out, indent=2))
+        else:
+            print(f"ERROR: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _print_human(output):
+    """Print human-readable output."""
+    status = output.get("status", "unknown")
+    print(f"CAG Portfolio Sweep -- {status.upper()}")
+    print("=" * 60)
+
+    if status == "listed":
+        print(f"  Sweeps: {output.get('sweep_count', 0)}")
+        print()
+        for s in output.get("sweeps", []):
+            print(f"  [{s.get('status', '?').upper()}] {s.get('id', '?')}")
+            print(f"    Progress:  {s.get('done_count', 0)}/{s.get('total', 0)} "
+                  f"({s.get('error_count', 0)} errors)")
+            print(f"    Started:   {s.get('started_at', '?')}")
+            print()
+        return
+
+    print(f"  Sweep ID:    {output.get('sweep_id', output.get('id', '?'))}")
+    total = output.get("total", 0)
+    done = output.get("done", output.get("done_count", 0))
+    errors = output.get("errors", output.get("error_count", 0))
+    print(f"  Progress:    {done}/{total}")
+    print(f"  Errors:      {errors}")
+    if output.get("skipped"):
+        print(f"  Resumed past: {output['skipped']} already done")
+    if "duration_seconds" in output:
+        print(f"  Workers:     {output.get('workers', '?')}")
+        print(f"  Duration:    {output['duration_seconds']}s")
+    for cag_status, count in sorted(output.get("status_counts", {}).items()):
+        print(f"    {cag_status:<12} {count}")
+    for err in output.get("error_details", []):
+        print(f"  ERROR {err.get('proposal_id', '?')}: {err.get('error', '')}")
+
+
+if __name__ == "__main__":
+    main()
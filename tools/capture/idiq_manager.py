@@ -76,20 +76,16 @@ def _now():
 
 def _get_db(db_path=None):
     """Open a database connection with WAL mode and foreign keys enabled."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _audit(conn, event_type, action, entity_type=None, entity_id=None,
            details=None):
     """Write an append-only audit trail record."""
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, "
-        "entity_id, details, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (
             event_type,
             "idiq_manager",
@@ -79,12 +79,8 @@ def _get_db(db_path=None):
     Returns:
         sqlite3.Connection with row_factory set to sqlite3.Row.
     """
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _audit(conn, event_type, action, entity_type=None, entity_id=None,
@@ -99,9 +95,9 @@ def _audit(conn, event_type, action, entity_type=None, entity_id=None,
         entity_id: ID of the affected entity.
         details: Optional JSON-serializable details dict.
     """
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, "
-        "entity_id, details, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (
             event_type,
             "teaming_engine",
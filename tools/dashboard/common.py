@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Helpers shared by the dashboard app and its view blueprints.
+
+DB_PATH is read at call time (common.DB_PATH), so tests and tools that
+repoint the dashboard at another database patch this one module.
+"""
+
+import functools
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+
+from flask import current_app, jsonify, make_response, request, url_for
+
+from tools.dashboard import http_cache, metrics as dash_metrics
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = Path(os.environ.get(
+    "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
+))
+
+logger = logging.getLogger("govproposal")
+
+
+def get_db():
+    from tools.db.pool import connect
+    return connect(DB_PATH)
+
+
+def write(statements, tables=()):
+    """Apply a unit of writes via the single-writer queue; returns rowcounts.
+
+    Blocks until committed, so reads made afterwards see the change.
+    tables lists the tables touched, to drop dependent cached metrics.
+    """
+    from tools.db.write_queue import write as queue_write
+    result = queue_write(statements, DB_PATH)
+    if tables:
+        dash_metrics.invalidate(*tables)
+    return result
+
+
+def conditional(*tables):
+    """Serve a GET view with an ETag from the data versions of tables.
+
+    A request whose If-None-Match still matches gets a 304 before the view
+    runs. If a table has no version trigger yet, http_cache.finalize falls
+    back to an ETag hashed from the body.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            conn = get_db()
+            try:
+                versions = http_cache.data_versions(conn, DB_PATH, tables)
+            finally:
+                conn.close()
+            if versions is None:
+                return view(*args, **kwargs)
+            if http_cache.versions_changed(DB_PATH, tables, versions):
+                dash_metrics.invalidate(*tables)
+            etag = http_cache.version_etag(DB_PATH, versions)
+            if request.if_none_match.contains_weak(etag):
+                resp = current_app.response_class(status=304)
+            else:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200:
+                    return resp
+            resp.set_etag(etag, weak=True)
+            resp.headers["Cache-Control"] = http_cache.API_CACHE_CONTROL
+            return resp
+        return wrapper
+    return decorator
+
+
+def paged_json(rows, next_cursor):
+    """JSON list response; the next page is advertised in Link/X-Next-Cursor."""
+    resp = jsonify([dict(r) for r in rows])
+    if next_cursor:
+        args = request.args.to_dict()
+        args["cursor"] = next_cursor
+        resp.headers["X-Next-Cursor"] = next_cursor
+        resp.headers["Link"] = (
+            f'<{url_for(request.endpoint, **request.view_args, **args)}>; rel="next"')
+    return resp
+
+
+def utcnow():
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def safe_json(text):
+    """Parse JSON safely, return empty structure on failure."""
+    if not text:
+        return {}
+    try:
+        return json.loads(text)
+    except (json.JSONDecodeError, TypeError):
+        return {}
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""HTTP caching for the dashboard — ETags, 304s, compression, static assets.
+
+JSON APIs:
+    Each API names the tables it reads. Triggers bump a data_version
+    counter per table (DATA_VERSION_TABLES in tools/db/init_db.py), so the
+    ETag for a request is a hash of its URL and those counters, known
+    before the view runs. A client sending a matching If-None-Match gets
+    a 304 without the query or the body. Responses without a version
+    ETag fall back to a hash of the body, which still saves the transfer.
+
+Compression:
+    Text responses of COMPRESS_MIN_BYTES or more are sent br-encoded when
+    the optional brotli package is installed and the client accepts it,
+    gzip otherwise. Streamed responses are left alone.
+
+Static assets:
+    url_for('static', ...) appends ?v=<content hash>. A request carrying
+    the current hash is served with a one-year immutable Cache-Control,
+    and its compressed bytes are kept in memory.
+
+Usage (from app.py):
+    app.url_defaults(http_cache.static_url_defaults(app.static_folder))
+    app.after_request(http_cache.finalize)
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # gzip only
+
+COMPRESS_MIN_BYTES = 1024
+COMPRESSIBLE = {
+    "application/json", "application/javascript", "text/javascript",
+    "text/css", "text/html", "text/plain", "image/svg+xml",
+}
+API_CACHE_CONTROL = "private, no-cache"
+STATIC_MAX_AGE = 365 * 24 * 3600
+TRACK_RECHECK_SEC = 60          # retry triggers for tables not yet migrated
+
+_lock = threading.Lock()
+_tracked = {}           # db path -> (checked_at, tables with triggers)
+_last_versions = {}     # (db path, table) -> version last served
+_fingerprints = {}      # static file path -> (mtime_ns, size, digest)
+_static_encoded = {}    # (static file path, digest, encoding) -> bytes
+
+
+# ---------------------------------------------------------------------------
+# Data versions
+# ---------------------------------------------------------------------------
+def _tracked_tables(conn, db_path, tables):
+    key = os.path.abspath(str(db_path))
+    now = time.monotonic()
+    with _lock:
+        checked_at, tracked = _tracked.get(key, (None, frozenset()))
+    if set(tables) <= tracked:
+        return tracked
+    if checked_at is None or now - checked_at >= TRACK_RECHECK_SEC:
+        from tools.db.init_db import install_data_versions
+        tracked = frozenset(install_data_versions(conn))
+        with _lock:
+            _tracked[key] = (now, tracked)
+    return tracked
+
+
+def data_versions(conn, db_path, tables):
+    """Current data_version of each table.
+
+    Args:
+        conn: Open connection to db_path.
+        db_path: Database path.
+        tables: Tables the response is built from.
+
+    Returns:
+        tuple of versions in tables order, or None if any table has no
+        version trigger (e.g. its migration has not run).
+    """
+    if not set(tables) <= _tracked_tables(conn, db_path, tables):
+        return None
+    marks = ", ".join("?" for _ in tables)
+    found = dict(conn.execute(
+        "SELECT dim, value FROM dashboard_metrics "
+        f"WHERE metric = 'data_version' AND dim IN ({marks})",
+        list(tables)).fetchall())
+    return tuple(int(found.get(t, 0)) for t in tables)
+
+
+def versions_changed(db_path, tables, versions):
+    """True if any table's version differs from the one last served here.
+
+    The caller drops in-process caches built from those tables, so a
+    write from another process never gets a fresh ETag on a stale body.
+    """
+    key = os.path.abspath(str(db_path))
+    changed = False
+    with _lock:
+        for table, version in zip(tables, versions):
+            if _last_versions.get((key, table)) != version:
+                _last_versions[(key, table)] = version
+                changed = True
+    return changed
+
+
+def version_etag(db_path, versions):
+    """Weak-comparison ETag value for the current request at versions."""
+    raw = f"{os.path.abspath(str(db_path))}|{request.full_path}|{versions}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+# ---------------------------------------------------------------------------
+# Static assets
+# ---------------------------------------------------------------------------
+def fingerprint(path):
+    """Short content hash of a static file (cached until it changes)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    with _lock:
+        hit = _fingerprints.get(path)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    with open(path, "rb") as fh:
+        digest = hashlib.sha256(fh.read()).hexdigest()[:12]
+    with _lock:
+        _fingerprints[path] = (st.st_mtime_ns, st.st_size, digest)
+    return digest
+
+
+def static_url_defaults(static_folder):
+    """url_defaults hook adding ?v=<fingerprint> to static URLs."""
+    def _add_fingerprint(endpoint, values):
+        if endpoint == "static" and "filename" in values and "v" not in values:
+            digest = fingerprint(os.path.join(static_folder, values["filename"]))
+            if digest:
+                values["v"] = digest
+    return _add_fingerprint
+
+
+# ---------------------------------------------------------------------------
+# Response finalization
+# ---------------------------------------------------------------------------
+def _encoding():
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return None
+
+
+def _compress(data, encoding, static=False):
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if static else 5)
+    return gzip.compress(data, compresslevel=9 if static else 6, mtime=0)
+
+
+def _finalize_static(response, static_folder):
+    path = os.path.join(static_folder, request.view_args.get("filename", ""))
+    digest = fingerprint(path)
+    if digest and request.args.get("v") == digest:
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_MAX_AGE
+        response.cache_control.immutable = True
+        response.cache_control.no_cache = None
+    encoding = _encoding()
+    if (response.status_code != 200 or not digest or encoding is None
+            or response.mimetype not in COMPRESSIBLE):
+        return response
+    key = (path, digest, encoding)
+    with _lock:
+        body = _static_encoded.get(key)
+    if body is None:
+        response.direct_passthrough = False
+        body = _compress(response.get_data(), encoding, static=True)
+        with _lock:
+            _static_encoded[key] = body
+    response.direct_passthrough = False
+    response.set_data(body)
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def finalize(response):
+    """after_request hook: body ETags, 304s, compression, static caching."""
+    if request.endpoint == "static":
+        from flask import current_app
+        return _finalize_static(response, current_app.static_folder)
+    if response.is_streamed or response.direct_passthrough:
+        return response
+
+    if (request.method == "GET" and response.status_code == 200
+            and response.mimetype == "application/json"):
+        if "ETag" not in response.headers:
+            body_hash = hashlib.sha1(response.get_data()).hexdigest()[:20]
+            response.set_etag(body_hash, weak=True)
+        if not response.cache_control.no_store:
+            response.headers["Cache-Control"] = API_CACHE_CONTROL
+        response.make_conditional(request)
+        if response.status_code == 304:
+            return response
+
+    encoding = _encoding()
+    if (encoding is None or response.status_code != 200
+            or response.mimetype not in COMPRESSIBLE
+            or "Content-Encoding" in response.headers
+            or response.content_length is None
+            or response.content_length < COMPRESS_MIN_BYTES):
+        return response
+    response.set_data(_compress(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Dashboard metrics — precomputed counters plus an in-process TTL cache.
+
+Pipeline, CAG alert, reminder and debrief counters live in the
+dashboard_metrics table (see DASHBOARD_METRICS in tools/db/init_db.py),
+maintained by triggers on the source tables, so reading them costs a few
+primary-key lookups however large the tables grow.
+
+On top of that, cached() keeps each computed value for CACHE_TTL seconds
+per database. Dashboard write paths call invalidate() with the tables they
+touched so their own process sees the change immediately; writes from
+other processes show up within the TTL.
+
+Usage:
+    python tools/dashboard/metrics.py --rebuild [--db-path PATH] [--json]
+    python tools/dashboard/metrics.py --show [--json]
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = Path(os.environ.get(
+    "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
+))
+
+CACHE_TTL = float(os.environ.get("GOVPROPOSAL_METRICS_TTL", "15"))
+
+_cache = {}             # (db_path, name) -> (expires_at, tables, value)
+_cache_lock = threading.Lock()
+_installed = set()      # db paths whose dashboard_metrics table is verified
+
+
+# ---------------------------------------------------------------------------
+# TTL cache
+# ---------------------------------------------------------------------------
+def cached(db_path, name, loader, tables=(), ttl=None):
+    """Return the cached value for name, computing it with loader() on a miss.
+
+    Args:
+        db_path: Database the value was computed from (part of the key).
+        name: Cache key within that database.
+        loader: Zero-argument callable producing the value.
+        tables: Source tables; invalidate() on any of them drops the entry.
+        ttl: Seconds to keep the value (default CACHE_TTL).
+
+    Returns:
+        The cached or freshly computed value.
+    """
+    key = (os.path.abspath(str(db_path)), name)
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit and hit[0] > now:
+            return hit[2]
+    value = loader()
+    with _cache_lock:
+        _cache[key] = (now + (CACHE_TTL if ttl is None else ttl),
+                       frozenset(tables), value)
+    return value
+
+
+def invalidate(*tables):
+    """Drop cached values that depend on any of tables (all if none given)."""
+    with _cache_lock:
+        if not tables:
+            _cache.clear()
+            return
+        touched = set(tables)
+        for key in [k for k, v in _cache.items() if v[1] & touched]:
+            del _cache[key]
+
+
+# ---------------------------------------------------------------------------
+# Counter reads
+# ---------------------------------------------------------------------------
+def _ensure_installed(conn, db_path):
+    """Create and seed dashboard_metrics on databases initialized before it."""
+    key = os.path.abspath(str(db_path))
+    if key in _installed:
+        return
+    from tools.db.init_db import install_dashboard_metrics
+    install_dashboard_metrics(conn)
+    _installed.add(key)
+
+
+def counters(conn, db_path, metric):
+    """{dim: value} for one metric; zeroed dims are omitted.
+
+    Args:
+        conn: Open connection to db_path.
+        db_path: Database path (used to install the table once if missing).
+        metric: Metric name from DASHBOARD_METRICS.
+
+    Returns:
+        dict of dim to value (int when integral).
+    """
+    _ensure_installed(conn, db_path)
+    rows = conn.execute(
+        "SELECT dim, value FROM dashboard_metrics WHERE metric = ? AND value <> 0",
+        (metric,),
+    ).fetchall()
+    return {r[0]: int(r[1]) if float(r[1]).is_integer() else r[1] for r in rows}
+
+
+def total(conn, db_path, metric, max_dim=None):
+    """Sum of one metric, optionally only for dims <= max_dim."""
+    _ensure_installed(conn, db_path)
+    sql = "SELECT COALESCE(SUM(value), 0) FROM dashboard_metrics WHERE metric = ?"
+    params = [metric]
+    if max_dim is not None:
+        sql += " AND dim <= ?"
+        params.append(max_dim)
+    value = conn.execute(sql, params).fetchone()[0]
+    return int(value) if float(value).is_integer() else value
+
+
+def rebuild(db_path=None):
+    """Recompute every counter from the source tables (repair / audit).
+
+    Returns:
+        dict of metric to {dim: value}.
+    """
+    from tools.db.init_db import install_dashboard_metrics, seed_dashboard_metrics
+    from tools.db.pool import connect
+    path = db_path or DB_PATH
+    conn = connect(path)
+    try:
+        install_dashboard_metrics(conn)
+        seed_dashboard_metrics(conn)
+        invalidate()
+        return snapshot(conn, path)
+    finally:
+        conn.close()
+
+
+def snapshot(conn, db_path):
+    """Every counter, grouped by metric."""
+    from tools.db.init_db import DASHBOARD_METRICS
+    return {m[0]: counters(conn, db_path, m[0]) for m in DASHBOARD_METRICS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GovProposal dashboard metrics")
+    parser.add_argument("--rebuild", action="store_true",
+                        help="Recompute counters from source tables")
+    parser.add_argument("--show", action="store_true", help="Print counters")
+    parser.add_argument("--db-path", default=None)
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    if args.rebuild:
+        result = rebuild(args.db_path)
+    elif args.show:
+        from tools.db.pool import connect
+        path = args.db_path or DB_PATH
+        conn = connect(path)
+        try:
+            result = snapshot(conn, path)
+        except sqlite3.Error as exc:
+            result = {"error": str(exc)}
+        finally:
+            conn.close()
+    else:
+        parser.print_help()
+        return
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for metric, dims in result.items():
+            print(f"{metric}: {dims}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Keyset (cursor) pagination for dashboard list pages and JSON APIs.
+
+A page is fetched with WHERE (sort keys) < (last row's sort keys) instead
+of OFFSET, so page N costs the same as page 1 when a composite index
+covers the ORDER BY. The cursor handed to clients is the last row's sort
+key values, JSON-encoded and base64url'd; it carries no SQL.
+
+Usage (from a route):
+    rows, next_cursor = keyset_page(
+        conn, "SELECT * FROM opportunities", ["status = ?"], ["qualifying"],
+        order=[("discovered_at", "discovered_at"), ("id", "id")],
+        descending=True, cursor=request.args.get("cursor"), limit=50)
+"""
+
+import base64
+import json
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(values):
+    """Opaque cursor token for a list of sort key values."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, width):
+    """Sort key values from a cursor token.
+
+    Args:
+        token: Cursor from a previous page (None/"" for the first page).
+        width: Number of sort keys the cursor must hold.
+
+    Returns:
+        list of values, or None for the first page.
+
+    Raises:
+        ValueError: Malformed or mismatched cursor.
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        values = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list) or len(values) != width:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def page_size(value, default=DEFAULT_PAGE_SIZE):
+    """Clamp a page_size query argument to 1..MAX_PAGE_SIZE."""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def keyset_page(conn, select_sql, conditions, params, order, descending,
+                cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """Fetch one page ordered by order, starting after cursor.
+
+    Args:
+        conn: Open connection.
+        select_sql: SELECT ... FROM ... [JOIN ...] without WHERE/ORDER BY.
+        conditions: Filter SQL fragments, ANDed together.
+        params: Parameters for conditions.
+        order: [(sql_expr, row_key)] — the sort keys, most significant
+            first; the last should be unique (the primary key). row_key is
+            the name the value has in each fetched row.
+        descending: Sort direction for every key.
+        cursor: Token from a previous page.
+        limit: Page size.
+
+    Returns:
+        (rows, next_cursor) — next_cursor is None on the last page.
+
+    Raises:
+        ValueError: Malformed cursor.
+    """
+    after = decode_cursor(cursor, len(order))
+    conditions = list(conditions)
+    params = list(params)
+    if after is not None:
+        exprs = ", ".join(expr for expr, _ in order)
+        marks = ", ".join("?" for _ in order)
+        conditions.append(f"({exprs}) {'<' if descending else '>'} ({marks})")
+        params.extend(after)
+    sql = select_sql
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    direction = "DESC" if descending else "ASC"
+    sql += " ORDER BY " + ", ".join(f"{expr} {direction}" for expr, _ in order)
+    sql += " LIMIT ?"
+    rows = conn.execute(sql, params + [limit + 1]).fetchall()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][key] for _, key in order])
+    return rows, next_cursor
@@ -0,0 +1,51 @@
+/**
+ * CUI // SP-PROPIN
+ *
+ * GovProposal Dashboard — Live Update Module
+ * One EventSource per page on /api/events, shared by every handler.
+ * Extends window.ICDEV namespace (shared with charts.js / tables.js).
+ *
+ *   ICDEV.live.on("proposal", function (ev) { ev.entity_id; ev.data; });
+ *
+ * Handlers registered while the page loads share one connection, opened
+ * once the page's own scripts have run. The browser reconnects on its own
+ * and sends Last-Event-ID, so events missed while disconnected are
+ * replayed by the server. on() returns false where EventSource is not
+ * supported, so callers can fall back to polling.
+ */
+
+(function () {
+    "use strict";
+
+    var NS = window.ICDEV || (window.ICDEV = {});
+    var handlers = {};
+    var source = null;
+    var pending = false;
+
+    function connect() {
+        pending = false;
+        var channels = Object.keys(handlers);
+        if (source) { source.close(); }
+        source = new EventSource("/api/events?channels=" + encodeURIComponent(channels.join(",")));
+        channels.forEach(function (channel) {
+            source.addEventListener(channel, function (e) {
+                var ev;
+                try { ev = JSON.parse(e.data); } catch (err) { return; }
+                handlers[channel].forEach(function (fn) { fn(ev); });
+            });
+        });
+    }
+
+    NS.live = {
+        on: function (channel, fn) {
+            if (!window.EventSource) { return false; }
+            var isNew = !handlers[channel];
+            (handlers[channel] = handlers[channel] || []).push(fn);
+            if (isNew && !pending) {
+                pending = true;
+                setTimeout(connect, 0);
+            }
+            return true;
+        }
+    };
+})();
@@ -0,0 +1,32 @@
+# CUI // SP-PROPIN
+"""Dashboard view blueprints, one module per area.
+
+View modules import only Flask and the dashboard helpers at module level.
+Tool modules (scanners, RFX services, LLM clients) are imported inside the
+views that use them, so registering every blueprint at worker boot stays
+cheap.
+"""
+
+import importlib
+
+BLUEPRINTS = (
+    "pipeline",
+    "proposals",
+    "cag",
+    "system",
+    "erp",
+    "crm",
+    "pricing",
+    "rfx",
+    "contracts",
+    "sbir",
+    "idiq",
+    "recompetes",
+)
+
+
+def register_all(app):
+    """Register every view blueprint on app."""
+    for name in BLUEPRINTS:
+        module = importlib.import_module(f"{__name__}.{name}")
+        app.register_blueprint(module.bp)
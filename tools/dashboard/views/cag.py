@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Classification Aggregation Guard views.
+
+Pages:
+    /cag                 — CAG monitor
+    /api/cag/alerts      — Open alerts (JSON)
+    /api/cag/sweep       — Start/resume a portfolio CAG re-scan (POST JSON)
+    /api/cag/sweep/<id>  — Sweep progress
+"""
+
+import threading
+
+from flask import Blueprint, jsonify, render_template, request
+
+from tools.dashboard import common, metrics as dash_metrics
+from tools.dashboard.common import conditional, get_db, logger
+
+bp = Blueprint("cag", __name__)
+
+
+@bp.route("/cag")
+def cag_monitor():
+    """Classification Aggregation Guard monitor."""
+    conn = get_db()
+    try:
+        # Open alerts by severity
+        alert_summary = {}
+        try:
+            alert_summary = dash_metrics.cached(
+                common.DB_PATH, "cag_open",
+                lambda: dash_metrics.counters(conn, common.DB_PATH, "cag_open"),
+                ("cag_alerts",))
+        except Exception as e:
+            logger.error("Error querying CAG alert summary by severity: %s", e)
+
+        # Recent alerts
+        recent_alerts = []
+        try:
+            recent_alerts = conn.execute(
+                """SELECT ca.*, p.title as proposal_title
+                   FROM cag_alerts ca
+                   LEFT JOIN proposals p ON ca.proposal_id = p.id
+                   ORDER BY ca.created_at DESC LIMIT 20"""
+            ).fetchall()
+        except Exception as e:
+            logger.error("Error querying recent CAG alerts: %s", e)
+
+        # Active rules
+        rule_count = 0
+        try:
+            rule_count = dash_metrics.cached(
+                common.DB_PATH, "cag_rules_active",
+                lambda: dash_metrics.total(conn, common.DB_PATH, "cag_rules_active"),
+                ("cag_rules",))
+        except Exception as e:
+            logger.error("Error querying active CAG rules count: %s", e)
+
+        # Exposure register summary
+        exposures = []
+        try:
+            exposures = conn.execute(
+                """SELECT capability_group,
+                          COUNT(*) as exposure_count,
+                          GROUP_CONCAT(DISTINCT categories_exposed) as all_categories
+                   FROM cag_exposure_register
+                   GROUP BY capability_group
+                   ORDER BY exposure_count DESC LIMIT 10"""
+            ).fetchall()
+        except Exception as e:
+            logger.error("Error querying CAG exposure register: %s", e)
+
+        return render_template("cag.html",
+                               alert_summary=alert_summary,
+                               recent_alerts=recent_alerts,
+                               rule_count=rule_count,
+                               exposures=exposures)
+    finally:
+        conn.close()
+
+
+@bp.route("/api/cag/alerts", methods=["GET"])
+@conditional("cag_alerts")
+def api_cag_alerts():
+    conn = get_db()
+    try:
+        rows = conn.execute(
+            "SELECT * FROM cag_alerts WHERE status = 'open' "
+            "ORDER BY severity DESC, created_at DESC LIMIT 20"
+        ).fetchall()
+        return jsonify([dict(r) for r in rows])
+    finally:
+        conn.close()
+
+
+@bp.route("/api/cag/sweep", methods=["POST"])
+def api_cag_sweep():
+    """Start (or resume) a portfolio-wide CAG re-scan in the background.
+
+    POST body (JSON, all optional):
+        sweep_id     — resume this sweep instead of starting a new one
+        proposal_ids — list of proposal IDs (default: all active proposals)
+        retag        — re-run keyword tagging first (default true)
+        workers      — worker process count (default and cap: CPU count)
+
+    The sweep is validated and claimed before the thread starts: an unknown
+    sweep_id is a 404, and a sweep that is already running or was started
+    under older rules is a 409.
+    """
+    from tools.cag.sweep import SweepConflict, claim_sweep, create_sweep, run_sweep
+
+    body = request.get_json(silent=True) or {}
+    sweep_id = body.get("sweep_id")
+    try:
+        workers = int(body.get("workers") or 0)
+        if not sweep_id:
+            created = create_sweep(
+                proposal_ids=body.get("proposal_ids") or None,
+                retag=bool(body.get("retag", True)),
+                actor="dashboard", db_path=common.DB_PATH,
+            )
+            sweep_id = created["sweep_id"]
+    except (TypeError, ValueError) as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    try:
+        claim_sweep(sweep_id, db_path=common.DB_PATH)
+    except SweepConflict as exc:
+        return jsonify({"error": str(exc)}), 409
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 404
+
+    def _run():
+        try:
+            run_sweep(sweep_id, workers=workers or None,
+                      db_path=common.DB_PATH, claimed=True)
+        except Exception as e:
+            logger.error("CAG sweep %s failed: %s", sweep_id, e)
+        finally:
+            dash_metrics.invalidate("cag_alerts")
+
+    threading.Thread(target=_run, daemon=True).start()
+    return jsonify({"sweep_id": sweep_id, "status": "running"}), 202
+
+
+@bp.route("/api/cag/sweep/<sweep_id>", methods=["GET"])
+def api_cag_sweep_status(sweep_id):
+    """Progress of a portfolio CAG sweep."""
+    from tools.cag.sweep import get_sweep_status
+
+    try:
+        return jsonify(get_sweep_status(sweep_id, db_path=common.DB_PATH))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 404
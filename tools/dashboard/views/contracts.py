@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Contract performance management views.
+
+Pages:
+    /contracts               — Contract list with CDRL/obligation summaries
+    /contracts/<id>          — Contract detail: CDRLs, SOW obligations, reminders, timeline
+    /api/contracts/<id>/cdrl/<id>       — Update CDRL status (PATCH)
+    /api/contracts/<id>/obligation/<id> — Update obligation status (PATCH)
+    /api/contracts/<id>/reminder/<id>/acknowledge — Acknowledge reminder (POST)
+"""
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+
+from tools.dashboard.common import get_db, logger, utcnow, write
+
+bp = Blueprint("contracts", __name__)
+
+
+@bp.route("/contracts")
+def contracts():
+    """Contract list with CDRL/obligation summary."""
+    conn = get_db()
+    try:
+        status_filter = request.args.get("status", "")
+        query = (
+            "SELECT c.*, o.title as opp_title, o.agency, "
+            "(SELECT COUNT(*) FROM contract_cdrls cc WHERE cc.contract_id = c.id) as cdrl_count, "
+            "(SELECT COUNT(*) FROM contract_cdrls cc WHERE cc.contract_id = c.id "
+            " AND cc.status IN ('delivered','accepted')) as cdrl_done, "
+            "(SELECT COUNT(*) FROM contract_obligations co WHERE co.contract_id = c.id) as obl_count, "
+            "(SELECT COUNT(*) FROM contract_obligations co WHERE co.contract_id = c.id "
+            " AND co.status = 'compliant') as obl_done "
+            "FROM contracts c "
+            "LEFT JOIN opportunities o ON c.opportunity_id = o.id "
+        )
+        params = []
+        if status_filter:
+            query += "WHERE c.status = ? "
+            params.append(status_filter)
+        query += "ORDER BY c.created_at DESC"
+
+        rows = conn.execute(query, params).fetchall()
+        contract_list = [dict(r) for r in rows]
+
+        # Stats
+        active_count = sum(1 for c in contract_list if c["status"] == "active")
+        total_cdrls = sum(c.get("cdrl_count", 0) for c in contract_list)
+        overdue_row = conn.execute(
+            "SELECT COUNT(*) as cnt FROM contract_cdrls WHERE status = 'overdue'"
+        ).fetchone()
+        overdue_count = overdue_row["cnt"] if overdue_row else 0
+        avg_row = conn.execute(
+            "SELECT AVG(cpars_risk_score) as avg_risk FROM contracts WHERE status = 'active'"
+        ).fetchone()
+        avg_risk = round(avg_row["avg_risk"] or 0.0, 2)
+
+        return render_template("contracts.html",
+                               contracts=contract_list,
+                               active_count=active_count,
+                               total_cdrls=total_cdrls,
+                               overdue_count=overdue_count,
+                               avg_risk=avg_risk,
+                               status_filter=status_filter)
+    except Exception as e:
+        logger.error("Error loading contracts: %s", e)
+        return render_template("contracts.html",
+                               contracts=[],
+                               active_count=0, total_cdrls=0,
+                               overdue_count=0, avg_risk=0.0,
+                               status_filter="")
+    finally:
+        conn.close()
+
+
+@bp.route("/contracts/<contract_id>")
+def contract_detail(contract_id):
+    """Contract detail with CDRLs, obligations, reminders, timeline."""
+    conn = get_db()
+    try:
+        contract = conn.execute(
+            "SELECT c.*, o.title as opp_title, o.agency "
+            "FROM contracts c "
+            "LEFT JOIN opportunities o ON c.opportunity_id = o.id "
+            "WHERE c.id = ?",
+            (contract_id,)
+        ).fetchone()
+        if not contract:
+            flash("Contract not found.", "error")
+            return redirect(url_for("contracts.contracts"))
+
+        cdrls = conn.execute(
+            "SELECT * FROM contract_cdrls WHERE contract_id = ? ORDER BY cdrl_number",
+            (contract_id,)
+        ).fetchall()
+
+        sow_obligations = conn.execute(
+            "SELECT * FROM contract_obligations WHERE contract_id = ? "
+            "AND obligation_type = 'sow' ORDER BY created_at",
+            (contract_id,)
+        ).fetchall()
+
+        deliverables = conn.execute(
+            "SELECT * FROM contract_obligations WHERE contract_id = ? "
+            "AND obligation_type IN ('deliverable', 'milestone') ORDER BY due_date",
+            (contract_id,)
+        ).fetchall()
+
+        reminders = conn.execute(
+            "SELECT * FROM deliverable_reminders WHERE contract_id = ? "
+            "AND status = 'pending' ORDER BY severity DESC, reminder_date",
+            (contract_id,)
+        ).fetchall()
+
+        # Timeline: next 90 days of due dates
+        timeline = []
+        today = utcnow()[:10]
+        for c in cdrls:
+            if c["next_due_date"] and c["status"] not in ("accepted", "delivered"):
+                timeline.append({
+                    "date": c["next_due_date"],
+                    "type": "CDRL",
+                    "title": f"CDRL {c['cdrl_number']}: {c['title'][:60]}",
+                    "status": c["status"],
+                })
+        for o in list(sow_obligations) + list(deliverables):
+            if o["due_date"] and o["status"] not in ("compliant", "waived"):
+                timeline.append({
+                    "date": o["due_date"],
+                    "type": o["obligation_type"].upper(),
+                    "title": o["obligation_text"][:80],
+                    "status": o["status"],
+                })
+        timeline.sort(key=lambda x: x["date"])
+        timeline = timeline[:30]  # Limit to next 30 items
+
+        # Stats
+        cdrl_total = len(cdrls)
+        cdrl_delivered = sum(1 for c in cdrls if c["status"] in ("delivered", "accepted"))
+        obl_total = len(sow_obligations) + len(deliverables)
+        obl_compliant = sum(1 for o in list(sow_obligations) + list(deliverables)
+                           if o["status"] == "compliant")
+
+        # CPARS risk
+        risk_score = contract["cpars_risk_score"] or 0.0
+        if risk_score >= 0.8:
+            risk_level = "critical"
+        elif risk_score >= 0.5:
+            risk_level = "high"
+        elif risk_score >= 0.2:
+            risk_level = "moderate"
+        else:
+            risk_level = "low"
+
+        return render_template("contract_detail.html",
+                               contract=contract,
+                               cdrls=cdrls,
+                               sow_obligations=sow_obligations,
+                               deliverables=deliverables,
+                               reminders=reminders,
+                               timeline=timeline,
+                               cdrl_total=cdrl_total,
+                               cdrl_delivered=cdrl_delivered,
+                               obl_total=obl_total,
+                               obl_compliant=obl_compliant,
+                               risk_score=risk_score,
+                               risk_level=risk_level)
+    except Exception as e:
+        logger.error("Error loading contract detail: %s", e)
+        flash("Error loading contract detail.", "error")
+        return redirect(url_for("contracts.contracts"))
+    finally:
+        conn.close()
+
+
+@bp.route("/api/contracts/<contract_id>/cdrl/<cdrl_id>", methods=["PATCH"])
+def api_update_cdrl(contract_id, cdrl_id):
+    """Update CDRL status via API."""
+    data = request.get_json(silent=True) or {}
+    new_status = data.get("status")
+    if not new_status:
+        return jsonify({"error": "status required"}), 400
+
+    valid = ("not_due", "on_schedule", "at_risk", "delivered",
+             "accepted", "rejected", "overdue")
+    if new_status not in valid:
+        return jsonify({"error": f"Invalid status. Must be one of: {valid}"}), 400
+
+    conn = get_db()
+    try:
+        cdrl = conn.execute(
+            "SELECT * FROM contract_cdrls WHERE id = ? AND contract_id = ?",
+            (cdrl_id, contract_id)
+        ).fetchone()
+        if not cdrl:
+            return jsonify({"error": "CDRL not found"}), 404
+
+        updates = ["status = ?", "updated_at = ?"]
+        params = [new_status, utcnow()]
+        if data.get("actual_delivery_date"):
+            updates.append("actual_delivery_date = ?")
+            params.append(data["actual_delivery_date"])
+        if new_status == "accepted":
+            updates.append("acceptance_date = ?")
+            params.append(utcnow()[:10])
+        if data.get("rejection_reason"):
+            updates.append("rejection_reason = ?")
+            params.append(data["rejection_reason"])
+
+        params.append(cdrl_id)
+        conn.execute(
+            f"UPDATE contract_cdrls SET {', '.join(updates)} WHERE id = ?",
+            params
+        )
+        conn.commit()
+
+        return jsonify({"updated": True, "cdrl_id": cdrl_id, "status": new_status})
+    finally:
+        conn.close()
+
+
+@bp.route("/api/contracts/<contract_id>/obligation/<obl_id>", methods=["PATCH"])
+def api_update_obligation(contract_id, obl_id):
+    """Update obligation status via API."""
+    data = request.get_json(silent=True) or {}
+    new_status = data.get("status")
+    if not new_status:
+        return jsonify({"error": "status required"}), 400
+
+    valid = ("not_started", "in_progress", "compliant",
+             "non_compliant", "waived", "deferred")
+    if new_status not in valid:
+        return jsonify({"error": f"Invalid status. Must be one of: {valid}"}), 400
+
+    conn = get_db()
+    try:
+        obl = conn.execute(
+            "SELECT * FROM contract_obligations WHERE id = ? AND contract_id = ?",
+            (obl_id, contract_id)
+        ).fetchone()
+        if not obl:
+            return jsonify({"error": "Obligation not found"}), 404
+
+        updates = ["status = ?", "updated_at = ?"]
+        params = [new_status, utcnow()]
+        if data.get("evidence"):
+            updates.append("evidence = ?")
+            params.append(data["evidence"])
+
+        params.append(obl_id)
+        conn.execute(
+            f"UPDATE contract_obligations SET {', '.join(updates)} WHERE id = ?",
+            params
+        )
+        conn.commit()
+
+        return jsonify({"updated": True, "obligation_id": obl_id, "status": new_status})
+    finally:
+        conn.close()
+
+
+@bp.route("/api/contracts/<contract_id>/reminder/<reminder_id>/acknowledge", methods=["POST"])
+def api_acknowledge_reminder(contract_id, reminder_id):
+    """Acknowledge a pending reminder."""
+    conn = get_db()
+    try:
+        rem = conn.execute(
+            "SELECT * FROM deliverable_reminders WHERE id = ? AND contract_id = ?",
+            (reminder_id, contract_id)
+        ).fetchone()
+        if not rem:
+            return jsonify({"error": "Reminder not found"}), 404
+
+        write((
+            "UPDATE deliverable_reminders SET status = 'acknowledged', "
+            "acknowledged_at = ? WHERE id = ?",
+            (utcnow(), reminder_id)
+        ), tables=("deliverable_reminders",))
+        return jsonify({"acknowledged": True, "reminder_id": reminder_id})
+    finally:
+        conn.close()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""CRM views: contacts and interactions.
+
+Pages:
+    /crm                 — Contact list with relationship type filter
+    /crm/new             — Add new contact
+    /crm/<id>            — Contact detail with interaction history
+    /crm/<id>/log        — Log interaction (POST)
+    /api/crm/stats       — CRM summary counts (JSON)
+"""
+
+import uuid
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+
+from tools.dashboard import common, metrics as dash_metrics
+from tools.dashboard.common import conditional, get_db, logger, utcnow, write
+
+bp = Blueprint("crm", __name__)
+
+
+@bp.route("/crm")
+def crm():
+    """CRM: Contact list."""
+    conn = get_db()
+    try:
+        rel_filter = request.args.get("rel")
+        sector_filter = request.args.get("sector")
+        search = request.args.get("search", "").strip()
+
+        query = """
+            SELECT c.id, c.full_name, c.title, c.company, c.email,
+                   c.sector, c.agency, c.status, c.last_contact_date,
+                   rt.type_name AS relationship_type, rt.color_code,
+                   COUNT(DISTINCT i.id) AS interaction_count,
+                   COUNT(DISTINCT pc.opportunity_id) AS opp_count
+            FROM contacts c
+            LEFT JOIN relationship_types rt ON c.relationship_type_id = rt.id
+            LEFT JOIN interactions i ON i.contact_id = c.id
+            LEFT JOIN pipeline_contacts pc ON pc.contact_id = c.id
+            WHERE c.status = 'active'
+        """
+        params = []
+        if rel_filter:
+            query += " AND rt.type_name = ?"
+            params.append(rel_filter)
+        if sector_filter:
+            query += " AND c.sector = ?"
+            params.append(sector_filter)
+        if search:
+            query += " AND (c.full_name LIKE ? OR c.company LIKE ? OR c.email LIKE ?)"
+            params.extend([f"%{search}%"] * 3)
+        query += " GROUP BY c.id ORDER BY c.full_name LIMIT 200"
+
+        contacts = conn.execute(query, params).fetchall()
+
+        # Relationship types for filter dropdown
+        rel_types = conn.execute(
+            "SELECT type_name, color_code FROM relationship_types ORDER BY type_name"
+        ).fetchall()
+
+        # Stats
+        stats = {}
+        try:
+            for rt in rel_types:
+                count = conn.execute(
+                    "SELECT COUNT(*) FROM contacts c "
+                    "JOIN relationship_types rt ON c.relationship_type_id = rt.id "
+                    "WHERE c.status='active' AND rt.type_name=?",
+                    (rt["type_name"],)
+                ).fetchone()[0]
+                stats[rt["type_name"]] = count
+        except Exception as e:
+            logger.error("Error querying CRM contact stats by relationship type: %s", e)
+
+        # Pending actions (interactions with upcoming next_action_date)
+        pending = []
+        try:
+            pending = conn.execute("""
+                SELECT i.contact_id, c.full_name, i.next_action, i.next_action_date
+                FROM interactions i
+                JOIN contacts c ON i.contact_id = c.id
+                WHERE i.next_action IS NOT NULL
+                  AND i.next_action_date IS NOT NULL
+                  AND i.next_action_date <= date('now', '+14 days')
+                  AND i.next_action_date >= date('now', '-1 day')
+                ORDER BY i.next_action_date
+                LIMIT 10
+            """).fetchall()
+        except Exception as e:
+            logger.error("Error querying pending CRM interaction actions: %s", e)
+
+        sectors = []
+        try:
+            sectors = [r[0] for r in conn.execute(
+                "SELECT DISTINCT sector FROM contacts WHERE sector IS NOT NULL ORDER BY sector"
+            ).fetchall()]
+        except Exception as e:
+            logger.error("Error querying distinct contact sectors for filter: %s", e)
+
+        return render_template("crm.html",
+                               contacts=contacts,
+                               rel_types=rel_types,
+                               stats=stats,
+                               pending_actions=pending,
+                               sectors=sectors,
+                               rel_filter=rel_filter,
+                               sector_filter=sector_filter,
+                               search=search)
+    finally:
+        conn.close()
+
+
+@bp.route("/crm/new", methods=["GET", "POST"])
+def crm_new():
+    """CRM: Add new contact."""
+    conn = get_db()
+    try:
+        rel_types = conn.execute(
+            "SELECT id, type_name, color_code FROM relationship_types ORDER BY type_name"
+        ).fetchall()
+
+        if request.method == "POST":
+            full_name = request.form.get("full_name", "").strip()
+            if not full_name:
+                flash("Name is required", "error")
+                return render_template("crm_form.html", rel_types=rel_types,
+                                       contact=request.form)
+
+            cid = str(uuid.uuid4())
+            now = utcnow()
+            # Resolve relationship type name → id
+            rt_name = request.form.get("relationship_type") or None
+            rt_id = None
+            if rt_name:
+                rt_row = conn.execute(
+                    "SELECT id FROM relationship_types WHERE type_name = ?", (rt_name,)
+                ).fetchone()
+                rt_id = rt_row["id"] if rt_row else None
+            write(("""
+                INSERT INTO contacts (
+                    id, full_name, title, email, phone, company,
+                    relationship_type_id, sector, agency, sub_agency,
+                    notes, linkedin_url, sam_entity_id, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (cid,
+                  full_name,
+                  request.form.get("title") or None,
+                  request.form.get("email") or None,
+                  request.form.get("phone") or None,
+                  request.form.get("company") or None,
+                  rt_id,
+                  request.form.get("sector") or None,
+                  request.form.get("agency") or None,
+                  request.form.get("sub_agency") or None,
+                  request.form.get("notes") or None,
+                  request.form.get("linkedin_url") or None,
+                  request.form.get("sam_entity_id") or None,
+                  now, now)), tables=("contacts",))
+            flash(f"Contact '{full_name}' added", "success")
+            return redirect(url_for("crm.crm_detail", contact_id=cid))
+
+        return render_template("crm_form.html", rel_types=rel_types, contact={})
+    finally:
+        conn.close()
+
+
+@bp.route("/crm/<contact_id>")
+def crm_detail(contact_id):
+    """CRM: Contact detail."""
+    conn = get_db()
+    try:
+        contact = conn.execute("""
+            SELECT c.*, rt.type_name AS relationship_type, rt.color_code
+            FROM contacts c
+            LEFT JOIN relationship_types rt ON c.relationship_type_id = rt.id
+            WHERE c.id = ?
+        """, (contact_id,)).fetchone()
+        if not contact:
+            flash("Contact not found", "error")
+            return redirect(url_for("crm.crm"))
+
+        interactions = conn.execute("""
+            SELECT * FROM interactions
+            WHERE contact_id = ?
+            ORDER BY interaction_date DESC, created_at DESC
+            LIMIT 50
+        """, (contact_id,)).fetchall()
+
+        linked_opps = conn.execute("""
+            SELECT o.id, o.title, o.agency, o.status, o.response_deadline,
+                   pc.role, pc.influence_level
+            FROM pipeline_contacts pc
+            JOIN opportunities o ON pc.opportunity_id = o.id
+            WHERE pc.contact_id = ?
+            ORDER BY o.response_deadline DESC
+        """, (contact_id,)).fetchall()
+
+        rel_types = conn.execute(
+            "SELECT id, type_name FROM relationship_types ORDER BY type_name"
+        ).fetchall()
+
+        return render_template("crm_detail.html",
+                               contact=contact,
+                               interactions=interactions,
+                               linked_opps=linked_opps,
+                               rel_types=rel_types)
+    finally:
+        conn.close()
+
+
+@bp.route("/crm/<contact_id>/log", methods=["POST"])
+def crm_log_interaction(contact_id):
+    """CRM: Log interaction for a contact."""
+    conn = get_db()
+    try:
+        notes = request.form.get("notes", "").strip()
+        if not notes:
+            flash("Notes are required", "error")
+            return redirect(url_for("crm.crm_detail", contact_id=contact_id))
+
+        iid = str(uuid.uuid4())
+        now = utcnow()
+        write([("""
+            INSERT INTO interactions (
+                id, contact_id, opportunity_id, interaction_date,
+                interaction_type, subject, notes, outcome,
+                next_action, next_action_date, logged_by, created_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (iid, contact_id,
+              request.form.get("opportunity_id") or None,
+              now[:10],
+              request.form.get("interaction_type", "note"),
+              request.form.get("subject") or None,
+              notes,
+              request.form.get("outcome") or None,
+              request.form.get("next_action") or None,
+              request.form.get("next_action_date") or None,
+              request.form.get("logged_by") or None,
+              now)),
+            ("UPDATE contacts SET last_contact_date=?, updated_at=? WHERE id=?",
+             (now[:10], now, contact_id)),
+        ], tables=("contacts",))
+        flash("Interaction logged", "success")
+    except Exception as e:
+        flash(f"Error: {e}", "error")
+    finally:
+        conn.close()
+    return redirect(url_for("crm.crm_detail", contact_id=contact_id))
+
+
+@bp.route("/api/crm/stats")
+@conditional("contacts", "relationship_types")
+def api_crm_stats():
+    conn = get_db()
+
+    def _load():
+        by_type = {r[0] or "unknown": r[1] for r in conn.execute("""
+            SELECT rt.type_name, COUNT(c.id)
+            FROM contacts c
+            LEFT JOIN relationship_types rt ON c.relationship_type_id = rt.id
+            WHERE c.status='active' GROUP BY rt.type_name
+        """).fetchall()}
+        return {"total": sum(by_type.values()), "by_type": by_type}
+
+    try:
+        return jsonify(dash_metrics.cached(common.DB_PATH, "crm_stats", _load, ("contacts",)))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
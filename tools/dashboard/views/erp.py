@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""ERP views: employees, skills, LCATs, capabilities.
+
+Pages:
+    /team                — Employee directory with skills and LCATs
+    /team/<id>           — Employee detail
+    /lcat-rates          — LCAT rate card management
+    /capabilities        — Company core capabilities dashboard
+    /api/erp/stats       — ERP summary counts (JSON)
+    /api/capabilities/refresh — Recompute capability coverage (POST)
+"""
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+
+from tools.dashboard import common, metrics as dash_metrics
+from tools.dashboard.common import conditional, get_db, logger
+
+bp = Blueprint("erp", __name__)
+
+
+@bp.route("/team")
+def team():
+    """ERP: Employee directory."""
+    conn = get_db()
+    try:
+        company_type = request.args.get("type")
+        clearance = request.args.get("clearance")
+        availability = request.args.get("availability")
+        search = request.args.get("search", "").strip()
+
+        query = """
+            SELECT e.id, e.full_name, e.job_title, e.company_type,
+                   e.clearance_level, e.clearance_status, e.clearance_expiry,
+                   e.availability, e.status, e.location, e.years_experience,
+                   l.lcat_code, l.lcat_name,
+                   COUNT(DISTINCT es.skill_id) AS skill_count,
+                   COUNT(DISTINCT c.id) AS cert_count
+            FROM employees e
+            LEFT JOIN employee_lcats el ON el.employee_id = e.id
+                AND el.end_date IS NULL AND el.is_primary = 1
+            LEFT JOIN lcats l ON el.lcat_id = l.id
+            LEFT JOIN employee_skills es ON es.employee_id = e.id
+            LEFT JOIN certifications c ON c.employee_id = e.id
+                AND c.status = 'active'
+            WHERE e.status = 'active'
+        """
+        params = []
+        if company_type:
+            query += " AND e.company_type = ?"
+            params.append(company_type)
+        if clearance:
+            query += " AND e.clearance_level = ?"
+            params.append(clearance)
+        if availability:
+            query += " AND e.availability = ?"
+            params.append(availability)
+        if search:
+            query += " AND (e.full_name LIKE ? OR e.job_title LIKE ? OR l.lcat_name LIKE ?)"
+            params.extend([f"%{search}%"] * 3)
+        query += " GROUP BY e.id ORDER BY e.full_name LIMIT 200"
+
+        employees = conn.execute(query, params).fetchall()
+
+        # Stats
+        stats = {}
+        try:
+            stats["total"] = conn.execute(
+                "SELECT COUNT(*) FROM employees WHERE status='active'"
+            ).fetchone()[0]
+            stats["own"] = conn.execute(
+                "SELECT COUNT(*) FROM employees WHERE status='active' AND company_type='own'"
+            ).fetchone()[0]
+            stats["cleared"] = conn.execute(
+                "SELECT COUNT(*) FROM employees WHERE status='active' "
+                "AND clearance_level IS NOT NULL AND clearance_level NOT IN ('none', '')"
+            ).fetchone()[0]
+            stats["available"] = conn.execute(
+                "SELECT COUNT(*) FROM employees WHERE status='active' AND availability='available'"
+            ).fetchone()[0]
+        except Exception as e:
+            logger.error("Error querying employee stats: %s", e)
+
+        return render_template("team.html",
+                               employees=employees,
+                               stats=stats,
+                               company_type=company_type,
+                               clearance=clearance,
+                               availability=availability,
+                               search=search)
+    finally:
+        conn.close()
+
+
+@bp.route("/team/<emp_id>")
+def team_detail(emp_id):
+    """ERP: Employee detail."""
+    conn = get_db()
+    try:
+        emp = conn.execute("SELECT * FROM employees WHERE id = ?", (emp_id,)).fetchone()
+        if not emp:
+            flash("Employee not found", "error")
+            return redirect(url_for("erp.team"))
+
+        skills = conn.execute("""
+            SELECT s.skill_name, s.category, es.proficiency, es.years_used
+            FROM employee_skills es
+            JOIN skills s ON es.skill_id = s.id
+            WHERE es.employee_id = ?
+            ORDER BY es.proficiency DESC, s.category
+        """, (emp_id,)).fetchall()
+
+        certs = conn.execute("""
+            SELECT cert_name, issuing_body, cert_number, expiry_date, status
+            FROM certifications WHERE employee_id = ?
+            ORDER BY expiry_date ASC
+        """, (emp_id,)).fetchall()
+
+        lcat_history = conn.execute("""
+            SELECT l.lcat_code, l.lcat_name, el.effective_date, el.end_date,
+                   el.is_primary, lr.direct_labor_rate, lr.wrap_rate
+            FROM employee_lcats el
+            JOIN lcats l ON el.lcat_id = l.id
+            LEFT JOIN lcat_rates lr ON lr.lcat_id = l.id
+                AND lr.effective_date = (
+                    SELECT MAX(effective_date) FROM lcat_rates
+                    WHERE lcat_id = l.id AND effective_date <= date('now')
+                )
+            WHERE el.employee_id = ?
+            ORDER BY el.is_primary DESC, el.effective_date DESC
+        """, (emp_id,)).fetchall()
+
+        # FPDS benchmark suggestions
+        title_word = (emp["job_title"] or "").split()[0] if emp["job_title"] else ""
+        benchmarks = []
+        if title_word:
+            try:
+                benchmarks = conn.execute("""
+                    SELECT labor_category, average_rate, median_rate, percentile_75, agency
+                    FROM pricing_benchmarks WHERE labor_category LIKE ?
+                    ORDER BY data_period DESC LIMIT 5
+                """, (f"%{title_word}%",)).fetchall()
+            except Exception as e:
+                logger.error("Error querying FPDS pricing benchmarks for employee: %s", e)
+
+        return render_template("team_detail.html",
+                               employee=emp,
+                               skills=skills,
+                               certifications=certs,
+                               lcat_history=lcat_history,
+                               benchmarks=benchmarks)
+    finally:
+        conn.close()
+
+
+@bp.route("/lcat-rates")
+def lcat_rates():
+    """ERP: LCAT rate cards."""
+    conn = get_db()
+    try:
+        lcats = conn.execute("""
+            SELECT l.id, l.lcat_code, l.lcat_name, l.naics_code,
+                   l.min_experience_years,
+                   lr.direct_labor_rate, lr.fringe_rate, lr.overhead_rate,
+                   lr.ga_rate, lr.fee_rate, lr.wrap_rate, lr.effective_date,
+                   COUNT(DISTINCT el.employee_id) AS employee_count
+            FROM lcats l
+            LEFT JOIN lcat_rates lr ON lr.lcat_id = l.id
+                AND lr.effective_date = (
+                    SELECT MAX(effective_date) FROM lcat_rates
+                    WHERE lcat_id = l.id AND effective_date <= date('now')
+                )
+            LEFT JOIN employee_lcats el ON el.lcat_id = l.id AND el.end_date IS NULL
+            GROUP BY l.id
+            ORDER BY l.lcat_code
+        """).fetchall()
+
+        # FPDS benchmarks for comparison
+        benchmarks = []
+        try:
+            benchmarks = conn.execute("""
+                SELECT labor_category, average_rate, median_rate,
+                       percentile_25, percentile_75, agency, naics_code
+                FROM pricing_benchmarks
+                ORDER BY data_period DESC, labor_category
+                LIMIT 50
+            """).fetchall()
+        except Exception as e:
+            logger.error("Error querying FPDS pricing benchmarks for LCAT rates page: %s", e)
+
+        return render_template("lcat_rates.html", lcats=lcats, benchmarks=benchmarks)
+    finally:
+        conn.close()
+
+
+@bp.route("/capabilities")
+def capabilities():
+    """ERP: Company core capabilities."""
+    conn = get_db()
+    try:
+        caps = conn.execute("""
+            SELECT capability_name, category, description,
+                   employee_count, proficiency_avg, proposal_count, last_used
+            FROM capabilities WHERE is_active = 1
+            ORDER BY employee_count DESC, category
+        """).fetchall()
+
+        by_category = {}
+        for cap in caps:
+            cat = cap["category"] or "other"
+            by_category.setdefault(cat, []).append(dict(cap))
+
+        # Clearance stats
+        clearance_summary = {}
+        try:
+            rows = conn.execute("""
+                SELECT clearance_level, COUNT(*) as cnt
+                FROM employees WHERE status='active'
+                  AND clearance_level IS NOT NULL AND clearance_level NOT IN ('none', '')
+                GROUP BY clearance_level
+                ORDER BY CASE clearance_level
+                    WHEN 'ts_sci_poly' THEN 0 WHEN 'ts_sci' THEN 1
+                    WHEN 'top_secret' THEN 2 WHEN 'secret' THEN 3 ELSE 4 END
+            """).fetchall()
+            clearance_summary = {r["clearance_level"]: r["cnt"] for r in rows}
+        except Exception as e:
+            logger.error("Error querying employee clearance summary: %s", e)
+
+        return render_template("capabilities.html",
+                               capabilities=caps,
+                               by_category=by_category,
+                               clearance_summary=clearance_summary)
+    finally:
+        conn.close()
+
+
+@bp.route("/api/erp/stats")
+@conditional("employees")
+def api_erp_stats():
+    conn = get_db()
+
+    def _load():
+        row = conn.execute(
+            "SELECT COUNT(*), "
+            "SUM(clearance_level IS NOT NULL AND clearance_level NOT IN ('none', '')), "
+            "SUM(availability = 'available') "
+            "FROM employees WHERE status='active'"
+        ).fetchone()
+        return {"total": row[0], "cleared": row[1] or 0, "available": row[2] or 0}
+
+    try:
+        return jsonify(dash_metrics.cached(common.DB_PATH, "erp_stats", _load, ("employees",)))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
+
+
+@bp.route("/api/capabilities/refresh", methods=["POST"])
+def api_refresh_capabilities():
+    """Aggregate capabilities from employee skills (replaces CLI command)."""
+    import logging as _log
+    try:
+        from tools.erp.skills_tracker import aggregate_capabilities
+        count = aggregate_capabilities()
+        return jsonify({"ok": True, "capabilities_updated": count})
+    except Exception as e:
+        _log.getLogger(__name__).error("Capability refresh failed: %s", e)
+        return jsonify({"error": "Capability refresh temporarily unavailable. Please try again."}), 503
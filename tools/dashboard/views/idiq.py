@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""IDIQ / BPA / GWAC views.
+
+Pages:
+    /idiq                — IDIQ vehicle listing with utilization
+    /idiq/<id>           — Vehicle detail with task orders
+"""
+
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+
+from tools.dashboard.common import get_db, logger
+
+bp = Blueprint("idiq", __name__)
+
+
+@bp.route("/idiq")
+def idiq_list():
+    """IDIQ vehicle listing."""
+    conn = get_db()
+    try:
+        status_filter = request.args.get("status", "")
+        query = (
+            "SELECT v.*, "
+            "(SELECT COUNT(*) FROM task_orders t WHERE t.vehicle_id = v.id) as task_order_count "
+            "FROM idiq_vehicles v"
+        )
+        params = []
+        if status_filter:
+            query += " WHERE v.status = ?"
+            params.append(status_filter)
+        query += " ORDER BY v.created_at DESC"
+
+        rows = conn.execute(query, params).fetchall()
+        vehicles = [dict(r) for r in rows]
+
+        active_count = sum(1 for v in vehicles if v.get("status") == "active")
+        total_to = sum(v.get("task_order_count", 0) for v in vehicles)
+        total_ceiling = sum(v.get("ceiling_value") or 0 for v in vehicles)
+
+        return render_template("idiq_list.html",
+                               vehicles=vehicles,
+                               total_count=len(vehicles),
+                               active_count=active_count,
+                               total_task_orders=total_to,
+                               total_ceiling=total_ceiling,
+                               status_filter=status_filter)
+    except Exception as e:
+        logger.error("Error loading IDIQ list: %s", e)
+        return render_template("idiq_list.html",
+                               vehicles=[], total_count=0,
+                               active_count=0, total_task_orders=0,
+                               total_ceiling=0, status_filter="")
+    finally:
+        conn.close()
+
+
+@bp.route("/idiq/<vehicle_id>")
+def idiq_detail(vehicle_id):
+    """IDIQ vehicle detail with task orders."""
+    conn = get_db()
+    try:
+        vehicle = conn.execute(
+            "SELECT * FROM idiq_vehicles WHERE id = ?",
+            (vehicle_id,)
+        ).fetchone()
+        if not vehicle:
+            flash("IDIQ vehicle not found.", "error")
+            return redirect(url_for("idiq.idiq_list"))
+
+        vehicle = dict(vehicle)
+
+        task_orders = [dict(r) for r in conn.execute(
+            "SELECT * FROM task_orders WHERE vehicle_id = ? ORDER BY created_at DESC",
+            (vehicle_id,)
+        ).fetchall()]
+
+        ceiling = vehicle.get("ceiling_value") or 0
+        obligated = vehicle.get("total_obligated") or 0
+        utilization_pct = round((obligated / ceiling * 100), 1) if ceiling > 0 else 0
+
+        return render_template("idiq_detail.html",
+                               vehicle=vehicle,
+                               task_orders=task_orders,
+                               task_order_count=len(task_orders),
+                               utilization_pct=utilization_pct)
+    except Exception as e:
+        logger.error("Error loading IDIQ detail: %s", e)
+        flash("Error loading IDIQ vehicle.", "error")
+        return redirect(url_for("idiq.idiq_list"))
+    finally:
+        conn.close()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Pipeline views: home, opportunities, analytics, SAM.gov scan.
+
+Pages:
+    /                    — Home dashboard with pipeline overview
+    /opportunities       — Opportunity listing with fit scores (keyset-paged)
+    /opportunities/<id>  — Opportunity detail with scorecard
+    /analytics           — Win/loss analytics and trends
+    /api/sam/scan        — Trigger a SAM.gov scan (POST JSON)
+    /api/opportunities   — Opportunity list (JSON, ?cursor=)
+    /api/pipeline/stats  — Pipeline counts (JSON)
+    /api/opportunities/<id>/score — Re-score an opportunity (POST)
+"""
+
+import os
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+
+from tools.dashboard import common, metrics as dash_metrics
+from tools.dashboard.common import conditional, get_db, logger, paged_json
+from tools.dashboard.pagination import keyset_page, page_size
+
+bp = Blueprint("pipeline", __name__)
+
+
+@bp.route("/")
+def home():
+    """Home dashboard with pipeline overview."""
+    conn = get_db()
+    try:
+        # Pipeline stats
+        stages = {}
+        try:
+            stages = dash_metrics.cached(
+                common.DB_PATH, "opp_status",
+                lambda: dash_metrics.counters(conn, common.DB_PATH, "opp_status"),
+                ("opportunities",))
+        except Exception as e:
+            logger.error("Error querying opportunity pipeline stage counts: %s", e)
+
+        # Recent opportunities
+        recent_opps = []
+        try:
+            recent_opps = conn.execute(
+                """SELECT id, title, agency, response_deadline, fit_score, status
+                   FROM opportunities ORDER BY discovered_at DESC LIMIT 10"""
+            ).fetchall()
+        except Exception as e:
+            logger.error("Error querying recent opportunities: %s", e)
+
+        # Active proposals
+        active_proposals = []
+        try:
+            active_proposals = conn.execute(
+                """SELECT p.id, p.title, p.status, p.cag_status, p.due_date,
+                          o.agency
+                   FROM proposals p
+                   LEFT JOIN opportunities o ON p.opportunity_id = o.id
+                   WHERE p.status NOT IN ('submitted', 'awarded', 'lost')
+                   ORDER BY p.due_date ASC LIMIT 10"""
+            ).fetchall()
+        except Exception as e:
+            logger.error("Error querying active proposals: %s", e)
+
+        # CAG alerts
+        open_alerts = 0
+        try:
+            open_alerts = sum(dash_metrics.cached(
+                common.DB_PATH, "cag_open",
+                lambda: dash_metrics.counters(conn, common.DB_PATH, "cag_open"),
+                ("cag_alerts",)).values())
+        except Exception as e:
+            logger.error("Error querying open CAG alerts count: %s", e)
+
+        return render_template("home.html",
+                               stages=stages,
+                               recent_opps=recent_opps,
+                               active_proposals=active_proposals,
+                               open_alerts=open_alerts)
+    finally:
+        conn.close()
+
+
+@bp.route("/opportunities")
+def opportunities():
+    """Opportunity listing."""
+    conn = get_db()
+    try:
+        status_filter = request.args.get("status")
+        agency_filter = request.args.get("agency")
+        try:
+            opps, next_cursor = _opportunity_page(
+                conn, "SELECT * FROM opportunities", status_filter,
+                agency_filter, request.args.get("cursor"),
+                page_size(request.args.get("page_size"), 100))
+        except ValueError:
+            return redirect(url_for("pipeline.opportunities", status=status_filter,
+                                    agency=agency_filter))
+
+        # Get distinct agencies for filter
+        agencies = []
+        try:
+            agencies = dash_metrics.cached(
+                common.DB_PATH, "opp_agencies",
+                lambda: [r["agency"] for r in conn.execute(
+                    "SELECT DISTINCT agency FROM opportunities ORDER BY agency"
+                ).fetchall()],
+                ("opportunities",))
+        except Exception as e:
+            logger.error("Error querying distinct agencies for filter: %s", e)
+
+        return render_template("opportunities.html",
+                               opportunities=opps,
+                               agencies=agencies,
+                               status_filter=status_filter,
+                               agency_filter=agency_filter,
+                               next_cursor=next_cursor,
+                               is_first_page=not request.args.get("cursor"))
+    finally:
+        conn.close()
+
+
+def _opportunity_page(conn, select_sql, status=None, agency=None, cursor=None,
+                      limit=100):
+    """One keyset page of opportunities, newest first.
+
+    Uses idx_opp_status_discovered / idx_opp_discovered_id.
+    Raises ValueError for a malformed cursor.
+    """
+    conditions, params = [], []
+    if status:
+        conditions.append("status = ?")
+        params.append(status)
+    if agency:
+        conditions.append("agency LIKE ?")
+        params.append(f"%{agency}%")
+    return keyset_page(conn, select_sql, conditions, params,
+                       order=[("discovered_at", "discovered_at"), ("id", "id")],
+                       descending=True, cursor=cursor, limit=limit)
+
+
+@bp.route("/opportunities/<opp_id>")
+def opportunity_detail(opp_id):
+    """Opportunity detail with scorecard."""
+    conn = get_db()
+    try:
+        opp = conn.execute(
+            "SELECT * FROM opportunities WHERE id = ?", (opp_id,)
+        ).fetchone()
+        if not opp:
+            flash("Opportunity not found", "error")
+            return redirect(url_for("pipeline.opportunities"))
+
+        # Qualification scores
+        scores = conn.execute(
+            "SELECT * FROM opportunity_scores WHERE opportunity_id = ? ORDER BY dimension",
+            (opp_id,)
+        ).fetchall()
+
+        # Pipeline history
+        pipeline = conn.execute(
+            "SELECT * FROM pipeline_stages WHERE opportunity_id = ? ORDER BY entered_at",
+            (opp_id,)
+        ).fetchall()
+
+        # Related proposals
+        proposals = conn.execute(
+            "SELECT * FROM proposals WHERE opportunity_id = ?", (opp_id,)
+        ).fetchall()
+
+        return render_template("opportunity_detail.html",
+                               opp=opp, scores=scores,
+                               pipeline=pipeline, proposals=proposals)
+    finally:
+        conn.close()
+
+
+@bp.route("/analytics")
+def analytics():
+    """Win/loss analytics."""
+    conn = get_db()
+    try:
+        # Win/loss stats
+        stats = {"wins": 0, "losses": 0, "win_rate": 0.0}
+        try:
+            results = dash_metrics.cached(
+                common.DB_PATH, "debrief_result",
+                lambda: dash_metrics.counters(conn, common.DB_PATH, "debrief_result"),
+                ("debriefs",))
+            stats["wins"] = results.get("win", 0)
+            stats["losses"] = results.get("loss", 0)
+            total = stats["wins"] + stats["losses"]
+            if total > 0:
+                stats["win_rate"] = round(stats["wins"] / total * 100, 1)
+        except Exception as e:
+            logger.error("Error querying win/loss stats from debriefs: %s", e)
+
+        # Patterns
+        patterns = []
+        try:
+            patterns = conn.execute(
+                "SELECT * FROM win_loss_patterns ORDER BY confidence DESC LIMIT 10"
+            ).fetchall()
+        except Exception as e:
+            logger.error("Error querying win/loss patterns: %s", e)
+
+        # Pipeline value
+        pipeline_value = 0
+        try:
+            pipeline_value = dash_metrics.cached(
+                common.DB_PATH, "pipeline_value",
+                lambda: dash_metrics.total(conn, common.DB_PATH, "pipeline_value"),
+                ("opportunities",))
+        except Exception as e:
+            logger.error("Error querying pipeline total value: %s", e)
+
+        return render_template("analytics.html",
+                               stats=stats, patterns=patterns,
+                               pipeline_value=pipeline_value)
+    finally:
+        conn.close()
+
+
+@bp.route("/api/sam/scan", methods=["POST"])
+def api_sam_scan():
+    """Trigger a SAM.gov opportunity scan.
+
+    POST body (JSON, all optional):
+        naics   — comma-separated NAICS codes, e.g. "541512,541519"
+        agency  — agency name filter
+        days_back — integer, days to look back (default 7)
+    """
+    try:
+        from tools.monitor.sam_scanner import scan_opportunities
+    except ImportError as exc:
+        return jsonify({"error": f"Scanner module not available: {exc}"}), 500
+
+    body = request.get_json(silent=True) or {}
+    naics = body.get("naics") or None
+    agency = body.get("agency") or None
+    days_back = int(body.get("days_back", 7))
+
+    api_key = os.environ.get("SAM_GOV_API_KEY", "")
+    if not api_key:
+        return jsonify({
+            "error": "SAM_GOV_API_KEY is not configured. "
+                     "Set it in your .env file and restart the server."
+        }), 400
+
+    result = scan_opportunities(naics=naics, agency=agency, days_back=days_back)
+    dash_metrics.invalidate("opportunities")
+    status_code = 200 if result.get("status") == "success" else (
+        429 if result.get("errors") and "429" in str(result.get("errors")) else 200
+    )
+    return jsonify(result), status_code
+
+
+@bp.route("/api/opportunities", methods=["GET"])
+@conditional("opportunities")
+def api_opportunities():
+    conn = get_db()
+    try:
+        rows, next_cursor = _opportunity_page(
+            conn,
+            "SELECT id, title, agency, status, fit_score, response_deadline, "
+            "discovered_at FROM opportunities",
+            request.args.get("status"), request.args.get("agency"),
+            request.args.get("cursor"), page_size(request.args.get("page_size")))
+        return paged_json(rows, next_cursor)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    finally:
+        conn.close()
+
+
+@bp.route("/api/pipeline/stats", methods=["GET"])
+@conditional("opportunities")
+def api_pipeline_stats():
+    conn = get_db()
+    try:
+        return jsonify(dash_metrics.cached(
+            common.DB_PATH, "opp_status",
+            lambda: dash_metrics.counters(conn, common.DB_PATH, "opp_status"),
+            ("opportunities",)))
+    finally:
+        conn.close()
+
+
+@bp.route("/api/opportunities/<opp_id>/score", methods=["POST"])
+def api_score_opportunity(opp_id):
+    """Trigger qualification scoring for an opportunity (replaces CLI command)."""
+    import logging as _log
+    try:
+        from tools.monitor.opportunity_scorer import score_fit, score_qualification
+        score_fit(opp_id)
+        result = score_qualification(opp_id)
+        return jsonify({"ok": True, "score": result.get("overall_score"), "decision": result.get("decision")})
+    except Exception as e:
+        _log.getLogger(__name__).error("Opportunity scoring failed for %s: %s", opp_id, e)
+        return jsonify({"error": "Scoring temporarily unavailable. Please try again."}), 503
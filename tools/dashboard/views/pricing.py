@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Pricing views: package catalog, calculator, scenarios.
+
+Pages:
+    /pricing             — Pricing calculator: packages, rate builder, breakeven
+    /pricing/scenarios   — Saved pricing scenarios
+    /api/pricing/calculate — Compute pricing (POST JSON)
+    /api/pricing/save      — Save scenario (POST JSON)
+    /api/pricing/stats     — Pricing summary (JSON)
+"""
+
+import uuid
+
+from flask import Blueprint, jsonify, render_template, request
+
+from tools.dashboard.common import conditional, get_db, logger, safe_json, utcnow, write
+
+bp = Blueprint("pricing", __name__)
+
+
+_SL_LABELS = {
+    "cloud_infra":   "Cloud Infrastructure",
+    "cyber_pentest": "Cyber / Pentest",
+    "ai_ml_ops":     "AI/ML Operations",
+    "help_desk":     "Help Desk",
+}
+
+
+_TIER_ORDER = {"bronze": 0, "silver": 1, "gold": 2}
+
+
+def _pricing_calc(dlr_hours, indirect, fee_rate, odc_base):
+    """DCAA-compliant wrap-rate pricing calculation.
+
+    Returns dict with every line item.
+    dlr_hours: list of (rate, hours) tuples.
+    """
+    dlc = sum(r * h for r, h in dlr_hours)
+    total_hours = sum(h for _, h in dlr_hours)
+    fringe_cost   = dlc * indirect["fringe_rate"]
+    lf            = dlc * (1 + indirect["fringe_rate"])          # labor + fringe
+    overhead_cost = lf * indirect["overhead_rate"]
+    cost_pool     = lf * (1 + indirect["overhead_rate"])         # after OH
+    ga_cost       = cost_pool * indirect["ga_rate"]
+    cost_before_fee = cost_pool * (1 + indirect["ga_rate"])
+    fee_amount      = cost_before_fee * fee_rate
+    odc_total       = odc_base * (1 + indirect["odc_markup"])
+    total_price     = cost_before_fee + fee_amount + odc_total
+    breakeven       = cost_before_fee + odc_total
+    margin_pct      = (fee_amount / total_price * 100) if total_price else 0
+    wrap_rate       = (total_price - odc_total) / dlc if dlc else 0
+    return {
+        "total_hours":        total_hours,
+        "direct_labor_cost":  dlc,
+        "fringe_cost":        fringe_cost,
+        "overhead_cost":      overhead_cost,
+        "ga_cost":            ga_cost,
+        "cost_before_fee":    cost_before_fee,
+        "fee_amount":         fee_amount,
+        "odc_cost":           odc_total,
+        "total_price":        total_price,
+        "breakeven_price":    breakeven,
+        "margin_amount":      fee_amount,
+        "margin_pct":         margin_pct,
+        "wrap_rate":          wrap_rate,
+    }
+
+
+@bp.route("/pricing")
+def pricing():
+    """Pricing calculator — package catalog + interactive rate builder."""
+    conn = get_db()
+    try:
+        # Load packages grouped by service line then tier
+        pkg_rows = conn.execute("""
+            SELECT id, service_line, tier, name, description, period,
+                   labor_mix, odc_base, market_low, market_high, notes
+            FROM service_packages
+            ORDER BY service_line,
+                     CASE tier WHEN 'bronze' THEN 0 WHEN 'silver' THEN 1 ELSE 2 END
+        """).fetchall()
+
+        # Labor rates dict for JS calculator
+        lab_rows = conn.execute(
+            "SELECT lcat_code, lcat_name, base_rate, discipline FROM pricing_labor"
+        ).fetchall()
+        labor_rates = [dict(r) for r in lab_rows]
+
+        # Active indirect rate
+        ir = conn.execute(
+            "SELECT * FROM indirect_rates WHERE is_active=1 ORDER BY created_at DESC LIMIT 1"
+        ).fetchone()
+
+        # Build package catalog with pre-calculated prices
+        packages = {}
+        for sl in _SL_LABELS:
+            packages[sl] = []
+
+        lrate_map = {r["lcat_code"]: r["base_rate"] for r in lab_rows}
+
+        for pkg in pkg_rows:
+            labor_mix = safe_json(pkg["labor_mix"]) or []
+            dlr_pairs = [(lrate_map.get(lm.get("lcat_code", ""), 0),
+                          lm.get("hours", 0)) for lm in labor_mix]
+
+            if ir:
+                ir_dict = dict(ir)
+                tm_calc  = _pricing_calc(dlr_pairs, ir_dict, ir_dict["fee_tm"],  pkg["odc_base"])
+                ffp_calc = _pricing_calc(dlr_pairs, ir_dict, ir_dict["fee_ffp"], pkg["odc_base"])
+            else:
+                tm_calc = ffp_calc = {k: 0 for k in
+                    ["total_hours", "direct_labor_cost", "fringe_cost", "overhead_cost",
+                     "ga_cost", "cost_before_fee", "fee_amount", "odc_cost",
+                     "total_price", "breakeven_price", "margin_amount", "margin_pct", "wrap_rate"]}
+
+            packages[pkg["service_line"]].append({
+                "id": pkg["id"],
+                "tier": pkg["tier"],
+                "name": pkg["name"],
+                "description": pkg["description"],
+                "period": pkg["period"],
+                "labor_mix": labor_mix,
+                "odc_base": pkg["odc_base"],
+                "market_low": pkg["market_low"],
+                "market_high": pkg["market_high"],
+                "notes": pkg["notes"],
+                "tm":  tm_calc,
+                "ffp": ffp_calc,
+            })
+
+        # Recent scenarios count
+        scenario_count = 0
+        try:
+            scenario_count = conn.execute(
+                "SELECT COUNT(*) FROM pricing_scenarios"
+            ).fetchone()[0]
+        except Exception as e:
+            logger.error("Error querying pricing scenario count: %s", e)
+
+        return render_template(
+            "pricing.html",
+            packages=packages,
+            sl_labels=_SL_LABELS,
+            indirect=dict(ir) if ir else {},
+            labor_rates=labor_rates,
+            scenario_count=scenario_count,
+        )
+    finally:
+        conn.close()
+
+
+@bp.route("/pricing/scenarios")
+def pricing_scenarios():
+    """List of saved pricing scenarios."""
+    conn = get_db()
+    try:
+        rows = conn.execute("""
+            SELECT ps.*, ir.name AS rate_name,
+                   ir.fringe_rate, ir.overhead_rate, ir.ga_rate,
+                   ir.fee_tm, ir.fee_ffp, ir.odc_markup
+            FROM pricing_scenarios ps
+            JOIN indirect_rates ir ON ps.indirect_rate_id = ir.id
+            ORDER BY ps.created_at DESC
+        """).fetchall()
+        scenarios = [dict(r) for r in rows]
+        for s in scenarios:
+            s["sl_label"] = _SL_LABELS.get(s["service_line"], s["service_line"])
+        return render_template(
+            "pricing_scenarios.html",
+            scenarios=scenarios,
+            sl_labels=_SL_LABELS,
+        )
+    finally:
+        conn.close()
+
+
+@bp.route("/api/pricing/calculate", methods=["POST"])
+def api_pricing_calculate():
+    """Compute pricing given labor mix + indirect rates. Returns JSON."""
+    data = request.get_json(silent=True) or {}
+    conn = get_db()
+    try:
+        ir = conn.execute(
+            "SELECT * FROM indirect_rates WHERE is_active=1 ORDER BY created_at DESC LIMIT 1"
+        ).fetchone()
+        if not ir:
+            return jsonify({"error": "No active indirect rate configured."}), 400
+
+        ir_dict = dict(ir)
+        contract_type = data.get("contract_type", "ffp")
+        fee_rate = ir_dict["fee_ffp"] if contract_type == "ffp" else ir_dict["fee_tm"]
+
+        labor_lines = data.get("labor_lines", [])  # [{lcat_code, hours}]
+        odc_base = float(data.get("odc_base", 0))
+
+        lab_rows = conn.execute("SELECT lcat_code, base_rate FROM pricing_labor").fetchall()
+        lrate_map = {r["lcat_code"]: r["base_rate"] for r in lab_rows}
+
+        dlr_pairs = [
+            (lrate_map.get(ll.get("lcat_code", ""), float(ll.get("custom_rate", 0))),
+             float(ll.get("hours", 0)))
+            for ll in labor_lines
+        ]
+
+        result = _pricing_calc(dlr_pairs, ir_dict, fee_rate, odc_base)
+        result["contract_type"] = contract_type
+        result["indirect_rate"] = {
+            "fringe":  ir_dict["fringe_rate"],
+            "oh":      ir_dict["overhead_rate"],
+            "ga":      ir_dict["ga_rate"],
+            "fee":     fee_rate,
+            "odc_mk":  ir_dict["odc_markup"],
+        }
+        # Format all monetary values for display
+        for k in list(result):
+            if isinstance(result[k], float) and k not in ("margin_pct", "wrap_rate"):
+                result[f"{k}_fmt"] = f"${result[k]:,.2f}"
+        result["margin_pct_fmt"] = f"{result['margin_pct']:.1f}%"
+        result["wrap_rate_fmt"]  = f"{result['wrap_rate']:.2f}x"
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
+
+
+@bp.route("/api/pricing/save", methods=["POST"])
+def api_pricing_save():
+    """Save a pricing scenario from the calculator."""
+    data = request.get_json(silent=True) or {}
+    conn = get_db()
+    try:
+        ir = conn.execute(
+            "SELECT * FROM indirect_rates WHERE is_active=1 ORDER BY created_at DESC LIMIT 1"
+        ).fetchone()
+        if not ir:
+            return jsonify({"error": "No active indirect rate."}), 400
+
+        import uuid
+        now = utcnow()
+        sid = str(uuid.uuid4())
+        ir_dict = dict(ir)
+        contract_type = data.get("contract_type", "ffp")
+        fee_rate = ir_dict["fee_ffp"] if contract_type == "ffp" else ir_dict["fee_tm"]
+
+        labor_lines = data.get("labor_lines", [])
+        odc_base = float(data.get("odc_base", 0))
+        lab_rows = conn.execute("SELECT lcat_code, base_rate FROM pricing_labor").fetchall()
+        lrate_map = {r["lcat_code"]: r["base_rate"] for r in lab_rows}
+        dlr_pairs = [
+            (lrate_map.get(ll.get("lcat_code", ""), float(ll.get("custom_rate", 0))),
+             float(ll.get("hours", 0)))
+            for ll in labor_lines
+        ]
+        calc = _pricing_calc(dlr_pairs, ir_dict, fee_rate, odc_base)
+
+        write(("""
+            INSERT INTO pricing_scenarios
+                (id, name, package_id, indirect_rate_id,
+                 service_line, tier, period, contract_type,
+                 labor_hours, direct_labor_cost, fringe_cost, overhead_cost,
+                 ga_cost, total_cost_before_fee, fee_amount, odc_cost,
+                 total_price, breakeven_price, margin_amount, margin_pct,
+                 notes, created_at, updated_at)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """, (
+            sid,
+            data.get("name") or "Untitled Scenario",
+            data.get("package_id"),
+            ir["id"],
+            data.get("service_line", ""),
+            data.get("tier", ""),
+            data.get("period", "monthly"),
+            contract_type,
+            calc["total_hours"],
+            calc["direct_labor_cost"],
+            calc["fringe_cost"],
+            calc["overhead_cost"],
+            calc["ga_cost"],
+            calc["cost_before_fee"],
+            calc["fee_amount"],
+            calc["odc_cost"],
+            calc["total_price"],
+            calc["breakeven_price"],
+            calc["margin_amount"],
+            calc["margin_pct"],
+            data.get("notes", ""),
+            now, now,
+        )))
+        return jsonify({"ok": True, "id": sid, "total_price": calc["total_price"]})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
+
+
+@bp.route("/api/pricing/stats")
+@conditional("pricing_scenarios")
+def api_pricing_stats():
+    conn = get_db()
+    try:
+        sc = conn.execute("SELECT COUNT(*) FROM pricing_scenarios").fetchone()[0]
+        avg_margin = conn.execute(
+            "SELECT AVG(margin_pct) FROM pricing_scenarios"
+        ).fetchone()[0] or 0
+        total_pipeline = conn.execute(
+            "SELECT SUM(total_price) FROM pricing_scenarios"
+        ).fetchone()[0] or 0
+        return jsonify({
+            "scenarios": sc,
+            "avg_margin_pct": round(avg_margin, 1),
+            "total_pipeline": total_pipeline,
+        })
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    finally:
+        conn.close()
@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Proposal views: listing, kanban board, detail, knowledge base, competitors.
+
+Pages:
+    /proposals           — Proposal listing with status (keyset-paged, ?cursor=)
+    /proposals/kanban    — Kanban board; columns load more via /api/proposals/kanban/<status>
+    /proposals/<id>      — Proposal detail with sections, reviews, CAG
+    /knowledge           — Knowledge base browser and search
+    /competitors         — Competitive intelligence dashboard
+    /api/proposals       — Proposal list (JSON, ?cursor=)
+    /api/proposals/<id>/status — Move a proposal (PATCH, kanban drag-drop)
+"""
+
+import sqlite3
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+
+from tools.dashboard import common, metrics as dash_metrics
+from tools.dashboard.common import conditional, get_db, logger, paged_json, write
+from tools.dashboard.pagination import keyset_page, page_size
+
+bp = Blueprint("proposals", __name__)
+
+
+@bp.route("/proposals")
+def proposals():
+    """Proposal listing."""
+    conn = get_db()
+    try:
+        try:
+            props, next_cursor = _proposal_page(
+                conn, """SELECT p.*, o.agency, o.title as opp_title
+                         FROM proposals p
+                         LEFT JOIN opportunities o ON p.opportunity_id = o.id""",
+                request.args.get("status"), request.args.get("cursor"),
+                page_size(request.args.get("page_size")))
+        except ValueError:
+            return redirect(url_for("proposals.proposals"))
+        return render_template("proposals.html", proposals=props,
+                               next_cursor=next_cursor,
+                               is_first_page=not request.args.get("cursor"))
+    finally:
+        conn.close()
+
+
+def _proposal_page(conn, select_sql, status=None, cursor=None, limit=50):
+    """One keyset page of proposals, most recently updated first.
+
+    Uses idx_prop_updated_id. Raises ValueError for a malformed cursor.
+    """
+    conditions, params = [], []
+    if status:
+        conditions.append("p.status = ?")
+        params.append(status)
+    return keyset_page(conn, select_sql, conditions, params,
+                       order=[("p.updated_at", "updated_at"), ("p.id", "id")],
+                       descending=True, cursor=cursor, limit=limit)
+
+
+KANBAN_COLUMNS = [
+    ("draft",        "Draft",        "#95a5a6"),
+    ("pink_review",  "Pink Review",  "#e91e8c"),
+    ("red_review",   "Red Review",   "#e74c3c"),
+    ("gold_review",  "Gold Review",  "#f39c12"),
+    ("white_review", "White Review", "#bdc3c7"),
+    ("final",        "Final",        "#2980b9"),
+    ("submitted",    "Submitted",    "#8e44ad"),
+    ("awarded",      "Awarded",      "#27ae60"),
+    ("lost",         "Lost",         "#7f8c8d"),
+]
+
+
+KANBAN_PAGE_SIZE = 25
+
+
+def _kanban_cards(conn, status, cursor=None, limit=KANBAN_PAGE_SIZE):
+    """One keyset page of Kanban cards for a column, soonest due first.
+
+    Section counts are aggregated only for the proposals on the page.
+    Raises ValueError for a malformed cursor.
+    """
+    rows, next_cursor = keyset_page(
+        conn,
+        """SELECT p.id, p.title, p.status, p.due_date, p.cag_status,
+                  p.assigned_pm, p.result, p.updated_at,
+                  IFNULL(p.due_date, '') AS due_key,
+                  o.agency, o.title as opp_title
+           FROM proposals p
+           LEFT JOIN opportunities o ON p.opportunity_id = o.id""",
+        ["p.status = ?"], [status],
+        order=[("IFNULL(p.due_date, '')", "due_key"), ("p.id", "id")],
+        descending=False, cursor=cursor, limit=limit)
+    cards = [dict(r) for r in rows]
+    if cards:
+        marks = ", ".join("?" for _ in cards)
+        try:
+            counts = {r["proposal_id"]: r for r in conn.execute(
+                f"""SELECT proposal_id,
+                           COUNT(*) AS section_count,
+                           SUM(hitl_status = 'accepted') AS accepted_count,
+                           SUM(hitl_status = 'pending') AS pending_count
+                    FROM rfx_ai_sections WHERE proposal_id IN ({marks})
+                    GROUP BY proposal_id""",
+                [c["id"] for c in cards]).fetchall()}
+        except sqlite3.OperationalError:
+            counts = {}  # RFX tables not migrated yet
+        for card in cards:
+            row = counts.get(card["id"])
+            card["section_count"] = row["section_count"] if row else 0
+            card["accepted_count"] = row["accepted_count"] if row else 0
+            card["pending_count"] = row["pending_count"] if row else 0
+    return cards, next_cursor
+
+
+@bp.route("/proposals/kanban")
+def proposals_kanban():
+    """Proposal Kanban board — per-column counts, first page of cards each.
+
+    Further cards load per column from /api/proposals/kanban/<status>.
+    """
+    conn = get_db()
+    try:
+        counts = dash_metrics.cached(
+            common.DB_PATH, "proposal_status",
+            lambda: dash_metrics.counters(conn, common.DB_PATH, "proposal_status"),
+            ("proposals",))
+        columns, cursors = {}, {}
+        for key, _, _ in KANBAN_COLUMNS:
+            if counts.get(key):
+                columns[key], cursors[key] = _kanban_cards(conn, key)
+            else:
+                columns[key], cursors[key] = [], None
+    finally:
+        conn.close()
+
+    return render_template(
+        "proposals_kanban.html",
+        columns=columns,
+        column_meta=KANBAN_COLUMNS,
+        column_counts=counts,
+        cursors=cursors,
+        total=sum(counts.get(key, 0) for key, _, _ in KANBAN_COLUMNS),
+    )
+
+
+@bp.route("/api/proposals/kanban/<status>", methods=["GET"])
+@conditional("proposals", "opportunities", "rfx_ai_sections")
+def api_proposals_kanban_column(status):
+    """Next page of cards for one Kanban column, as rendered HTML + cursor."""
+    meta = {key: (label, color) for key, label, color in KANBAN_COLUMNS}
+    if status not in meta:
+        return jsonify({"error": f"Unknown column '{status}'"}), 404
+    conn = get_db()
+    try:
+        cards, next_cursor = _kanban_cards(
+            conn, status, request.args.get("cursor"),
+            page_size(request.args.get("page_size"), KANBAN_PAGE_SIZE))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    finally:
+        conn.close()
+    html = render_template("_kanban_cards.html", cards=cards,
+                           color=meta[status][1])
+    return jsonify({"html": html, "count": len(cards),
+                    "next_cursor": next_cursor})
+
+
+@bp.route("/proposals/<prop_id>")
+def proposal_detail(prop_id):
+    """Proposal detail with sections, reviews, CAG status."""
+    conn = get_db()
+    try:
+        prop = conn.execute(
+            """SELECT p.*, o.title as opp_title, o.agency, o.response_deadline
+               FROM proposals p
+               LEFT JOIN opportunities o ON p.opportunity_id = o.id
+               WHERE p.id = ?""", (prop_id,)
+        ).fetchone()
+        if not prop:
+            flash("Proposal not found", "error")
+            return redirect(url_for("proposals.proposals"))
+
+        # Sections by volume
+        sections = conn.execute(
+            """SELECT * FROM proposal_sections
+               WHERE proposal_id = ? ORDER BY volume, section_number""",
+            (prop_id,)
+        ).fetchall()
+
+        # Reviews
+        reviews = conn.execute(
+            """SELECT * FROM proposal_reviews
+               WHERE proposal_id = ? ORDER BY review_type, created_at DESC""",
+            (prop_id,)
+        ).fetchall()
+
+        # CAG alerts
+        alerts = conn.execute(
+            "SELECT * FROM cag_alerts WHERE proposal_id = ? ORDER BY created_at DESC",
+            (prop_id,)
+        ).fetchall()
+
+        # Compliance matrix
+        compliance = conn.execute(
+            """SELECT compliance_status, COUNT(*) as cnt
+               FROM compliance_matrices WHERE proposal_id = ?
+               GROUP BY compliance_status""",
+            (prop_id,)
+        ).fetchall()
+
+        # Win themes
+        themes = conn.execute(
+            "SELECT * FROM win_themes WHERE proposal_id = ?", (prop_id,)
+        ).fetchall()
+
+        return render_template("proposal_detail.html",
+                               prop=prop, sections=sections,
+                               reviews=reviews, alerts=alerts,
+                               compliance=compliance, themes=themes)
+    finally:
+        conn.close()
+
+
+@bp.route("/knowledge")
+def knowledge():
+    """Knowledge base browser."""
+    conn = get_db()
+    try:
+        entry_type = request.args.get("type")
+        search_query = request.args.get("q")
+
+        query = "SELECT * FROM kb_entries WHERE is_active = 1"
+        params = []
+
+        if entry_type:
+            query += " AND entry_type = ?"
+            params.append(entry_type)
+        if search_query:
+            query += " AND (title LIKE ? OR content LIKE ?)"
+            params.extend([f"%{search_query}%", f"%{search_query}%"])
+
+        query += " ORDER BY updated_at DESC LIMIT 50"
+        entries = conn.execute(query, params).fetchall()
+
+        # Type counts
+        type_counts = {}
+        try:
+            rows = conn.execute(
+                "SELECT entry_type, COUNT(*) as cnt FROM kb_entries "
+                "WHERE is_active = 1 GROUP BY entry_type"
+            ).fetchall()
+            type_counts = {r["entry_type"]: r["cnt"] for r in rows}
+        except Exception as e:
+            logger.error("Error querying knowledge base entry type counts: %s", e)
+
+        return render_template("knowledge.html",
+                               entries=entries,
+                               type_counts=type_counts,
+                               entry_type=entry_type,
+                               search_query=search_query)
+    finally:
+        conn.close()
+
+
+@bp.route("/competitors")
+def competitors():
+    """Competitive intelligence dashboard."""
+    conn = get_db()
+    try:
+        comps = []
+        try:
+            comps = conn.execute(
+                """SELECT c.*, COUNT(cw.id) as win_count
+                   FROM competitors c
+                   LEFT JOIN competitor_wins cw ON c.id = cw.competitor_id
+                   WHERE c.is_active = 1
+                   GROUP BY c.id
+                   ORDER BY win_count DESC"""
+            ).fetchall()
+        except Exception as e:
+            logger.error("Error querying competitors with win counts: %s", e)
+
+        # Recent wins
+        recent_wins = []
+        try:
+            recent_wins = conn.execute(
+                """SELECT * FROM competitor_wins
+                   ORDER BY award_date DESC LIMIT 20"""
+            ).fetchall()
+        except Exception as e:
+            logger.error("Error querying recent competitor wins: %s", e)
+
+        return render_template("competitors.html",
+                               competitors=comps,
+                               recent_wins=recent_wins)
+    finally:
+        conn.close()
+
+
+@bp.route("/api/proposals", methods=["GET"])
+@conditional("proposals")
+def api_proposals():
+    conn = get_db()
+    try:
+        rows, next_cursor = _proposal_page(
+            conn,
+            "SELECT p.id, p.title, p.status, p.cag_status, p.due_date, "
+            "p.updated_at FROM proposals p",
+            request.args.get("status"), request.args.get("cursor"),
+            page_size(request.args.get("page_size")))
+        return paged_json(rows, next_cursor)
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
+    finally:
+        conn.close()
+
+
+@bp.route("/api/proposals/<prop_id>/status", methods=["PATCH"])
+def api_proposal_move_status(prop_id):
+    """Move a proposal to a new status (used by Kanban drag-drop)."""
+    data = request.get_json(silent=True) or {}
+    new_status = (data.get("status") or "").strip().lower()
+    valid = {"draft", "pink_review", "red_review", "gold_review",
+             "white_review", "final", "submitted", "awarded", "lost"}
+    if new_status not in valid:
+        return jsonify({"error": f"Invalid status '{new_status}'"}), 400
+    from tools.db import change_log
+    conn = get_db()
+    try:
+        row = conn.execute(
+            "SELECT id, status FROM proposals WHERE id = ?", (prop_id,)
+        ).fetchone()
+        if not row:
+            return jsonify({"error": "Proposal not found"}), 404
+        change_log.ensure_table(conn)
+        write([
+            ("UPDATE proposals SET status = ?, updated_at = datetime('now') WHERE id = ?",
+             (new_status, prop_id)),
+            change_log.entry("proposal", {"status": new_status,
+                                          "old_status": row["status"]}, prop_id),
+        ], tables=("proposals",))
+        return jsonify({"status": "ok", "new_status": new_status})
+    finally:
+        conn.close()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Recompete intelligence views.
+
+Pages:
+    /recompetes          — Recompete tracking with displacement scores
+    /recompetes/<id>     — Recompete detail with incumbent profile
+"""
+
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+
+from tools.dashboard.common import get_db, logger, safe_json, utcnow
+
+bp = Blueprint("recompetes", __name__)
+
+
+@bp.route("/recompetes")
+def recompetes():
+    """Recompete intelligence listing."""
+    conn = get_db()
+    try:
+        status_filter = request.args.get("status", "")
+        query = "SELECT * FROM recompete_tracking"
+        params = []
+        if status_filter:
+            query += " WHERE status = ?"
+            params.append(status_filter)
+        query += " ORDER BY anticipated_recompete_date ASC"
+
+        rows = conn.execute(query, params).fetchall()
+        recompete_list = [dict(r) for r in rows]
+
+        # Stats
+        upcoming_count = 0
+        today = utcnow()[:10]
+        for r in recompete_list:
+            rd = r.get("anticipated_recompete_date", "")
+            if rd and rd <= today[:4] + "-" + str(int(today[5:7]) + 3).zfill(2) + "-" + today[8:10]:
+                upcoming_count += 1
+
+        disp_vals = [r["displacement_score"] for r in recompete_list
+                     if r.get("displacement_score") is not None]
+        avg_displacement = round(sum(disp_vals) / len(disp_vals), 2) if disp_vals else 0
+
+        pending_count = sum(1 for r in recompete_list
+                           if r.get("our_decision") == "undecided")
+
+        return render_template("recompetes.html",
+                               recompetes=recompete_list,
+                               total_count=len(recompete_list),
+                               upcoming_count=upcoming_count,
+                               avg_displacement=avg_displacement,
+                               pending_count=pending_count,
+                               status_filter=status_filter)
+    except Exception as e:
+        logger.error("Error loading recompetes: %s", e)
+        return render_template("recompetes.html",
+                               recompetes=[], total_count=0,
+                               upcoming_count=0, avg_displacement=0,
+                               pending_count=0, status_filter="")
+    finally:
+        conn.close()
+
+
+@bp.route("/recompetes/<recompete_id>")
+def recompete_detail(recompete_id):
+    """Recompete detail with displacement assessment."""
+    conn = get_db()
+    try:
+        recompete = conn.execute(
+            "SELECT * FROM recompete_tracking WHERE id = ?",
+            (recompete_id,)
+        ).fetchone()
+        if not recompete:
+            flash("Recompete not found.", "error")
+            return redirect(url_for("recompetes.recompetes"))
+
+        recompete = dict(recompete)
+
+        # Parse win strategy from JSON
+        strategy = []
+        raw_strategy = recompete.get("win_strategy")
+        if raw_strategy:
+            parsed = safe_json(raw_strategy)
+            if isinstance(parsed, list):
+                strategy = parsed
+            elif isinstance(parsed, dict) and "items" in parsed:
+                strategy = parsed["items"]
+
+        return render_template("recompete_detail.html",
+                               recompete=recompete,
+                               strategy=strategy)
+    except Exception as e:
+        logger.error("Error loading recompete detail: %s", e)
+        flash("Error loading recompete.", "error")
+        return redirect(url_for("recompetes.recompetes"))
+    finally:
+        conn.close()
@@ -0,0 +1,813 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""RFX AI Proposal Engine views.
+
+RFX services (sentence-transformers, document parsers, LLM clients) are
+imported by the _rfx_* helpers on first use, not when the blueprint is
+registered.
+
+Pages:
+    /ai-proposals            — AI proposal dashboard (all proposals with AI sections)
+    /ai-proposals/<id>       — Proposal AI detail: HITL review, section editor
+    /rfx/documents           — Document upload (RFI/RFP + corpus)
+    /rfx/requirements        — Requirements view with compliance status
+    /rfx/exclusions          — Sensitive term masking list
+    /rfx/research            — Web and government source research panel
+    /rfx/fine-tuning         — Unsloth fine-tuning job dashboard
+    /api/rfx/documents/upload       — Queue document ingestion (POST multipart)
+    /api/rfx/documents/<id>/vectorize — Queue embedding (POST)
+    /api/rfx/jobs/<id>              — Ingestion job progress (GET)
+    /api/rfx/documents/<id>         — Delete document (DELETE)
+    /api/rfx/requirements/extract   — Extract requirements from doc (POST)
+    /api/rfx/exclusions/add         — Add exclusion term (POST)
+    /api/rfx/exclusions/<id>        — Remove exclusion term (DELETE)
+    /api/rfx/research               — Run deep research (POST)
+    /api/rfx/ai/generate            — Generate AI section (POST)
+    /api/rfx/ai/sections/<id>/review — HITL review action (POST)
+    /api/rfx/proposals/create       — Create proposal from opportunity (POST)
+    /api/rfx/finetune/start         — Start fine-tuning job (POST)
+    /api/rfx/finetune/status        — List fine-tuning jobs (GET)
+"""
+
+import json
+import threading
+
+from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
+
+from tools.dashboard import common
+from tools.dashboard.common import conditional, get_db, logger
+
+bp = Blueprint("rfx", __name__)
+
+
+# Lazy imports — services load on first request so the dashboard starts
+# even if sentence-transformers or unsloth are not yet installed.
+
+def _rfx_doc_proc():
+    from tools.rfx.document_processor import (
+        store_upload, list_documents, get_document, delete_document
+    )
+    return store_upload, list_documents, get_document, delete_document
+
+
+def _rfx_ingest():
+    from tools.rfx import ingest_queue
+    return ingest_queue
+
+
+def _rfx_rag():
+    from tools.rfx.rag_service import vectorize_document, search_all
+    return vectorize_document, search_all
+
+
+def _rfx_req():
+    from tools.rfx.requirement_extractor import (
+        extract_and_store, get_requirements, get_compliance_status,
+        update_requirement_status
+    )
+    return extract_and_store, get_requirements, get_compliance_status, update_requirement_status
+
+
+def _rfx_excl():
+    from tools.rfx.exclusion_service import add_term, list_terms, remove_term
+    return add_term, list_terms, remove_term
+
+
+def _rfx_research():
+    from tools.rfx.research_service import deep_research, get_cached_research
+    return deep_research, get_cached_research
+
+
+def _rfx_llm():
+    from tools.rfx.llm_bridge import generate_section, score_section
+    return generate_section, score_section
+
+
+# ── pages ─────────────────────────────────────────────────────────────────────
+
+@bp.route("/ai-proposals")
+def ai_proposals():
+    """AI Proposal Dashboard — all proposals with their AI section status."""
+    conn = get_db()
+    try:
+        proposals = conn.execute("""
+            SELECT p.id, p.title, p.status, p.due_date,
+                   p.assigned_pm, p.created_at,
+                   o.title as opp_title, o.agency,
+                   COUNT(s.id) as section_count,
+                   SUM(CASE WHEN s.hitl_status='accepted' THEN 1 ELSE 0 END) as accepted_count,
+                   SUM(CASE WHEN s.hitl_status='pending' THEN 1 ELSE 0 END) as pending_count
+            FROM proposals p
+            LEFT JOIN opportunities o ON p.opportunity_id = o.id
+            LEFT JOIN rfx_ai_sections s ON s.proposal_id = p.id
+            GROUP BY p.id
+            ORDER BY p.created_at DESC
+        """).fetchall()
+        return render_template("rfx/ai_proposals.html",
+                               proposals=[dict(r) for r in proposals])
+    finally:
+        conn.close()
+
+
+@bp.route("/ai-proposals/<proposal_id>")
+def ai_proposal_detail(proposal_id):
+    """AI Proposal detail: sections list + HITL review panel."""
+    conn = get_db()
+    try:
+        proposal = conn.execute(
+            "SELECT p.*, o.title as opp_title, o.agency, o.response_deadline "
+            "FROM proposals p "
+            "LEFT JOIN opportunities o ON p.opportunity_id = o.id "
+            "WHERE p.id = ?", (proposal_id,)
+        ).fetchone()
+        if not proposal:
+            flash("Proposal not found.", "error")
+            return redirect(url_for("rfx.ai_proposals"))
+
+        sections = conn.execute(
+            "SELECT * FROM rfx_ai_sections WHERE proposal_id = ? "
+            "ORDER BY volume, section_number", (proposal_id,)
+        ).fetchall()
+
+        docs = conn.execute(
+            "SELECT id, filename, doc_type, vectorized, chunk_count, created_at "
+            "FROM rfx_documents WHERE proposal_id = ? ORDER BY created_at",
+            (proposal_id,)
+        ).fetchall()
+
+        req_status = conn.execute("""
+            SELECT rs.status, COUNT(*) as cnt
+            FROM rfx_requirement_status rs
+            JOIN rfx_requirements r ON r.id = rs.requirement_id
+            WHERE rs.proposal_id = ? AND r.removed_at IS NULL
+            GROUP BY rs.status
+        """, (proposal_id,)).fetchall()
+
+        pricing = conn.execute(
+            "SELECT id, name, total_price, margin_pct, contract_type, period "
+            "FROM pricing_scenarios ORDER BY created_at DESC LIMIT 10"
+        ).fetchall()
+
+        win_themes = conn.execute(
+            "SELECT theme_text FROM win_themes WHERE proposal_id = ?",
+            (proposal_id,)
+        ).fetchall()
+
+        return render_template(
+            "rfx/ai_proposal_detail.html",
+            proposal=dict(proposal),
+            sections=[dict(s) for s in sections],
+            docs=[dict(d) for d in docs],
+            req_status={r["status"]: r["cnt"] for r in req_status},
+            pricing_scenarios=[dict(p) for p in pricing],
+            win_themes=[w["theme_text"] for w in win_themes],
+        )
+    finally:
+        conn.close()
+
+
+@bp.route("/rfx/documents")
+def rfx_documents():
+    """Document upload and management page."""
+    _, list_documents, _, _ = _rfx_doc_proc()
+    docs = list_documents()
+    return render_template("rfx/documents.html", documents=docs)
+
+
+@bp.route("/rfx/requirements")
+def rfx_requirements():
+    """Requirements view with compliance status per proposal."""
+    _, get_requirements, get_compliance_status, _ = _rfx_req()
+    proposal_id = request.args.get("proposal_id")
+    requirements = get_requirements(proposal_id=proposal_id)
+    compliance = get_compliance_status(proposal_id) if proposal_id else {}
+
+    conn = get_db()
+    try:
+        proposals = conn.execute(
+            "SELECT id, title FROM proposals ORDER BY created_at DESC"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return render_template("rfx/requirements.html",
+                           requirements=requirements,
+                           compliance=compliance,
+                           proposals=[dict(p) for p in proposals],
+                           selected_proposal=proposal_id)
+
+
+@bp.route("/rfx/exclusions")
+def rfx_exclusions():
+    """Sensitive term exclusion list management."""
+    _, list_terms, _ = _rfx_excl()
+    terms = list_terms()
+    by_type: dict = {}
+    for t in terms:
+        by_type.setdefault(t["term_type"], []).append(t)
+    return render_template("rfx/exclusions.html", terms=terms, by_type=by_type)
+
+
+@bp.route("/rfx/research")
+def rfx_research():
+    """Web and government source research panel."""
+    proposal_id = request.args.get("proposal_id")
+    _, get_cached_research = _rfx_research()
+    cached = get_cached_research(proposal_id) if proposal_id else []
+
+    conn = get_db()
+    try:
+        proposals = conn.execute(
+            "SELECT id, title FROM proposals ORDER BY created_at DESC"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return render_template("rfx/research.html",
+                           cached_research=cached,
+                           proposals=[dict(p) for p in proposals],
+                           selected_proposal=proposal_id)
+
+
+@bp.route("/rfx/fine-tuning")
+def rfx_fine_tuning():
+    """Fine-tuning job dashboard."""
+    conn = get_db()
+    try:
+        jobs = conn.execute(
+            "SELECT j.*, m.model_name as config_name "
+            "FROM rfx_finetune_jobs j "
+            "LEFT JOIN rfx_model_config m ON j.model_config_id = m.id "
+            "ORDER BY j.created_at DESC"
+        ).fetchall()
+        models = conn.execute(
+            "SELECT * FROM rfx_model_config ORDER BY priority, created_at"
+        ).fetchall()
+        docs = conn.execute(
+            "SELECT id, filename, doc_type FROM rfx_documents "
+            "WHERE exclude_from_training = 0 ORDER BY filename"
+        ).fetchall()
+    finally:
+        conn.close()
+
+    return render_template("rfx/fine_tuning.html",
+                           jobs=[dict(j) for j in jobs],
+                           models=[dict(m) for m in models],
+                           corpus_docs=[dict(d) for d in docs])
+
+
+# ── API: documents ─────────────────────────────────────────────────────────────
+
+@bp.route("/api/rfx/documents/upload", methods=["POST"])
+def api_rfx_upload():
+    """Upload a document (RFI/RFP or corpus). Multipart form-data.
+
+    The body is hashed while it is written to the queue's incoming dir, and
+    duplicates are rejected (409) before anything else is stored. New files
+    are queued for background ingestion; returns 202 with a job id to poll
+    at /api/rfx/jobs/<job_id>. An optional ``supersedes_id`` field uploads
+    the file as a new version (amendment) of that document.
+    """
+    import tempfile
+    from pathlib import Path as P
+    from tools.rfx.document_processor import find_duplicate, hash_stream
+
+    if "file" not in request.files:
+        return jsonify({"error": "No file provided"}), 400
+
+    f = request.files["file"]
+    doc_type = request.form.get("doc_type", "other")
+    proposal_id = request.form.get("proposal_id") or None
+    opportunity_id = request.form.get("opportunity_id") or None
+    notes = request.form.get("notes") or None
+    supersedes_id = request.form.get("supersedes_id") or None
+
+    if supersedes_id:
+        conn = get_db()
+        try:
+            prior = conn.execute(
+                "SELECT id FROM rfx_documents WHERE id = ?", (supersedes_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not prior:
+            return jsonify({"error": "Superseded document not found"}), 404
+
+    iq = _rfx_ingest()
+
+    # Save into the queue's incoming dir, hashing in the same pass; the
+    # worker renames it into content-addressed storage
+    iq.INCOMING_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        delete=False, dir=iq.INCOMING_DIR, suffix=P(f.filename).suffix
+    ) as tmp:
+        fhash, _ = hash_stream(f.stream, tmp)
+        tmp_path = P(tmp.name)
+
+    conn = get_db()
+    try:
+        existing = find_duplicate(conn, fhash)
+    finally:
+        conn.close()
+    if existing:
+        tmp_path.unlink()
+        return jsonify({"status": "duplicate", "document_id": existing,
+                        "filename": f.filename,
+                        "message": "Document already uploaded (same SHA-256 hash)."}), 409
+
+    job_id = iq.enqueue_upload(
+        tmp_path,
+        filename=f.filename,
+        fhash=fhash,
+        doc_type=doc_type,
+        proposal_id=proposal_id,
+        opportunity_id=opportunity_id,
+        notes=notes,
+        supersedes_id=supersedes_id,
+    )
+    iq.ensure_worker()
+    return jsonify({"status": "queued", "job_id": job_id,
+                    "filename": f.filename}), 202
+
+
+@bp.route("/api/rfx/documents/<doc_id>/vectorize", methods=["POST"])
+def api_rfx_vectorize(doc_id):
+    """Queue embedding generation for a document's chunks (202 + job id)."""
+    iq = _rfx_ingest()
+    job_id = iq.enqueue_stages(doc_id, ["embed"])
+    iq.ensure_worker()
+    return jsonify({"status": "queued", "job_id": job_id, "doc_id": doc_id}), 202
+
+
+@bp.route("/api/rfx/jobs/<job_id>")
+def api_rfx_job(job_id):
+    """Poll an ingestion job: status, current stage, progress_pct, results."""
+    job = _rfx_ingest().get_job(job_id)
+    if not job:
+        return jsonify({"error": "Job not found"}), 404
+    job.pop("src_path", None)
+    return jsonify(job)
+
+
+@bp.route("/api/rfx/documents/<doc_id>", methods=["DELETE"])
+def api_rfx_delete_doc(doc_id):
+    """Delete a document and its chunks."""
+    _, _, _, delete_document = _rfx_doc_proc()
+    ok = delete_document(doc_id)
+    return jsonify({"deleted": ok}), 200 if ok else 404
+
+
+# ── API: requirements ──────────────────────────────────────────────────────────
+
+@bp.route("/api/rfx/requirements/extract", methods=["POST"])
+def api_rfx_extract_requirements():
+    """Extract requirements from an uploaded document."""
+    data = request.get_json(force=True) or {}
+    doc_id = data.get("doc_id")
+    proposal_id = data.get("proposal_id")
+
+    if not doc_id:
+        return jsonify({"error": "doc_id required"}), 400
+
+    extract_and_store, _, _, _ = _rfx_req()
+    result = extract_and_store(doc_id=doc_id, proposal_id=proposal_id)
+    return jsonify(result)
+
+
+@bp.route("/api/rfx/requirements/<proposal_id>")
+@conditional("rfx_requirements", "rfx_requirement_status")
+def api_rfx_get_requirements(proposal_id):
+    """Return all requirements for a proposal with their address status."""
+    _, get_requirements, get_compliance_status, _ = _rfx_req()
+    reqs = get_requirements(proposal_id=proposal_id)
+    status = get_compliance_status(proposal_id)
+    return jsonify({"requirements": reqs, "compliance": status})
+
+
+# ── API: exclusions ────────────────────────────────────────────────────────────
+
+@bp.route("/api/rfx/exclusions/add", methods=["POST"])
+def api_rfx_add_exclusion():
+    """Add a sensitive term to the exclusion list."""
+    data = request.get_json(force=True) or {}
+    term = data.get("sensitive_term", "").strip()
+    if not term:
+        return jsonify({"error": "sensitive_term required"}), 400
+
+    add_term, _, _ = _rfx_excl()
+    result = add_term(
+        sensitive_term=term,
+        term_type=data.get("term_type", "custom"),
+        context_notes=data.get("context_notes"),
+        case_sensitive=bool(data.get("case_sensitive", False)),
+        whole_word=bool(data.get("whole_word", True)),
+    )
+    return jsonify(result)
+
+
+@bp.route("/api/rfx/exclusions/<entry_id>", methods=["DELETE"])
+def api_rfx_remove_exclusion(entry_id):
+    """Soft-delete an exclusion list entry."""
+    _, _, remove_term = _rfx_excl()
+    ok = remove_term(entry_id)
+    return jsonify({"removed": ok}), 200 if ok else 404
+
+
+# ── API: exclusions preview ────────────────────────────────────────────────────
+
+@bp.route("/api/rfx/exclusions/preview", methods=["POST"])
+def api_rfx_preview_mask():
+    """Preview masking without modifying the DB."""
+    data = request.get_json(force=True) or {}
+    text = data.get("text", "")
+    _, list_terms, _ = _rfx_excl()
+    from tools.rfx.exclusion_service import preview_mask
+    result = preview_mask(text)
+    return jsonify(result)
+
+
+# ── API: research ──────────────────────────────────────────────────────────────
+
+@bp.route("/api/rfx/research", methods=["POST"])
+def api_rfx_research():
+    """Run deep research (web + SAM.gov + USASpending) for a query."""
+    data = request.get_json(force=True, silent=True)
+    if data is None:
+        return jsonify({"error": "Request body must be valid JSON."}), 400
+    query = data.get("query", "").strip()
+    if not query:
+        return jsonify({"error": "query is required."}), 400
+    if len(query) > 500:
+        return jsonify({"error": "query must be 500 characters or fewer."}), 400
+
+    deep_research, _ = _rfx_research()
+    result = deep_research(query=query,
+                           proposal_id=data.get("proposal_id"))
+
+    # Optionally summarize with LLM
+    if data.get("summarize", False):
+        try:
+            from tools.rfx.llm_bridge import summarize_research
+            all_results = (result.get("sam_results") or []) + \
+                          (result.get("spend_results") or []) + \
+                          (result.get("web_results") or [])
+            result["summary"] = summarize_research(
+                all_results, query,
+                proposal_id=data.get("proposal_id")
+            )
+        except Exception:
+            result["summary"] = ""
+
+    return jsonify(result)
+
+
+# ── API: AI section generation ─────────────────────────────────────────────────
+
+@bp.route("/api/rfx/ai/generate", methods=["POST"])
+def api_rfx_generate_section():
+    """Generate an AI proposal section with RAG + LLM."""
+    import uuid as _uuid
+    from datetime import datetime as _dt, timezone as _tz
+
+    data = request.get_json(force=True) or {}
+    proposal_id = data.get("proposal_id")
+    section_title = data.get("section_title", "").strip()
+    volume = data.get("volume", "technical")
+    pricing_scenario_id = data.get("pricing_scenario_id")
+
+    if not proposal_id or not section_title:
+        return jsonify({"error": "proposal_id and section_title required"}), 400
+
+    # Pull RFP context from rfx_requirements
+    _, get_requirements, _, _ = _rfx_req()
+    reqs = get_requirements(proposal_id=proposal_id)
+    rfp_context = "\n".join(r["req_text"] for r in reqs[:20])
+
+    # RAG search
+    _, search_all = _rfx_rag()
+    search_results = search_all(
+        query=f"{section_title} {volume}",
+        top_k=6,
+        proposal_id=proposal_id,
+    )
+    rag_chunks = search_results.get("combined", [])
+
+    # Win themes
+    conn = get_db()
+    try:
+        wt_rows = conn.execute(
+            "SELECT theme_text FROM win_themes WHERE proposal_id = ?",
+            (proposal_id,)
+        ).fetchall()
+        win_themes = [r["theme_text"] for r in wt_rows]
+
+        # Pricing context for cost volumes
+        pricing_ctx = None
+        if volume == "cost" and pricing_scenario_id:
+            ps = conn.execute(
+                "SELECT * FROM pricing_scenarios WHERE id = ?",
+                (pricing_scenario_id,)
+            ).fetchone()
+            if ps:
+                ps = dict(ps)
+                pricing_ctx = (
+                    f"Service: {ps.get('sl_label','')}, "
+                    f"Tier: {ps.get('tier','')}, "
+                    f"Type: {ps.get('contract_type','').upper()}, "
+                    f"Hours: {ps.get('labor_hours',0):.0f}, "
+                    f"Total Price: ${ps.get('total_price',0):,.2f}, "
+                    f"Margin: {ps.get('margin_pct',0):.1f}%"
+                )
+    finally:
+        conn.close()
+
+    generate_section, _ = _rfx_llm()
+    try:
+        gen = generate_section(
+            section_title=section_title,
+            volume=volume,
+            rfp_context=rfp_context,
+            rag_chunks=rag_chunks,
+            kb_entries=[c for c in rag_chunks if c.get("source") == "kb"],
+            win_themes=win_themes,
+            pricing_context=pricing_ctx,
+            proposal_id=proposal_id,
+        )
+    except Exception as llm_err:
+        import logging as _log
+        _log.getLogger(__name__).error("AI generation failed: %s", llm_err, exc_info=True)
+        return jsonify({
+            "error": "AI generation is temporarily unavailable. Please try again or contact your system administrator.",
+            "llm_unavailable": True,
+        }), 503
+
+    # Persist to rfx_ai_sections
+    now = _dt.now(_tz.utc).isoformat()
+    section_id = str(_uuid.uuid4())
+    conn = get_db()
+    try:
+        conn.execute("""
+            INSERT INTO rfx_ai_sections
+                (id, proposal_id, volume, section_title, content_draft,
+                 source_type, rag_sources, pricing_scenario_id,
+                 prompt_hash, hitl_status, classification,
+                 created_at, updated_at)
+            VALUES (?,?,?,?,?,?,?,?,?,'pending','CUI // SP-PROPIN',?,?)
+        """, (
+            section_id, proposal_id, volume, section_title,
+            gen.get("content_draft", ""),
+            gen.get("source_type", "ai"),
+            json.dumps(gen.get("rag_sources", [])),
+            pricing_scenario_id,
+            gen.get("prompt_hash", ""),
+            now, now,
+        ))
+        conn.commit()
+    finally:
+        conn.close()
+
+    return jsonify({"section_id": section_id, "status": "pending",
+                    "section_title": section_title, **gen})
+
+
+@bp.route("/api/rfx/ai/sections/<section_id>/review", methods=["POST"])
+def api_rfx_review_section(section_id):
+    """Submit a HITL review action (accept / revise / reject)."""
+    import uuid as _uuid
+    from datetime import datetime as _dt, timezone as _tz
+
+    data = request.get_json(force=True) or {}
+    action = data.get("action", "").strip()
+    if action not in ("accept", "revise", "reject", "flag"):
+        return jsonify({"error": "action must be accept|revise|reject|flag"}), 400
+
+    reviewer = data.get("reviewer", "reviewer")
+    feedback = data.get("feedback", "")
+    revised_content = data.get("revised_content", "")
+    now = _dt.now(_tz.utc).isoformat()
+
+    conn = get_db()
+    try:
+        section = conn.execute(
+            "SELECT * FROM rfx_ai_sections WHERE id = ?", (section_id,)
+        ).fetchone()
+        if not section:
+            return jsonify({"error": "Section not found"}), 404
+
+        section = dict(section)
+        proposal_id = section["proposal_id"]
+
+        # Append-only HITL review record
+        conn.execute("""
+            INSERT INTO rfx_hitl_reviews
+                (id, ai_section_id, proposal_id, reviewer, action,
+                 feedback, revised_content, classification, reviewed_at)
+            VALUES (?,?,?,?,?,?,?,'CUI // SP-PROPIN',?)
+        """, (str(_uuid.uuid4()), section_id, proposal_id,
+              reviewer, action, feedback, revised_content, now))
+
+        # Update section status
+        accepted_content = revised_content if action == "revise" else (
+            section["content_draft"] if action == "accept" else None
+        )
+        conn.execute("""
+            UPDATE rfx_ai_sections
+            SET hitl_status = ?,
+                hitl_feedback = ?,
+                hitl_reviewed_by = ?,
+                hitl_reviewed_at = ?,
+                content_accepted = ?,
+                revision_count = revision_count + ?,
+                updated_at = ?
+            WHERE id = ?
+        """, (
+            action + "ed" if action in ("accept", "reject") else "revised",
+            feedback, reviewer, now, accepted_content,
+            1 if action == "revise" else 0,
+            now, section_id,
+        ))
+
+        # If accepted, push content to proposal_sections
+        if action in ("accept", "revise") and accepted_content:
+            existing = conn.execute(
+                "SELECT id FROM proposal_sections "
+                "WHERE proposal_id = ? AND section_title = ?",
+                (proposal_id, section["section_title"])
+            ).fetchone()
+            if existing:
+                conn.execute(
+                    "UPDATE proposal_sections SET content = ?, status = 'drafted', "
+                    "updated_at = ? WHERE id = ?",
+                    (accepted_content, now, existing["id"])
+                )
+            else:
+                conn.execute("""
+                    INSERT INTO proposal_sections
+                        (id, proposal_id, volume, section_number, section_title,
+                         content, status, created_at, updated_at)
+                    VALUES (?,?,?,?,?,?,'drafted',?,?)
+                """, (
+                    str(_uuid.uuid4()), proposal_id,
+                    section["volume"],
+                    section.get("section_number") or "AI",
+                    section["section_title"],
+                    accepted_content, now, now,
+                ))
+            conn.execute(
+                "UPDATE rfx_ai_sections SET proposal_section_id = "
+                "(SELECT id FROM proposal_sections WHERE proposal_id=? AND section_title=?) "
+                "WHERE id=?",
+                (proposal_id, section["section_title"], section_id)
+            )
+            pushed = conn.execute(
+                "SELECT proposal_section_id FROM rfx_ai_sections WHERE id = ?",
+                (section_id,)
+            ).fetchone()
+            pushed_section_id = pushed["proposal_section_id"] if pushed else None
+        else:
+            pushed_section_id = None
+
+        conn.commit()
+    finally:
+        conn.close()
+
+    # Re-tag the changed section and re-evaluate only its CAG pairs
+    cag = None
+    if pushed_section_id:
+        try:
+            from tools.cag.data_tagger import tag_proposal_section
+            from tools.cag.aggregation_monitor import scan_section
+            tag_proposal_section(pushed_section_id, replace=True, db_path=common.DB_PATH)
+            scan = scan_section(pushed_section_id, db_path=common.DB_PATH)
+            cag = {
+                "cag_status": scan["cag_status"],
+                "alerts_opened": scan["alerts_opened"],
+                "alerts_resolved": scan["alerts_resolved"],
+            }
+        except Exception as e:
+            logger.warning("CAG rescan after HITL %s failed: %s", action, e)
+
+    return jsonify({"section_id": section_id, "action": action, "status": "ok",
+                    "cag": cag})
+
+
+# ── API: proposals (create from opportunity) ───────────────────────────────────
+
+@bp.route("/api/rfx/proposals/create", methods=["POST"])
+def api_rfx_create_proposal():
+    """Create a GovProposal proposal linked to an opportunity, ready for AI drafting."""
+    import uuid as _uuid
+    from datetime import datetime as _dt, timezone as _tz
+
+    data = request.get_json(force=True) or {}
+    opportunity_id = data.get("opportunity_id", "").strip()
+    title = data.get("title", "").strip()
+    if not opportunity_id or not title:
+        return jsonify({"error": "opportunity_id and title required"}), 400
+
+    now = _dt.now(_tz.utc).isoformat()
+    prop_id = str(_uuid.uuid4())
+
+    conn = get_db()
+    try:
+        # Verify opportunity exists
+        opp = conn.execute(
+            "SELECT id, agency FROM opportunities WHERE id = ?",
+            (opportunity_id,)
+        ).fetchone()
+        if not opp:
+            return jsonify({"error": "Opportunity not found"}), 404
+
+        conn.execute("""
+            INSERT INTO proposals
+                (id, opportunity_id, title, version, status,
+                 classification, created_at, updated_at)
+            VALUES (?,?,?,1,'draft','CUI // SP-PROPIN',?,?)
+        """, (prop_id, opportunity_id, title, now, now))
+        conn.commit()
+    finally:
+        conn.close()
+
+    return jsonify({"proposal_id": prop_id, "status": "created"})
+
+
+# ── API: fine-tuning ───────────────────────────────────────────────────────────
+
+@bp.route("/api/rfx/finetune/start", methods=["POST"])
+def api_rfx_finetune_start():
+    """Start a fine-tuning job (deferred to finetune_runner subprocess)."""
+    import uuid as _uuid
+    from datetime import datetime as _dt, timezone as _tz
+
+    data = request.get_json(force=True) or {}
+    job_name = (data.get("job_name") or data.get("model_name", "")).strip()
+    base_model = data.get("base_model", "llama3:8b")
+    doc_ids = data.get("doc_ids", [])
+
+    if not job_name:
+        return jsonify({"error": "job_name required"}), 400
+
+    now = _dt.now(_tz.utc).isoformat()
+    job_id = str(_uuid.uuid4())
+
+    conn = get_db()
+    try:
+        conn.execute("""
+            INSERT INTO rfx_finetune_jobs
+                (id, job_name, model_name, base_model, backend, status,
+                 model_config_id, training_doc_ids, training_doc_count,
+                 lora_rank, lora_alpha, epochs, batch_size,
+                 learning_rate, export_gguf, created_at)
+            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+        """, (
+            job_id, job_name, job_name, base_model,
+            data.get("backend", "unsloth"), "queued",
+            data.get("model_config_id") or None,
+            json.dumps(doc_ids), len(doc_ids),
+            data.get("lora_rank", 16), data.get("lora_alpha", 32),
+            data.get("epochs", 3), data.get("batch_size", 4),
+            str(data.get("learning_rate", "2e-4")),
+            int(data.get("export_gguf", True)),
+            now,
+        ))
+        from tools.db import change_log
+        change_log.publish(conn, "finetune_job",
+                           {"status": "queued", "job_name": job_name}, job_id)
+        conn.commit()
+    finally:
+        conn.close()
+
+    # Launch finetune_runner in background thread (non-blocking)
+    def _run_finetune():
+        try:
+            from tools.rfx.finetune_runner import launch_job
+            launch_job(job_id)
+        except ImportError:
+            logger.info("finetune_runner not installed — job %s queued for manual pickup", job_id)
+        except Exception as e:
+            logger.error("Fine-tuning job %s failed: %s", job_id, e)
+
+    threading.Thread(target=_run_finetune, daemon=True).start()
+
+    return jsonify({"job_id": job_id, "status": "pending",
+                    "message": "Fine-tuning job queued."})
+
+
+@bp.route("/api/rfx/finetune/status")
+def api_rfx_finetune_status():
+    """List all fine-tuning jobs with current status."""
+    conn = get_db()
+    try:
+        jobs = conn.execute(
+            "SELECT id, model_name, base_model, backend, status, "
+            "training_doc_count, progress_pct, error_message, "
+            "started_at, completed_at, created_at "
+            "FROM rfx_finetune_jobs ORDER BY created_at DESC"
+        ).fetchall()
+        return jsonify({"jobs": [dict(j) for j in jobs]})
+    finally:
+        conn.close()
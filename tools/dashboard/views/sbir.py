@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""SBIR/STTR views.
+
+Pages:
+    /sbir                — SBIR/STTR proposal listing with program/phase filters
+    /sbir/<id>           — SBIR/STTR proposal detail with checklist and TRL
+"""
+
+from flask import Blueprint, flash, redirect, render_template, request, url_for
+
+from tools.dashboard.common import get_db, logger
+
+bp = Blueprint("sbir", __name__)
+
+
+@bp.route("/sbir")
+def sbir_list():
+    """SBIR/STTR proposal listing with filters."""
+    conn = get_db()
+    try:
+        program_filter = request.args.get("program_type", "")
+        phase_filter = request.args.get("phase", "")
+
+        query = "SELECT * FROM sbir_proposals"
+        conditions, params = [], []
+        if program_filter:
+            conditions.append("program_type = ?")
+            params.append(program_filter)
+        if phase_filter:
+            conditions.append("phase = ?")
+            params.append(phase_filter)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY created_at DESC"
+
+        rows = conn.execute(query, params).fetchall()
+        proposals = [dict(r) for r in rows]
+
+        phase1_count = sum(1 for p in proposals if p.get("phase") == "phase_1"
+                          and p.get("status") not in ("closed", "withdrawn"))
+        phase2_count = sum(1 for p in proposals if p.get("phase") == "phase_2"
+                          and p.get("status") not in ("closed", "withdrawn"))
+        trl_vals = [p["trl_current"] for p in proposals if p.get("trl_current")]
+        avg_trl = round(sum(trl_vals) / len(trl_vals), 1) if trl_vals else 0
+
+        return render_template("sbir_list.html",
+                               proposals=proposals,
+                               total_count=len(proposals),
+                               phase1_count=phase1_count,
+                               phase2_count=phase2_count,
+                               avg_trl=avg_trl,
+                               program_filter=program_filter,
+                               phase_filter=phase_filter)
+    except Exception as e:
+        logger.error("Error loading SBIR list: %s", e)
+        return render_template("sbir_list.html",
+                               proposals=[], total_count=0,
+                               phase1_count=0, phase2_count=0,
+                               avg_trl=0, program_filter="",
+                               phase_filter="")
+    finally:
+        conn.close()
+
+
+@bp.route("/sbir/<proposal_id>")
+def sbir_detail(proposal_id):
+    """SBIR/STTR proposal detail."""
+    conn = get_db()
+    try:
+        proposal = conn.execute(
+            "SELECT * FROM sbir_proposals WHERE id = ?",
+            (proposal_id,)
+        ).fetchone()
+        if not proposal:
+            flash("SBIR proposal not found.", "error")
+            return redirect(url_for("sbir.sbir_list"))
+
+        proposal = dict(proposal)
+
+        # Build checklist from sbir_manager pattern
+        checklist = []
+        phase = proposal.get("phase", "phase_1")
+        base_items = [
+            ("Technical proposal narrative", True),
+            ("Budget/cost proposal", True),
+            ("Commercialization plan", phase != "phase_1"),
+            ("Company data (DUNS, CAGE, SAM)", True),
+            ("PI/Key personnel resumes", True),
+            ("Subcontract plan", False),
+            ("Letters of support", False),
+            ("Data rights assertions", False),
+        ]
+        if proposal.get("program_type") == "sttr":
+            base_items.append(("Research institution agreement", True))
+            base_items.append(("Allocation plan (min 40% small biz, 30% RI)", True))
+
+        submitted = proposal.get("status") in ("submitted", "awarded", "phase_complete")
+        for item_text, required in base_items:
+            checklist.append({
+                "item": item_text,
+                "required": required,
+                "complete": submitted,
+            })
+
+        return render_template("sbir_detail.html",
+                               proposal=proposal,
+                               checklist=checklist)
+    except Exception as e:
+        logger.error("Error loading SBIR detail: %s", e)
+        flash("Error loading SBIR proposal.", "error")
+        return redirect(url_for("sbir.sbir_list"))
+    finally:
+        conn.close()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Operational endpoints: health, profiling, live event stream.
+
+Pages:
+    /api/health          — Health check with write-queue stats
+    /api/debug/perf      — Request profiling snapshot; /metrics for Prometheus (GOVPROPOSAL_PROFILE=1)
+    /api/events          — Server-sent event stream of live changes (?channels=)
+"""
+
+import json
+import os
+import time
+
+from flask import Blueprint, current_app, jsonify, request
+
+from tools.dashboard import common, profiler
+from tools.dashboard.common import utcnow
+from tools.dashboard.pagination import page_size
+
+bp = Blueprint("system", __name__)
+
+
+@bp.route("/api/health")
+def health():
+    """Health check endpoint."""
+    from tools.db.write_queue import queue_stats
+    return jsonify({
+        "status": "healthy",
+        "service": "govproposal-dashboard",
+        "db_path": str(common.DB_PATH),
+        "write_queue": queue_stats().get(os.path.abspath(str(common.DB_PATH))),
+        "timestamp": utcnow(),
+    })
+
+
+@bp.route("/api/debug/perf")
+def api_debug_perf():
+    """Request profiling snapshot (404 unless GOVPROPOSAL_PROFILE=1).
+
+    Query params: limit (recent/slowest traces and top statements, default 20),
+    reset=1 to clear after reading.
+    """
+    if not profiler.ENABLED:
+        return jsonify({"error": "Profiling is disabled"}), 404
+    limit = page_size(request.args.get("limit"), default=20)
+    snapshot = profiler.snapshot(limit)
+    if request.args.get("reset") == "1":
+        profiler.reset()
+    resp = jsonify(snapshot)
+    resp.cache_control.no_store = True
+    return resp
+
+
+@bp.route("/api/debug/perf/metrics")
+def api_debug_perf_metrics():
+    """Profiling aggregates in Prometheus text format."""
+    if not profiler.ENABLED:
+        return jsonify({"error": "Profiling is disabled"}), 404
+    return current_app.response_class(
+        profiler.prometheus(), content_type=profiler.PROMETHEUS_CONTENT_TYPE)
+
+
+SSE_RETRY_MS = 3000          # client reconnect delay
+SSE_HEARTBEAT = 15.0         # seconds between keep-alive comments
+SSE_MAX_SECONDS = 300.0      # streams end and resume via Last-Event-ID
+
+
+def _sse(event):
+    payload = json.dumps({"entity_id": event["entity_id"], "data": event["data"],
+                          "created_at": event["created_at"]}, default=str)
+    return f"id: {event['seq']}\nevent: {event['channel']}\ndata: {payload}\n\n"
+
+
+@bp.route("/api/events")
+def api_events():
+    """Server-sent event stream of change_log events.
+
+    ?channels=proposal,cag limits the stream (default: all channels). A
+    reconnecting EventSource sends Last-Event-ID (or ?last_event_id=) and
+    gets the missed events replayed from change_log before live ones.
+    """
+    from tools.db import change_log
+    channels = [c for c in request.args.get("channels", "").split(",") if c] or None
+    last_id = request.headers.get("Last-Event-ID") or request.args.get("last_event_id")
+    try:
+        last_id = int(last_id) if last_id else None
+    except ValueError:
+        return jsonify({"error": "Invalid Last-Event-ID"}), 400
+    db_path = common.DB_PATH
+
+    def _stream():
+        # Subscribed on first iteration: a response that is never sent
+        # never holds a subscription
+        sub = change_log.subscribe(channels, db_path)
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n\n"
+            seq = last_id
+            while seq is not None and seq < sub.start_seq:
+                batch = [e for e in change_log.since(seq, channels, db_path=db_path)
+                         if e["seq"] <= sub.start_seq]
+                if not batch:
+                    break
+                for event in batch:
+                    yield _sse(event)
+                seq = batch[-1]["seq"]
+            deadline = time.monotonic() + SSE_MAX_SECONDS
+            while time.monotonic() < deadline:
+                event = sub.get(timeout=SSE_HEARTBEAT)
+                if event is not None:
+                    yield _sse(event)
+                elif sub.overflowed:
+                    return
+                else:
+                    yield ": keepalive\n\n"
+        finally:
+            sub.close()
+
+    return current_app.response_class(_stream(), mimetype="text/event-stream",
+                                      headers={"Cache-Control": "no-cache",
+                                               "X-Accel-Buffering": "no"})
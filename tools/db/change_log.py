@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN (Proprietary Business Information)
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Change log + in-process pub/sub for dashboard live updates.
+
+Tool modules publish state changes (proposal status, CAG alerts, ingest
+and fine-tune job progress) as change_log rows inside their own
+transaction, so an event exists exactly when the change it describes was
+committed, whichever process made it: a gunicorn worker, the ingest
+worker, a fine-tune subprocess or a CLI tool.
+
+Each process that serves subscribers runs one tailer thread per database.
+It watches PRAGMA data_version, which changes only when another
+connection commits, and reads change_log (seq > last seen) only then.
+It fans new rows out to in-process Subscription queues. However many
+browsers are connected, the database sees one cheap PRAGMA per
+POLL_INTERVAL per worker, plus one primary-key range read per commit.
+
+seq is a monotonic AUTOINCREMENT, used as the SSE event id. A reconnecting
+client sends Last-Event-ID and replays what it missed from the table. The
+tailer keeps the newest KEEP_ROWS rows.
+
+A database error in the tailer is logged and retried with backoff (up to
+MAX_BACKOFF seconds). If the tailer thread ever exits, the broker leaves
+the registry and ends its subscribers' streams, so the next subscribe()
+starts a fresh one and clients resume via Last-Event-ID.
+
+Usage:
+    python tools/db/change_log.py --tail [--channels proposal,cag] [--json]
+    python tools/db/change_log.py --publish CHANNEL --data '{"k": 1}'
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = Path(os.environ.get(
+    "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
+))
+
+POLL_INTERVAL = 0.25         # seconds between PRAGMA data_version checks
+READ_BATCH = 500             # change_log rows read per tailer pass
+SUBSCRIBER_BUFFER = 1000     # queued events before a slow client is dropped
+KEEP_ROWS = 20000            # change_log rows kept for Last-Event-ID replay
+PRUNE_INTERVAL = 600.0       # seconds between prunes
+IDLE_EXIT = 60.0             # tailer stops after this long without subscribers
+MAX_BACKOFF = 30.0           # longest wait between tailer retries after an error
+
+INSERT_SQL = ("INSERT INTO change_log (channel, entity_id, payload) "
+              "VALUES (?, ?, ?)")
+
+_ready = set()               # db paths whose change_log table is verified
+_brokers = {}
+_brokers_lock = threading.Lock()
+_brokers_pid = os.getpid()
+
+logger = logging.getLogger("govproposal.change_log")
+
+
+# ---------------------------------------------------------------------------
+# Publishing
+# ---------------------------------------------------------------------------
+def ensure_table(conn):
+    """Create change_log on databases initialized before it (once per path)."""
+    key = (getattr(conn, "_pool_key", None)
+           or conn.execute("PRAGMA database_list").fetchone()[2])
+    if key in _ready:
+        return
+    from tools.db.init_db import CHANGE_LOG_SQL
+    conn.execute(CHANGE_LOG_SQL)
+    _ready.add(key)
+
+
+def entry(channel, data=None, entity_id=None):
+    """(sql, params) for one event, for a tools.db.write_queue unit.
+
+    Args:
+        channel: Event family, e.g. "proposal", "cag", "ingest_job".
+        data: JSON-serializable payload (the delta clients apply).
+        entity_id: ID of the changed row, if any.
+
+    Returns:
+        tuple (sql, params).
+    """
+    return (INSERT_SQL, (channel, entity_id,
+                         json.dumps(data or {}, separators=(",", ":"),
+                                    default=str)))
+
+
+def publish(conn, channel, data=None, entity_id=None):
+    """Record an event in the caller's transaction; the caller commits.
+
+    Args:
+        conn: Open connection (the one making the change).
+        channel: Event family.
+        data: JSON-serializable payload.
+        entity_id: ID of the changed row, if any.
+    """
+    ensure_table(conn)
+    sql, params = entry(channel, data, entity_id)
+    conn.execute(sql, params)
+
+
+def since(seq, channels=None, limit=READ_BATCH, db_path=None, conn=None):
+    """Events with seq > seq, oldest first (Last-Event-ID replay).
+
+    Args:
+        seq: Last event id the client saw.
+        channels: Optional iterable of channels to keep.
+        limit: Maximum rows returned.
+        db_path: Database path. Falls back to DB_PATH.
+        conn: Reuse an open connection instead of checking one out.
+
+    Returns:
+        list of event dicts (seq, channel, entity_id, data, created_at).
+    """
+    from tools.db.pool import connect
+    own = conn is None
+    if own:
+        conn = connect(db_path or DB_PATH)
+    try:
+        ensure_table(conn)
+        sql = ("SELECT seq, channel, entity_id, payload, created_at "
+               "FROM change_log WHERE seq > ?")
+        params = [seq]
+        if channels:
+            channels = list(channels)
+            sql += f" AND channel IN ({', '.join('?' for _ in channels)})"
+            params += channels
+        sql += " ORDER BY seq LIMIT ?"
+        rows = conn.execute(sql, params + [limit]).fetchall()
+    finally:
+        if own:
+            conn.close()
+    return [_event(r) for r in rows]
+
+
+def _event(row):
+    try:
+        data = json.loads(row[3] or "{}")
+    except ValueError:
+        # A malformed payload must not stall the stream behind it
+        logger.warning("change_log seq %s has an invalid payload", row[0])
+        data = {}
+    return {"seq": row[0], "channel": row[1], "entity_id": row[2],
+            "data": data, "created_at": row[4]}
+
+
+# ---------------------------------------------------------------------------
+# Subscribers
+# ---------------------------------------------------------------------------
+class Subscription:
+    """One client's view of the event stream."""
+
+    def __init__(self, broker, channels, start_seq):
+        self.channels = frozenset(channels) if channels else None
+        self.start_seq = start_seq
+        self.overflowed = False
+        self._broker = broker
+        self._queue = queue.Queue(maxsize=SUBSCRIBER_BUFFER)
+
+    def _offer(self, event):
+        if self.channels is not None and event["channel"] not in self.channels:
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            # Client is too slow: end its stream; it resumes via Last-Event-ID
+            self.overflowed = True
+            self._broker.unsubscribe(self)
+
+    def get(self, timeout=None):
+        """Next event, or None on timeout or once the stream has overflowed."""
+        if self.overflowed and self._queue.empty():
+            return None
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self._broker.unsubscribe(self)
+
+
+class ChangeBroker:
+    """Tails change_log for one database and fans rows out to subscribers."""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._subs = set()
+        self._lock = threading.Lock()
+        self._last_seq = None
+        self._closed = False
+        self._started = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f"change-log:{Path(self.db_path).name}",
+            daemon=True)
+        self._thread.start()
+        self._started.wait(5)
+
+    def subscribe(self, channels=None):
+        """Register a subscriber; it receives events with seq > start_seq.
+
+        Returns None if this broker has already shut down.
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            sub = Subscription(self, channels, self._last_seq or 0)
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subs.discard(sub)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subs)
+
+    def _open(self):
+        from tools.db.pool import connect
+        conn = connect(self.db_path, row_factory=None)
+        try:
+            ensure_table(conn)
+            conn.commit()
+            if self._last_seq is None:
+                self._last_seq = conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM change_log").fetchone()[0]
+        except BaseException:
+            conn.close()
+            raise
+        finally:
+            self._started.set()
+        return conn
+
+    def _run(self):
+        conn = None
+        version = None
+        backoff = POLL_INTERVAL
+        next_prune = time.monotonic() + PRUNE_INTERVAL
+        idle_since = time.monotonic()
+        try:
+            while True:
+                try:
+                    if conn is None:
+                        conn = self._open()
+                        version = None
+                    if self.subscriber_count():
+                        idle_since = time.monotonic()
+                    elif time.monotonic() - idle_since >= IDLE_EXIT and self._retire():
+                        return
+                    current = conn.execute("PRAGMA data_version").fetchone()[0]
+                    if current != version:
+                        version = current
+                        self._pump(conn)
+                    if time.monotonic() >= next_prune:
+                        next_prune = time.monotonic() + PRUNE_INTERVAL
+                        _prune(self.db_path, self._last_seq)
+                    backoff = POLL_INTERVAL
+                except Exception as exc:
+                    logger.warning("change_log tailer for %s failed (%s); "
+                                   "retrying in %.1fs", self.db_path, exc, backoff)
+                    if conn is not None:
+                        conn.close()
+                        conn = None
+                    time.sleep(backoff)
+                    backoff = min(backoff * 2, MAX_BACKOFF)
+                    continue
+                time.sleep(POLL_INTERVAL)
+        finally:
+            if conn is not None:
+                conn.close()
+            self._retire(force=True)
+
+    def _retire(self, force=False):
+        """Leave the registry if still idle (or unconditionally, if forced).
+
+        The next subscriber starts a new broker; any remaining
+        subscriptions end as if they had overflowed.
+        """
+        with _brokers_lock, self._lock:
+            if self._subs and not force:
+                return False
+            self._closed = True
+            key = os.path.abspath(self.db_path)
+            if _brokers.get(key) is self:
+                del _brokers[key]
+            for sub in self._subs:
+                sub.overflowed = True
+            self._subs.clear()
+            return True
+
+    def _pump(self, conn):
+        while True:
+            rows = conn.execute(
+                "SELECT seq, channel, entity_id, payload, created_at "
+                "FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?",
+                (self._last_seq, READ_BATCH)).fetchall()
+            if not rows:
+                return
+            events = [_event(r) for r in rows]
+            with self._lock:
+                self._last_seq = events[-1]["seq"]
+                subs = list(self._subs)
+            for sub in subs:
+                for event in events:
+                    if sub.overflowed:
+                        break
+                    sub._offer(event)
+            if len(rows) < READ_BATCH:
+                return
+
+
+def _prune(db_path, last_seq):
+    """Drop change_log rows older than the newest KEEP_ROWS."""
+    if not last_seq or last_seq <= KEEP_ROWS:
+        return
+    from tools.db.write_queue import submit
+    submit(("DELETE FROM change_log WHERE seq <= ?", (last_seq - KEEP_ROWS,)),
+           db_path)
+
+
+def get_broker(db_path=None):
+    """Broker for db_path, started on first use (and again after a fork)."""
+    global _brokers_pid
+    key = os.path.abspath(str(db_path or DB_PATH))
+    with _brokers_lock:
+        if _brokers_pid != os.getpid():
+            _brokers.clear()
+            _brokers_pid = os.getpid()
+        broker = _brokers.get(key)
+        if broker is None:
+            broker = _brokers[key] = ChangeBroker(key)
+        return broker
+
+
+def subscribe(channels=None, db_path=None):
+    """Subscription to live events on db_path (see ChangeBroker.subscribe)."""
+    while True:
+        sub = get_broker(db_path).subscribe(channels)
+        if sub is not None:
+            return sub
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GovProposal change log")
+    parser.add_argument("--tail", action="store_true", help="Follow new events")
+    parser.add_argument("--publish", metavar="CHANNEL", help="Publish one event")
+    parser.add_argument("--data", default="{}", help="JSON payload for --publish")
+    parser.add_argument("--entity-id", default=None)
+    parser.add_argument("--channels", default="", help="Comma-separated filter")
+    parser.add_argument("--db-path", default=None)
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    if args.publish:
+        from tools.db.pool import connect
+        conn = connect(args.db_path or DB_PATH)
+        try:
+            publish(conn, args.publish, json.loads(args.data), args.entity_id)
+            conn.commit()
+        except (sqlite3.Error, ValueError) as exc:
+            parser.error(str(exc))
+        finally:
+            conn.close()
+    elif args.tail:
+        channels = [c for c in args.channels.split(",") if c] or None
+        sub = subscribe(channels, args.db_path)
+        try:
+            while True:
+                event = sub.get(timeout=1.0)
+                if event is None:
+                    continue
+                if args.json:
+                    print(json.dumps(event), flush=True)
+                else:
+                    print(f"{event['seq']:>8} {event['channel']:<12} "
+                          f"{event['entity_id'] or '-':<24} "
+                          f"{json.dumps(event['data'])}", flush=True)
+        except KeyboardInterrupt:
+            pass
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -17,7 +17,7 @@ Creates tables for:
   - Production (templates, formatting, packaging)
   - Learning (debriefs, win/loss analysis, pricing calibration)
   - Contract Performance Management (post-award CDRL/SOW tracking)
-  - System (audit trail, acronyms, config)
+  - System (audit trail, acronyms, config, dashboard metrics)
 
 Usage:
     python tools/db/init_db.py [--json]
@@ -89,12 +89,16 @@ CREATE TABLE IF NOT EXISTS opportunities (
     updated_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_opp_status ON opportunities(status);
+DROP INDEX IF EXISTS idx_opp_status;  -- prefix of idx_opp_status_deadline
 CREATE INDEX IF NOT EXISTS idx_opp_agency ON opportunities(agency);
 CREATE INDEX IF NOT EXISTS idx_opp_naics ON opportunities(naics_code);
 CREATE INDEX IF NOT EXISTS idx_opp_deadline ON opportunities(response_deadline);
 CREATE INDEX IF NOT EXISTS idx_opp_sam_id ON opportunities(sam_notice_id);
 CREATE INDEX IF NOT EXISTS idx_opp_fit ON opportunities(fit_score);
+CREATE INDEX IF NOT EXISTS idx_opp_discovered_id ON opportunities(discovered_at, id);
+CREATE INDEX IF NOT EXISTS idx_opp_status_discovered ON opportunities(status, discovered_at, id);
+CREATE INDEX IF NOT EXISTS idx_opp_solnum ON opportunities(solicitation_number);
+CREATE INDEX IF NOT EXISTS idx_opp_status_deadline ON opportunities(status, response_deadline);
 
 -- Opportunity qualification scores (per-dimension breakdown)
 CREATE TABLE IF NOT EXISTS opportunity_scores (
@@ -108,7 +112,8 @@ CREATE TABLE IF NOT EXISTS opportunity_scores (
     scored_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_oppscore_opp ON opportunity_scores(opportunity_id);
+DROP INDEX IF EXISTS idx_oppscore_opp;  -- prefix of idx_oppscore_opp_scored
+CREATE INDEX IF NOT EXISTS idx_oppscore_opp_scored ON opportunity_scores(opportunity_id, scored_at);
 
 -- Pipeline stage tracking (append-only history)
 CREATE TABLE IF NOT EXISTS pipeline_stages (
@@ -122,8 +127,9 @@ CREATE TABLE IF NOT EXISTS pipeline_stages (
     advanced_by TEXT
 );
 
-CREATE INDEX IF NOT EXISTS idx_pipeline_opp ON pipeline_stages(opportunity_id);
+DROP INDEX IF EXISTS idx_pipeline_opp;  -- prefix of idx_pipeline_opp_entered
 CREATE INDEX IF NOT EXISTS idx_pipeline_stage ON pipeline_stages(stage);
+CREATE INDEX IF NOT EXISTS idx_pipeline_opp_entered ON pipeline_stages(opportunity_id, entered_at);
 
 -- ============================================================
 -- PROPOSALS & SECTIONS
@@ -161,6 +167,9 @@ CREATE TABLE IF NOT EXISTS proposals (
 CREATE INDEX IF NOT EXISTS idx_prop_opp ON proposals(opportunity_id);
 CREATE INDEX IF NOT EXISTS idx_prop_status ON proposals(status);
 CREATE INDEX IF NOT EXISTS idx_prop_cag ON proposals(cag_status);
+CREATE INDEX IF NOT EXISTS idx_prop_due ON proposals(due_date);
+CREATE INDEX IF NOT EXISTS idx_prop_updated_id ON proposals(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_prop_status_due ON proposals(status, IFNULL(due_date, ''), id);
 
 -- Proposal sections (individual content blocks)
 CREATE TABLE IF NOT EXISTS proposal_sections (
@@ -190,9 +199,10 @@ CREATE TABLE IF NOT EXISTS proposal_sections (
     updated_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_section_prop ON proposal_sections(proposal_id);
+DROP INDEX IF EXISTS idx_section_prop;  -- prefix of idx_section_prop_order
 CREATE INDEX IF NOT EXISTS idx_section_volume ON proposal_sections(volume);
 CREATE INDEX IF NOT EXISTS idx_section_status ON proposal_sections(status);
+CREATE INDEX IF NOT EXISTS idx_section_prop_order ON proposal_sections(proposal_id, volume, section_number);
 
 -- Compliance matrices (Section L/M mapping)
 CREATE TABLE IF NOT EXISTS compliance_matrices (
@@ -211,8 +221,9 @@ CREATE TABLE IF NOT EXISTS compliance_matrices (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_compliance_prop ON compliance_matrices(proposal_id);
+DROP INDEX IF EXISTS idx_compliance_prop;  -- prefix of idx_compliance_prop_order
 CREATE INDEX IF NOT EXISTS idx_compliance_status ON compliance_matrices(compliance_status);
+CREATE INDEX IF NOT EXISTS idx_compliance_prop_order ON compliance_matrices(proposal_id, source, requirement_id);
 
 -- Proposal reviews (color team results)
 CREATE TABLE IF NOT EXISTS proposal_reviews (
@@ -234,8 +245,10 @@ CREATE TABLE IF NOT EXISTS proposal_reviews (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_review_prop ON proposal_reviews(proposal_id);
+DROP INDEX IF EXISTS idx_review_prop;  -- prefix of idx_review_prop_reviewed
 CREATE INDEX IF NOT EXISTS idx_review_type ON proposal_reviews(review_type);
+CREATE INDEX IF NOT EXISTS idx_review_prop_reviewed ON proposal_reviews(proposal_id, reviewed_at);
+CREATE INDEX IF NOT EXISTS idx_review_prop_type_reviewed ON proposal_reviews(proposal_id, review_type, reviewed_at);
 
 -- ============================================================
 -- KNOWLEDGE BASE
@@ -272,7 +285,9 @@ CREATE TABLE IF NOT EXISTS kb_entries (
 );
 
 CREATE INDEX IF NOT EXISTS idx_kb_type ON kb_entries(entry_type);
-CREATE INDEX IF NOT EXISTS idx_kb_active ON kb_entries(is_active);
+DROP INDEX IF EXISTS idx_kb_active;  -- prefix of idx_kb_active_updated
+CREATE INDEX IF NOT EXISTS idx_kb_active_updated ON kb_entries(is_active, updated_at);
+CREATE INDEX IF NOT EXISTS idx_kb_active_type_updated ON kb_entries(is_active, entry_type, updated_at);
 
 -- KB embeddings for semantic search
 CREATE TABLE IF NOT EXISTS kb_embeddings (
@@ -389,8 +404,9 @@ CREATE TABLE IF NOT EXISTS cag_data_tags (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_cagtag_source ON cag_data_tags(source_type, source_id);
+DROP INDEX IF EXISTS idx_cagtag_source;  -- prefix of idx_cagtag_source_pos
 CREATE INDEX IF NOT EXISTS idx_cagtag_cat ON cag_data_tags(category);
+CREATE INDEX IF NOT EXISTS idx_cagtag_source_pos ON cag_data_tags(source_type, source_id, position_start);
 
 -- Aggregation rules (loaded from YAML + SCGs)
 CREATE TABLE IF NOT EXISTS cag_rules (
@@ -441,9 +457,89 @@ CREATE TABLE IF NOT EXISTS cag_alerts (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_cagalert_prop ON cag_alerts(proposal_id);
-CREATE INDEX IF NOT EXISTS idx_cagalert_status ON cag_alerts(status);
+DROP INDEX IF EXISTS idx_cagalert_prop;  -- prefix of idx_cagalert_prop_created
+DROP INDEX IF EXISTS idx_cagalert_status;  -- prefix of idx_cagalert_status_sev
 CREATE INDEX IF NOT EXISTS idx_cagalert_severity ON cag_alerts(severity);
+CREATE INDEX IF NOT EXISTS idx_cagalert_created ON cag_alerts(created_at);
+CREATE INDEX IF NOT EXISTS idx_cagalert_prop_created ON cag_alerts(proposal_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_cagalert_status_sev ON cag_alerts(status, severity, created_at);
+
+-- Persisted aggregation state per proposal (category bitmasks by scope).
+-- Lets the monitor re-evaluate only the pairs touched by a section change.
+CREATE TABLE IF NOT EXISTS cag_aggregation_state (
+    proposal_id TEXT NOT NULL REFERENCES proposals(id),
+    scope TEXT NOT NULL
+        CHECK(scope IN ('paragraph', 'section', 'volume')),
+    scope_key TEXT NOT NULL,
+    section_id TEXT,
+    volume TEXT,
+    paragraph_index INTEGER,
+    category_mask INTEGER NOT NULL DEFAULT 0,
+    tag_count INTEGER NOT NULL DEFAULT 0,
+    confidence_sum REAL NOT NULL DEFAULT 0.0,
+    updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (proposal_id, scope, scope_key)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cagstate_section ON cag_aggregation_state(proposal_id, section_id);
+
+-- Active alert per (rule, source set) so rescans diff instead of re-inserting
+CREATE TABLE IF NOT EXISTS cag_alert_state (
+    proposal_id TEXT NOT NULL REFERENCES proposals(id),
+    alert_key TEXT NOT NULL,
+    alert_id TEXT NOT NULL REFERENCES cag_alerts(id),
+    rule_id TEXT NOT NULL,
+    action TEXT,
+    proximity_type TEXT NOT NULL,
+    source_elements TEXT NOT NULL,
+    volumes TEXT NOT NULL,
+    updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (proposal_id, alert_key)
+);
+
+-- Portfolio-wide CAG sweeps (re-scan after rule changes) and their
+-- per-proposal checkpoints, so an interrupted sweep can be resumed
+CREATE TABLE IF NOT EXISTS cag_sweeps (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'running'
+        CHECK(status IN ('running', 'completed', 'failed')),
+    rules_version TEXT NOT NULL,
+    retag INTEGER NOT NULL DEFAULT 1,
+    total INTEGER NOT NULL DEFAULT 0,
+    done_count INTEGER NOT NULL DEFAULT 0,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    started_by TEXT,
+    started_at TEXT NOT NULL DEFAULT (datetime('now')),
+    completed_at TEXT,
+    heartbeat_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS cag_sweep_checkpoints (
+    sweep_id TEXT NOT NULL REFERENCES cag_sweeps(id),
+    proposal_id TEXT NOT NULL REFERENCES proposals(id),
+    status TEXT NOT NULL DEFAULT 'pending'
+        CHECK(status IN ('pending', 'done', 'error')),
+    cag_status TEXT,
+    alert_count INTEGER,
+    error TEXT,
+    updated_at TEXT NOT NULL DEFAULT (datetime('now')),
+    PRIMARY KEY (sweep_id, proposal_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cagsweepcp_status ON cag_sweep_checkpoints(sweep_id, status);
+
+-- Pre-export CAG verdict cache, keyed by the proposal content fingerprint
+-- (Merkle root over section content+tag hashes, bound to the rules version)
+CREATE TABLE IF NOT EXISTS cag_export_verdicts (
+    proposal_id TEXT PRIMARY KEY REFERENCES proposals(id),
+    fingerprint TEXT NOT NULL,
+    merkle_root TEXT NOT NULL,
+    rules_version TEXT NOT NULL,
+    section_hashes TEXT NOT NULL,
+    blocking_alerts TEXT NOT NULL,
+    total_alerts INTEGER NOT NULL DEFAULT 0,
+    checked_at TEXT NOT NULL DEFAULT (datetime('now'))
+);
 
 -- Cross-proposal exposure register
 CREATE TABLE IF NOT EXISTS cag_exposure_register (
@@ -460,8 +556,33 @@ CREATE TABLE IF NOT EXISTS cag_exposure_register (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_cagexpose_cap ON cag_exposure_register(capability_group);
+DROP INDEX IF EXISTS idx_cagexpose_cap;  -- prefix of idx_cagexpose_cap_date
 CREATE INDEX IF NOT EXISTS idx_cagexpose_prop ON cag_exposure_register(proposal_id);
+CREATE INDEX IF NOT EXISTS idx_cagexpose_date ON cag_exposure_register(exposure_date);
+CREATE INDEX IF NOT EXISTS idx_cagexpose_cap_date ON cag_exposure_register(capability_group, exposure_date);
+
+-- Materialized cumulative exposure: category bitmask per (group, day).
+-- Cumulative lookups OR the masks over a sliding lookback window.
+CREATE TABLE IF NOT EXISTS cag_exposure_daily (
+    capability_group TEXT NOT NULL,
+    exposure_day TEXT NOT NULL,
+    category_mask INTEGER NOT NULL DEFAULT 0,
+    exposure_count INTEGER NOT NULL DEFAULT 0,
+    alert_count INTEGER NOT NULL DEFAULT 0,
+    audiences TEXT,
+    latest_exposure TEXT,
+    PRIMARY KEY (capability_group, exposure_day)
+);
+
+CREATE INDEX IF NOT EXISTS idx_cagexpdaily_day ON cag_exposure_daily(exposure_day);
+
+-- Set once the rollup has been backfilled from the register, so an empty
+-- rollup (every day expired) is not mistaken for one never built.
+CREATE TABLE IF NOT EXISTS cag_exposure_rollup_state (
+    id INTEGER PRIMARY KEY CHECK(id = 1),
+    built_at TEXT NOT NULL,
+    cutoff TEXT
+);
 
 -- SCG programs and rules
 CREATE TABLE IF NOT EXISTS scg_programs (
@@ -539,6 +660,7 @@ CREATE TABLE IF NOT EXISTS win_themes (
 );
 
 CREATE INDEX IF NOT EXISTS idx_wintheme_opp ON win_themes(opportunity_id);
+CREATE INDEX IF NOT EXISTS idx_wintheme_prop ON win_themes(proposal_id);
 
 -- Teaming partners
 CREATE TABLE IF NOT EXISTS teaming_partners (
@@ -599,7 +721,8 @@ CREATE TABLE IF NOT EXISTS black_hat_analyses (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_blackhat_opp ON black_hat_analyses(opportunity_id);
+DROP INDEX IF EXISTS idx_blackhat_opp;  -- prefix of idx_blackhat_opp_created
+CREATE INDEX IF NOT EXISTS idx_blackhat_opp_created ON black_hat_analyses(opportunity_id, created_at);
 
 -- ============================================================
 -- COMPETITIVE INTELLIGENCE
@@ -648,9 +771,12 @@ CREATE TABLE IF NOT EXISTS competitor_wins (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_compwin_comp ON competitor_wins(competitor_id);
+DROP INDEX IF EXISTS idx_compwin_comp;  -- prefix of idx_compwin_comp_date
 CREATE INDEX IF NOT EXISTS idx_compwin_agency ON competitor_wins(agency);
 CREATE INDEX IF NOT EXISTS idx_compwin_naics ON competitor_wins(naics_code);
+CREATE INDEX IF NOT EXISTS idx_compwin_comp_date ON competitor_wins(competitor_id, award_date);
+CREATE INDEX IF NOT EXISTS idx_compwin_name_date ON competitor_wins(competitor_name, award_date);
+CREATE INDEX IF NOT EXISTS idx_compwin_fpds ON competitor_wins(fpds_id);
 
 -- Pricing benchmarks (from FPDS analysis)
 CREATE TABLE IF NOT EXISTS pricing_benchmarks (
@@ -694,8 +820,10 @@ CREATE TABLE IF NOT EXISTS debriefs (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_debrief_prop ON debriefs(proposal_id);
+DROP INDEX IF EXISTS idx_debrief_prop;  -- prefix of idx_debrief_prop_created
 CREATE INDEX IF NOT EXISTS idx_debrief_result ON debriefs(result);
+CREATE INDEX IF NOT EXISTS idx_debrief_prop_created ON debriefs(proposal_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_debrief_created ON debriefs(created_at);
 
 -- Win/loss pattern analysis
 CREATE TABLE IF NOT EXISTS win_loss_patterns (
@@ -733,6 +861,13 @@ CREATE INDEX IF NOT EXISTS idx_audit_event ON audit_trail(event_type);
 CREATE INDEX IF NOT EXISTS idx_audit_entity ON audit_trail(entity_type, entity_id);
 CREATE INDEX IF NOT EXISTS idx_audit_time ON audit_trail(created_at);
 
+-- Last audit spool sequence committed to audit_trail (tools/audit/audit_sink.py)
+CREATE TABLE IF NOT EXISTS audit_spool_checkpoint (
+    spool TEXT PRIMARY KEY,
+    seq INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
 -- Acronym registry
 CREATE TABLE IF NOT EXISTS acronyms (
     id TEXT PRIMARY KEY,
@@ -759,6 +894,8 @@ CREATE TABLE IF NOT EXISTS templates (
     created_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
+CREATE INDEX IF NOT EXISTS idx_template_name ON templates(name);
+
 -- ============================================================
 -- PHASE 36: EVOLUTIONARY INTELLIGENCE
 -- ============================================================
@@ -972,9 +1109,10 @@ CREATE TABLE IF NOT EXISTS contract_cdrls (
     updated_at TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_cdrls_contract ON contract_cdrls(contract_id);
+DROP INDEX IF EXISTS idx_cdrls_contract;  -- prefix of idx_cdrls_contract_num
 CREATE INDEX IF NOT EXISTS idx_cdrls_status ON contract_cdrls(status);
 CREATE INDEX IF NOT EXISTS idx_cdrls_due ON contract_cdrls(next_due_date);
+CREATE INDEX IF NOT EXISTS idx_cdrls_contract_num ON contract_cdrls(contract_id, cdrl_number);
 
 -- Contract SOW obligations (shall/must/will statements from Section C/F)
 CREATE TABLE IF NOT EXISTS contract_obligations (
@@ -1026,7 +1164,9 @@ CREATE TABLE IF NOT EXISTS deliverable_reminders (
 
 CREATE INDEX IF NOT EXISTS idx_reminders_status ON deliverable_reminders(status);
 CREATE INDEX IF NOT EXISTS idx_reminders_date ON deliverable_reminders(reminder_date);
-CREATE INDEX IF NOT EXISTS idx_reminders_contract ON deliverable_reminders(contract_id);
+DROP INDEX IF EXISTS idx_reminders_contract;  -- prefix of idx_reminders_contract_pending
+CREATE INDEX IF NOT EXISTS idx_reminders_contract_pending ON deliverable_reminders(contract_id, status, reminder_date);
+CREATE INDEX IF NOT EXISTS idx_reminders_related ON deliverable_reminders(related_id, days_before);
 
 -- ── AI Proposal Self-Scoring Evaluator ──────────────────────────────────────
 
@@ -1232,6 +1372,183 @@ CREATE INDEX IF NOT EXISTS idx_taskorders_deadline ON task_orders(response_deadl
 """
 
 
+# Append-only feed of state changes (proposal status, CAG alerts, ingest and
+# fine-tune jobs) published by tool modules via tools/db/change_log.py and
+# pushed to browsers over the dashboard's server-sent event stream. seq is
+# AUTOINCREMENT so it is never reused, even after pruning.
+CHANGE_LOG_SQL = """CREATE TABLE IF NOT EXISTS change_log (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    entity_id TEXT,
+    payload TEXT NOT NULL DEFAULT '{}',
+    created_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%dT%H:%M:%fZ', 'now'))
+)"""
+
+
+# SAM.gov incremental harvest (tools/monitor/sam_scanner.py). One checkpoint
+# per query slice: the posted date it is complete through and, while a
+# window is being paged, that window and the next offset to request.
+# api_budget is a persistent token bucket shared by every process that
+# calls a rate-limited API.
+SAM_HARVEST_SQL = """
+CREATE TABLE IF NOT EXISTS sam_harvest_state (
+    slice_key TEXT PRIMARY KEY,
+    naics_code TEXT,
+    watermark TEXT,
+    covered_from TEXT,
+    last_posted TEXT,
+    window_from TEXT,
+    window_to TEXT,
+    next_offset INTEGER,
+    total_records INTEGER,
+    completed_at TEXT,
+    last_error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS api_budget (
+    api TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    capacity REAL NOT NULL,
+    refilled_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+# Dashboard summary counters, kept current by triggers on the source tables
+# and read by tools/dashboard/metrics.py instead of GROUP BY over full tables.
+# (metric, table, dim expr, value expr, row filter, columns that matter);
+# "{r}" is NEW/OLD inside triggers and the table itself when seeding.
+DASHBOARD_METRICS = (
+    ("opp_status", "opportunities", "COALESCE({r}.status, '')", "1", "1",
+     ("status",)),
+    ("pipeline_value", "opportunities", "''",
+     "COALESCE({r}.estimated_value_high, 0)",
+     "{r}.status NOT IN ('no_bid', 'archived', 'lost')",
+     ("status", "estimated_value_high")),
+    ("cag_open", "cag_alerts", "{r}.severity", "1", "{r}.status = 'open'",
+     ("status", "severity")),
+    ("cag_rules_active", "cag_rules", "''", "1", "{r}.is_active = 1",
+     ("is_active",)),
+    ("reminder_pending", "deliverable_reminders", "{r}.reminder_date", "1",
+     "{r}.status = 'pending'", ("status", "reminder_date")),
+    ("debrief_result", "debriefs", "COALESCE({r}.result, '')", "1", "1",
+     ("result",)),
+    ("proposal_status", "proposals", "{r}.status", "1", "1", ("status",)),
+)
+
+
+def _metric_upsert(metric, dim, value, where, sign):
+    return (
+        f"INSERT INTO dashboard_metrics (metric, dim, value) "
+        f"SELECT '{metric}', {dim}, {sign}({value}) WHERE {where} "
+        f"ON CONFLICT(metric, dim) DO UPDATE SET value = value + excluded.value;"
+    )
+
+
+def dashboard_metrics_sql():
+    """DDL for dashboard_metrics and the triggers that maintain it."""
+    stmts = ["""CREATE TABLE IF NOT EXISTS dashboard_metrics (
+    metric TEXT NOT NULL,
+    dim TEXT NOT NULL DEFAULT '',
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (metric, dim)
+) WITHOUT ROWID;"""]
+    tables = {}
+    for metric in DASHBOARD_METRICS:
+        tables.setdefault(metric[1], []).append(metric)
+    for table, metrics in tables.items():
+        def body(row, sign):
+            return "\n    ".join(
+                _metric_upsert(m, d.format(r=row), v.format(r=row),
+                               w.format(r=row), sign)
+                for m, _, d, v, w, _ in metrics)
+        cols = sorted({c for m in metrics for c in m[5]})
+        stmts.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_metrics_{table}_ins "
+            f"AFTER INSERT ON {table} BEGIN\n    {body('NEW', '')}\nEND;")
+        stmts.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_metrics_{table}_del "
+            f"AFTER DELETE ON {table} BEGIN\n    {body('OLD', '-')}\nEND;")
+        stmts.append(
+            f"CREATE TRIGGER IF NOT EXISTS trg_metrics_{table}_upd "
+            f"AFTER UPDATE OF {', '.join(cols)} ON {table} BEGIN\n"
+            f"    {body('OLD', '-')}\n    {body('NEW', '')}\nEND;")
+    return "\n".join(stmts)
+
+
+def seed_dashboard_metrics(conn, only=None):
+    """Recompute dashboard counters (all, or the names in only) from source.
+
+    Each seeded metric gets a ('_seeded', metric) marker row so a metric
+    added later is seeded once on existing databases.
+    """
+    for metric, table, dim, value, where, _ in DASHBOARD_METRICS:
+        if only is not None and metric not in only:
+            continue
+        conn.execute("DELETE FROM dashboard_metrics WHERE metric = ?", (metric,))
+        conn.execute(
+            f"INSERT INTO dashboard_metrics (metric, dim, value) "
+            f"SELECT '{metric}', {dim.format(r=table)}, SUM({value.format(r=table)}) "
+            f"FROM {table} WHERE {where.format(r=table)} "
+            f"GROUP BY {dim.format(r=table)}"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO dashboard_metrics (metric, dim, value) "
+            "VALUES ('_seeded', ?, 1)", (metric,))
+    conn.commit()
+
+
+def install_dashboard_metrics(conn):
+    """Create dashboard_metrics + triggers; seed metrics not yet seeded."""
+    conn.executescript(dashboard_metrics_sql())
+    seeded = {r[0] for r in conn.execute(
+        "SELECT dim FROM dashboard_metrics WHERE metric = '_seeded'")}
+    missing = {m[0] for m in DASHBOARD_METRICS} - seeded
+    if missing:
+        seed_dashboard_metrics(conn, only=missing)
+    install_data_versions(conn)
+
+
+# Tables whose every write bumps a ('data_version', table) row in
+# dashboard_metrics. The dashboard derives HTTP ETags for its JSON APIs
+# from these counters (tools/dashboard/http_cache.py). Tables created by
+# later migrations (RFX, ERP, CRM, pricing) get their triggers once they
+# exist.
+DATA_VERSION_TABLES = (
+    "opportunities", "proposals", "cag_alerts",
+    "rfx_ai_sections", "rfx_requirements", "rfx_requirement_status",
+    "employees", "contacts", "relationship_types", "pricing_scenarios",
+)
+
+
+def data_version_sql(tables):
+    """DDL for the triggers that bump each table's data_version counter."""
+    stmts = []
+    for table in tables:
+        bump = ("INSERT INTO dashboard_metrics (metric, dim, value) "
+                f"VALUES ('data_version', '{table}', 1) "
+                "ON CONFLICT(metric, dim) DO UPDATE SET value = value + 1;")
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            stmts.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_dv_{table}_{event[:3].lower()} "
+                f"AFTER {event} ON {table} BEGIN\n    {bump}\nEND;")
+    return "\n".join(stmts)
+
+
+def install_data_versions(conn, tables=DATA_VERSION_TABLES):
+    """Create data_version triggers on those of tables that exist.
+
+    Returns:
+        set of table names now tracked.
+    """
+    present = {r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table'")}
+    tracked = [t for t in tables if t in present]
+    if tracked:
+        conn.executescript(data_version_sql(tracked))
+    return set(tracked)
+
+
 def init_db(db_path=None):
     """Initialize the GovProposal database."""
     path = db_path or str(DB_PATH)
@@ -1243,7 +1560,10 @@ def init_db(db_path=None):
     conn.execute("PRAGMA foreign_keys=ON")
 
     conn.executescript(SCHEMA_SQL)
+    conn.execute(CHANGE_LOG_SQL)
+    conn.executescript(SAM_HARVEST_SQL)
     conn.commit()
+    install_dashboard_metrics(conn)
 
     # Count tables
     cursor = conn.execute(
@@ -87,6 +87,7 @@ CREATE INDEX IF NOT EXISTS idx_emp_status    ON employees(status);
 CREATE INDEX IF NOT EXISTS idx_emp_clearance ON employees(clearance_level);
 CREATE INDEX IF NOT EXISTS idx_emp_type      ON employees(company_type);
 CREATE INDEX IF NOT EXISTS idx_emp_avail     ON employees(availability);
+CREATE INDEX IF NOT EXISTS idx_emp_email     ON employees(email);
 
 
 -- ============================================================
@@ -138,9 +139,10 @@ CREATE TABLE IF NOT EXISTS certifications (
     created_at      TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_cert_emp    ON certifications(employee_id);
+DROP INDEX IF EXISTS idx_cert_emp;  -- prefix of idx_cert_emp_expiry
 CREATE INDEX IF NOT EXISTS idx_cert_status ON certifications(status);
 CREATE INDEX IF NOT EXISTS idx_cert_expiry ON certifications(expiry_date);
+CREATE INDEX IF NOT EXISTS idx_cert_emp_expiry ON certifications(employee_id, expiry_date);
 
 
 -- ============================================================
@@ -199,8 +201,9 @@ CREATE TABLE IF NOT EXISTS lcat_rates (
     created_at          TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_rate_lcat      ON lcat_rates(lcat_id);
+DROP INDEX IF EXISTS idx_rate_lcat;  -- prefix of idx_rate_lcat_effective
 CREATE INDEX IF NOT EXISTS idx_rate_effective ON lcat_rates(effective_date);
+CREATE INDEX IF NOT EXISTS idx_rate_lcat_effective ON lcat_rates(lcat_id, effective_date);
 
 
 -- ============================================================
@@ -275,6 +278,8 @@ CREATE INDEX IF NOT EXISTS idx_contact_rel    ON contacts(relationship_type_id);
 CREATE INDEX IF NOT EXISTS idx_contact_sector ON contacts(sector);
 CREATE INDEX IF NOT EXISTS idx_contact_status ON contacts(status);
 CREATE INDEX IF NOT EXISTS idx_contact_agency ON contacts(agency);
+CREATE INDEX IF NOT EXISTS idx_contact_email  ON contacts(email);
+CREATE INDEX IF NOT EXISTS idx_contact_name_co ON contacts(full_name, company);
 
 
 -- ============================================================
@@ -299,9 +304,10 @@ CREATE TABLE IF NOT EXISTS interactions (
     created_at          TEXT NOT NULL DEFAULT (datetime('now'))
 );
 
-CREATE INDEX IF NOT EXISTS idx_inter_contact ON interactions(contact_id);
+DROP INDEX IF EXISTS idx_inter_contact;  -- prefix of idx_inter_contact_date
 CREATE INDEX IF NOT EXISTS idx_inter_opp     ON interactions(opportunity_id);
 CREATE INDEX IF NOT EXISTS idx_inter_date    ON interactions(interaction_date);
+CREATE INDEX IF NOT EXISTS idx_inter_contact_date ON interactions(contact_id, interaction_date);
 
 
 -- ============================================================
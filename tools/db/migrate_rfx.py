@@ -13,9 +13,11 @@ Tables added:
   rfx_ai_sections       — AI-generated proposal sections (HITL workflow)
   rfx_hitl_reviews      — append-only HITL review decisions
   rfx_exclusion_list    — sensitive term masking (term -> placeholder)
+  rfx_exclusion_version — change stamp for the cached exclusion masker
   rfx_research_cache    — web/gov research results with TTL
   rfx_model_config      — fine-tuned model registry (Ollama + Bedrock)
   rfx_finetune_jobs     — Unsloth/LoRA training job queue
+  rfx_ingest_jobs       — staged document ingestion job queue
 
 Usage:
     python tools/db/migrate_rfx.py [--json]
@@ -34,6 +36,15 @@ DB_PATH = Path(os.environ.get(
 ))
 
 
+def _add_column(cur, table, column_def):
+    """ALTER TABLE ... ADD COLUMN for databases created before the column existed."""
+    try:
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column_def}")
+    except sqlite3.OperationalError as e:
+        if "duplicate column" not in str(e).lower():
+            raise
+
+
 def run(db_path=None):
     path = str(db_path or DB_PATH)
     conn = sqlite3.connect(path)
@@ -70,16 +81,20 @@ def run(db_path=None):
             classification      TEXT NOT NULL DEFAULT 'CUI // SP-PROPIN',
             uploaded_by         TEXT,
             notes               TEXT,
+            supersedes_id       TEXT REFERENCES rfx_documents(id),  -- prior version (amendment)
             created_at          TEXT NOT NULL DEFAULT (datetime('now')),
             updated_at          TEXT NOT NULL DEFAULT (datetime('now'))
         )
     """)
     created.append("rfx_documents")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxdoc_proposal  ON rfx_documents(proposal_id)")
+    _add_column(cur, "rfx_documents", "supersedes_id TEXT REFERENCES rfx_documents(id)")
+    cur.execute("DROP INDEX IF EXISTS idx_rfxdoc_proposal")  # prefix of idx_rfxdoc_prop_created
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxdoc_opp       ON rfx_documents(opportunity_id)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxdoc_type      ON rfx_documents(doc_type)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxdoc_hash      ON rfx_documents(file_hash)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxdoc_vector    ON rfx_documents(vectorized)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxdoc_supersedes ON rfx_documents(supersedes_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxdoc_prop_created ON rfx_documents(proposal_id, created_at)")
 
     # ── rfx_document_chunks ───────────────────────────────────────────────────
     # Text chunks from rfx_documents with float32 embedding BLOBs for RAG.
@@ -100,6 +115,9 @@ def run(db_path=None):
     created.append("rfx_document_chunks")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxchunk_doc    ON rfx_document_chunks(document_id)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxchunk_idx    ON rfx_document_chunks(document_id, chunk_index)")
+    # Partial: only chunks still waiting for an embedding (rag_service backfill)
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxchunk_unembedded ON rfx_document_chunks(document_id) "
+                "WHERE embedding IS NULL")
 
     # ── rfx_requirements ──────────────────────────────────────────────────────
     # Requirements extracted from RFI/RFP documents (shall/should/must statements).
@@ -124,14 +142,20 @@ def run(db_path=None):
             notes           TEXT,
             extracted_by    TEXT NOT NULL DEFAULT 'ai'
                 CHECK(extracted_by IN ('ai', 'manual')),
+            text_hash       TEXT,   -- SHA-256 of normalized req_text (amendment diff)
+            removed_at      TEXT,   -- set when an amendment drops the requirement
             created_at      TEXT NOT NULL DEFAULT (datetime('now'))
         )
     """)
     created.append("rfx_requirements")
+    # text_hash was added for amended-RFP re-import; NULL rows are hashed lazily
+    _add_column(cur, "rfx_requirements", "text_hash TEXT")
+    _add_column(cur, "rfx_requirements", "removed_at TEXT")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxreq_doc      ON rfx_requirements(document_id)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxreq_proposal ON rfx_requirements(proposal_id)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxreq_section  ON rfx_requirements(section)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxreq_priority ON rfx_requirements(priority)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxreq_hash     ON rfx_requirements(document_id, text_hash)")
 
     # ── rfx_requirement_status ────────────────────────────────────────────────
     # Tracks how each requirement is addressed in a specific proposal.
@@ -192,6 +216,7 @@ def run(db_path=None):
     """)
     created.append("rfx_ai_sections")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxaisec_prop    ON rfx_ai_sections(proposal_id)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxaisec_prop_hitl ON rfx_ai_sections(proposal_id, hitl_status)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxaisec_hitl    ON rfx_ai_sections(hitl_status)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxaisec_volume  ON rfx_ai_sections(volume)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxaisec_pricing ON rfx_ai_sections(pricing_scenario_id)")
@@ -242,6 +267,19 @@ def run(db_path=None):
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxexcl_type     ON rfx_exclusion_list(term_type)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxexcl_active   ON rfx_exclusion_list(is_active)")
 
+    # ── rfx_exclusion_version ─────────────────────────────────────────────────
+    # Single-row stamp bumped on every exclusion list change, so processes
+    # can keep a compiled masker cached and rebuild it only when stale.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS rfx_exclusion_version (
+            id              INTEGER PRIMARY KEY CHECK(id = 1),
+            version         INTEGER NOT NULL DEFAULT 0,
+            updated_at      TEXT
+        )
+    """)
+    cur.execute("INSERT OR IGNORE INTO rfx_exclusion_version (id, version) VALUES (1, 0)")
+    created.append("rfx_exclusion_version")
+
     # ── rfx_research_cache ────────────────────────────────────────────────────
     # Cached web/gov search results. Keyed by SHA-256(query).
     # expires_at enables TTL-based invalidation (default 24h).
@@ -261,9 +299,11 @@ def run(db_path=None):
         )
     """)
     created.append("rfx_research_cache")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxcache_hash    ON rfx_research_cache(query_hash)")
-    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxcache_prop    ON rfx_research_cache(proposal_id)")
+    cur.execute("DROP INDEX IF EXISTS idx_rfxcache_hash")  # prefix of idx_rfxcache_hash_expire
+    cur.execute("DROP INDEX IF EXISTS idx_rfxcache_prop")  # prefix of idx_rfxcache_prop_created
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxcache_expire  ON rfx_research_cache(expires_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxcache_hash_expire ON rfx_research_cache(query_hash, expires_at)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxcache_prop_created ON rfx_research_cache(proposal_id, created_at)")
 
     # ── rfx_model_config ──────────────────────────────────────────────────────
     # Registry of available fine-tuned and base models (Ollama + Bedrock).
@@ -331,6 +371,48 @@ def run(db_path=None):
     created.append("rfx_finetune_jobs")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxft_status     ON rfx_finetune_jobs(status)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxft_model      ON rfx_finetune_jobs(model_name)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxft_created    ON rfx_finetune_jobs(created_at)")
+
+    # ── rfx_ingest_jobs ───────────────────────────────────────────────────────
+    # Durable document ingestion queue (tools/rfx/ingest_queue.py). A job walks
+    # its stages in order; `stage` is the next stage to run, so a retried or
+    # reclaimed job resumes where it stopped. Workers claim jobs with a lease.
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS rfx_ingest_jobs (
+            id                  TEXT PRIMARY KEY,
+            document_id         TEXT,
+            src_path            TEXT,
+            file_hash           TEXT,
+            supersedes_id       TEXT,
+            filename            TEXT,
+            doc_type            TEXT NOT NULL DEFAULT 'other',
+            proposal_id         TEXT,
+            opportunity_id      TEXT,
+            uploaded_by         TEXT,
+            notes               TEXT,
+            stages              TEXT NOT NULL,
+            stage               TEXT,
+            status              TEXT NOT NULL DEFAULT 'queued'
+                CHECK(status IN ('queued', 'running', 'done', 'duplicate', 'failed')),
+            attempts            INTEGER NOT NULL DEFAULT 0,
+            max_attempts        INTEGER NOT NULL DEFAULT 3,
+            results             TEXT NOT NULL DEFAULT '{}',
+            error_message       TEXT,
+            worker_id           TEXT,
+            lease_expires       TEXT,
+            run_after           TEXT NOT NULL DEFAULT (datetime('now')),
+            started_at          TEXT,
+            completed_at        TEXT,
+            updated_at          TEXT,
+            created_at          TEXT NOT NULL DEFAULT (datetime('now'))
+        )
+    """)
+    created.append("rfx_ingest_jobs")
+    # file_hash was added after the first release of the queue
+    _add_column(cur, "rfx_ingest_jobs", "file_hash TEXT")
+    _add_column(cur, "rfx_ingest_jobs", "supersedes_id TEXT")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxingest_status ON rfx_ingest_jobs(status, run_after)")
+    cur.execute("CREATE INDEX IF NOT EXISTS idx_rfxingest_doc    ON rfx_ingest_jobs(document_id)")
 
     conn.commit()
     conn.close()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN (Proprietary Business Information)
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Shared SQLite connection pool for all GovProposal tools.
+
+Every tool module's _get_db()/_conn()/_db() helper goes through connect().
+Connections are pooled per thread and per database path, opened once with
+a consistent set of PRAGMAs and a larger prepared-statement cache, and
+handed back to the pool when the caller closes them:
+
+  journal_mode=WAL      readers never block the writer
+  synchronous=NORMAL    safe with WAL; fsync at checkpoint, not every commit
+  busy_timeout          wait for a competing writer instead of failing
+  cache_size, mmap_size larger page cache + memory-mapped reads
+  temp_store=MEMORY     sorts and temp tables stay in RAM
+
+close() on a pooled connection rolls back anything left uncommitted and
+returns it to the thread's idle list, so the existing open/try/finally
+close() pattern in every module keeps working unchanged. A nested caller
+in the same thread gets a different connection, never one that is in use.
+Set GOVPROPOSAL_DB_POOL=0 to open (and really close) a connection per
+checkout, with the same PRAGMAs.
+
+Audit rows recorded against a pooled connection (tools/audit/audit_sink.py
+record_event) are held on the connection and written with one executemany
+when the caller commits, or dropped with the transaction on rollback.
+
+A per-thread trace installed with set_trace() (the dashboard request
+profiler, tools/dashboard/profiler.py) is attached to each connection the
+thread checks out and detached when it is closed.
+
+Usage:
+    python tools/db/pool.py --bench [--iterations 2000] [--json]
+    python tools/db/pool.py --bench-detail [--requests 300] [--db PATH] [--json]
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = Path(os.environ.get(
+    "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
+))
+
+BUSY_TIMEOUT_MS = 30000
+CACHE_SIZE_KB = 16384          # PRAGMA cache_size is negative KiB
+MMAP_SIZE = 256 * 1024 * 1024
+CACHED_STATEMENTS = 256
+MAX_IDLE_PER_PATH = 4          # idle connections kept per thread and path
+MAX_PATHS_PER_THREAD = 8       # older databases are closed (tests, tools)
+POOL_ENABLED = os.environ.get("GOVPROPOSAL_DB_POOL", "1") != "0"
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}",
+    f"PRAGMA cache_size=-{CACHE_SIZE_KB}",
+    f"PRAGMA mmap_size={MMAP_SIZE}",
+    "PRAGMA temp_store=MEMORY",
+)
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {"opened": 0, "reused": 0, "closed": 0}
+
+
+# ---------------------------------------------------------------------------
+# Pooled connection
+# ---------------------------------------------------------------------------
+class PooledConnection(sqlite3.Connection):
+    """sqlite3.Connection whose close() returns it to the thread's pool."""
+
+    _trace = None
+
+    def commit(self):
+        self._flush_audit()
+        sqlite3.Connection.commit(self)
+
+    def rollback(self):
+        self._audit_rows = []
+        sqlite3.Connection.rollback(self)
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            try:
+                self._flush_audit()
+            except BaseException:
+                sqlite3.Connection.rollback(self)
+                raise
+        else:
+            self._audit_rows = []
+        return sqlite3.Connection.__exit__(self, exc_type, exc, tb)
+
+    def _flush_audit(self):
+        rows = getattr(self, "_audit_rows", None)
+        if rows:
+            from tools.audit.audit_sink import AUDIT_INSERT_SQL
+            self._audit_rows = []
+            self.executemany(AUDIT_INSERT_SQL, rows)
+
+    def close(self):
+        if not getattr(self, "_checked_out", False):
+            return
+        self._checked_out = False
+        self._audit_rows = []
+        if self._trace is not None:
+            self._trace.detach(self)
+        try:
+            if self.in_transaction:
+                self.rollback()
+        except sqlite3.Error:
+            self.discard()
+            return
+        idle = _idle_list(self._pool_key, create=False) if POOL_ENABLED else None
+        if idle is not None and len(idle) < MAX_IDLE_PER_PATH:
+            idle.append(self)
+        else:
+            self.discard()
+
+    def discard(self):
+        """Really close the underlying connection."""
+        self._checked_out = False
+        with _stats_lock:
+            _stats["closed"] += 1
+        sqlite3.Connection.close(self)
+
+
+def _thread_pools():
+    """Per-thread {path: [idle connections]}, reset after a fork."""
+    pools = getattr(_local, "pools", None)
+    if pools is None or _local.pid != os.getpid():
+        # Connections inherited across fork() must not be used
+        pools = _local.pools = OrderedDict()
+        _local.pid = os.getpid()
+    return pools
+
+
+def _idle_list(key, create=True):
+    pools = _thread_pools()
+    idle = pools.get(key)
+    if idle is None and create:
+        idle = pools[key] = []
+        while len(pools) > MAX_PATHS_PER_THREAD:
+            _, stale = pools.popitem(last=False)
+            for conn in stale:
+                conn.discard()
+    elif idle is not None:
+        pools.move_to_end(key)
+    return idle
+
+
+def _open(path):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000,
+                           factory=PooledConnection,
+                           cached_statements=CACHED_STATEMENTS)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    conn._foreign_keys = False
+    with _stats_lock:
+        _stats["opened"] += 1
+    return conn
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+def connect(db_path=None, foreign_keys=False, row_factory=sqlite3.Row):
+    """Check out a connection for the current thread.
+
+    Args:
+        db_path: Database path. Falls back to DB_PATH.
+        foreign_keys: Enforce FOREIGN KEY constraints on this checkout.
+        row_factory: Row factory to install (sqlite3.Row by default).
+
+    Returns:
+        PooledConnection; call close() to hand it back.
+    """
+    key = os.path.abspath(str(db_path or DB_PATH))
+    idle = _idle_list(key) if POOL_ENABLED else None
+    if idle:
+        conn = idle.pop()
+        with _stats_lock:
+            _stats["reused"] += 1
+    else:
+        conn = _open(key)
+        conn._pool_key = key
+    conn._checked_out = True
+    conn._audit_rows = []
+    conn.row_factory = row_factory
+    conn.isolation_level = ""
+    if conn._foreign_keys != foreign_keys:
+        conn.execute(f"PRAGMA foreign_keys={'ON' if foreign_keys else 'OFF'}")
+        conn._foreign_keys = foreign_keys
+    trace = getattr(_local, "trace", None)
+    if trace is not None:
+        trace.attach(conn)
+    return conn
+
+
+def set_trace(trace):
+    """Attach trace to the connections this thread checks out (None stops).
+
+    trace.attach(conn) is called on each checkout and trace.detach(conn)
+    when the connection is closed.
+    """
+    _local.trace = trace
+
+
+def close_all():
+    """Close every idle connection held by the current thread."""
+    pools = _thread_pools()
+    for idle in pools.values():
+        for conn in idle:
+            conn.discard()
+    pools.clear()
+
+
+def pool_stats():
+    """Process-wide counters: connections opened, reused and closed."""
+    with _stats_lock:
+        return dict(_stats)
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+def bench(iterations=2000, db_path=None):
+    """Time open-query-close with a fresh connection vs the pool.
+
+    Args:
+        iterations: Number of open/query/close cycles per mode.
+        db_path: Database to query. Falls back to DB_PATH.
+
+    Returns:
+        dict with per-mode ops/sec and the speedup.
+    """
+    path = str(db_path or DB_PATH)
+    sql = "SELECT COUNT(*) FROM sqlite_master"
+
+    def _fresh():
+        conn = sqlite3.connect(path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.execute(sql).fetchone()
+        conn.close()
+
+    def _pooled():
+        conn = connect(path, foreign_keys=True)
+        conn.execute(sql).fetchone()
+        conn.close()
+
+    result = {"iterations": iterations}
+    for name, fn in (("fresh", _fresh), ("pooled", _pooled)):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = time.perf_counter() - start
+        result[f"{name}_ops_per_sec"] = round(iterations / elapsed, 1)
+    result["speedup"] = round(result["pooled_ops_per_sec"] / result["fresh_ops_per_sec"], 2)
+    return result
+
+
+def _seed_detail(db_path, sections=24):
+    """Insert one opportunity and a proposal with sections; return its id."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute(
+            "INSERT INTO opportunities (id, title, agency, status) "
+            "VALUES ('OPP-bench', 'Pool benchmark', 'Benchmark Agency', 'discovered')")
+        conn.execute(
+            "INSERT INTO proposals (id, opportunity_id, title) "
+            "VALUES ('PROP-bench', 'OPP-bench', 'Pool benchmark proposal')")
+        volumes = ("technical", "management", "past_performance", "cost")
+        conn.executemany(
+            "INSERT INTO proposal_sections (id, proposal_id, volume, section_number, "
+            "section_title, content, word_count) VALUES (?, 'PROP-bench', ?, ?, ?, ?, 200)",
+            [(f"SEC-bench-{i}", volumes[i % len(volumes)], str(i + 1),
+              f"Section {i + 1}", "The contractor shall deliver. " * 40)
+             for i in range(sections)])
+        conn.commit()
+    finally:
+        conn.close()
+    return "PROP-bench"
+
+
+def bench_detail(requests=300, db_path=None, prop_id=None):
+    """Time GET /proposals/<id> through the dashboard, pool off vs on.
+
+    Drives the real route (six queries plus template render) with the
+    Flask test client. Without db_path a seeded throwaway database in a
+    temporary directory is used and removed afterwards.
+
+    Args:
+        requests: Requests per mode.
+        db_path: Database to serve. Defaults to a temporary seeded one.
+        prop_id: Proposal to fetch. Defaults to the first proposal.
+
+    Returns:
+        dict with per-mode requests/sec and the speedup.
+    """
+    global POOL_ENABLED
+    from tools.dashboard import common
+    from tools.dashboard.app import app
+
+    tmp_dir = None
+    if db_path is None:
+        from tools.db.init_db import init_db
+        tmp_dir = tempfile.mkdtemp(prefix="pool-bench-")
+        db_path = Path(tmp_dir) / "bench.db"
+        init_db(str(db_path))
+        prop_id = _seed_detail(db_path)
+    elif prop_id is None:
+        conn = connect(db_path)
+        try:
+            row = conn.execute("SELECT id FROM proposals LIMIT 1").fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            raise ValueError(f"No proposals in {db_path}")
+        prop_id = row["id"]
+
+    url = f"/proposals/{prop_id}"
+    saved_path, saved_pool = common.DB_PATH, POOL_ENABLED
+    result = {"requests": requests, "path": url}
+    try:
+        common.DB_PATH = Path(db_path)
+        client = app.test_client()
+        status = client.get(url).status_code
+        if status != 200:
+            raise ValueError(f"GET {url} returned {status}")
+        for name, enabled in (("fresh", False), ("pooled", True)):
+            POOL_ENABLED = enabled
+            close_all()
+            client.get(url)
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get(url)
+            elapsed = time.perf_counter() - start
+            result[f"{name}_req_per_sec"] = round(requests / elapsed, 1)
+    finally:
+        common.DB_PATH, POOL_ENABLED = saved_path, saved_pool
+        close_all()
+        if tmp_dir:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+    result["speedup"] = round(result["pooled_req_per_sec"] / result["fresh_req_per_sec"], 2)
+    return result
+
+
+def main():
+    sys.path.insert(0, str(BASE_DIR))
+    parser = argparse.ArgumentParser(description="GovProposal SQLite connection pool")
+    parser.add_argument("--bench", action="store_true",
+                        help="Benchmark pooled vs fresh connections")
+    parser.add_argument("--bench-detail", action="store_true",
+                        help="Benchmark GET /proposals/<id> with the pool off vs on")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--db-path", "--db", dest="db_path", default=None,
+                        help="Database (--bench-detail defaults to a temporary one)")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    if args.bench_detail:
+        result = bench_detail(args.requests, args.db_path)
+    elif args.bench:
+        result = bench(args.iterations, args.db_path)
+    else:
+        parser.print_help()
+        return
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for k, v in result.items():
+            print(f"{k:>22}: {v}")
+
+
+if __name__ == "__main__":
+    main()
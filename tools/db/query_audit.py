@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN (Proprietary Business Information)
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Query-plan audit: EXPLAIN QUERY PLAN over every SQL string in tools/.
+
+SQL is found statically. Every string literal and f-string in tools/**/*.py
+that starts with SELECT / WITH / UPDATE / DELETE (or INSERT ... SELECT) is
+collected, with f-string substitutions replaced by a bound parameter.
+Each statement is planned against a scratch database built from init_db
+plus every migration, or against --db-path to use a real database and its
+ANALYZE statistics.
+
+Findings:
+  full-scan    SCAN of a table in a statement that filters or joins
+               (unfiltered listings are expected to scan and are not flagged)
+  temp-btree   USE TEMP B-TREE for ORDER BY / GROUP BY / DISTINCT
+  auto-index   SQLite had to build a transient AUTOMATIC index
+
+Statements that cannot be prepared (dynamic table names, partial fragments)
+are counted as skipped. A deliberate scan can be accepted with a
+"# query-plan: ok" comment on the line where the string starts, or on the
+line above it.
+
+Usage:
+    python tools/db/query_audit.py [--json] [--strict] [--db-path PATH]
+    python tools/db/query_audit.py --sql "SELECT ... FROM ... WHERE ..."
+"""
+
+import argparse
+import ast
+import contextlib
+import io
+import json
+import re
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+TOOLS_DIR = BASE_DIR / "tools"
+
+SQL_START = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT|REPLACE)\s")
+FILTERED = re.compile(r"\b(WHERE|JOIN|ON)\b", re.I)
+ACCEPT_MARK = "query-plan: ok"
+SCAN_RE = re.compile(r"^SCAN (\w+)(?: AS \w+)?$")
+BINDINGS_RE = re.compile(r"statement uses (\d+)")
+
+
+# ---------------------------------------------------------------------------
+# Extraction
+# ---------------------------------------------------------------------------
+def _render(node):
+    """Source text of a string node; f-string fields become '?'."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    parts = []
+    for value in node.values:
+        if isinstance(value, ast.Constant):
+            parts.append(str(value.value))
+        else:
+            parts.append("?")
+    return "".join(parts)
+
+
+def extract_sql(root=None):
+    """Collect SQL statements from Python sources under root.
+
+    Args:
+        root: Directory to scan (default tools/).
+
+    Returns:
+        list of dicts: file, line, sql, accepted.
+    """
+    root = Path(root or TOOLS_DIR)
+    found = []
+    for path in sorted(root.rglob("*.py")):
+        try:
+            source = path.read_text(encoding="utf-8")
+            tree = ast.parse(source, filename=str(path))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        lines = source.splitlines()
+        try:
+            name = str(path.relative_to(BASE_DIR))
+        except ValueError:
+            name = str(path)
+        nested = {id(v) for n in ast.walk(tree) if isinstance(n, ast.JoinedStr)
+                  for v in n.values}
+        for node in ast.walk(tree):
+            if id(node) in nested:
+                continue
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                text = node.value
+            elif isinstance(node, ast.JoinedStr):
+                text = _render(node)
+            else:
+                continue
+            match = SQL_START.match(text)
+            if not match:
+                continue
+            verb = match.group(1)
+            if verb in ("INSERT", "REPLACE") and not re.search(r"\bSELECT\b", text, re.I):
+                continue
+            near = " ".join(lines[max(0, node.lineno - 2):node.lineno])
+            found.append({
+                "file": name,
+                "line": node.lineno,
+                "sql": " ".join(text.split()),
+                "accepted": ACCEPT_MARK in near,
+            })
+    return found
+
+
+# ---------------------------------------------------------------------------
+# Planning
+# ---------------------------------------------------------------------------
+def build_scratch_db(path):
+    """Create the full schema (init_db + every migration) at path."""
+    from tools.db import init_db, migrate_erp_crm, migrate_pricing, migrate_rfx
+    with contextlib.redirect_stdout(io.StringIO()):
+        init_db.init_db(str(path))
+        for mod, fn in ((migrate_erp_crm, "run_migration"),
+                        (migrate_pricing, "run")):
+            saved = mod.DB_PATH
+            mod.DB_PATH = Path(path)
+            try:
+                getattr(mod, fn)()
+            finally:
+                mod.DB_PATH = saved
+        migrate_rfx.run(str(path))
+
+    # Tables that modules create for themselves on first use
+    conn = sqlite3.connect(str(path))
+    try:
+        for stmt in _create_statements():
+            try:
+                conn.execute(stmt)
+            except sqlite3.Error:
+                pass
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _create_statements():
+    for path in sorted(TOOLS_DIR.rglob("*.py")):
+        try:
+            tree = ast.parse(path.read_text(encoding="utf-8"))
+        except (SyntaxError, UnicodeDecodeError):
+            continue
+        for node in ast.walk(tree):
+            if (isinstance(node, ast.Constant) and isinstance(node.value, str)
+                    and re.match(r"^\s*CREATE (TABLE|INDEX) IF NOT EXISTS",
+                                 node.value, re.I)):
+                yield node.value
+
+
+class _Nulls(dict):
+    """Binds NULL to every named parameter."""
+
+    def __missing__(self, key):
+        return None
+
+
+def plan(conn, sql):
+    """EXPLAIN QUERY PLAN detail strings for sql (raises sqlite3.Error).
+
+    Parameters are bound to NULL; the plan does not depend on their values.
+    """
+    sql = "EXPLAIN QUERY PLAN " + sql
+    try:
+        rows = conn.execute(sql).fetchall()
+    except sqlite3.ProgrammingError as exc:
+        needed = BINDINGS_RE.search(str(exc))
+        if needed:
+            rows = conn.execute(sql, [None] * int(needed.group(1))).fetchall()
+        elif "named" in str(exc) or "binding parameter :" in str(exc):
+            rows = conn.execute(sql, _Nulls()).fetchall()
+        else:
+            raise
+    return [row[3] for row in rows]
+
+
+def findings_for(sql, details):
+    """Classify plan details into findings.
+
+    Args:
+        sql: The statement (used to tell filtered from listing queries).
+        details: Output of plan().
+
+    Returns:
+        list of (kind, detail) tuples.
+    """
+    found = []
+    filtered = bool(FILTERED.search(sql))
+    for detail in details:
+        if detail.startswith("USE TEMP B-TREE"):
+            found.append(("temp-btree", detail))
+        elif "AUTOMATIC" in detail:
+            found.append(("auto-index", detail))
+        elif filtered and SCAN_RE.match(detail):
+            found.append(("full-scan", detail))
+    return found
+
+
+def audit(db_path=None, root=None):
+    """Plan every statement under root and collect findings.
+
+    Args:
+        db_path: Database to plan against (default: a scratch database).
+        root: Source directory to scan (default tools/).
+
+    Returns:
+        dict with statements, skipped, accepted, and findings
+        (file, line, sql, kind, detail).
+    """
+    statements = extract_sql(root)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = db_path
+        if path is None:
+            path = Path(tmp) / "query_audit.db"
+            build_scratch_db(path)
+        conn = sqlite3.connect(str(path))
+        try:
+            result = {"statements": len(statements), "planned": 0,
+                      "skipped": 0, "accepted": 0, "findings": []}
+            for stmt in statements:
+                try:
+                    details = plan(conn, stmt["sql"])
+                except sqlite3.Error:
+                    result["skipped"] += 1
+                    continue
+                result["planned"] += 1
+                found = findings_for(stmt["sql"], details)
+                if found and stmt["accepted"]:
+                    result["accepted"] += 1
+                    continue
+                for kind, detail in found:
+                    result["findings"].append({
+                        "file": stmt["file"], "line": stmt["line"],
+                        "sql": stmt["sql"], "kind": kind, "detail": detail,
+                    })
+        finally:
+            conn.close()
+    return result
+
+
+def main():
+    sys.path.insert(0, str(BASE_DIR))
+    parser = argparse.ArgumentParser(description="GovProposal query-plan audit")
+    parser.add_argument("--db-path", default=None,
+                        help="Plan against this database instead of a scratch copy")
+    parser.add_argument("--sql", default=None, help="Plan a single statement")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    parser.add_argument("--strict", action="store_true",
+                        help="Exit 1 if there are findings")
+    args = parser.parse_args()
+
+    if args.sql:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = args.db_path or Path(tmp) / "query_audit.db"
+            if not args.db_path:
+                build_scratch_db(path)
+            conn = sqlite3.connect(str(path))
+            try:
+                details = plan(conn, args.sql)
+            finally:
+                conn.close()
+        result = {"plan": details, "findings": findings_for(args.sql, details)}
+        print(json.dumps(result, indent=2) if args.json
+              else "\n".join(details + [f"!! {k}: {d}" for k, d in result["findings"]]))
+        sys.exit(1 if args.strict and result["findings"] else 0)
+
+    result = audit(args.db_path)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for f in result["findings"]:
+            print(f"{f['file']}:{f['line']}: {f['kind']}: {f['detail']}")
+            print(f"    {f['sql'][:160]}")
+        print(f"\n{result['statements']} statements, {result['planned']} planned, "
+              f"{result['skipped']} skipped, {result['accepted']} accepted, "
+              f"{len(result['findings'])} findings")
+    sys.exit(1 if args.strict and result["findings"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+# Controlled by: GovProposal Portal
+# CUI Category: PROPIN (Proprietary Business Information)
+# Distribution: D
+# POC: GovProposal System Administrator
+"""Single-writer queue for govproposal.db.
+
+Request handlers and loggers that only need to append or update rows hand
+their statements to a per-database writer thread instead of opening their
+own write transaction. The writer drains whatever is queued into one
+BEGIN IMMEDIATE ... COMMIT, so N concurrent handlers cost one lock
+acquisition and one WAL commit instead of N competing ones.
+
+Each submitted unit (one or more statements) runs inside its own SAVEPOINT:
+a unit that fails is rolled back on its own and its error is raised in the
+submitting thread, while the rest of the batch still commits.
+
+Read-your-writes: write() blocks until the batch holding the unit has
+committed, so any read the caller issues afterwards (on any connection)
+sees the row. submit() returns a WriteTicket for callers that do not need
+to wait; shutdown() (registered at exit) drains anything still queued.
+
+Each gunicorn worker process runs its own writer; across processes the
+busy_timeout from tools.db.pool still arbitrates, but with one writer per
+process instead of one per request thread.
+
+Set GOVPROPOSAL_WRITE_QUEUE=0 to execute units inline on a pooled
+connection (CLI tools, debugging).
+
+Usage:
+    python tools/db/write_queue.py --stats [--json]
+    python tools/db/write_queue.py --stress 200 [--json]
+"""
+
+import argparse
+import atexit
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = Path(os.environ.get(
+    "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
+))
+
+QUEUE_ENABLED = os.environ.get("GOVPROPOSAL_WRITE_QUEUE", "1") != "0"
+BATCH_MAX = 256              # units per transaction
+LATENCY_WINDOW = 5000        # recent latencies kept for percentiles
+WRITE_TIMEOUT = 60.0         # seconds write() waits before giving up
+
+_queues = {}
+_queues_lock = threading.Lock()
+_queues_pid = os.getpid()
+
+
+# ---------------------------------------------------------------------------
+# Tickets
+# ---------------------------------------------------------------------------
+class WriteTicket:
+    """Completion handle for one submitted unit of statements."""
+
+    __slots__ = ("statements", "enqueued", "_done", "_result", "_error")
+
+    def __init__(self, statements):
+        self.statements = statements
+        self.enqueued = time.perf_counter()
+        self._done = threading.Event()
+        self._result = None
+        self._error = None
+
+    def _finish(self, result=None, error=None):
+        self._result = result
+        self._error = error
+        self._done.set()
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=WRITE_TIMEOUT):
+        """Block until committed.
+
+        Returns:
+            List of rowcounts, one per statement.
+
+        Raises:
+            The statement's sqlite3 error, or TimeoutError.
+        """
+        if not self._done.wait(timeout):
+            raise TimeoutError("write queue did not commit in time")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def _normalize(statements):
+    """Accept (sql, params), [(sql, params), ...] or a bare SQL string."""
+    if isinstance(statements, str):
+        return [(statements, ())]
+    if (isinstance(statements, tuple) and len(statements) == 2
+            and isinstance(statements[0], str)):
+        return [statements]
+    return [(sql, params or ()) for sql, params in statements]
+
+
+# ---------------------------------------------------------------------------
+# Writer
+# ---------------------------------------------------------------------------
+class WriteQueue:
+    """One writer thread draining batched units into a single database."""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+        self._counts = {"units": 0, "failed": 0, "batches": 0, "max_batch": 0}
+        self._thread = threading.Thread(
+            target=self._run, name=f"db-writer:{Path(self.db_path).name}",
+            daemon=True)
+        self._thread.start()
+
+    def submit(self, statements):
+        ticket = WriteTicket(_normalize(statements))
+        self._queue.put(ticket)
+        return ticket
+
+    def _drain(self):
+        """Block for the first unit, then take whatever else is queued."""
+        batch = [self._queue.get()]
+        while len(batch) < BATCH_MAX:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        from tools.db.pool import connect
+        while True:
+            batch = self._drain()
+            stop = any(t is None for t in batch)
+            batch = [t for t in batch if t is not None]
+            if batch:
+                conn = connect(self.db_path, row_factory=None)
+                try:
+                    self._commit_batch(conn, batch)
+                finally:
+                    conn.close()
+            if stop:
+                return
+
+    def _commit_batch(self, conn, batch):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for ticket in batch:
+                conn.execute("SAVEPOINT unit")
+                try:
+                    counts = []
+                    for sql, params in ticket.statements:
+                        counts.append(conn.execute(sql, params).rowcount)
+                    conn.execute("RELEASE unit")
+                    results.append((ticket, counts, None))
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO unit")
+                    conn.execute("RELEASE unit")
+                    results.append((ticket, None, exc))
+            conn.commit()
+        except Exception as exc:
+            # The batch itself failed (lock timeout, disk, ...): fail every unit
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            results = [(t, None, exc) for t in batch]
+
+        now = time.perf_counter()
+        with self._lock:
+            self._counts["batches"] += 1
+            self._counts["max_batch"] = max(self._counts["max_batch"], len(batch))
+            for ticket, _, error in results:
+                self._counts["units"] += 1
+                if error is not None:
+                    self._counts["failed"] += 1
+                self._latencies.append(now - ticket.enqueued)
+        for ticket, counts, error in results:
+            ticket._finish(counts, error)
+
+    def stats(self):
+        """Counters plus p50/p99/max write latency (enqueue to commit), in ms."""
+        with self._lock:
+            data = dict(self._counts)
+            lat = sorted(self._latencies)
+        data["pending"] = self._queue.qsize()
+        data["avg_batch"] = round(data["units"] / data["batches"], 2) if data["batches"] else 0
+        for name, q in (("p50_ms", 0.50), ("p99_ms", 0.99)):
+            data[name] = round(lat[min(len(lat) - 1, int(q * len(lat)))] * 1000, 2) if lat else 0.0
+        data["max_ms"] = round(lat[-1] * 1000, 2) if lat else 0.0
+        return data
+
+    def close(self, timeout=10.0):
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+
+def get_queue(db_path=None):
+    """Writer for db_path, started on first use (and again after a fork)."""
+    global _queues_pid
+    key = os.path.abspath(str(db_path or DB_PATH))
+    with _queues_lock:
+        if _queues_pid != os.getpid():
+            _queues.clear()
+            _queues_pid = os.getpid()
+        wq = _queues.get(key)
+        if wq is None:
+            wq = _queues[key] = WriteQueue(key)
+        return wq
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+def submit(statements, db_path=None):
+    """Queue a unit of statements without waiting for it.
+
+    Args:
+        statements: (sql, params) or a list of them, applied atomically.
+        db_path: Database path. Falls back to DB_PATH.
+
+    Returns:
+        WriteTicket; call wait() for the rowcounts.
+    """
+    if not QUEUE_ENABLED:
+        ticket = WriteTicket(_normalize(statements))
+        try:
+            ticket._finish(_write_inline(ticket.statements, db_path))
+        except Exception as exc:
+            ticket._finish(error=exc)
+        return ticket
+    return get_queue(db_path).submit(statements)
+
+
+def write(statements, db_path=None, timeout=WRITE_TIMEOUT):
+    """Apply a unit of statements and return once it is committed.
+
+    Args:
+        statements: (sql, params) or a list of them, applied atomically.
+        db_path: Database path. Falls back to DB_PATH.
+        timeout: Seconds to wait for the writer.
+
+    Returns:
+        List of rowcounts, one per statement.
+    """
+    return submit(statements, db_path).wait(timeout)
+
+
+def _write_inline(statements, db_path):
+    from tools.db.pool import connect
+    conn = connect(db_path or DB_PATH, row_factory=None)
+    try:
+        counts = [conn.execute(sql, params).rowcount for sql, params in statements]
+        conn.commit()
+        return counts
+    finally:
+        conn.close()
+
+
+def queue_stats():
+    """stats() for every writer started in this process, keyed by path."""
+    with _queues_lock:
+        queues = dict(_queues) if _queues_pid == os.getpid() else {}
+    return {path: wq.stats() for path, wq in queues.items()}
+
+
+def shutdown():
+    """Drain and stop every writer in this process."""
+    with _queues_lock:
+        queues = list(_queues.values()) if _queues_pid == os.getpid() else []
+        _queues.clear()
+    for wq in queues:
+        wq.close()
+
+
+atexit.register(shutdown)
+
+
+# ---------------------------------------------------------------------------
+# Stress test
+# ---------------------------------------------------------------------------
+def stress(concurrency=200, writes_per_thread=5, db_path=None):
+    """Hammer one table from many threads and report errors and latency.
+
+    Args:
+        concurrency: Number of concurrent writer threads.
+        writes_per_thread: write() calls per thread.
+        db_path: Database path. Falls back to DB_PATH.
+
+    Returns:
+        dict with total writes, errors, wall time and queue stats.
+    """
+    path = db_path or DB_PATH
+    write("CREATE TABLE IF NOT EXISTS write_queue_stress "
+          "(id INTEGER PRIMARY KEY, thread INTEGER, n INTEGER)", path)
+    errors = []
+    start_gate = threading.Barrier(concurrency)
+
+    def _worker(idx):
+        start_gate.wait()
+        for n in range(writes_per_thread):
+            try:
+                write(("INSERT INTO write_queue_stress (thread, n) VALUES (?, ?)",
+                       (idx, n)), path)
+            except Exception as exc:
+                errors.append(str(exc))
+
+    threads = [threading.Thread(target=_worker, args=(i,)) for i in range(concurrency)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    write("DROP TABLE write_queue_stress", path)
+    return {
+        "writes": concurrency * writes_per_thread,
+        "errors": len(errors),
+        "elapsed_sec": round(elapsed, 3),
+        "writes_per_sec": round(concurrency * writes_per_thread / elapsed, 1),
+        "queue": get_queue(path).stats() if QUEUE_ENABLED else {},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GovProposal single-writer queue")
+    parser.add_argument("--stats", action="store_true", help="Show writer stats")
+    parser.add_argument("--stress", type=int, metavar="THREADS",
+                        help="Run a concurrent write stress test")
+    parser.add_argument("--db-path", default=None)
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    if args.stress:
+        result = stress(args.stress, db_path=args.db_path)
+    elif args.stats:
+        result = queue_stats()
+    else:
+        parser.print_help()
+        return
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for k, v in result.items():
+            print(f"{k:>16}: {v}")
+
+
+if __name__ == "__main__":
+    main()
@@ -45,7 +45,6 @@ Usage:
 import json
 import os
 import re
-import sqlite3
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -84,11 +83,8 @@ def _uid(prefix="CTR"):
 
 
 def _get_db(db_path=None):
-    path = db_path or str(DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _parse_xrefs(xref_text):
@@ -29,10 +29,8 @@ DB_PATH = Path(os.environ.get(
 
 
 def _db():
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -19,6 +19,7 @@ Usage:
     python tools/knowledge/kb_search.py --embed-all --json
 """
 
+import importlib
 import json
 import math
 import os
@@ -41,17 +42,20 @@ try:
 except ImportError:
     HAS_BM25 = False
 
-try:
-    import numpy as np
-    HAS_NUMPY = True
-except ImportError:
-    HAS_NUMPY = False
+# numpy and openai are imported on first use: keyword search needs neither,
+# and importing openai costs more than the rest of this module.
+_OPTIONAL = {}
+
+
+def _optional(name):
+    """Import an optional dependency on first use; None if not installed."""
+    if name not in _OPTIONAL:
+        try:
+            _OPTIONAL[name] = importlib.import_module(name)
+        except ImportError:
+            _OPTIONAL[name] = None
+    return _OPTIONAL[name]
 
-try:
-    import openai
-    HAS_OPENAI = True
-except ImportError:
-    HAS_OPENAI = False
 
 # Search weights
 BM25_WEIGHT = 0.7
@@ -80,12 +84,8 @@ def _get_db(db_path=None):
     Returns:
         sqlite3.Connection with row_factory set to sqlite3.Row.
     """
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _audit(conn, event_type, action, entity_type=None, entity_id=None, details=None):
@@ -99,9 +99,9 @@ def _audit(conn, event_type, action, entity_type=None, entity_id=None, details=N
         entity_id: ID of the affected entity.
         details: Optional JSON-serializable details dict.
     """
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, "
-        "entity_id, details, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (
             event_type,
             "kb_search",
@@ -178,7 +178,8 @@ def _cosine_similarity(vec_a, vec_b):
     Returns:
         float between -1.0 and 1.0.
     """
-    if HAS_NUMPY:
+    np = _optional("numpy")
+    if np is not None:
         a = np.array(vec_a, dtype=np.float32)
         b = np.array(vec_b, dtype=np.float32)
         dot = np.dot(a, b)
@@ -208,7 +209,8 @@ def _get_embedding(text):
     Returns:
         list of floats (embedding vector), or None if unavailable.
     """
-    if not HAS_OPENAI:
+    openai = _optional("openai")
+    if openai is None:
         return None
 
     api_key = os.environ.get("OPENAI_API_KEY")
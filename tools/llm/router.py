@@ -249,7 +249,9 @@ class LLMRouter:
                 continue
             model_id = model_cfg.get("model_id", "")
             try:
-                response = provider.invoke(request, model_id, model_cfg)
+                from tools.dashboard.profiler import span
+                with span("llm", f"{function}:{model_name}"):
+                    response = provider.invoke(request, model_id, model_cfg)
                 return response
             except Exception as exc:
                 logger.warning(
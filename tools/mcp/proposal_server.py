@@ -28,7 +28,6 @@ Usage:
 
 import json
 import os
-import sqlite3
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
@@ -90,9 +89,8 @@ def _now():
 
 
 def _get_db():
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    from tools.db.pool import connect
+    return connect(DB_PATH)
 
 
 # =========================================================================
@@ -45,7 +45,6 @@ import hashlib
 import json
 import os
 import re
-import sqlite3
 import sys
 from datetime import datetime, timezone
 from pathlib import Path
@@ -113,12 +112,8 @@ DEFAULT_PENALTY_KEYWORDS = [
 
 def _get_db(db_path=None):
     """Return a sqlite3 connection with WAL mode and foreign keys enabled."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.row_factory = sqlite3.Row
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -135,9 +130,9 @@ def _score_id():
 def _audit(conn, event_type, action, entity_type=None, entity_id=None,
            details=None, actor="opportunity_scorer"):
     """Write an append-only audit trail entry."""
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, "
-        "entity_id, details, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, actor, action, entity_type, entity_id,
          json.dumps(details) if isinstance(details, dict) else details,
          _now()),
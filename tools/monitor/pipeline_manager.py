@@ -24,7 +24,6 @@ Usage:
 import argparse
 import json
 import os
-import sqlite3
 import sys
 import uuid
 from datetime import datetime, timezone, timedelta
@@ -63,9 +62,8 @@ def _now():
 
 
 def _get_db():
-    conn = sqlite3.connect(str(DB_PATH))
-    conn.row_factory = sqlite3.Row
-    return conn
+    from tools.db.pool import connect
+    return connect(DB_PATH)
 
 
 def pipeline_status():
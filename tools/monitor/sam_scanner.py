@@ -10,6 +10,11 @@ Discovers new government contract opportunities, stores them in the
 opportunities table with deduplication by sam_notice_id, and tracks
 modifications to already-tracked opportunities.
 
+Scans are incremental. Each NAICS slice keeps a watermark and requests only
+notices posted since then. An interrupted pagination (HTTP 429, network
+error, empty budget) resumes at its saved offset. Requests are drawn from a
+persistent token bucket sized to the account's daily limit.
+
 Supports filtering by NAICS code, agency, opportunity type, and
 set-aside type. Gracefully degrades when the SAM.gov API is
 unavailable (missing API key or network error).
@@ -21,6 +26,13 @@ Usage:
     # Scan specific NAICS and agency
     python tools/monitor/sam_scanner.py --scan --naics 541512 --agency "Department of Defense"
 
+    # Ignore the poll interval for slices harvested recently
+    python tools/monitor/sam_scanner.py --scan --force --json
+
+    # Show per-NAICS checkpoints and the remaining request budget
+    python tools/monitor/sam_scanner.py --harvest-state --json
+    python tools/monitor/sam_scanner.py --reset-budget --daily-limit 1000
+
     # Scan for modifications to tracked opportunities
     python tools/monitor/sam_scanner.py --scan-mods --json
 
@@ -44,7 +56,6 @@ import argparse
 import hashlib
 import json
 import os
-import sqlite3
 import sys
 import time
 from datetime import datetime, timedelta, timezone
@@ -102,12 +113,8 @@ SAM_TYPE_MAP = {
 
 def _get_db(db_path=None):
     """Return a sqlite3 connection with WAL mode and foreign keys enabled."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.row_factory = sqlite3.Row
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -130,9 +137,9 @@ def _score_id():
 def _audit(conn, event_type, action, entity_type=None, entity_id=None,
            details=None, actor="sam_scanner"):
     """Write an append-only audit trail entry."""
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, "
-        "entity_id, details, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, actor, action, entity_type, entity_id,
          json.dumps(details) if isinstance(details, dict) else details,
          _now()),
@@ -263,29 +270,450 @@ def _parse_sam_response(data):
     return results
 
 
+# ---------------------------------------------------------------------------
+# Incremental harvest
+# ---------------------------------------------------------------------------
+# Each query slice (NAICS code x agency filter x notice types) keeps a
+# checkpoint in sam_harvest_state. The checkpoint records the posted date
+# the slice is complete through (the watermark). While a window is being
+# paged, it also records that window and the next offset. A run asks only
+# for postedFrom=watermark..today. The watermark day is fetched again
+# because SAM.gov dates have no time part.
+#
+# A run cut short resumes at the saved offset of the same window. That
+# covers a 429, a network error, an empty budget or MAX_PAGES_PER_SLICE.
+# Each page's inserts and its checkpoint commit in one transaction.
+#
+# Every request is paid for from the api_budget token bucket. The bucket
+# refills at the account's daily limit and is shared across runs and
+# processes. A 429 empties it until Retry-After (or the next refill).
+
+API_NAME = "sam.gov"
+DEFAULT_DAILY_LIMIT = 10     # individual accounts; system accounts get 1,000+
+MAX_PAGES_PER_SLICE = 10     # per run; the rest of the window resumes next run
+
+RATE_LIMIT_MESSAGE = (
+    "SAM.gov rate limit reached (HTTP 429). "
+    "Individual (non-federal) accounts are limited to 10 requests/day. "
+    "Request a System Account at https://sam.gov for 1,000+/day. "
+    "The harvest resumes where it stopped on the next run."
+)
+
+_harvest_ready = set()       # db paths whose harvest tables are verified
+
+
+def _ensure_harvest_tables(conn):
+    """Create the harvest tables on databases initialized before them."""
+    key = (getattr(conn, "_pool_key", None)
+           or conn.execute("PRAGMA database_list").fetchone()[2])
+    if key in _harvest_ready:
+        return
+    from tools.db.init_db import SAM_HARVEST_SQL
+    conn.executescript(SAM_HARVEST_SQL)
+    _harvest_ready.add(key)
+
+
+def _sam_date(iso_date):
+    """YYYY-MM-DD -> MM/DD/YYYY (the SAM.gov postedFrom/postedTo format)."""
+    return datetime.strptime(iso_date, "%Y-%m-%d").strftime("%m/%d/%Y")
+
+
+def _take_token(conn, daily_limit):
+    """Spend one request from the persistent token bucket.
+
+    Args:
+        conn: Open connection, not inside a transaction.
+        daily_limit: Bucket capacity; it refills at this many per day.
+
+    Returns:
+        True if a request may be made now.
+    """
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute(
+            "SELECT tokens, refilled_at, blocked_until FROM api_budget "
+            "WHERE api = ?", (API_NAME,)).fetchone()
+        if row is None:
+            tokens, blocked_until = float(daily_limit), 0.0
+        else:
+            elapsed = max(0.0, now - row["refilled_at"])
+            tokens = min(float(daily_limit),
+                         row["tokens"] + elapsed * daily_limit / 86400.0)
+            blocked_until = row["blocked_until"]
+        allowed = now >= blocked_until and tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        conn.execute(
+            "INSERT OR REPLACE INTO api_budget "
+            "(api, tokens, capacity, refilled_at, blocked_until) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (API_NAME, tokens, float(daily_limit), now, blocked_until))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return allowed
+
+
+def _drain_budget(conn, retry_after=None):
+    """Empty the bucket after a 429; honour Retry-After (seconds) if sent."""
+    now = time.time()
+    blocked_until = now + retry_after if retry_after else 0.0
+    conn.execute(
+        "UPDATE api_budget SET tokens = 0, refilled_at = ?, "
+        "blocked_until = MAX(blocked_until, ?) WHERE api = ?",
+        (now, blocked_until, API_NAME))
+    conn.commit()
+
+
+def reset_budget(daily_limit=None, db_path=None):
+    """Refill the request budget (e.g. after moving to a system account).
+
+    Args:
+        daily_limit: New capacity (default: config or DEFAULT_DAILY_LIMIT).
+        db_path: Override database path.
+
+    Returns:
+        dict from budget_status().
+    """
+    if daily_limit is None:
+        daily_limit = _load_config().get("sam_gov", {}).get(
+            "daily_request_limit", DEFAULT_DAILY_LIMIT)
+    conn = _get_db(db_path)
+    try:
+        _ensure_harvest_tables(conn)
+        conn.execute(
+            "INSERT OR REPLACE INTO api_budget "
+            "(api, tokens, capacity, refilled_at, blocked_until) "
+            "VALUES (?, ?, ?, ?, 0)",
+            (API_NAME, float(daily_limit), float(daily_limit), time.time()))
+        conn.commit()
+    finally:
+        conn.close()
+    return budget_status(db_path)
+
+
+def budget_status(db_path=None):
+    """Current request budget and every slice checkpoint.
+
+    Returns:
+        dict with budget (tokens, capacity, blocked_until) and slices.
+    """
+    conn = _get_db(db_path)
+    try:
+        _ensure_harvest_tables(conn)
+        row = conn.execute(
+            "SELECT tokens, capacity, refilled_at, blocked_until "
+            "FROM api_budget WHERE api = ?", (API_NAME,)).fetchone()
+        budget = None
+        if row:
+            elapsed = max(0.0, time.time() - row["refilled_at"])
+            budget = {
+                "tokens": round(min(row["capacity"], row["tokens"]
+                                    + elapsed * row["capacity"] / 86400.0), 2),
+                "capacity": row["capacity"],
+                "blocked_until": (datetime.fromtimestamp(
+                    row["blocked_until"], timezone.utc).strftime(
+                        "%Y-%m-%dT%H:%M:%SZ")
+                    if row["blocked_until"] > time.time() else None),
+            }
+        slices = conn.execute(
+            "SELECT * FROM sam_harvest_state ORDER BY slice_key").fetchall()
+        return {"budget": budget, "slices": [dict(s) for s in slices]}
+    finally:
+        conn.close()
+
+
+def _store_page(conn, opps):
+    """Insert the page's unseen notices; returns (new, duplicates).
+
+    One lookup per page finds notices already tracked. The caller commits.
+    """
+    ids = list({o["sam_notice_id"] for o in opps if o.get("sam_notice_id")})
+    known = set()
+    if ids:
+        known = {r[0] for r in conn.execute(
+            "SELECT sam_notice_id FROM opportunities WHERE sam_notice_id IN "
+            f"({', '.join('?' for _ in ids)})", ids)}
+    new_count = dup_count = 0
+    for opp in opps:
+        notice_id = opp.get("sam_notice_id")
+        if not notice_id:
+            continue
+        if notice_id in known:
+            dup_count += 1
+            continue
+        known.add(notice_id)
+
+        opp_id = _opp_id()
+        now = _now()
+        conn.execute(
+            """INSERT INTO opportunities (
+                id, sam_notice_id, title, solicitation_number, agency,
+                sub_agency, office, naics_code, set_aside_type,
+                contract_type, classification_code, description,
+                response_deadline, posted_date, archive_date,
+                place_of_performance, contact_name, contact_email,
+                contact_phone, opportunity_type, source_url, full_text,
+                attachments, estimated_value_low, status,
+                discovered_at, updated_at
+            ) VALUES (
+                ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                ?, ?, ?, ?, ?, 'discovered', ?, ?
+            )""",
+            (
+                opp_id, notice_id, opp["title"],
+                opp["solicitation_number"], opp["agency"],
+                opp["sub_agency"], opp["office"], opp["naics_code"],
+                opp["set_aside_type"], opp["contract_type"],
+                opp["classification_code"], opp["description"],
+                opp["response_deadline"], opp["posted_date"],
+                opp["archive_date"], opp["place_of_performance"],
+                opp["contact_name"], opp["contact_email"],
+                opp["contact_phone"], opp["opportunity_type"],
+                opp["source_url"], opp["full_text"],
+                opp["attachments"], opp["estimated_value_low"],
+                now, now,
+            ),
+        )
+        new_count += 1
+
+        _audit(
+            conn, "opportunity.discovered", f"Discovered: {opp['title']}",
+            "opportunity", opp_id,
+            {"sam_notice_id": notice_id, "agency": opp["agency"],
+             "naics": opp["naics_code"]},
+        )
+    return new_count, dup_count
+
+
+def _is_fresh(state, now_dt, fresh_secs):
+    """True if the slice completed through today less than fresh_secs ago."""
+    completed = state.get("completed_at")
+    if not completed or state.get("watermark") != now_dt.strftime("%Y-%m-%d"):
+        return False
+    done_dt = datetime.strptime(completed, "%Y-%m-%dT%H:%M:%SZ").replace(
+        tzinfo=timezone.utc)
+    return (now_dt - done_dt).total_seconds() < fresh_secs
+
+
+def _save_state(conn, key, ncode, state):
+    conn.execute(
+        """INSERT OR REPLACE INTO sam_harvest_state (
+            slice_key, naics_code, watermark, covered_from, last_posted,
+            window_from, window_to, next_offset, total_records,
+            completed_at, last_error, updated_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+        (key, ncode, state.get("watermark"), state.get("covered_from"),
+         state.get("last_posted"), state.get("window_from"),
+         state.get("window_to"), state.get("next_offset"),
+         state.get("total_records"), state.get("completed_at"),
+         state.get("last_error"), _now()),
+    )
+
+
+def harvest(naics=None, agency=None, days_back=7, db_path=None,
+            force=False, api_base=None, page_size=None, daily_limit=None):
+    """Fetch new SAM.gov notices incrementally, one checkpointed slice per NAICS.
+
+    Args:
+        naics: Comma-separated NAICS codes or list. If None, uses config
+               defaults (or one unfiltered slice).
+        agency: Agency name filter (client-side; part of the slice key).
+        days_back: How far back a slice with no history starts.
+        db_path: Override database path.
+        force: Query slices harvested within poll_interval_minutes too.
+        api_base: Override the configured API base URL.
+        page_size: Override max_results_per_page.
+        daily_limit: Override the configured daily request limit.
+
+    Returns:
+        dict with keys: status, new_count, duplicate_count, total_scanned,
+        total_available, requests_made, budget_exhausted, slices, errors.
+    """
+    sam_cfg = _load_config().get("sam_gov", {})
+    api_base = api_base or os.environ.get("SAM_GOV_API_BASE") or sam_cfg.get(
+        "api_base", "https://api.sam.gov/opportunities/v2")
+    api_key = os.environ.get("SAM_GOV_API_KEY", "")
+    limit = page_size or sam_cfg.get("max_results_per_page", 100)
+    daily_limit = daily_limit or sam_cfg.get(
+        "daily_request_limit", DEFAULT_DAILY_LIMIT)
+    fresh_secs = 60 * sam_cfg.get("poll_interval_minutes", 30)
+
+    if naics:
+        naics_list = (naics if isinstance(naics, list)
+                      else [n.strip() for n in naics.split(",") if n.strip()])
+    else:
+        naics_list = sam_cfg.get("default_naics") or [None]
+    ptype = ",".join(sam_cfg.get("opportunity_types", ["o", "p", "k", "r", "i"]))
+
+    today_dt = datetime.now(timezone.utc)
+    today = today_dt.strftime("%Y-%m-%d")
+    start = (today_dt - timedelta(days=days_back)).strftime("%Y-%m-%d")
+
+    result = {"new_count": 0, "duplicate_count": 0, "total_scanned": 0,
+              "total_available": None, "requests_made": 0,
+              "budget_exhausted": False, "slices": [], "errors": []}
+    conn = _get_db(db_path)
+    try:
+        _ensure_harvest_tables(conn)
+        conn.commit()
+        rows = {r["slice_key"]: dict(r) for r in conn.execute(
+            "SELECT * FROM sam_harvest_state").fetchall()}
+        keys = [(f"{n or '*'}|{agency or '*'}|{ptype}", n) for n in naics_list]
+        # Oldest watermark first, so a short budget rotates across slices
+        keys.sort(key=lambda k: (rows.get(k[0], {}).get("watermark") or "",
+                                 k[0]))
+
+        stop = False
+        for key, ncode in keys:
+            state = rows.get(key, {})
+            summary = {"slice": key, "naics": ncode, "requests": 0,
+                       "new": 0, "duplicates": 0, "complete": False}
+            result["slices"].append(summary)
+            if stop:
+                continue
+
+            if state.get("next_offset") is not None:
+                window = (state["window_from"], state["window_to"])
+                offset = state["next_offset"]
+            else:
+                if not force and _is_fresh(state, today_dt, fresh_secs):
+                    summary["complete"] = True
+                    summary["skipped"] = "fresh"
+                    continue
+                window_from = start
+                covered = state.get("covered_from")
+                if state.get("watermark") and covered and covered <= start:
+                    window_from = max(start, state["watermark"])
+                window = (window_from, today)
+                offset = 0
+            summary["window"] = list(window)
+
+            params = {
+                "api_key": api_key,
+                "postedFrom": _sam_date(window[0]),
+                "postedTo": _sam_date(window[1]),
+                "ptype": ptype,
+                "limit": limit,
+            }
+            if ncode is not None:
+                params["ncode"] = str(ncode)
+
+            for _ in range(MAX_PAGES_PER_SLICE):
+                if not _take_token(conn, daily_limit):
+                    result["budget_exhausted"] = True
+                    stop = True
+                    break
+                params["offset"] = offset
+                result["requests_made"] += 1
+                summary["requests"] += 1
+                error = None
+                try:
+                    resp = requests.get(
+                        f"{api_base}/search",
+                        params=params,
+                        timeout=30,
+                        headers={"Accept": "application/json"},
+                    )
+                    if resp.status_code == 429:
+                        retry = resp.headers.get("Retry-After", "")
+                        _drain_budget(conn, int(retry) if retry.isdigit() else None)
+                        error = RATE_LIMIT_MESSAGE
+                        stop = True
+                    else:
+                        resp.raise_for_status()
+                        data = resp.json()
+                except requests.exceptions.ConnectionError as exc:
+                    error = f"Connection error: {exc}"
+                except requests.exceptions.Timeout:
+                    error = "API request timed out after 30s"
+                except requests.exceptions.HTTPError as exc:
+                    error = f"HTTP error {resp.status_code}: {exc}"
+                except ValueError as exc:
+                    error = f"Invalid JSON response: {exc}"
+
+                if error:
+                    if api_key:
+                        error = error.replace(api_key, "***")
+                    result["errors"].append(error)
+                    state.update(window_from=window[0], window_to=window[1],
+                                 next_offset=offset, last_error=error)
+                    _save_state(conn, key, ncode, state)
+                    conn.commit()
+                    break
+
+                parsed = _parse_sam_response(data)
+                total = data.get("totalRecords", len(parsed))
+                if offset == 0:
+                    result["total_available"] = (
+                        (result["total_available"] or 0) + total)
+                if agency:
+                    agency_lower = agency.lower()
+                    matched = [r for r in parsed
+                               if agency_lower in (r.get("agency") or "").lower()]
+                else:
+                    matched = parsed
+                new, dups = _store_page(conn, matched)
+                summary["new"] += new
+                summary["duplicates"] += dups
+                result["total_scanned"] += len(matched)
+
+                offset += len(parsed)
+                posted = [(r.get("posted_date") or "")[:10] for r in parsed]
+                state["last_posted"] = max(posted + [state.get("last_posted") or ""]) or None
+                state.update(total_records=total, last_error=None)
+                if len(parsed) < limit or offset >= total:
+                    covered = state.get("covered_from")
+                    state.update(
+                        watermark=window[1],
+                        covered_from=min(covered, window[0]) if covered else window[0],
+                        window_from=None, window_to=None, next_offset=None,
+                        completed_at=_now())
+                    summary["complete"] = True
+                else:
+                    state.update(window_from=window[0], window_to=window[1],
+                                 next_offset=offset)
+                _save_state(conn, key, ncode, state)
+                conn.commit()
+                if summary["complete"]:
+                    break
+            summary["next_offset"] = state.get("next_offset")
+            result["new_count"] += summary["new"]
+            result["duplicate_count"] += summary["duplicates"]
+    finally:
+        conn.close()
+
+    incomplete = any(not s["complete"] for s in result["slices"])
+    result["status"] = "partial" if result["errors"] or incomplete else "success"
+    return result
+
+
 # ---------------------------------------------------------------------------
 # Core functions
 # ---------------------------------------------------------------------------
 
-def scan_opportunities(naics=None, agency=None, days_back=7, db_path=None):
+def scan_opportunities(naics=None, agency=None, days_back=7, db_path=None,
+                       force=False):
     """Query SAM.gov Opportunities API v2 for new opportunities.
 
+    Runs an incremental harvest(): each NAICS slice asks only for notices
+    posted since its watermark and resumes an interrupted pagination.
+
     Args:
         naics: Comma-separated NAICS codes or list. If None, uses config
                defaults.
-        agency: Agency name filter. If None, uses config defaults.
-        days_back: Number of days to look back for posted opportunities.
+        agency: Agency name filter.
+        days_back: Number of days to look back when a slice has no history.
         db_path: Override database path.
+        force: Also query slices harvested within the poll interval.
 
     Returns:
         dict with keys: status, new_count, duplicate_count, total_scanned,
-        errors, scan_time.
+        total_available, requests_made, slices, errors, scan_time.
     """
-    config = _load_config()
-    sam_cfg = config.get("sam_gov", {})
-    api_base = sam_cfg.get("api_base", "https://api.sam.gov/opportunities/v2")
     api_key = os.environ.get("SAM_GOV_API_KEY", "")
-    max_per_page = sam_cfg.get("max_results_per_page", 100)
 
     # ---- Validate prerequisites ----
     if requests is None:
@@ -309,219 +737,41 @@ def scan_opportunities(naics=None, agency=None, days_back=7, db_path=None):
             "total_scanned": 0,
         }
 
-    # ---- Build query parameters ----
-    posted_from = (
-        datetime.now(timezone.utc) - timedelta(days=days_back)
-    ).strftime("%m/%d/%Y")
-    posted_to = datetime.now(timezone.utc).strftime("%m/%d/%Y")
-
-    params = {
-        "api_key": api_key,
-        "postedFrom": posted_from,
-        "postedTo": posted_to,
-        "limit": max_per_page,
-        "offset": 0,
-    }
-
-    # NAICS filter — SAM.gov ncode param only accepts one code at a time.
-    # Build a list of codes; we'll iterate over them making one call each.
-    naics_list = None
-    if naics:
-        naics_list = (naics if isinstance(naics, list)
-                      else [n.strip() for n in naics.split(",")])
-    elif sam_cfg.get("default_naics"):
-        naics_list = sam_cfg["default_naics"]
-
-    # Opportunity type filter
-    opp_types = sam_cfg.get("opportunity_types", ["o", "p", "k", "r", "i"])
-    if opp_types:
-        params["ptype"] = ",".join(opp_types)
-
-    # Agency filter (description-based for API v2)
-    target_agency = agency  # may be None
-
-    # ---- Build list of (naics_code_or_None) slices to query ----
-    # If no NAICS specified run one unfiltered call; otherwise one call per code.
-    naics_slices = naics_list if naics_list else [None]
-
-    # ---- Execute API calls (one per NAICS code) with pagination ----
-    all_raw = []
-    seen_notice_ids = set()   # dedup across NAICS slices
-    total_available = None
-    errors = []
-    max_pages = 10  # Safety limit per NAICS slice
+    result = harvest(naics=naics, agency=agency, days_back=days_back,
+                     db_path=db_path, force=force)
+    if result["budget_exhausted"] and not result["errors"]:
+        result["errors"].append(
+            "SAM.gov request budget exhausted for today; "
+            "the harvest resumes where it stopped on the next run.")
 
-    for ncode in naics_slices:
-        slice_params = dict(params)
-        if ncode is not None:
-            slice_params["ncode"] = str(ncode)
-        else:
-            slice_params.pop("ncode", None)
-
-        # Small pause between NAICS slice calls to respect rate limits
-        if ncode != naics_slices[0]:
-            time.sleep(0.5)
-
-        page = 0
-        slice_hit_limit = False
-        while page < max_pages:
-            slice_params["offset"] = page * max_per_page
-            try:
-                resp = requests.get(
-                    f"{api_base}/search",
-                    params=slice_params,
-                    timeout=30,
-                    headers={"Accept": "application/json"},
-                )
-                if resp.status_code == 429:
-                    errors.append(
-                        "SAM.gov rate limit reached (HTTP 429). "
-                        "Individual (non-federal) accounts are limited to "
-                        "10 requests/day. Request a System Account at "
-                        "https://sam.gov for 1,000+/day. "
-                        "Try again tomorrow or reduce the number of NAICS codes."
-                    )
-                    slice_hit_limit = True
-                    break
-                resp.raise_for_status()
-                data = resp.json()
-            except requests.exceptions.ConnectionError as exc:
-                errors.append(f"Connection error: {exc}")
-                break
-            except requests.exceptions.Timeout:
-                errors.append("API request timed out after 30s")
-                break
-            except requests.exceptions.HTTPError as exc:
-                errors.append(f"HTTP error {resp.status_code}: {exc}")
-                break
-            except (ValueError, json.JSONDecodeError) as exc:
-                errors.append(f"Invalid JSON response: {exc}")
-                break
-        if slice_hit_limit:
-            break
-
-            parsed = _parse_sam_response(data)
-
-            # Cross-slice deduplication by notice ID
-            for item in parsed:
-                nid = item.get("sam_notice_id")
-                if nid and nid not in seen_notice_ids:
-                    seen_notice_ids.add(nid)
-                    all_raw.append(item)
-                elif not nid:
-                    all_raw.append(item)
-
-            # Accumulate total from first page of first slice
-            if total_available is None:
-                total_available = data.get("totalRecords", len(parsed))
-
-            if len(parsed) < max_per_page:
-                break
-            page += 1
-
-    # ---- Apply agency filter client-side (API v2 doesn't have exact match)
-    if target_agency:
-        agency_lower = target_agency.lower()
-        all_raw = [
-            r for r in all_raw
-            if agency_lower in (r.get("agency") or "").lower()
-        ]
-
-    # ---- Deduplicate and insert into DB ----
+    # Record scan in audit trail
     conn = _get_db(db_path)
-    new_count = 0
-    dup_count = 0
-
     try:
-        for opp in all_raw:
-            notice_id = opp.get("sam_notice_id")
-            if not notice_id:
-                continue
-
-            # Check for existing entry
-            existing = conn.execute(
-                "SELECT id FROM opportunities WHERE sam_notice_id = ?",
-                (notice_id,),
-            ).fetchone()
-
-            if existing:
-                dup_count += 1
-                continue
-
-            opp_id = _opp_id()
-            now = _now()
-            conn.execute(
-                """INSERT INTO opportunities (
-                    id, sam_notice_id, title, solicitation_number, agency,
-                    sub_agency, office, naics_code, set_aside_type,
-                    contract_type, classification_code, description,
-                    response_deadline, posted_date, archive_date,
-                    place_of_performance, contact_name, contact_email,
-                    contact_phone, opportunity_type, source_url, full_text,
-                    attachments, estimated_value_low, status,
-                    discovered_at, updated_at
-                ) VALUES (
-                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
-                    ?, ?, ?, ?, ?, 'discovered', ?, ?
-                )""",
-                (
-                    opp_id, notice_id, opp["title"],
-                    opp["solicitation_number"], opp["agency"],
-                    opp["sub_agency"], opp["office"], opp["naics_code"],
-                    opp["set_aside_type"], opp["contract_type"],
-                    opp["classification_code"], opp["description"],
-                    opp["response_deadline"], opp["posted_date"],
-                    opp["archive_date"], opp["place_of_performance"],
-                    opp["contact_name"], opp["contact_email"],
-                    opp["contact_phone"], opp["opportunity_type"],
-                    opp["source_url"], opp["full_text"],
-                    opp["attachments"], opp["estimated_value_low"],
-                    now, now,
-                ),
-            )
-            new_count += 1
-
-            _audit(
-                conn, "opportunity.discovered", f"Discovered: {opp['title']}",
-                "opportunity", opp_id,
-                {"sam_notice_id": notice_id, "agency": opp["agency"],
-                 "naics": opp["naics_code"]},
-            )
-
-        conn.commit()
-
-        # Record scan in audit trail
         _audit(
             conn, "scan.completed", "SAM.gov scan completed",
             details={
                 "days_back": days_back,
                 "naics_filter": naics,
                 "agency_filter": agency,
-                "new": new_count,
-                "duplicates": dup_count,
-                "total": len(all_raw),
-                "errors": errors,
+                "new": result["new_count"],
+                "duplicates": result["duplicate_count"],
+                "total": result["total_scanned"],
+                "requests": result["requests_made"],
+                "errors": result["errors"],
             },
         )
         conn.commit()
-
     finally:
         conn.close()
 
-    return {
-        "status": "success" if not errors else "partial",
-        "new_count": new_count,
-        "duplicate_count": dup_count,
-        "total_scanned": len(all_raw),
-        "total_available": total_available,
-        "errors": errors if errors else None,
-        "scan_time": _now(),
-        "filters": {
-            "naics": naics,
-            "agency": agency,
-            "days_back": days_back,
-        },
+    result["errors"] = result["errors"] or None
+    result["scan_time"] = _now()
+    result["filters"] = {
+        "naics": naics,
+        "agency": agency,
+        "days_back": days_back,
     }
+    return result
 
 
 def scan_modifications(days_back=3, db_path=None):
@@ -848,6 +1098,14 @@ def main():
         "--scan-mods", action="store_true",
         help="Scan for modifications to tracked opportunities",
     )
+    group.add_argument(
+        "--harvest-state", action="store_true",
+        help="Show harvest checkpoints and the request budget",
+    )
+    group.add_argument(
+        "--reset-budget", action="store_true",
+        help="Refill the SAM.gov request budget",
+    )
     group.add_argument(
         "--history", action="store_true",
         help="View scan history from audit trail",
@@ -867,6 +1125,14 @@ def main():
         "--days-back", type=int, default=7,
         help="Days to look back (default: 7)",
     )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Harvest slices even if scanned within the poll interval",
+    )
+    parser.add_argument(
+        "--daily-limit", type=int,
+        help="Request budget capacity for --reset-budget",
+    )
     parser.add_argument("--status", help="Filter by status")
     parser.add_argument(
         "--limit", type=int, default=50,
@@ -887,6 +1153,7 @@ def main():
             agency=args.agency,
             days_back=args.days_back,
             db_path=args.db_path,
+            force=args.force,
         )
         if args.json:
             print(json.dumps(result, indent=2))
@@ -897,6 +1164,8 @@ def main():
             print(f"  New:         {result['new_count']}")
             print(f"  Duplicates:  {result['duplicate_count']}")
             print(f"  Scanned:     {result['total_scanned']}")
+            if "requests_made" in result:
+                print(f"  Requests:    {result['requests_made']}")
             if result.get("total_available"):
                 print(f"  Available:   {result['total_available']}")
             if result.get("scan_time"):
@@ -925,6 +1194,30 @@ def main():
                 for e in result["errors"]:
                     print(f"    - {e}")
 
+    # -------------------------------------------------------------------
+    elif args.harvest_state or args.reset_budget:
+        if args.reset_budget:
+            state = reset_budget(args.daily_limit, db_path=args.db_path)
+        else:
+            state = budget_status(db_path=args.db_path)
+        if args.json:
+            print(json.dumps(state, indent=2))
+        else:
+            budget = state["budget"]
+            print("SAM.gov Harvest State")
+            print("=" * 40)
+            if budget:
+                print(f"  Budget:      {budget['tokens']:.2f} / "
+                      f"{budget['capacity']:.0f} requests")
+                if budget["blocked_until"]:
+                    print(f"  Blocked:     until {budget['blocked_until']}")
+            for sl in state["slices"]:
+                resume = (f", resume at offset {sl['next_offset']} of "
+                          f"{sl['window_from']}..{sl['window_to']}"
+                          if sl["next_offset"] is not None else "")
+                print(f"  {sl['slice_key']:<32} through "
+                      f"{sl['watermark'] or '-'}{resume}")
+
     # -------------------------------------------------------------------
     elif args.history:
         history = get_scan_history(
@@ -85,12 +85,8 @@ def _get_db(db_path=None):
     Returns:
         sqlite3.Connection with row_factory set to sqlite3.Row.
     """
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _audit(conn, event_type, action, entity_type=None, entity_id=None,
@@ -105,9 +101,9 @@ def _audit(conn, event_type, action, entity_type=None, entity_id=None,
         entity_id: ID of the affected entity.
         details: Optional JSON-serializable details dict.
     """
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, "
-        "entity_id, details, created_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (
             event_type,
             "submission_packager",
@@ -261,17 +257,26 @@ def package_proposal(proposal_id, output_dir, db_path=None):
             warnings.append("No White team review found. QC not verified.")
 
         # --- Step 3: CAG pre-export check ---
-        cag_status = proposal.get("cag_status") or "pending"
+        from tools.cag.aggregation_monitor import check_before_export
+        cag_gate = check_before_export(proposal_id, db_path=db_path)
+        cag_status = cag_gate["cag_status"]
+        if not cag_gate["export_allowed"]:
+            blocking = (cag_gate["blocking_alerts_new"]
+                        + cag_gate["blocking_alerts_existing"])
+            issues.append(
+                f"CAG pre-export check failed: {blocking} blocking "
+                f"alert(s). Cannot export."
+            )
+        elif cag_status == "blocked" or cag_status == "quarantined":
+            issues.append(
+                f"CAG status is '{cag_status}'. Cannot export."
+            )
         open_alerts = conn.execute(
             "SELECT COUNT(*) as cnt FROM cag_alerts "
             "WHERE proposal_id = ? AND status IN ('open', 'quarantined')",
             (proposal_id,),
         ).fetchone()
         open_alert_count = open_alerts["cnt"] if open_alerts else 0
-        if cag_status == "blocked" or cag_status == "quarantined":
-            issues.append(
-                f"CAG status is '{cag_status}'. Cannot export."
-            )
         if open_alert_count > 0:
             issues.append(
                 f"{open_alert_count} open CAG alert(s). Resolve before export."
@@ -383,7 +388,7 @@ def package_proposal(proposal_id, output_dir, db_path=None):
                 acr_lines.append(
                     f"  {a['acronym']:12s} {a['expansion']}"
                 )
-            acr_lines.append("", classification)
+            acr_lines.extend(["", classification])
             acr_path.write_text("\n".join(acr_lines), encoding="utf-8")
             files_written.append({
                 "filename": acr_filename,
@@ -409,7 +414,10 @@ def package_proposal(proposal_id, output_dir, db_path=None):
             chk_lines.append(f"  {status_mark} {item['item']}")
             if not item["passed"] and item.get("note"):
                 chk_lines.append(f"       NOTE: {item['note']}")
-        chk_lines.append("", classification)
+        chk_lines.append("")
+        chk_lines.append(f"  CAG fingerprint: {cag_gate['fingerprint']}")
+        chk_lines.append(f"  CAG rules version: {cag_gate['rules_version']}")
+        chk_lines.extend(["", classification])
         chk_path.write_text("\n".join(chk_lines), encoding="utf-8")
         files_written.append({
             "filename": chk_filename,
@@ -440,6 +448,13 @@ def package_proposal(proposal_id, output_dir, db_path=None):
             "toc": toc_entries,
             "acronym_count": len(acronyms_found.get("acronyms", [])),
             "cross_ref_issues": len(broken_refs),
+            "cag_gate": {
+                "export_allowed": cag_gate["export_allowed"],
+                "fingerprint": cag_gate["fingerprint"],
+                "rules_version": cag_gate["rules_version"],
+                "cache_hit": cag_gate["cache_hit"],
+                "checked_at": cag_gate["checked_at"],
+            },
             "packaged_at": now,
         }
 
@@ -448,7 +463,8 @@ def package_proposal(proposal_id, output_dir, db_path=None):
                "proposal", proposal_id,
                {"compliance_status": compliance_status,
                 "files": len(files_written),
-                "issues": len(issues)})
+                "issues": len(issues),
+                "cag_fingerprint": cag_gate["fingerprint"]})
         conn.commit()
         return result
     finally:
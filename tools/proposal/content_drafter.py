@@ -21,10 +21,10 @@ Usage:
 """
 
 import argparse
+import importlib
 import json
 import os
 import re
-import sqlite3
 import sys
 import uuid
 from datetime import datetime, timezone
@@ -43,10 +43,19 @@ try:
 except ImportError:  # pragma: no cover
     yaml = None
 
-try:
-    import openai as openai_mod  # type: ignore
-except ImportError:  # pragma: no cover
-    openai_mod = None
+# openai is imported on first LLM call; template drafting never needs it.
+_OPTIONAL = {}
+
+
+def _optional(name):
+    """Import an optional dependency on first use; None if not installed."""
+    if name not in _OPTIONAL:
+        try:
+            _OPTIONAL[name] = importlib.import_module(name)
+        except ImportError:  # pragma: no cover
+            _OPTIONAL[name] = None
+    return _OPTIONAL[name]
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -54,12 +63,8 @@ except ImportError:  # pragma: no cover
 
 def _get_db(db_path=None):
     """Return an SQLite connection with WAL + FK enabled."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.row_factory = sqlite3.Row
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -74,9 +79,9 @@ def _uid():
 
 def _audit(conn, event_type, action, entity_type=None, entity_id=None, details=None):
     """Append-only audit trail entry."""
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, entity_id, details, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, "content_drafter", action, entity_type, entity_id, details, _now()),
     )
 
@@ -244,10 +249,8 @@ def _get_section_requirements(conn, proposal_id, section_id=None, section_number
 
 def _llm_available():
     """Check if an LLM provider is configured and available."""
-    if openai_mod is None:
-        return False
     api_key = os.environ.get("OPENAI_API_KEY") or os.environ.get("GOVPROPOSAL_LLM_KEY")
-    return bool(api_key)
+    return bool(api_key) and _optional("openai") is not None
 
 
 def _call_llm(system_prompt, user_prompt, max_tokens=2000):
@@ -263,16 +266,18 @@ def _call_llm(system_prompt, user_prompt, max_tokens=2000):
         client_kwargs = {"api_key": api_key}
         if base_url:
             client_kwargs["base_url"] = base_url
-        client = openai_mod.OpenAI(**client_kwargs)
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            max_tokens=max_tokens,
-            temperature=0.4,
-        )
+        client = _optional("openai").OpenAI(**client_kwargs)
+        from tools.dashboard.profiler import span
+        with span("llm", f"content_drafter:{model}"):
+            response = client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt},
+                ],
+                max_tokens=max_tokens,
+                temperature=0.4,
+            )
         return response.choices[0].message.content
     except Exception as e:
         # Log but don't crash — fall back to template
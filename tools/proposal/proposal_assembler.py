@@ -55,19 +55,15 @@ def _asm_id():
 
 def _get_db(db_path=None):
     """Return an SQLite connection with WAL + FK enabled."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.row_factory = sqlite3.Row
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _audit(conn, event_type, action, entity_type=None, entity_id=None, details=None):
     """Append-only audit trail entry."""
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, entity_id, details, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, "proposal_assembler", action, entity_type, entity_id, details, _now()),
     )
 
@@ -7,7 +7,7 @@
 """Parse solicitation documents to extract Section L (Instructions) and Section M
 (Evaluation Criteria), plus deep "shredding" of all requirement-bearing sections.
 
-Supports plain-text, PDF (via pypdf), and Word (via python-docx) input formats.
+Supports plain-text, PDF (via pypdf), and Word (.docx, streamed XML) input formats.
 Extracts structured requirements, page limits, format rules, evaluation factors,
 and relative importance weightings.  Results are stored in the proposals table
 (section_l_parsed, section_m_parsed) and feed into the compliance-matrix generator.
@@ -35,7 +35,6 @@ import argparse
 import json
 import os
 import re
-import sqlite3
 import sys
 import uuid
 from datetime import datetime, timezone
@@ -46,6 +45,10 @@ DB_PATH = Path(os.environ.get(
     "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
 ))
 
+# Shredding runs section extractors in parallel above this document size
+SHRED_PARALLEL_MIN_CHARS = 200_000
+SHRED_WORKERS = min(5, os.cpu_count() or 1)
+
 # ---------------------------------------------------------------------------
 # Optional imports — degrade gracefully
 # ---------------------------------------------------------------------------
@@ -59,23 +62,14 @@ try:
 except ImportError:  # pragma: no cover
     PdfReader = None
 
-try:
-    import docx as python_docx  # type: ignore
-except ImportError:  # pragma: no cover
-    python_docx = None
-
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
 def _get_db(db_path=None):
     """Return an SQLite connection with WAL + FK enabled."""
-    path = str(db_path or DB_PATH)
-    conn = sqlite3.connect(path)
-    conn.execute("PRAGMA journal_mode=WAL")
-    conn.execute("PRAGMA foreign_keys=ON")
-    conn.row_factory = sqlite3.Row
-    return conn
+    from tools.db.pool import connect
+    return connect(db_path or DB_PATH, foreign_keys=True)
 
 
 def _now():
@@ -90,9 +84,9 @@ def _uid():
 
 def _audit(conn, event_type, action, entity_type=None, entity_id=None, details=None):
     """Append-only audit trail entry."""
-    conn.execute(
-        "INSERT INTO audit_trail (event_type, actor, action, entity_type, entity_id, details, created_at) "
-        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+    from tools.audit.audit_sink import record_event
+    record_event(
+        conn,
         (event_type, "section_parser", action, entity_type, entity_id, details, _now()),
     )
 
@@ -115,12 +109,13 @@ def _read_pdf(file_path):
 
 
 def _read_docx(file_path):
-    """Extract text from Word document using python-docx."""
-    if python_docx is None:
-        raise ImportError("python-docx is required for Word parsing. Install with: pip install python-docx")
-    doc = python_docx.Document(str(file_path))
-    paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-    return "\n".join(paragraphs)
+    """Extract text from a Word document, tables included.
+
+    Streams word/document.xml (see document_processor.iter_docx_blocks)
+    rather than loading the python-docx object model.
+    """
+    from tools.rfx.document_processor import iter_docx_blocks
+    return "\n".join(iter_docx_blocks(Path(file_path)))
 
 
 def _read_file(file_path):
@@ -250,9 +245,14 @@ def _find_section(text, start_patterns, stop_patterns):
     return text[start_pos:stop_pos].strip()
 
 
-def parse_text(text):
+def parse_text(text, sections=None):
     """Parse raw text for Section L and Section M content.
 
+    Args:
+        text: Solicitation text.
+        sections: Optional offsets from sectionize(text), so callers that
+                  already scanned the document do not locate L/M again.
+
     Returns:
         dict with keys:
             sections_l: list of extracted L instructions
@@ -270,17 +270,21 @@ def parse_text(text):
             "raw_section_m": "",
         }
 
-    # --- Extract Section L block ---
-    raw_l = _find_section(text, _SECTION_L_PATTERNS, _SECTION_M_PATTERNS)
-    # If Section L not found, try the whole document (some RFPs inline instructions)
+    if sections is not None:
+        raw_l = _section_text(text, sections, "L")
+        raw_m = _section_text(text, sections, "M")
+    else:
+        # --- Extract Section L block ---
+        raw_l = _find_section(text, _SECTION_L_PATTERNS, _SECTION_M_PATTERNS)
+
+        # --- Extract Section M block ---
+        # Section M typically appears after L; stop patterns = next lettered section or EOF
+        _section_n_patterns = [
+            re.compile(r"(?i)\bSECTION\s+[N-Z][\.\s:\-—]+", re.MULTILINE),
+        ]
+        raw_m = _find_section(text, _SECTION_M_PATTERNS, _section_n_patterns)
+    # If Section L/M not found, try the whole document (some RFPs inline instructions)
     search_text_l = raw_l if raw_l else text
-
-    # --- Extract Section M block ---
-    # Section M typically appears after L; stop patterns = next lettered section or EOF
-    _section_n_patterns = [
-        re.compile(r"(?i)\bSECTION\s+[N-Z][\.\s:\-—]+", re.MULTILINE),
-    ]
-    raw_m = _find_section(text, _SECTION_M_PATTERNS, _section_n_patterns)
     search_text_m = raw_m if raw_m else text
 
     # --- Parse Section L instructions ---
@@ -504,6 +508,86 @@ _SECTION_J_PATTERNS = [
     re.compile(r"(?i)\bLIST\s+OF\s+ATTACHMENTS\b", re.MULTILINE),
 ]
 
+# Stop rule per section: the first "SECTION X" heading with X in this range
+# (Section L instead stops at the first Section M start pattern)
+_SECTION_STOP_LETTERS = {
+    "C": "DEFGHIJKLMNOPQRSTUVWXYZ",
+    "F": "GHIJKLMNOPQRSTUVWXYZ",
+    "H": "IJKLMNOPQRSTUVWXYZ",
+    "J": "KLMNOPQRSTUVWXYZ",
+    "M": "NOPQRSTUVWXYZ",
+}
+
+
+def _build_section_scan():
+    """One alternation over every lettered heading and section start cue."""
+    alts = [r"(?P<heading>\bSECTION\s+(?P<letter>[A-Z])[\.\s:\-—]+)"]
+    for letter, pats in (("C", _SECTION_C_PATTERNS), ("F", _SECTION_F_PATTERNS),
+                         ("H", _SECTION_H_PATTERNS), ("J", _SECTION_J_PATTERNS),
+                         ("L", _SECTION_L_PATTERNS), ("M", _SECTION_M_PATTERNS)):
+        body = "|".join(p.pattern.replace("(?i)", "") for p in pats)
+        alts.append(f"(?P<s_{letter}>{body})")
+    return re.compile("|".join(alts), re.IGNORECASE | re.MULTILINE)
+
+
+_SECTION_SCAN = _build_section_scan()
+
+
+def sectionize(text):
+    """Locate Sections C, F, H, J, L and M in a single scan of the text.
+
+    Applies the same start/stop rules as _find_section (earliest start
+    cue; stop at the next later lettered heading, or for Section L at the
+    first Section M cue), but from one pass instead of one full-text
+    search per pattern per section.
+
+    Returns:
+        dict mapping letter -> (start, stop) character offsets, for the
+        sections that were found.
+    """
+    import bisect
+
+    hits = {}        # letter -> ascending match offsets (start cues + headings)
+    headings = []    # (offset, letter) for every "SECTION X" heading
+    for m in _SECTION_SCAN.finditer(text):
+        if m.lastgroup == "heading":
+            letter = m.group("letter").upper()
+            headings.append((m.start(), letter))
+        else:
+            letter = m.lastgroup[2:]
+        hits.setdefault(letter, []).append(m.start())
+
+    heading_pos = [pos for pos, _ in headings]
+    sections = {}
+    for letter in ("C", "F", "H", "J", "L", "M"):
+        if letter not in hits:
+            continue
+        start = hits[letter][0]
+        stop = len(text)
+        if letter == "L":
+            later = hits.get("M", [])
+            i = bisect.bisect_left(later, start + 10)
+            if i < len(later):
+                stop = later[i]
+        else:
+            stop_letters = _SECTION_STOP_LETTERS[letter]
+            i = bisect.bisect_left(heading_pos, start + 10)
+            for pos, hl in headings[i:]:
+                if hl in stop_letters:
+                    stop = pos
+                    break
+        sections[letter] = (start, stop)
+    return sections
+
+
+def _section_text(text, sections, letter):
+    """Slice one section out of text using sectionize() offsets."""
+    if letter not in sections:
+        return ""
+    start, stop = sections[letter]
+    return text[start:stop].strip()
+
+
 # Cross-reference detection patterns
 _XREF_PATTERNS = [
     re.compile(r"(?i)(?:see|refer\s+to|per|in\s+accordance\s+with|IAW|ref(?:erence)?)\s+Section\s+([A-Z](?:\.\d+)*)", re.MULTILINE),
@@ -748,6 +832,28 @@ def _extract_attachment_requirements(text):
     return requirements
 
 
+def _run_extractors(text, sections, tasks):
+    """Run the L/M parse and the per-section extractors.
+
+    Large documents fan the work out across a process pool (the extractors
+    are pure-Python regex and would serialize on the GIL in threads);
+    small ones run inline, where pool start-up would dominate.
+
+    Returns:
+        (parsed L/M dict, list of requirement lists in task order)
+    """
+    if len(text) < SHRED_PARALLEL_MIN_CHARS or not tasks:
+        parsed = parse_text(text, sections)
+        return parsed, [fn(raw) for fn, raw in tasks]
+
+    from concurrent.futures import ProcessPoolExecutor
+    workers = min(len(tasks) + 1, SHRED_WORKERS)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        parsed_future = pool.submit(parse_text, text, sections)
+        futures = [pool.submit(fn, raw) for fn, raw in tasks]
+        return parsed_future.result(), [f.result() for f in futures]
+
+
 def shred_solicitation(file_path, proposal_id=None, db_path=None):
     """Deep-extract ALL requirements from a solicitation document.
 
@@ -763,6 +869,10 @@ def shred_solicitation(file_path, proposal_id=None, db_path=None):
     Each requirement includes obligation level, source section, and
     cross-references to other documents/sections.
 
+    All section boundaries are found in one scan (sectionize); the section
+    extractors then run concurrently on large documents and the results
+    are stored with a single batched insert.
+
     Args:
         file_path: Path to solicitation document (PDF, DOCX, TXT).
         proposal_id: If provided, store shredded requirements in DB.
@@ -774,40 +884,20 @@ def shred_solicitation(file_path, proposal_id=None, db_path=None):
     text = _read_file(file_path)
     all_requirements = []
 
-    # --- Extract Section C / SOW ---
-    _stop_after_c = [
-        re.compile(r"(?i)\bSECTION\s+[D-Z][\.\s:\-—]+", re.MULTILINE),
-    ]
-    raw_c = _find_section(text, _SECTION_C_PATTERNS, _stop_after_c)
-    sow_reqs = _extract_sow_requirements(raw_c) if raw_c else []
-    all_requirements.extend(sow_reqs)
-
-    # --- Extract Section F (Deliverables) ---
-    _stop_after_f = [
-        re.compile(r"(?i)\bSECTION\s+[G-Z][\.\s:\-—]+", re.MULTILINE),
+    # --- Locate every section in one scan, then extract per section ---
+    sections = sectionize(text)
+    tasks = [
+        (_extract_sow_requirements, _section_text(text, sections, "C")),
+        (_extract_deliverables, _section_text(text, sections, "F")),
+        (_extract_special_requirements, _section_text(text, sections, "H")),
+        (_extract_attachment_requirements, _section_text(text, sections, "J")),
     ]
-    raw_f = _find_section(text, _SECTION_F_PATTERNS, _stop_after_f)
-    deliverable_reqs = _extract_deliverables(raw_f) if raw_f else []
-    all_requirements.extend(deliverable_reqs)
+    tasks = [(fn, raw) for fn, raw in tasks if raw]
+    parsed, per_section = _run_extractors(text, sections, tasks)
+    for reqs in per_section:
+        all_requirements.extend(reqs)
 
-    # --- Extract Section H (Special Requirements) ---
-    _stop_after_h = [
-        re.compile(r"(?i)\bSECTION\s+[I-Z][\.\s:\-—]+", re.MULTILINE),
-    ]
-    raw_h = _find_section(text, _SECTION_H_PATTERNS, _stop_after_h)
-    special_reqs = _extract_special_requirements(raw_h) if raw_h else []
-    all_requirements.extend(special_reqs)
-
-    # --- Extract Section J (Attachments) ---
-    _stop_after_j = [
-        re.compile(r"(?i)\bSECTION\s+[K-Z][\.\s:\-—]+", re.MULTILINE),
-    ]
-    raw_j = _find_section(text, _SECTION_J_PATTERNS, _stop_after_j)
-    attachment_reqs = _extract_attachment_requirements(raw_j) if raw_j else []
-    all_requirements.extend(attachment_reqs)
-
-    # --- Extract Section L (Instructions) — reuse existing parser ---
-    parsed = parse_text(text)
+    # --- Section L (Instructions) — from the existing L/M parser ---
     for item in parsed.get("sections_l", []):
         inst_text = item.get("instruction_text", "")
         all_requirements.append({
@@ -915,14 +1005,15 @@ def shred_solicitation(file_path, proposal_id=None, db_path=None):
                     ON shredded_requirements(compliance_status)
             """)
 
-            # Insert requirements
-            for req in deduped:
-                conn.execute(
-                    "INSERT INTO shredded_requirements "
-                    "(id, proposal_id, requirement_id, requirement_text, "
-                    "obligation_level, source_section, cross_references, "
-                    "compliance_status, created_at) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, 'not_addressed', ?)",
+            # Insert requirements in one batch
+            now = _now()
+            conn.executemany(
+                "INSERT INTO shredded_requirements "
+                "(id, proposal_id, requirement_id, requirement_text, "
+                "obligation_level, source_section, cross_references, "
+                "compliance_status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 'not_addressed', ?)",
+                [
                     (
                         _uid(),
                         proposal_id,
@@ -931,9 +1022,11 @@ def shred_solicitation(file_path, proposal_id=None, db_path=None):
                         req["obligation_level"],
                         req["source_section"],
                         json.dumps(req["cross_references"]) if req.get("cross_references") else None,
-                        _now(),
-                    ),
-                )
+                        now,
+                    )
+                    for req in deduped
+                ],
+            )
 
             # Also run standard L/M parse and store
             conn.execute(
@@ -1082,12 +1175,6 @@ def generate_compliance_matrix(sections_l, sections_m, proposal_id, db_path=None
             req_id = item.get("id", _uid()[:6])
             req_text = item.get("instruction_text", "")
             volume = item.get("volume")
-            conn.execute(
-                "INSERT INTO compliance_matrices "
-                "(id, proposal_id, requirement_id, requirement_text, source, volume, compliance_status, created_at) "
-                "VALUES (?, ?, ?, ?, 'section_l', ?, 'not_addressed', ?)",
-                (entry_id, proposal_id, req_id, req_text, volume, _now()),
-            )
             entries.append({
                 "id": entry_id,
                 "proposal_id": proposal_id,
@@ -1109,12 +1196,6 @@ def generate_compliance_matrix(sections_l, sections_m, proposal_id, db_path=None
             if subfactors:
                 sf_text = "; ".join(sf.get("text", "") for sf in subfactors)
                 req_text = f"{factor} [Subfactors: {sf_text}]"
-            conn.execute(
-                "INSERT INTO compliance_matrices "
-                "(id, proposal_id, requirement_id, requirement_text, source, compliance_status, created_at) "
-                "VALUES (?, ?, ?, ?, 'section_m', 'not_addressed', ?)",
-                (entry_id, proposal_id, req_id, req_text, _now()),
-            )
             entries.append({
                 "id": entry_id,
                 "proposal_id": proposal_id,
@@ -1124,6 +1205,19 @@ def generate_compliance_matrix(sections_l, sections_m, proposal_id, db_path=None
                 "compliance_status": "not_addressed",
             })
 
+        # Insert all entries in one batch
+        now = _now()
+        conn.executemany(
+            "INSERT INTO compliance_matrices "
+            "(id, proposal_id, requirement_id, requirement_text, source, volume, compliance_status, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, 'not_addressed', ?)",
+            [
+                (e["id"], proposal_id, e["requirement_id"], e["requirement_text"],
+                 e["source"], e.get("volume"), now)
+                for e in entries
+            ],
+        )
+
         _audit(conn, "compliance.matrix_generated",
                f"Generated compliance matrix with {len(entries)} entries",
                "proposal", proposal_id,
@@ -1233,6 +1327,8 @@ def main():
         conn = _get_db()
         try:
             entries = []
+            rows = []
+            now = _now()
             for req in reqs:
                 entry_id = _uid()
                 # Map source_section to compliance_matrix source
@@ -1245,20 +1341,22 @@ def main():
                     "section_m": "section_m",
                 }
                 source = source_map.get(req.get("source_section"), "other")
-                conn.execute(
-                    "INSERT INTO compliance_matrices "
-                    "(id, proposal_id, requirement_id, requirement_text, source, "
-                    "compliance_status, created_at) "
-                    "VALUES (?, ?, ?, ?, ?, 'not_addressed', ?)",
-                    (entry_id, args.proposal_id, req.get("requirement_id", _uid()[:6]),
-                     req["requirement_text"], source, _now()),
-                )
+                rows.append((entry_id, args.proposal_id,
+                             req.get("requirement_id", _uid()[:6]),
+                             req["requirement_text"], source, now))
                 entries.append({
                     "id": entry_id,
                     "requirement_id": req.get("requirement_id"),
                     "source": source,
                     "requirement_text": req["requirement_text"][:100],
                 })
+            conn.executemany(
+                "INSERT INTO compliance_matrices "
+                "(id, proposal_id, requirement_id, requirement_text, source, "
+                "compliance_status, created_at) "
+                "VALUES (?, ?, ?, ?, ?, 'not_addressed', ?)",
+                rows,
+            )
             _audit(conn, "compliance.matrix_from_shredded",
                    f"Generated matrix from {len(entries)} shredded requirements",
                    "proposal", args.proposal_id,
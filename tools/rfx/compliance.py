@@ -11,7 +11,6 @@ Satisfies:
 """
 
 import os
-import sqlite3
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
@@ -39,10 +38,8 @@ CONTROL_MAP = {
 
 
 def _conn():
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    c.execute("PRAGMA journal_mode=WAL")
-    return c
+    from tools.db.pool import connect
+    return connect(DB_PATH)
 
 
 def log_audit_event(
@@ -2,9 +2,22 @@
 # CUI // SP-PROPIN
 """Document processor: upload, extract text, chunk, store in SQLite.
 
-Supports PDF (via pypdf), DOCX (via python-docx), and plain text.
-Files are stored in data/rfx_uploads/. Text is chunked at ~500 words
-with 50-word overlap for RAG retrieval.
+Supports PDF (via pypdf), DOCX (streamed straight from word/document.xml,
+tables included), and plain text.
+Files are stored content-addressed under data/rfx_uploads/ab/cdef...
+(SHA-256), hashed once and deduplicated before anything is copied.
+Text is segmented at detected headings (Section L/M, SOW, lettered and
+numbered headings) and paragraphs are packed into ~512-token chunks with
+overlap, so chunks do not straddle sections; each chunk records its
+section label and heading.
+
+PDFs are streamed page by page: large files are sharded into page ranges
+extracted across a process pool, pages are yielded in order, and the
+chunker consumes them directly, so only a few pages are held at a time.
+DOCX files stream the same way, one block at a time. The full text for
+rfx_documents.content is spooled to disk and copied into the row in
+blocks. PDF chunks carry the real page span (page_start/page_end) in
+metadata.
 
 No external services required — all processing is local Python.
 """
@@ -13,11 +26,17 @@ import hashlib
 import json
 import os
 import re
-import sqlite3
+import shutil
+import tempfile
 import uuid
+import xml.etree.ElementTree as ET
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterable, Iterator, Optional
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = Path(os.environ.get(
@@ -26,33 +45,145 @@ DB_PATH = Path(os.environ.get(
 UPLOAD_DIR = BASE_DIR / "data" / "rfx_uploads"
 UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
-CHUNK_WORDS = 500
-CHUNK_OVERLAP = 50
+CHUNK_TOKENS = 512
+CHUNK_OVERLAP_TOKENS = 64
+CHUNK_INSERT_BATCH = 200
+
+# PDFs at or above this many pages are extracted across a process pool
+PDF_PARALLEL_MIN_PAGES = 48
+PDF_SHARD_PAGES = 8
+PDF_WORKERS = int(os.environ.get("RFX_PDF_WORKERS", "0")) or min(4, os.cpu_count() or 1)
 
 
 # ── text extraction ────────────────────────────────────────────────────────────
 
+def _extract_pdf_range(path: str, start: int, stop: int) -> list[tuple[int, str]]:
+    """Extract pages [start, stop) of a PDF. Runs inside pool workers."""
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    return [(i + 1, reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+def iter_pdf_pages(path: Path, workers: int = PDF_WORKERS,
+                   shard_pages: int = PDF_SHARD_PAGES) -> Iterator[tuple[int, str]]:
+    """Yield (page_no, text) for each PDF page, in order, 1-based.
+
+    Small PDFs are read serially. Large ones are split into shards of
+    ``shard_pages`` pages; at most ``workers + 1`` shards are in flight,
+    which bounds memory regardless of document length.
+    """
+    from pypdf import PdfReader
+    reader = PdfReader(str(path))
+    total = len(reader.pages)
+
+    if workers <= 1 or total < PDF_PARALLEL_MIN_PAGES:
+        for i, page in enumerate(reader.pages):
+            yield i + 1, page.extract_text() or ""
+        return
+    del reader
+
+    shards = iter(range(0, total, shard_pages))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start in shards:
+            pending.append(pool.submit(
+                _extract_pdf_range, str(path), start, min(start + shard_pages, total)))
+            if len(pending) > workers:
+                break
+        while pending:
+            yield from pending.popleft().result()
+            start = next(shards, None)
+            if start is not None:
+                pending.append(pool.submit(
+                    _extract_pdf_range, str(path), start, min(start + shard_pages, total)))
+
+
+def _iter_pdf_pages_safe(path: Path) -> Iterator[tuple[Optional[int], str]]:
+    """iter_pdf_pages, turning a failure into a trailing error marker."""
+    try:
+        yield from iter_pdf_pages(path)
+    except Exception as e:
+        yield None, f"[PDF extraction error: {e}]"
+
+
 def _extract_pdf(path: Path) -> tuple[str, int]:
     """Extract text from PDF. Returns (text, page_count)."""
     try:
-        from pypdf import PdfReader
-        reader = PdfReader(str(path))
-        pages = []
-        for page in reader.pages:
-            t = page.extract_text() or ""
-            pages.append(t)
+        pages = [t for _, t in iter_pdf_pages(path)]
         return "\n\n".join(pages), len(pages)
     except Exception as e:
         return f"[PDF extraction error: {e}]", 0
 
 
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_BREAKS = {_W + "tab": "\t", _W + "br": "\n", _W + "cr": "\n"}
+
+
+def _docx_paragraph_text(p) -> str:
+    # w:delText (tracked deletions) and w:instrText (field codes) are skipped
+    parts = []
+    for el in p.iter():
+        if el.tag == _W + "t":
+            parts.append(el.text or "")
+        elif el.tag in _DOCX_BREAKS:
+            parts.append(_DOCX_BREAKS[el.tag])
+    return "".join(parts)
+
+
+def iter_docx_blocks(path: Path) -> Iterator[str]:
+    """Stream the body of a DOCX as text blocks in document order.
+
+    Parses word/document.xml with iterparse straight from the zip, so the
+    document model is never built. Each non-empty paragraph is one block;
+    each table is one block with a line per row and cells joined by " | "
+    (nested tables are flattened into their cell). Processed elements are
+    cleared as we go, keeping memory flat on very large files.
+    """
+    with zipfile.ZipFile(path) as zf, zf.open("word/document.xml") as xml:
+        body = None
+        tables: list[dict] = []     # open tables, innermost last
+        for event, el in ET.iterparse(xml, events=("start", "end")):
+            tag = el.tag
+            if event == "start":
+                if tag == _W + "body":
+                    body = el
+                elif tag == _W + "tbl":
+                    tables.append({"rows": [], "row": [], "cell": []})
+                continue
+
+            if tag == _W + "p":
+                text = _docx_paragraph_text(el)
+                el.clear()
+                if tables:
+                    tables[-1]["cell"].append(text.strip())
+                elif text.strip():
+                    yield text
+            elif not tables:
+                pass
+            elif tag == _W + "tc":
+                t = tables[-1]
+                t["row"].append(" ".join(c for c in t["cell"] if c))
+                t["cell"] = []
+            elif tag == _W + "tr":
+                t = tables[-1]
+                if any(t["row"]):
+                    t["rows"].append(" | ".join(t["row"]))
+                t["row"] = []
+            elif tag == _W + "tbl":
+                rows = tables.pop()["rows"]
+                if tables:
+                    tables[-1]["cell"].append("; ".join(rows))
+                elif rows:
+                    yield "\n".join(rows)
+
+            if body is not None and not tables and tag in (_W + "p", _W + "tbl"):
+                body.clear()
+
+
 def _extract_docx(path: Path) -> tuple[str, int]:
-    """Extract text from DOCX. Returns (text, estimated_pages)."""
+    """Extract text from DOCX, tables included. Returns (text, estimated_pages)."""
     try:
-        from docx import Document
-        doc = Document(str(path))
-        paragraphs = [p.text for p in doc.paragraphs if p.text.strip()]
-        text = "\n\n".join(paragraphs)
+        text = "\n\n".join(iter_docx_blocks(path))
         estimated_pages = max(1, len(text) // 3000)
         return text, estimated_pages
     except Exception as e:
@@ -75,136 +206,549 @@ def extract_text(file_path: Path, mime_type: str = "") -> tuple[str, int]:
         return f"[Text extraction error: {e}]", 0
 
 
-# ── chunking ───────────────────────────────────────────────────────────────────
-
-def chunk_text(text: str, chunk_words: int = CHUNK_WORDS,
-               overlap_words: int = CHUNK_OVERLAP) -> list[dict]:
-    """Split text into overlapping word-boundary chunks.
-
-    Returns list of {"chunk_index": int, "content": str, "word_count": int}.
+# ── structure-aware chunking ───────────────────────────────────────────────────
+
+_HEADING_MAX_CHARS = 120
+_LETTERED_SECTION = re.compile(r"(?i)^SECTION\s+([A-M])\b")
+# Numbered titles; a numbered line stating a requirement is a paragraph
+_NUMBERED_HEADING = re.compile(
+    r"^(?:[A-M][.\-])?\d+(?:\.\d+)*\.?\s+"
+    r"(?!.*\b(?i:shall|must|will)\b)[A-Z][^.!?]{2,100}$")
+# Lettered UCF sections mapped to rfx_requirements.section labels
+_LETTER_LABELS = {"C": "sow", "H": "contract_terms", "L": "section_l", "M": "section_m"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token), no tokenizer needed."""
+    return (len(text) + 3) // 4
+
+
+@lru_cache(maxsize=1)
+def _heading_patterns() -> list[tuple]:
+    """(pattern, label) pairs: section_parser's section start patterns plus
+    requirement_extractor's SOW/CDRL/evaluation cues."""
+    from tools.proposal import section_parser as sp
+    from tools.rfx import requirement_extractor as rx
+    groups = [
+        (sp._SECTION_C_PATTERNS, "sow"),
+        (sp._SECTION_F_PATTERNS, "other"),
+        (sp._SECTION_H_PATTERNS, "contract_terms"),
+        (sp._SECTION_J_PATTERNS, "other"),
+        (sp._SECTION_L_PATTERNS, "section_l"),
+        (sp._SECTION_M_PATTERNS, "section_m"),
+        ([rx._SOW], "sow"),
+        ([rx._CDRL], "cdrl"),
+        ([rx._EVAL], "evaluation_criteria"),
+    ]
+    return [(p, label) for pats, label in groups for p in pats]
+
+
+def _heading_label(line: str) -> Optional[str]:
+    """Return the section label a heading line switches to.
+
+    "" means the line is a heading that keeps the current section (e.g. a
+    numbered subsection); None means it is not a heading.
     """
-    words = text.split()
-    if not words:
-        return []
-
-    chunks = []
-    idx = 0
+    if len(line) > _HEADING_MAX_CHARS:
+        return None
+    m = _LETTERED_SECTION.match(line)
+    if m:
+        return _LETTER_LABELS.get(m.group(1).upper(), "other")
+    for pat, label in _heading_patterns():
+        if pat.match(line):
+            return label
+    if _NUMBERED_HEADING.match(line) or (
+            line.isupper() and " " in line and not line.endswith(".")):
+        return ""
+    return None
+
+
+def _structure_units(pages: Iterable[tuple[Optional[int], str]],
+                     max_tokens: int, piece_tokens: int) -> Iterator[tuple]:
+    """Yield ("heading", text, page, label) and ("para", text, page, None).
+
+    Paragraphs end at blank lines, headings and page breaks, and are cut
+    at ``max_tokens`` so no unit is larger than a chunk. A single line
+    longer than that (text with no line breaks) is cut on words into
+    ``piece_tokens`` pieces so overlap still has something to carry.
+    """
+    max_chars = max_tokens * 4
+    piece_max = max(piece_tokens, 16) * 4
+    para: list[str] = []
+    para_chars = 0
+    page = None
+
+    def _flush():
+        nonlocal para_chars
+        if para:
+            text = "\n".join(para)
+            para.clear()
+            para_chars = 0
+            return ("para", text, page, None)
+        return None
+
+    for page_no, text in pages:
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line:
+                unit = _flush()
+                if unit:
+                    yield unit
+                continue
+            label = _heading_label(line)
+            if label is not None:
+                unit = _flush()
+                if unit:
+                    yield unit
+                yield ("heading", line, page_no, label)
+                continue
+            if para_chars + len(line) > max_chars:
+                unit = _flush()
+                if unit:
+                    yield unit
+            page = page_no
+            if len(line) > max_chars:
+                # One enormous line (e.g. text without newlines): cut on words
+                piece: list[str] = []
+                piece_chars = 0
+                for word in line.split():
+                    if piece_chars + len(word) > piece_max and piece:
+                        yield ("para", " ".join(piece), page_no, None)
+                        piece = []
+                        piece_chars = 0
+                    piece.append(word)
+                    piece_chars += len(word) + 1
+                if piece:
+                    para.append(" ".join(piece))
+                    para_chars = piece_chars
+                continue
+            para.append(line)
+            para_chars += len(line) + 1
+        unit = _flush()
+        if unit:
+            yield unit
+
+
+def chunk_structured(pages: Iterable[tuple[Optional[int], str]],
+                     target_tokens: int = CHUNK_TOKENS,
+                     overlap_tokens: int = CHUNK_OVERLAP_TOKENS) -> Iterator[dict]:
+    """Chunk a page stream by document structure, in one linear pass.
+
+    Headings (lettered UCF sections, Section L/M, SOW/CDRL/evaluation cues,
+    numbered and all-caps headings) close the current chunk, so chunks never
+    straddle sections. Paragraphs are packed up to ``target_tokens``; a new
+    chunk within the same section starts with the trailing paragraphs of the
+    previous one, up to ``overlap_tokens``.
+
+    Yields {"chunk_index", "content", "word_count", "token_count",
+    "page_start", "page_end", "section", "heading"}.
+    """
+    units: deque = deque()      # (text, tokens, words, page)
+    tokens = 0
+    fresh = False               # window holds paragraphs not yet emitted
+    headed = False              # window is only headings not yet emitted
+    section, heading = "other", None
     chunk_num = 0
 
-    while idx < len(words):
-        end = min(idx + chunk_words, len(words))
-        chunk_words_list = words[idx:end]
-        content = " ".join(chunk_words_list)
-        chunks.append({
+    def _emit():
+        pages_seen = [u[3] for u in units if u[3] is not None]
+        return {
             "chunk_index": chunk_num,
-            "content": content,
-            "word_count": len(chunk_words_list),
-        })
-        chunk_num += 1
-        if end >= len(words):
-            break
-        idx += chunk_words - overlap_words
-
-    return chunks
-
+            "content": "\n\n".join(u[0] for u in units),
+            "word_count": sum(u[2] for u in units),
+            "token_count": tokens,
+            "page_start": pages_seen[0] if pages_seen else None,
+            "page_end": pages_seen[-1] if pages_seen else None,
+            "section": section,
+            "heading": heading,
+        }
+
+    for kind, text, page, label in _structure_units(pages, target_tokens,
+                                                    overlap_tokens // 2):
+        if kind == "heading":
+            tok = estimate_tokens(text)
+            # Consecutive headings stack into the next chunk; they are only
+            # emitted on their own when they change section or outgrow a chunk
+            stack = (headed and not (label and label != section)
+                     and tokens + tok <= target_tokens)
+            if not stack:
+                if fresh or headed:
+                    yield _emit()
+                    chunk_num += 1
+                units.clear()
+                tokens = 0
+            fresh = False
+            headed = True
+            if label:
+                section = label
+            heading = text
+            # The heading leads the next chunk so it reads on its own
+            units.append((text, tok, len(text.split()), page))
+            tokens += tok
+            continue
+
+        tok = estimate_tokens(text)
+        if fresh and tokens + tok > target_tokens:
+            yield _emit()
+            chunk_num += 1
+            keep: deque = deque()
+            kept = 0
+            for u in reversed(units):
+                if kept + u[1] > overlap_tokens:
+                    break
+                keep.appendleft(u)
+                kept += u[1]
+            units, tokens, fresh = keep, kept, False
+        units.append((text, tok, len(text.split()), page))
+        tokens += tok
+        fresh, headed = True, False
+
+    if fresh or headed:
+        yield _emit()
+
+
+# ── hashing & storage ──────────────────────────────────────────────────────────
+
+HASH_BLOCK = 1 << 20
+
+
+def hash_stream(src: BinaryIO, out: Optional[BinaryIO] = None) -> tuple[str, int]:
+    """SHA-256 a stream in one pass, optionally teeing it to ``out``.
+
+    Lets the upload route hash while it writes the request body to disk,
+    so the file is never read back just to hash it. Returns (hex, size).
+    """
+    h = hashlib.sha256()
+    size = 0
+    for block in iter(lambda: src.read(HASH_BLOCK), b""):
+        h.update(block)
+        size += len(block)
+        if out is not None:
+            out.write(block)
+    return h.hexdigest(), size
 
-# ── hashing ────────────────────────────────────────────────────────────────────
 
 def file_hash(path: Path) -> str:
     """SHA-256 hash of file contents."""
-    h = hashlib.sha256()
     with open(path, "rb") as f:
-        for block in iter(lambda: f.read(65536), b""):
-            h.update(block)
-    return h.hexdigest()
+        return hash_stream(f)[0]
+
+
+def content_path(fhash: str, suffix: str = "") -> Path:
+    """Content-addressed location for a file: UPLOAD_DIR/ab/cdef...<suffix>."""
+    return UPLOAD_DIR / fhash[:2] / (fhash[2:] + suffix.lower())
+
+
+def _place_file(src: Path, dest: Path, move: bool) -> None:
+    """Put src at dest without reading it through Python.
+
+    move=True renames (atomic on the same filesystem). Otherwise src is
+    hard-linked, falling back to shutil.copyfile (sendfile on Linux) into
+    a temp name that is renamed into place, so dest is never partial.
+    """
+    if dest.exists():
+        # Same content already stored (e.g. a retried job); nothing to copy
+        if move:
+            src.unlink(missing_ok=True)
+        return
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if move:
+        try:
+            os.replace(src, dest)
+            return
+        except OSError:
+            pass        # cross-device: copy, then drop the source
+    else:
+        try:
+            os.link(src, dest)
+            return
+        except OSError:
+            pass
+    tmp = dest.with_name(f".{dest.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, dest)
+    finally:
+        tmp.unlink(missing_ok=True)
+    if move:
+        src.unlink(missing_ok=True)
+
+
+def find_duplicate(conn, fhash: str, exclude_id: Optional[str] = None) -> Optional[str]:
+    """Return the id of a stored document with this hash, if any."""
+    row = conn.execute(
+        "SELECT id FROM rfx_documents WHERE file_hash = ? AND id != ?",
+        (fhash, exclude_id or ""),
+    ).fetchone()
+    return row["id"] if row else None
 
 
 # ── DB helpers ─────────────────────────────────────────────────────────────────
 
 def _conn():
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    c.execute("PRAGMA journal_mode=WAL")
-    c.execute("PRAGMA foreign_keys=ON")
-    return c
+    from tools.db.pool import connect
+    return connect(DB_PATH, foreign_keys=True)
 
 
-# ── public API ─────────────────────────────────────────────────────────────────
+def _insert_chunks(conn, batch: list) -> int:
+    """Insert a batch of chunk rows and clear it. Returns rows inserted."""
+    conn.executemany("""
+        INSERT INTO rfx_document_chunks
+            (id, document_id, chunk_index, content, word_count,
+             metadata, created_at, embedding, embedding_model)
+        VALUES (?,?,?,?,?,?,?,?,?)
+    """, batch)
+    n = len(batch)
+    batch.clear()
+    return n
 
-def store_upload(
+
+def _iter_docx_pages_safe(path: Path) -> Iterator[tuple[Optional[int], str]]:
+    """iter_docx_blocks as a page stream, failures as a trailing error marker."""
+    try:
+        for block in iter_docx_blocks(path):
+            yield None, block
+    except Exception as e:
+        yield None, f"[DOCX extraction error: {e}]"
+
+
+def iter_document_pages(path: Path, mime: str = "") -> Iterator[tuple[Optional[int], str]]:
+    """Yield (page_no, text) for a stored document.
+
+    PDFs stream real pages; DOCX files stream one block (paragraph or
+    table) at a time with page_no None. Plain text is yielded whole, once,
+    with page_no None (its page count is an estimate, see extract_text).
+    """
+    suffix = path.suffix.lower()
+    if suffix == ".pdf" or "pdf" in mime:
+        yield from _iter_pdf_pages_safe(path)
+    elif suffix in (".docx", ".doc") or "word" in mime:
+        yield from _iter_docx_pages_safe(path)
+    else:
+        text, _ = extract_text(path, mime)
+        yield None, text
+
+
+def tee_pages(pages: Iterable[tuple[Optional[int], str]], spool: BinaryIO,
+              totals: dict) -> Iterator[tuple[Optional[int], str]]:
+    """Pass a page stream through, appending its text to ``spool`` as UTF-8.
+
+    Pages are separated by a blank line, as in rfx_documents.content.
+    ``totals["chars"]`` and ``totals["page_count"]`` (last real page
+    number) are kept up to date as pages go by.
+    """
+    first = True
+    for page_no, text in pages:
+        if not first:
+            spool.write(b"\n\n")
+            totals["chars"] += 2
+        first = False
+        spool.write(text.encode("utf-8"))
+        totals["chars"] += len(text)
+        if page_no:
+            totals["page_count"] = page_no
+        yield page_no, text
+
+
+def store_content(conn, doc_id: str, spool: BinaryIO) -> int:
+    """Copy the UTF-8 text in ``spool`` into rfx_documents.content (caller commits).
+
+    The column is sized once and filled through SQLite incremental blob
+    I/O in HASH_BLOCK blocks, so the text never exists as one Python
+    string. Returns the number of bytes stored.
+    """
+    size = spool.seek(0, os.SEEK_END)
+    spool.seek(0)
+    conn.execute(
+        "UPDATE rfx_documents SET content = CAST(zeroblob(?) AS TEXT) WHERE id = ?",
+        (size, doc_id))
+    if size:
+        rowid = conn.execute(
+            "SELECT rowid FROM rfx_documents WHERE id = ?", (doc_id,)).fetchone()[0]
+        with conn.blobopen("rfx_documents", "content", rowid) as blob:
+            hash_stream(spool, blob)
+    return size
+
+
+def chunk_hash(content: str) -> str:
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def prior_chunk_embeddings(conn, doc_id: str) -> dict[str, tuple[bytes, str]]:
+    """{chunk content hash: (embedding, model)} for a document's embedded chunks.
+
+    Passed to write_chunks as ``reuse`` when ingesting a new version of the
+    document, so unchanged chunks are not embedded again.
+    """
+    rows = conn.execute(
+        "SELECT content, embedding, embedding_model FROM rfx_document_chunks "
+        "WHERE document_id = ? AND embedding IS NOT NULL", (doc_id,))
+    return {chunk_hash(r["content"]): (r["embedding"], r["embedding_model"])
+            for r in rows}
+
+
+def write_chunks(conn, doc_id: str,
+                 pages: Iterable[tuple[Optional[int], str]],
+                 reuse: Optional[dict[str, tuple[bytes, str]]] = None) -> int:
+    """Chunk a page stream into rfx_document_chunks in batches (caller commits).
+
+    Uses chunk_structured; metadata records the section label, heading and
+    token count. PDF chunks record page_start/page_end; text without page
+    numbers keeps the page_approx estimate. Chunks whose text matches an
+    entry in ``reuse`` (see prior_chunk_embeddings) copy its embedding.
+    Returns the number of chunks written.
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    model = conn.execute(
+        "SELECT embedding_model FROM rfx_documents WHERE id = ?", (doc_id,)
+    ).fetchone()
+    model = model[0] if model else "all-MiniLM-L6-v2"
+    chunk_count = 0
+    batch = []
+    for c in chunk_structured(pages):
+        if c["page_start"] is None:
+            meta = {"page_approx": c["chunk_index"] // 3 + 1}
+        else:
+            meta = {"page_start": c["page_start"], "page_end": c["page_end"]}
+        meta.update(section=c["section"], heading=c["heading"],
+                    token_count=c["token_count"])
+        embedding, emb_model = (reuse or {}).get(chunk_hash(c["content"]), (None, model))
+        if emb_model != model:
+            embedding, emb_model = None, model
+        batch.append((
+            str(uuid.uuid4()), doc_id,
+            c["chunk_index"], c["content"], c["word_count"],
+            json.dumps(meta), now, embedding, emb_model,
+        ))
+        if len(batch) >= CHUNK_INSERT_BATCH:
+            chunk_count += _insert_chunks(conn, batch)
+    chunk_count += _insert_chunks(conn, batch)
+    return chunk_count
+
+
+def register_upload(
+    conn,
     src_path: Path,
+    doc_id: Optional[str] = None,
+    filename: Optional[str] = None,
     doc_type: str = "other",
     proposal_id: Optional[str] = None,
     opportunity_id: Optional[str] = None,
     uploaded_by: Optional[str] = None,
     notes: Optional[str] = None,
+    fhash: Optional[str] = None,
+    move: bool = False,
+    supersedes_id: Optional[str] = None,
 ) -> dict:
-    """Process an uploaded document and store it in rfx_documents.
+    """Store a file content-addressed and insert its rfx_documents row (caller commits).
 
-    Copies the file to UPLOAD_DIR, extracts text, chunks, and writes
-    document + chunk metadata to the DB. Embedding is deferred to
-    rag_service.vectorize_document().
+    The duplicate check runs on the hash before anything is copied; pass
+    ``fhash`` if the caller already hashed the file while receiving it.
+    ``move=True`` hands src_path over (renamed into place); otherwise it is
+    linked or copied and left alone. ``supersedes_id`` marks the file as a
+    new version (e.g. an amendment) of an earlier document.
 
-    Returns the new rfx_documents row as a dict.
+    The row starts with empty content; extraction and chunking fill it in.
+    Returns {"status": "ok"|"duplicate", "document_id", ...}.
     """
     now = datetime.now(timezone.utc).isoformat()
-    doc_id = str(uuid.uuid4())
+    doc_id = doc_id or str(uuid.uuid4())
+    filename = filename or src_path.name
+    dest_path = content_path(fhash, Path(filename).suffix) if fhash else None
+
+    if fhash and not src_path.exists() and dest_path.exists():
+        # Moved on an earlier attempt that did not commit
+        size = dest_path.stat().st_size
+    else:
+        if not fhash:
+            fhash = file_hash(src_path)
+            dest_path = content_path(fhash, Path(filename).suffix)
+        size = src_path.stat().st_size
+
+    existing = find_duplicate(conn, fhash, exclude_id=doc_id)
+    if existing:
+        if move:
+            src_path.unlink(missing_ok=True)
+        return {"status": "duplicate", "document_id": existing,
+                "message": "Document already uploaded (same SHA-256 hash)."}
+
+    if src_path.exists():
+        _place_file(src_path, dest_path, move)
+    mime = _guess_mime(Path(filename))
+
+    conn.execute("""
+        INSERT INTO rfx_documents
+            (id, proposal_id, opportunity_id, filename, doc_type,
+             file_path, file_hash, mime_type, file_size_bytes,
+             content, page_count, chunk_count,
+             uploaded_by, notes, supersedes_id, created_at, updated_at)
+        VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+    """, (
+        doc_id, proposal_id, opportunity_id,
+        filename, doc_type,
+        str(dest_path.relative_to(BASE_DIR)),
+        fhash, mime, size,
+        "", 0, 0,
+        uploaded_by, notes, supersedes_id, now, now,
+    ))
+    return {"status": "ok", "document_id": doc_id, "filename": filename,
+            "file_hash": fhash, "file_size_bytes": size,
+            "file_path": dest_path, "mime_type": mime}
 
-    # Copy file to upload dir
-    dest_filename = f"{doc_id}_{src_path.name}"
-    dest_path = UPLOAD_DIR / dest_filename
-    dest_path.write_bytes(src_path.read_bytes())
 
-    fhash = file_hash(dest_path)
-    size = dest_path.stat().st_size
-    mime = _guess_mime(dest_path)
+# ── public API ─────────────────────────────────────────────────────────────────
 
-    # Check for duplicate
+def store_upload(
+    src_path: Path,
+    doc_type: str = "other",
+    proposal_id: Optional[str] = None,
+    opportunity_id: Optional[str] = None,
+    uploaded_by: Optional[str] = None,
+    notes: Optional[str] = None,
+    supersedes_id: Optional[str] = None,
+) -> dict:
+    """Process an uploaded document and store it in rfx_documents.
+
+    Links (or copies) the file into content-addressed storage, streams
+    extracted pages through the chunker, and writes document + chunk
+    metadata to the DB in batches.
+    Embedding is deferred to rag_service.vectorize_document(); for a new
+    version (``supersedes_id``) unchanged chunks keep the prior embeddings.
+
+    This runs the whole pipeline in the caller; the dashboard uses
+    ingest_queue.enqueue_upload() instead so requests return immediately.
+
+    Returns the new rfx_documents row as a dict.
+    """
     conn = _conn()
     try:
-        existing = conn.execute(
-            "SELECT id FROM rfx_documents WHERE file_hash = ?", (fhash,)
-        ).fetchone()
-        if existing:
-            return {"status": "duplicate", "document_id": existing["id"],
-                    "message": "Document already uploaded (same SHA-256 hash)."}
-
-        # Extract text
-        text, page_count = extract_text(dest_path, mime)
-
-        # Chunk text
-        chunks = chunk_text(text)
-
-        # Insert document record
-        conn.execute("""
-            INSERT INTO rfx_documents
-                (id, proposal_id, opportunity_id, filename, doc_type,
-                 file_path, file_hash, mime_type, file_size_bytes,
-                 content, page_count, chunk_count,
-                 uploaded_by, notes, created_at, updated_at)
-            VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-        """, (
-            doc_id, proposal_id, opportunity_id,
-            src_path.name, doc_type,
-            str(dest_path.relative_to(BASE_DIR)),
-            fhash, mime, size,
-            text, page_count, len(chunks),
-            uploaded_by, notes, now, now,
-        ))
-
-        # Insert chunks (no embedding yet)
-        for c in chunks:
-            conn.execute("""
-                INSERT INTO rfx_document_chunks
-                    (id, document_id, chunk_index, content, word_count,
-                     metadata, created_at)
-                VALUES (?,?,?,?,?,?,?)
-            """, (
-                str(uuid.uuid4()), doc_id,
-                c["chunk_index"], c["content"], c["word_count"],
-                json.dumps({"page_approx": c["chunk_index"] // 3 + 1}),
-                now,
-            ))
+        reg = register_upload(
+            conn, src_path, doc_type=doc_type, proposal_id=proposal_id,
+            opportunity_id=opportunity_id, uploaded_by=uploaded_by, notes=notes,
+            supersedes_id=supersedes_id,
+        )
+        if reg["status"] == "duplicate":
+            return reg
+        doc_id = reg["document_id"]
+        is_pdf = reg["file_path"].suffix.lower() == ".pdf" or "pdf" in reg["mime_type"]
+
+        # Stream pages -> chunker -> batched inserts. Page text is spooled
+        # to disk and copied into rfx_documents.content in blocks.
+        totals = {"chars": 0, "page_count": 0}
+        with tempfile.TemporaryFile() as spool:
+            pages = tee_pages(iter_document_pages(reg["file_path"], reg["mime_type"]),
+                              spool, totals)
+            reuse = prior_chunk_embeddings(conn, supersedes_id) if supersedes_id else None
+            chunk_count = write_chunks(conn, doc_id, pages, reuse)
+            store_content(conn, doc_id, spool)
+
+        page_count = totals["page_count"]
+        if not is_pdf:
+            page_count = max(1, totals["chars"] // 3000) if totals["chars"] else 0
+        conn.execute(
+            "UPDATE rfx_documents SET page_count = ?, chunk_count = ? WHERE id = ?",
+            (page_count, chunk_count, doc_id),
+        )
 
         conn.commit()
     finally:
@@ -213,11 +757,11 @@ def store_upload(
     return {
         "status": "ok",
         "document_id": doc_id,
-        "filename": src_path.name,
-        "file_hash": fhash,
+        "filename": reg["filename"],
+        "file_hash": reg["file_hash"],
         "page_count": page_count,
-        "chunk_count": len(chunks),
-        "file_size_bytes": size,
+        "chunk_count": chunk_count,
+        "file_size_bytes": reg["file_size_bytes"],
         "vectorized": False,
     }
 
@@ -264,6 +808,8 @@ def delete_document(doc_id: str) -> bool:
         if not row:
             return False
         # ON DELETE CASCADE handles rfx_document_chunks
+        conn.execute("UPDATE rfx_documents SET supersedes_id = NULL "
+                     "WHERE supersedes_id = ?", (doc_id,))
         conn.execute("DELETE FROM rfx_documents WHERE id = ?", (doc_id,))
         conn.commit()
         # Remove file
@@ -9,11 +9,17 @@ at export time via merge-back.
 
 Placeholders follow the pattern [TYPE_N], e.g.:
   [PERSON_1], [PROGRAM_1], [LOCATION_1], [CAPABILITY_1]
+
+Active terms are compiled into one trie-shaped regex (a branch per
+case/whole-word class) and cached per process. add_term/remove_term bump
+rfx_exclusion_version; each mask call checks that stamp and rebuilds the
+masker only when it has changed.
 """
 
 import os
 import re
 import sqlite3
+import threading
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
@@ -35,10 +41,18 @@ _TYPE_PREFIXES = {
 
 
 def _conn():
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    c.execute("PRAGMA journal_mode=WAL")
-    return c
+    from tools.db.pool import connect
+    return connect(DB_PATH)
+
+
+def _bump_version(conn) -> None:
+    """Mark the exclusion list as changed (caller commits)."""
+    conn.execute("""
+        INSERT INTO rfx_exclusion_version (id, version, updated_at)
+        VALUES (1, 1, ?)
+        ON CONFLICT(id) DO UPDATE SET version = version + 1,
+                                      updated_at = excluded.updated_at
+    """, (datetime.now(timezone.utc).isoformat(),))
 
 
 # ── CRUD ──────────────────────────────────────────────────────────────────────
@@ -90,6 +104,7 @@ def add_term(sensitive_term: str, term_type: str = "custom",
             int(case_sensitive), int(whole_word),
             context_notes, created_by, now,
         ))
+        _bump_version(conn)
         conn.commit()
         return {"status": "ok", "id": entry_id,
                 "placeholder": placeholder, "term_type": term_type}
@@ -120,60 +135,152 @@ def remove_term(entry_id: str) -> bool:
     """Soft-delete an exclusion list entry."""
     conn = _conn()
     try:
-        conn.execute(
+        cur = conn.execute(
             "UPDATE rfx_exclusion_list SET is_active = 0 WHERE id = ?",
             (entry_id,)
         )
+        changed = cur.rowcount > 0
+        if changed:
+            _bump_version(conn)
         conn.commit()
-        return conn.total_changes > 0
+        return changed
     finally:
         conn.close()
 
 
-# ── masking ────────────────────────────────────────────────────────────────────
+# ── compiled masker ────────────────────────────────────────────────────────────
 
-def apply_mask(text: str) -> tuple[str, dict[str, str]]:
-    """Replace all active sensitive terms in text with placeholders.
+_PLACEHOLDER_RE = re.compile(r"\[[A-Z]+_\d+\]")
 
-    Returns (masked_text, mapping) where mapping is {placeholder: original}.
+_lock = threading.Lock()
+_masker: Optional["_Masker"] = None
+
+
+def _trie_pattern(entries: list[tuple[str, int]]) -> str:
+    """Regex matching any term in ``entries``, factored on common prefixes.
+
+    Each entry is (term, index). A shared prefix is tested once instead of
+    once per term, and the end of each term carries an empty group named
+    ``t<index>``, so Match.lastgroup names the term that matched without
+    folding the matched text back to a key.
+    """
+    trie: dict = {}
+    for term, index in entries:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node.setdefault("", index)
+
+    def _emit(node: dict) -> str:
+        branches = [re.escape(ch) + _emit(child)
+                    for ch, child in sorted(node.items()) if ch]
+        if "" in node:
+            branches.append(f"(?P<t{node['']}>)")
+        return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+
+    return _emit(trie)
+
+
+class _Masker:
+    """Compiled form of the active exclusion list at one version.
+
+    Terms are bucketed by (length, case_sensitive, whole_word); each bucket
+    is one prefix trie with its flags inline, and the buckets are
+    alternated longest first. Python's alternation takes the first branch
+    that matches, so at any position the longest term wins whatever its
+    class, as in the original longest-first loop.
     """
-    terms = list_terms(active_only=True)
-    mapping: dict[str, str] = {}
-    masked = text
 
-    # Sort by length desc to handle longer terms first (prevents partial matches)
-    terms.sort(key=lambda t: len(t["sensitive_term"]), reverse=True)
+    def __init__(self, version: Optional[int], terms: list[dict]):
+        self.version = version
+        # index -> (placeholder, original term)
+        self.terms: list[tuple[str, str]] = []
+        buckets: dict[tuple[int, bool, bool], list[tuple[str, int]]] = {}
+        for t in terms:
+            term = t["sensitive_term"]
+            if not term:
+                continue
+            key = (len(term), bool(t["case_sensitive"]), bool(t["whole_word"]))
+            buckets.setdefault(key, []).append((term, len(self.terms)))
+            self.terms.append((t["placeholder"], term))
+        branches = []
+        for (_, case_sensitive, whole_word), entries in sorted(
+                buckets.items(), key=lambda kv: -kv[0][0]):
+            body = _trie_pattern(entries)
+            if whole_word:
+                body = rf"\b{body}\b"
+            if not case_sensitive:
+                body = f"(?i:{body})"
+            branches.append(body)
+        self.regex = re.compile("|".join(branches)) if branches else None
+        self.placeholders = {}
+        for placeholder, original in self.terms:
+            self.placeholders.setdefault(placeholder, original)
+
+    def mask(self, text: str) -> tuple[str, dict[str, str]]:
+        mapping: dict[str, str] = {}
+        if self.regex is None:
+            return text, mapping
+
+        def _sub(m):
+            placeholder, original = self.terms[int(m.lastgroup[1:])]
+            mapping[placeholder] = original
+            return placeholder
+
+        return self.regex.sub(_sub, text), mapping
+
+
+def _current_version() -> Optional[int]:
+    """Current list version, or None on a DB that predates the stamp."""
+    conn = _conn()
+    try:
+        row = conn.execute(
+            "SELECT version FROM rfx_exclusion_version WHERE id = 1"
+        ).fetchone()
+        return row["version"] if row else 0
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def get_masker() -> _Masker:
+    """Return the cached masker, rebuilding it if the list version changed."""
+    global _masker
+    version = _current_version()
+    if version is None:
+        # Unmigrated DB: no way to tell when the list changes, so never cache
+        return _Masker(None, list_terms(active_only=True))
+    masker = _masker
+    if masker is not None and masker.version == version:
+        return masker
+    with _lock:
+        if _masker is None or _masker.version != version:
+            _masker = _Masker(version, list_terms(active_only=True))
+        return _masker
 
-    for entry in terms:
-        term = entry["sensitive_term"]
-        placeholder = entry["placeholder"]
-        flags = 0 if entry["case_sensitive"] else re.IGNORECASE
 
-        if entry["whole_word"]:
-            pattern = r"\b" + re.escape(term) + r"\b"
-        else:
-            pattern = re.escape(term)
+# ── masking ────────────────────────────────────────────────────────────────────
 
-        if re.search(pattern, masked, flags=flags):
-            mapping[placeholder] = term
-            masked = re.sub(pattern, placeholder, masked, flags=flags)
+def apply_mask(text: str) -> tuple[str, dict[str, str]]:
+    """Replace all active sensitive terms in text with placeholders.
 
-    return masked, mapping
+    Runs in a single pass; where terms overlap, the longest match wins.
+    Returns (masked_text, mapping) where mapping is {placeholder: original}.
+    """
+    return get_masker().mask(text)
 
 
 def merge_back(text: str, mapping: Optional[dict[str, str]] = None) -> str:
     """Restore all placeholders to their original sensitive terms.
 
-    If mapping is None, loads all active terms from the DB.
+    If mapping is None, uses all active terms (from the cached masker).
     """
     if mapping is None:
-        terms = list_terms(active_only=True)
-        mapping = {t["placeholder"]: t["sensitive_term"] for t in terms}
-
-    result = text
-    for placeholder, original in mapping.items():
-        result = result.replace(placeholder, original)
-    return result
+        mapping = get_masker().placeholders
+    if not mapping:
+        return text
+    return _PLACEHOLDER_RE.sub(lambda m: mapping.get(m.group(0), m.group(0)), text)
 
 
 def preview_mask(text: str) -> dict:
@@ -17,7 +17,6 @@ Unsloth install: pip install unsloth
 
 import json
 import os
-import sqlite3
 import subprocess
 import sys
 import uuid
@@ -37,10 +36,13 @@ TRAINING_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def _conn():
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    c.execute("PRAGMA journal_mode=WAL")
-    return c
+    from tools.db.pool import connect
+    return connect(DB_PATH)
+
+
+# Job fields pushed to the dashboard's live-update stream when they change
+_LIVE_FIELDS = ("status", "progress_pct", "current_epoch", "total_epochs",
+                "train_loss", "output_model_path", "error_message")
 
 
 def _update_job(job_id: str, **kwargs):
@@ -54,6 +56,10 @@ def _update_job(job_id: str, **kwargs):
         conn.execute(
             f"UPDATE rfx_finetune_jobs SET {sets} WHERE id = ?", vals
         )
+        live = {k: v for k, v in kwargs.items() if k in _LIVE_FIELDS}
+        if live:
+            from tools.db import change_log
+            change_log.publish(conn, "finetune_job", live, job_id)
         conn.commit()
     finally:
         conn.close()
@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+# CUI // SP-PROPIN
+"""Durable document ingestion queue backed by SQLite.
+
+Uploads are enqueued as rfx_ingest_jobs rows and processed by a worker
+process, so the dashboard request returns a job id immediately. Each job
+walks its stages in order:
+
+  upload → extract → chunk → tag → embed → extract_requirements
+
+Every stage is idempotent: it can be re-run after a crash or a failure
+without duplicating rows. `stage` on the job row is the next stage to run,
+so a retried job resumes where it stopped. Failed stages are retried with
+backoff up to max_attempts; a worker that dies mid-job loses its lease and
+the job is picked up again by the next worker. A live worker renews its
+lease from a heartbeat thread while a stage runs, and every job update is
+conditional on worker_id, so a worker that lost its lease anyway drops the
+job instead of overwriting the new owner's state.
+
+A job with supersedes_id ingests an amendment as a new document version:
+the chunk stage copies embeddings for chunks whose text is unchanged, and
+requirement extraction only re-reads paragraphs that changed.
+
+No external broker — workers claim jobs with BEGIN IMMEDIATE on the same
+SQLite database the rest of the portal uses.
+
+Usage:
+    python -m tools.rfx.ingest_queue --worker [--exit-when-idle 30]
+    python -m tools.rfx.ingest_queue --status <job_id>
+    python -m tools.rfx.ingest_queue --list
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_PATH = Path(os.environ.get(
+    "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
+))
+UPLOAD_DIR = BASE_DIR / "data" / "rfx_uploads"
+INCOMING_DIR = UPLOAD_DIR / ".incoming"
+WORK_DIR = UPLOAD_DIR / ".work"
+PID_FILE = BASE_DIR / "data" / "rfx_ingest_worker.pid"
+
+STAGES = ["upload", "extract", "chunk", "tag", "embed", "extract_requirements"]
+LEASE_SECONDS = 600
+HEARTBEAT_SECONDS = LEASE_SECONDS / 4
+RETRY_BASE_SECONDS = 5
+POLL_SECONDS = 1.0
+
+
+# ── DB helpers ─────────────────────────────────────────────────────────────────
+
+def _conn():
+    from tools.db.pool import connect
+    return connect(DB_PATH, foreign_keys=True)
+
+
+def _now(offset_seconds: float = 0) -> str:
+    return (datetime.now(timezone.utc) + timedelta(seconds=offset_seconds)).isoformat()
+
+
+def _update_job(conn, job_id: str, owner: Optional[str] = None, **kwargs) -> bool:
+    """Partial update of an ingest job row (commits).
+
+    With owner, the row is only updated while that worker holds the job.
+
+    Returns:
+        False if owner no longer holds the job (nothing was written).
+    """
+    kwargs["updated_at"] = _now()
+    sets = ", ".join(f"{k} = ?" for k in kwargs)
+    sql = f"UPDATE rfx_ingest_jobs SET {sets} WHERE id = ?"
+    params = list(kwargs.values()) + [job_id]
+    if owner is not None:
+        sql += " AND worker_id = ?"
+        params.append(owner)
+    if conn.execute(sql, params).rowcount == 0:
+        conn.rollback()
+        return False
+    _publish_job(conn, job_id)
+    conn.commit()
+    return True
+
+
+def _publish_job(conn, job_id: str) -> None:
+    """Push the job's progress to dashboard live-update subscribers."""
+    from tools.db import change_log
+    row = conn.execute("SELECT * FROM rfx_ingest_jobs WHERE id = ?",
+                       (job_id,)).fetchone()
+    if row is None:
+        return
+    job = _job_dict(row)
+    change_log.publish(conn, "ingest_job", {
+        k: job.get(k) for k in ("status", "stage", "progress_pct",
+                                "document_id", "error_message")
+    }, job_id)
+
+
+def _job_dict(row) -> dict:
+    job = dict(row)
+    job["stages"] = json.loads(job["stages"])
+    job["results"] = json.loads(job["results"] or "{}")
+    done = len(job["stages"]) if job["stage"] is None else job["stages"].index(job["stage"])
+    job["progress_pct"] = round(100.0 * done / len(job["stages"]), 1)
+    return job
+
+
+# ── enqueue ────────────────────────────────────────────────────────────────────
+
+def _enqueue(conn, stages: list[str], **fields) -> str:
+    job_id = str(uuid.uuid4())
+    now = _now()
+    cols = ["id", "stages", "stage", "status", "run_after", "created_at", "updated_at"]
+    vals = [job_id, json.dumps(stages), stages[0], "queued", now, now, now]
+    for k, v in fields.items():
+        cols.append(k)
+        vals.append(v)
+    conn.execute(
+        f"INSERT INTO rfx_ingest_jobs ({', '.join(cols)}) "
+        f"VALUES ({', '.join('?' for _ in cols)})", vals)
+    _publish_job(conn, job_id)
+    conn.commit()
+    return job_id
+
+
+def enqueue_upload(
+    src_path: Path,
+    filename: Optional[str] = None,
+    fhash: Optional[str] = None,
+    doc_type: str = "other",
+    proposal_id: Optional[str] = None,
+    opportunity_id: Optional[str] = None,
+    uploaded_by: Optional[str] = None,
+    notes: Optional[str] = None,
+    supersedes_id: Optional[str] = None,
+) -> str:
+    """Queue a full ingestion job for a file and return the job id.
+
+    The queue takes ownership of src_path: it should live in INCOMING_DIR
+    (same filesystem as UPLOAD_DIR) so the upload stage can rename it into
+    content-addressed storage. Pass ``fhash`` if the caller hashed the file
+    while receiving it, so it is never re-read. ``supersedes_id`` ingests
+    the file as a new version of that document: unchanged chunks keep
+    their embeddings and only changed paragraphs are re-extracted.
+    """
+    conn = _conn()
+    try:
+        return _enqueue(
+            conn, STAGES,
+            document_id=str(uuid.uuid4()),
+            src_path=str(src_path), file_hash=fhash,
+            filename=filename or src_path.name,
+            doc_type=doc_type, proposal_id=proposal_id,
+            opportunity_id=opportunity_id, uploaded_by=uploaded_by, notes=notes,
+            supersedes_id=supersedes_id,
+        )
+    finally:
+        conn.close()
+
+
+def enqueue_stages(document_id: str, stages: list[str],
+                   proposal_id: Optional[str] = None) -> str:
+    """Queue selected stages (e.g. ["embed"]) for an already stored document."""
+    unknown = [s for s in stages if s not in STAGES or s == "upload"]
+    if not stages or unknown:
+        raise ValueError(f"Invalid stages: {unknown or stages}")
+    stages = [s for s in STAGES if s in stages]
+    conn = _conn()
+    try:
+        return _enqueue(conn, stages, document_id=document_id,
+                        proposal_id=proposal_id)
+    finally:
+        conn.close()
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """Return a job with parsed stages/results and progress_pct, or None."""
+    conn = _conn()
+    try:
+        row = conn.execute(
+            "SELECT * FROM rfx_ingest_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return _job_dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def list_jobs(status: Optional[str] = None, limit: int = 50) -> list[dict]:
+    """List recent ingest jobs, newest first."""
+    conn = _conn()
+    try:
+        sql = "SELECT * FROM rfx_ingest_jobs"
+        params: list = []
+        if status:
+            sql += " WHERE status = ?"
+            params.append(status)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        return [_job_dict(r) for r in conn.execute(sql, params).fetchall()]
+    finally:
+        conn.close()
+
+
+# ── stages ─────────────────────────────────────────────────────────────────────
+# Each stage takes (conn, job) and returns a JSON-serializable summary.
+
+def _work_file(job: dict) -> Path:
+    return WORK_DIR / f"{job['document_id']}.pages.jsonl"
+
+
+def _document(conn, job: dict):
+    row = conn.execute(
+        "SELECT * FROM rfx_documents WHERE id = ?", (job["document_id"],)
+    ).fetchone()
+    if not row:
+        raise ValueError(f"Document not found: {job['document_id']}")
+    return row
+
+
+def _stage_upload(conn, job: dict) -> dict:
+    from tools.rfx.document_processor import register_upload
+    if conn.execute("SELECT 1 FROM rfx_documents WHERE id = ?",
+                    (job["document_id"],)).fetchone():
+        return {"status": "ok", "document_id": job["document_id"]}
+
+    src = Path(job["src_path"])
+    reg = register_upload(
+        conn, src, doc_id=job["document_id"], filename=job["filename"],
+        doc_type=job["doc_type"], proposal_id=job["proposal_id"],
+        opportunity_id=job["opportunity_id"], uploaded_by=job["uploaded_by"],
+        notes=job["notes"], fhash=job["file_hash"], move=True,
+        supersedes_id=job["supersedes_id"],
+    )
+    conn.commit()
+    return {k: reg[k] for k in ("status", "document_id", "file_hash", "file_size_bytes")
+            if k in reg}
+
+
+def _stage_extract(conn, job: dict) -> dict:
+    """Stream pages to a work file and fill in rfx_documents.content."""
+    from tools.rfx.document_processor import iter_document_pages, store_content, tee_pages
+    doc = _document(conn, job)
+    path = BASE_DIR / doc["file_path"]
+    is_pdf = path.suffix.lower() == ".pdf" or "pdf" in (doc["mime_type"] or "")
+
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    work = _work_file(job)
+    tmp = work.with_suffix(".tmp")
+    totals = {"chars": 0, "page_count": 0}
+    with open(tmp, "w", encoding="utf-8") as f, tempfile.TemporaryFile() as spool:
+        pages = iter_document_pages(path, doc["mime_type"] or "")
+        for page_no, text in tee_pages(pages, spool, totals):
+            f.write(json.dumps([page_no, text]) + "\n")
+        store_content(conn, doc["id"], spool)
+    os.replace(tmp, work)
+
+    page_count = totals["page_count"]
+    if not is_pdf:
+        page_count = max(1, totals["chars"] // 3000) if totals["chars"] else 0
+    conn.execute(
+        "UPDATE rfx_documents SET page_count = ?, updated_at = ? WHERE id = ?",
+        (page_count, _now(), doc["id"]))
+    conn.commit()
+    return {"page_count": page_count, "chars": totals["chars"]}
+
+
+def _iter_work_pages(conn, job: dict):
+    work = _work_file(job)
+    if work.exists():
+        with open(work, encoding="utf-8") as f:
+            for line in f:
+                page_no, text = json.loads(line)
+                yield page_no, text
+    else:
+        # Work file lost (e.g. a different host picked the job up): fall
+        # back to the stored text, without page spans
+        yield None, _document(conn, job)["content"] or ""
+
+
+def _stage_chunk(conn, job: dict) -> dict:
+    """Chunk the document; a new version reuses the prior version's embeddings."""
+    from tools.rfx.document_processor import prior_chunk_embeddings, write_chunks
+    doc_id = job["document_id"]
+    prior_id = _document(conn, job)["supersedes_id"]
+    reuse = prior_chunk_embeddings(conn, prior_id) if prior_id else None
+    conn.execute("DELETE FROM rfx_document_chunks WHERE document_id = ?", (doc_id,))
+    chunk_count = write_chunks(conn, doc_id, _iter_work_pages(conn, job), reuse)
+    reused = conn.execute(
+        "SELECT COUNT(*) FROM rfx_document_chunks "
+        "WHERE document_id = ? AND embedding IS NOT NULL", (doc_id,)).fetchone()[0]
+    conn.execute(
+        "UPDATE rfx_documents SET chunk_count = ?, vectorized = ?, updated_at = ? "
+        "WHERE id = ?",
+        (chunk_count, int(chunk_count > 0 and reused == chunk_count), _now(), doc_id))
+    conn.commit()
+    _work_file(job).unlink(missing_ok=True)
+    result = {"chunk_count": chunk_count}
+    if prior_id:
+        result["reused_embeddings"] = reused
+    return result
+
+
+def _stage_tag(conn, job: dict) -> dict:
+    """CAG-tag the document text, replacing earlier auto tags."""
+    from tools.cag.data_tagger import _detect_tags, _store_tags
+    doc = _document(conn, job)
+    try:
+        tags = _detect_tags(doc["content"] or "", "free_text", doc["id"])
+    except (RuntimeError, FileNotFoundError) as e:
+        return {"skipped": str(e)}
+    conn.execute(
+        "DELETE FROM cag_data_tags WHERE source_type = 'free_text' "
+        "AND source_id = ? AND tagged_by = 'auto'", (doc["id"],))
+    if tags:
+        _store_tags(conn, tags, "free_text", doc["id"])
+    conn.commit()
+    return {"tag_count": len(tags),
+            "categories": sorted({t["category"] for t in tags})}
+
+
+def _stage_embed(conn, job: dict) -> dict:
+    # A missing embedding backend is not retryable; leave the document
+    # un-vectorized so it can be re-queued once the model is installed
+    try:
+        from tools.rfx.rag_service import vectorize_document
+    except ImportError as e:
+        return {"skipped": str(e)}
+    result = vectorize_document(job["document_id"])
+    if "error" in result:
+        return {"skipped": result["error"]}
+    return result
+
+
+def _stage_extract_requirements(conn, job: dict) -> dict:
+    from tools.rfx.requirement_extractor import extract_and_store
+    existing = conn.execute(
+        "SELECT COUNT(*) FROM rfx_requirements WHERE document_id = ?",
+        (job["document_id"],)).fetchone()[0]
+    if existing:
+        # store_requirements commits all-or-nothing, so rows mean a prior run finished
+        return {"total_extracted": existing, "already_extracted": True}
+    prior_id = _document(conn, job)["supersedes_id"]
+    result = extract_and_store(job["document_id"], job["proposal_id"],
+                               prior_doc_id=prior_id)
+    if "error" in result:
+        return {"skipped": result["error"]}
+    return result
+
+
+STAGE_FUNCS: dict[str, Callable] = {
+    "upload": _stage_upload,
+    "extract": _stage_extract,
+    "chunk": _stage_chunk,
+    "tag": _stage_tag,
+    "embed": _stage_embed,
+    "extract_requirements": _stage_extract_requirements,
+}
+
+
+# ── worker ─────────────────────────────────────────────────────────────────────
+
+def claim_job(conn, worker_id: str) -> Optional[dict]:
+    """Atomically claim the next runnable job (queued, or with an expired lease)."""
+    now = _now()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        row = conn.execute("""
+            SELECT * FROM rfx_ingest_jobs
+            WHERE (status = 'queued' AND run_after <= ?)
+               OR (status = 'running' AND lease_expires < ?)
+            ORDER BY created_at LIMIT 1
+        """, (now, now)).fetchone()
+        if not row:
+            conn.rollback()
+            return None
+        conn.execute("""
+            UPDATE rfx_ingest_jobs
+            SET status = 'running', worker_id = ?, lease_expires = ?,
+                started_at = COALESCE(started_at, ?), updated_at = ?
+            WHERE id = ?
+        """, (worker_id, _now(LEASE_SECONDS), now, now, row["id"]))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    job = _job_dict(row)
+    job["status"] = "running"
+    job["worker_id"] = worker_id
+    return job
+
+
+def _keep_lease(job_id: str, owner: str, stop: threading.Event,
+                lost: threading.Event) -> None:
+    """Renew a job's lease every HEARTBEAT_SECONDS until stop is set.
+
+    Sets lost and returns if another worker has taken the job over.
+    """
+    conn = _conn()
+    try:
+        while not stop.wait(HEARTBEAT_SECONDS):
+            try:
+                cur = conn.execute(
+                    "UPDATE rfx_ingest_jobs SET lease_expires = ? "
+                    "WHERE id = ? AND worker_id = ? AND status = 'running'",
+                    (_now(LEASE_SECONDS), job_id, owner))
+                conn.commit()
+            except sqlite3.OperationalError:
+                # Writer busy past busy_timeout: try again next beat
+                conn.rollback()
+                continue
+            if cur.rowcount == 0:
+                lost.set()
+                return
+    finally:
+        conn.close()
+
+
+def _run_stage(conn, job: dict, stage: str) -> tuple[dict, bool]:
+    """Run one stage with its lease kept alive. Returns (result, lease_lost)."""
+    stop, lost = threading.Event(), threading.Event()
+    keeper = threading.Thread(target=_keep_lease, daemon=True,
+                              args=(job["id"], job["worker_id"], stop, lost))
+    keeper.start()
+    try:
+        return STAGE_FUNCS[stage](conn, job), lost.is_set()
+    finally:
+        stop.set()
+        keeper.join()
+
+
+def process_job(conn, job: dict) -> dict:
+    """Run a claimed job's remaining stages. Returns the final job state.
+
+    Stops without writing anything further once the job has been claimed
+    by another worker (its lease lapsed).
+    """
+    stages = job["stages"]
+    results = job["results"]
+    owner = job["worker_id"]
+    for stage in stages[stages.index(job["stage"]):]:
+        if not _update_job(conn, job["id"], owner, stage=stage,
+                           lease_expires=_now(LEASE_SECONDS)):
+            return get_job(job["id"])
+        try:
+            result, lost = _run_stage(conn, job, stage)
+        except Exception as e:
+            conn.rollback()
+            attempts = job["attempts"] + 1
+            error = f"{stage}: {e}"[:1000]
+            if attempts >= job["max_attempts"]:
+                _update_job(conn, job["id"], owner, status="failed", attempts=attempts,
+                            error_message=error, lease_expires=None,
+                            completed_at=_now())
+            else:
+                _update_job(conn, job["id"], owner, status="queued", attempts=attempts,
+                            error_message=error, lease_expires=None,
+                            run_after=_now(RETRY_BASE_SECONDS * 2 ** (attempts - 1)))
+            return get_job(job["id"])
+        if lost:
+            return get_job(job["id"])
+
+        results[stage] = result
+        nxt = stages.index(stage) + 1
+        if result.get("status") == "duplicate":
+            _update_job(conn, job["id"], owner, status="duplicate", stage=None,
+                        document_id=result["document_id"],
+                        results=json.dumps(results), lease_expires=None,
+                        completed_at=_now())
+            return get_job(job["id"])
+        job["attempts"] = 0
+        if not _update_job(conn, job["id"], owner,
+                           stage=stages[nxt] if nxt < len(stages) else None,
+                           attempts=0, results=json.dumps(results)):
+            return get_job(job["id"])
+
+    _update_job(conn, job["id"], owner, status="done", stage=None, error_message=None,
+                lease_expires=None, completed_at=_now())
+    return get_job(job["id"])
+
+
+def run_worker(exit_when_idle: Optional[float] = None,
+               max_jobs: Optional[int] = None,
+               poll_seconds: float = POLL_SECONDS) -> int:
+    """Process jobs until idle for exit_when_idle seconds (forever if None).
+
+    Returns the number of jobs processed.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    processed = 0
+    idle_since = time.monotonic()
+    conn = _conn()
+    try:
+        while max_jobs is None or processed < max_jobs:
+            job = claim_job(conn, worker_id)
+            if job is None:
+                if exit_when_idle is not None and \
+                        time.monotonic() - idle_since >= exit_when_idle:
+                    break
+                time.sleep(poll_seconds)
+                continue
+            process_job(conn, job)
+            processed += 1
+            idle_since = time.monotonic()
+    finally:
+        conn.close()
+    return processed
+
+
+def _worker_alive() -> bool:
+    try:
+        pid = int(PID_FILE.read_text().strip())
+        os.kill(pid, 0)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def ensure_worker(exit_when_idle: float = 60) -> None:
+    """Spawn a detached worker process unless one is already running.
+
+    Used by the dashboard after enqueueing. Two workers racing is harmless
+    since claims are atomic; the pid file just avoids spawning one per request.
+    """
+    if _worker_alive():
+        return
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "tools.rfx.ingest_queue", "--worker",
+         "--exit-when-idle", str(exit_when_idle)],
+        cwd=str(BASE_DIR),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,   # detach from parent process group
+    )
+    PID_FILE.write_text(str(proc.pid))
+
+
+# ── CLI entry point ─────────────────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="RFX document ingestion queue")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--worker", action="store_true", help="Run a queue worker")
+    group.add_argument("--status", metavar="JOB_ID", help="Show one job")
+    group.add_argument("--list", action="store_true", help="List recent jobs")
+    parser.add_argument("--exit-when-idle", type=float, default=None,
+                        help="Worker exits after this many idle seconds")
+    parser.add_argument("--json", action="store_true", help="JSON output")
+    args = parser.parse_args()
+
+    if args.worker:
+        n = run_worker(exit_when_idle=args.exit_when_idle)
+        out = {"processed": n}
+    elif args.status:
+        out = get_job(args.status) or {"error": f"Job not found: {args.status}"}
+    else:
+        out = {"jobs": list_jobs()}
+
+    if args.json or not args.list:
+        print(json.dumps(out, indent=2, default=str))
+    else:
+        for j in out["jobs"]:
+            print(f"  {j['id'][:8]}  {j['status']:<9} {j['progress_pct']:5.1f}%  "
+                  f"{j['stage'] or '-':<20} {j['filename'] or j['document_id']}")
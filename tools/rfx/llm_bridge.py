@@ -19,7 +19,6 @@ Functions exposed to the rest of the RFX engine:
 import hashlib
 import json
 import os
-import sqlite3
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
@@ -46,10 +45,8 @@ def _get_router():
 
 
 def _conn():
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    c.execute("PRAGMA journal_mode=WAL")
-    return c
+    from tools.db.pool import connect
+    return connect(DB_PATH)
 
 
 def _sha256(text: str) -> str:
@@ -10,18 +10,19 @@ Also searches kb_entries (GovProposal Knowledge Base) so past performance,
 capabilities, and boilerplate are available as RAG sources.
 
 Graceful degradation: if sentence-transformers is not installed, semantic
-search falls back to BM25 keyword search (rank_bm25).
+search falls back to BM25 keyword search (rank_bm25). numpy is imported only
+once there are vectors to handle, so the fallback works without it.
 """
 
 import json
 import os
-import sqlite3
 import struct
 import uuid
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-import numpy as np
+if TYPE_CHECKING:
+    import numpy as np
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = Path(os.environ.get(
@@ -46,33 +47,35 @@ def _get_model():
 
 
 def _conn():
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    c.execute("PRAGMA journal_mode=WAL")
-    return c
+    from tools.db.pool import connect
+    return connect(DB_PATH)
 
 
 # ── embedding helpers ──────────────────────────────────────────────────────────
 
-def embed_text(text: str) -> Optional[np.ndarray]:
+def embed_text(text: str) -> Optional["np.ndarray"]:
     """Embed a string. Returns float32 ndarray or None if model unavailable."""
     model = _get_model()
     if model is None:
         return None
+    import numpy as np
     vec = model.encode(text, normalize_embeddings=True)
     return vec.astype(np.float32)
 
 
-def _to_blob(vec: np.ndarray) -> bytes:
+def _to_blob(vec: "np.ndarray") -> bytes:
+    import numpy as np
     return vec.astype(np.float32).tobytes()
 
 
-def _from_blob(blob: bytes) -> np.ndarray:
+def _from_blob(blob: bytes) -> "np.ndarray":
+    import numpy as np
     return np.frombuffer(blob, dtype=np.float32)
 
 
-def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+def _cosine(a: "np.ndarray", b: "np.ndarray") -> float:
     """Cosine similarity (both vectors assumed unit-normalized)."""
+    import numpy as np
     return float(np.dot(a, b))
 
 
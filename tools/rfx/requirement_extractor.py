@@ -3,88 +3,78 @@
 """Requirement extractor: parse shall/should/must statements from RFI/RFP text.
 
 Two extraction modes:
-  1. Regex (fast, no LLM) — catches explicit modal verbs in each sentence.
+  1. Regex (fast, no LLM) — a single streaming pass that tracks the current
+     section from headers and flags sentences with explicit modal verbs.
   2. LLM-assisted (via llm_bridge) — catches implicit requirements and
      classifies section/priority more accurately.
 
 Results are stored in rfx_requirements and rfx_requirement_status is
 initialized to 'not_addressed' for each requirement × proposal pair.
+Storage is set-based: rows are bulk-loaded into a temp staging table and
+moved into place with INSERT ... SELECT in one transaction. Re-importing an
+amended RFP diffs against the prior requirements by normalized-text hash so
+unchanged requirements keep their id and status; for a new document version
+(rfx_documents.supersedes_id) only paragraphs that changed are re-extracted,
+and requirements that disappeared are marked removed_at rather than deleted.
 """
 
+import difflib
+import hashlib
 import os
 import re
-import sqlite3
 import uuid
+from collections import Counter
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_PATH = Path(os.environ.get(
     "GOVPROPOSAL_DB_PATH", str(BASE_DIR / "data" / "govproposal.db")
 ))
 
-# Modal verbs that signal a requirement
-_SHALL_PATTERNS = [
-    r"\bshall\b", r"\bmust\b", r"\bwill\b",
-    r"\bshould\b", r"\bmay\b", r"\bshall not\b", r"\bmust not\b",
-]
-_REQ_REGEX = re.compile(
-    "|".join(_SHALL_PATTERNS), re.IGNORECASE
-)
-
-# Section header patterns for RFI/RFP docs
-_SECTION_L = re.compile(r"section\s+l\b", re.IGNORECASE)
-_SECTION_M = re.compile(r"section\s+m\b", re.IGNORECASE)
+# Section header patterns for RFI/RFP docs (also used by document_processor)
 _SOW = re.compile(r"\b(statement\s+of\s+work|sow)\b", re.IGNORECASE)
 _CDRL = re.compile(r"\b(cdrl|data\s+item\s+description|dd\s+1423)\b", re.IGNORECASE)
 _EVAL = re.compile(r"\b(evaluation\s+(criteria|factor)|best\s+value)\b", re.IGNORECASE)
 
 
 def _conn():
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    c.execute("PRAGMA journal_mode=WAL")
-    c.execute("PRAGMA foreign_keys=ON")
-    return c
-
-
-def _detect_section(context: str) -> str:
-    """Guess the RFP section from surrounding text."""
-    if _SECTION_L.search(context):
-        return "section_l"
-    if _SECTION_M.search(context):
-        return "section_m"
-    if _SOW.search(context):
-        return "sow"
-    if _CDRL.search(context):
-        return "cdrl"
-    if _EVAL.search(context):
-        return "evaluation_criteria"
-    return "other"
-
-
-def _detect_req_type(sentence: str) -> str:
-    """Identify the primary modal verb in a sentence."""
-    low = sentence.lower()
-    if "shall not" in low or "must not" in low:
-        return "shall"
-    if "shall" in low:
-        return "shall"
-    if "must" in low:
-        return "must"
-    if "will" in low:
-        return "will"
-    if "should" in low:
-        return "should"
-    if "may" in low:
-        return "may"
-    return "other"
-
-
-def _detect_priority(sentence: str, section: str) -> str:
+    from tools.db.pool import connect
+    return connect(DB_PATH, foreign_keys=True)
+
+
+# Section headers: a cue at the start of a sentence or of a line within it.
+# Group names are the rfx_requirements.section labels.
+_HEADER_RE = re.compile(
+    r"^[ \t]*(?:[A-Z]?[\d.]+[ \t]+)?(?:"
+    r"(?P<section_l>section\s+l\b)|(?P<section_m>section\s+m\b)"
+    r"|(?P<sow>(?:statement\s+of\s+work|sow)\b)"
+    r"|(?P<cdrl>(?:cdrl|data\s+item\s+description|dd\s+1423)\b)"
+    r"|(?P<evaluation_criteria>(?:evaluation\s+(?:criteria|factors?)|best\s+value)\b))",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Everything a sentence is classified on, in one alternation: modal verbs
+# (whole words) and volume cues (prefixes, so "costs"/"pricing" match)
+_CLASSIFY_RE = re.compile(
+    r"\b(?:(?P<shall_not>(?:shall|must)\s+not)\b|(?P<shall>shall)\b|(?P<must>must)\b"
+    r"|(?P<will>will)\b|(?P<should>should)\b|(?P<may>may)\b"
+    r"|(?P<management>management)"
+    r"|(?P<past_performance>past\s+performance|cpars|contract\s+history)"
+    r"|(?P<cost>price|cost|pricing))",
+    re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+# Precedence when a sentence has several cues
+_REQ_TYPE_ORDER = (("shall_not", "shall"), ("shall", "shall"), ("must", "must"),
+                   ("will", "will"), ("should", "should"), ("may", "may"))
+_VOLUME_ORDER = ("management", "past_performance", "cost")
+
+
+def _detect_priority(req_type: str, section: str) -> str:
     """Heuristic priority from modal verb + section."""
-    req_type = _detect_req_type(sentence)
     if req_type in ("shall", "must") or section == "section_m":
         return "critical"
     if req_type == "will" or section == "section_l":
@@ -94,74 +84,199 @@ def _detect_priority(sentence: str, section: str) -> str:
     return "low"
 
 
-def _detect_volume(section: str, sentence: str) -> Optional[str]:
-    """Map requirement to a proposal volume."""
-    low = sentence.lower()
-    if "management" in low or "program management" in low:
-        return "management"
-    if "past performance" in low or "cpars" in low or "contract history" in low:
-        return "past_performance"
-    if "price" in low or "cost" in low or "pricing" in low:
-        return "cost"
-    if section in ("section_l", "sow"):
-        return "technical"
-    return None
+def _classify(sentence: str, section: str) -> Optional[tuple[str, str, Optional[str]]]:
+    """(req_type, priority, volume) for a requirement sentence, else None."""
+    cues = {m.lastgroup for m in _CLASSIFY_RE.finditer(sentence)}
+    req_type = next((t for cue, t in _REQ_TYPE_ORDER if cue in cues), None)
+    if req_type is None:
+        return None
+    volume = next((v for v in _VOLUME_ORDER if v in cues), None)
+    if volume is None and section in ("section_l", "sow"):
+        volume = "technical"
+    return req_type, _detect_priority(req_type, section), volume
+
+
+def _iter_sentences(text: str) -> Iterator[tuple[int, str]]:
+    """Yield (offset, sentence) pairs."""
+    start = 0
+    for m in _SENTENCE_END.finditer(text):
+        yield start, text[start:m.start()]
+        start = m.end()
+    yield start, text[start:]
 
 
 # ── regex extraction ───────────────────────────────────────────────────────────
 
+def iter_requirements(text: str, doc_id: str,
+                      proposal_id: Optional[str] = None,
+                      spans: Optional[list[tuple[int, int]]] = None,
+                      start_number: int = 1) -> Iterator[dict]:
+    """Stream requirements from text in a single pass (fast, no LLM).
+
+    The current section is kept as state and only changes when a section
+    header starts a sentence or a line; each sentence is classified with
+    one combined regex scan. With ``spans`` (sorted (start, end) offsets),
+    only sentences overlapping a span are classified, though headers are
+    still tracked everywhere. Yields requirement dicts (not yet stored).
+    """
+    section = "other"
+    req_num = start_number
+    span_i = 0
+    for offset, sentence in _iter_sentences(text):
+        for h in _HEADER_RE.finditer(sentence):
+            section = h.lastgroup
+
+        if spans is not None:
+            while span_i < len(spans) and spans[span_i][1] <= offset:
+                span_i += 1
+            if span_i == len(spans) or spans[span_i][0] >= offset + len(sentence):
+                continue
+        sentence = sentence.strip()
+        if len(sentence) < 20:
+            continue
+        found = _classify(sentence, section)
+        if found is None:
+            continue
+        req_type, priority, volume = found
+        yield {
+            "id": str(uuid.uuid4()),
+            "document_id": doc_id,
+            "proposal_id": proposal_id,
+            "req_number": f"REQ-{req_num:04d}",
+            "section": section,
+            "req_text": sentence,
+            "req_type": req_type,
+            "volume": volume,
+            "priority": priority,
+            "extracted_by": "ai",  # regex counts as automated
+        }
+        req_num += 1
+
+
 def extract_regex(text: str, doc_id: str,
                   proposal_id: Optional[str] = None) -> list[dict]:
     """Extract requirements via regex (fast, no LLM).
 
-    Splits text into sentences and flags those containing modal verbs.
-    Returns a list of requirement dicts (not yet stored to DB).
+    Returns a list of requirement dicts (not yet stored to DB); see
+    iter_requirements for the streaming form.
     """
-    sentences = re.split(r"(?<=[.!?])\s+", text)
-    requirements = []
-    req_num = 1
+    return list(iter_requirements(text, doc_id, proposal_id))
 
-    current_section_context = ""
 
-    for i, sentence in enumerate(sentences):
-        sentence = sentence.strip()
-        if not sentence or len(sentence) < 20:
-            continue
+# ── DB storage ─────────────────────────────────────────────────────────────────
 
-        # Update section context from surrounding text
-        context_window = " ".join(sentences[max(0, i - 3):i + 1])
-        section = _detect_section(context_window)
+# An import drops the secondary indexes and rebuilds them once at the end,
+# instead of updating every index on every row, only when it has at least
+# BULK_DEFER_INDEX_MIN rows and at least BULK_DEFER_INDEX_RATIO times the
+# rows already stored. The rebuild scans the whole table, and the schema
+# change makes every pooled connection re-prepare its statements, so on a
+# table that is already large a single-transaction executemany is cheaper.
+BULK_DEFER_INDEX_MIN = 2000
+BULK_DEFER_INDEX_RATIO = 1.0
+_DEFERRABLE_INDEXES = {
+    "idx_rfxreq_proposal": "ON rfx_requirements(proposal_id)",
+    "idx_rfxreq_section": "ON rfx_requirements(section)",
+    "idx_rfxreq_priority": "ON rfx_requirements(priority)",
+}
 
-        if _REQ_REGEX.search(sentence):
-            req_type = _detect_req_type(sentence)
-            priority = _detect_priority(sentence, section)
-            volume = _detect_volume(section, sentence)
+_REQ_COLUMNS = ("id", "document_id", "proposal_id", "req_number", "section",
+                "req_text", "req_type", "volume", "priority", "extracted_by",
+                "text_hash", "created_at")
+_NON_WORD = re.compile(r"[\W_]+")
 
-            requirements.append({
-                "id": str(uuid.uuid4()),
-                "document_id": doc_id,
-                "proposal_id": proposal_id,
-                "req_number": f"REQ-{req_num:04d}",
-                "section": section,
-                "req_text": sentence,
-                "req_type": req_type,
-                "volume": volume,
-                "priority": priority,
-                "extracted_by": "ai",  # regex counts as automated
-            })
-            req_num += 1
 
-    return requirements
+def normalize_req_text(text: str) -> str:
+    """Case-fold and strip punctuation/whitespace differences."""
+    return _NON_WORD.sub(" ", text.casefold()).strip()
 
 
-# ── DB storage ─────────────────────────────────────────────────────────────────
+def req_text_hash(text: str) -> str:
+    return hashlib.sha256(normalize_req_text(text).encode("utf-8")).hexdigest()
+
+
+def _stage_requirements(conn, requirements: list[dict],
+                        proposal_id: Optional[str], now: str) -> None:
+    """Bulk-load requirements into the per-connection staging table.
+
+    ``matched`` marks rows whose id is an existing requirement (re-import).
+    """
+    cols = ", ".join(_REQ_COLUMNS)
+    conn.execute(f"""
+        CREATE TEMP TABLE IF NOT EXISTS rfx_req_stage (
+            {cols}, status_id TEXT, matched INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    conn.execute("DELETE FROM temp.rfx_req_stage")
+    conn.executemany(
+        f"INSERT INTO temp.rfx_req_stage ({cols}, status_id, matched) "
+        f"VALUES ({', '.join('?' * (len(_REQ_COLUMNS) + 2))})",
+        ((req["id"], req["document_id"], req.get("proposal_id") or proposal_id,
+          req.get("req_number"), req["section"], req["req_text"],
+          req["req_type"], req.get("volume"), req["priority"],
+          req.get("extracted_by", "ai"),
+          req.get("text_hash") or req_text_hash(req["req_text"]), now,
+          str(uuid.uuid4()), int(bool(req.get("matched"))))
+         for req in requirements),
+    )
+
+
+def _insert_staged(conn) -> int:
+    """Move unmatched staged rows into rfx_requirements; return count inserted."""
+    cols = ", ".join(_REQ_COLUMNS)
+    cur = conn.execute(f"""
+        INSERT OR IGNORE INTO rfx_requirements ({cols})
+        SELECT {cols} FROM temp.rfx_req_stage WHERE matched = 0
+    """)
+    return cur.rowcount
+
+
+def _fan_out_status(conn, now: str) -> int:
+    """Initialize 'not_addressed' status for staged requirement × proposal pairs
+    that do not have one yet."""
+    cur = conn.execute("""
+        INSERT INTO rfx_requirement_status
+            (id, requirement_id, proposal_id, status, updated_at)
+        SELECT s.status_id, s.id, s.proposal_id, 'not_addressed', ?
+        FROM temp.rfx_req_stage s
+        JOIN rfx_requirements r ON r.id = s.id
+        WHERE s.proposal_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM rfx_requirement_status rs
+                          WHERE rs.requirement_id = s.id
+                            AND rs.proposal_id = s.proposal_id)
+    """, (now,))
+    return cur.rowcount
+
+
+def _drop_deferred_indexes(conn, n_rows: int) -> bool:
+    if n_rows < BULK_DEFER_INDEX_MIN:
+        return False
+    # MAX(rowid) is an O(log n) upper bound on the row count
+    stored = conn.execute(
+        "SELECT COALESCE(MAX(rowid), 0) FROM rfx_requirements").fetchone()[0]
+    if n_rows < stored * BULK_DEFER_INDEX_RATIO:
+        return False
+    # The pooled connection only opens its implicit transaction at the first
+    # DML, so begin explicitly: the drop then rolls back with a failed import
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    for name in _DEFERRABLE_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+    return True
+
+
+def _rebuild_deferred_indexes(conn) -> None:
+    for name, target in _DEFERRABLE_INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} {target}")
+
 
 def store_requirements(requirements: list[dict],
                        proposal_id: Optional[str] = None) -> int:
     """Insert extracted requirements into rfx_requirements.
 
     Also initializes rfx_requirement_status = 'not_addressed' for each
-    requirement if proposal_id is given.
+    requirement if proposal_id is given. Everything runs in one
+    transaction; an import that dwarfs the stored table defers secondary
+    index maintenance (see BULK_DEFER_INDEX_RATIO).
 
     Returns number of requirements inserted.
     """
@@ -171,88 +286,255 @@ def store_requirements(requirements: list[dict],
     now = datetime.now(timezone.utc).isoformat()
     conn = _conn()
     try:
-        inserted = 0
-        for req in requirements:
-            conn.execute("""
-                INSERT OR IGNORE INTO rfx_requirements
-                    (id, document_id, proposal_id, req_number, section,
-                     req_text, req_type, volume, priority, extracted_by,
-                     created_at)
-                VALUES (?,?,?,?,?,?,?,?,?,?,?)
-            """, (
-                req["id"], req["document_id"],
-                req.get("proposal_id") or proposal_id,
-                req.get("req_number"), req["section"],
-                req["req_text"], req["req_type"],
-                req.get("volume"), req["priority"],
-                req.get("extracted_by", "ai"), now,
-            ))
-
-            if conn.total_changes > 0 and (req.get("proposal_id") or proposal_id):
-                pid = req.get("proposal_id") or proposal_id
-                conn.execute("""
-                    INSERT OR IGNORE INTO rfx_requirement_status
-                        (id, requirement_id, proposal_id, status, updated_at)
-                    VALUES (?,?,?,'not_addressed',?)
-                """, (str(uuid.uuid4()), req["id"], pid, now))
-                inserted += 1
-            else:
-                inserted += 1
-
-        conn.commit()
+        with conn:
+            deferred = _drop_deferred_indexes(conn, len(requirements))
+            _stage_requirements(conn, requirements, proposal_id, now)
+            inserted = _insert_staged(conn)
+            _fan_out_status(conn, now)
+            if deferred:
+                _rebuild_deferred_indexes(conn)
         return inserted
     finally:
         conn.close()
 
 
-def extract_and_store(doc_id: str,
+def _active_requirements(conn, doc_id: str) -> list:
+    """Non-removed requirements of a document, with text_hash backfilled."""
+    rows = [dict(r) for r in conn.execute("""
+        SELECT id, req_number, req_text, text_hash, extracted_by
+        FROM rfx_requirements
+        WHERE document_id = ? AND removed_at IS NULL
+        ORDER BY req_number, created_at
+    """, (doc_id,))]
+    backfill = []
+    for r in rows:
+        if not r["text_hash"]:
+            r["text_hash"] = req_text_hash(r["req_text"])
+            backfill.append((r["text_hash"], r["id"]))
+    if backfill:
+        conn.executemany(
+            "UPDATE rfx_requirements SET text_hash = ? WHERE id = ?", backfill)
+    return rows
+
+
+def _apply_requirement_diff(conn, requirements: list[dict], prior: list,
+                            proposal_id: Optional[str], now: str) -> dict:
+    """Reconcile incoming requirements with ``prior`` rows (caller's transaction).
+
+    Incoming requirements are matched to prior ones by normalized-text hash
+    (repeated text is paired in order). Matches keep their id, and so their
+    rfx_requirement_status rows, while number/section/document are updated;
+    new text is inserted with fresh status rows; unmatched prior rows are
+    marked removed_at.
+    """
+    available: dict[str, list[str]] = {}
+    for r in reversed(prior):
+        available.setdefault(r["text_hash"], []).append(r["id"])
+
+    staged = []
+    for req in requirements:
+        h = req_text_hash(req["req_text"])
+        ids = available.get(h)
+        req = dict(req, text_hash=h)
+        if ids:
+            req.update(id=ids.pop(), matched=True)
+        staged.append(req)
+    removed = [(now, rid) for ids in available.values() for rid in ids]
+
+    deferred = _drop_deferred_indexes(conn, len(staged))
+    _stage_requirements(conn, staged, proposal_id, now)
+    conn.execute("""
+        UPDATE rfx_requirements
+        SET document_id = s.document_id,
+            proposal_id = COALESCE(s.proposal_id, rfx_requirements.proposal_id),
+            req_number = s.req_number, section = s.section,
+            req_text = s.req_text, req_type = s.req_type,
+            volume = s.volume, priority = s.priority
+        FROM temp.rfx_req_stage s
+        WHERE rfx_requirements.id = s.id AND s.matched = 1
+    """)
+    added = _insert_staged(conn)
+    _fan_out_status(conn, now)
+    conn.executemany(
+        "UPDATE rfx_requirements SET removed_at = ? WHERE id = ?", removed)
+    if deferred:
+        _rebuild_deferred_indexes(conn)
+    return {"kept": len(staged) - added, "added": added, "removed": len(removed)}
+
+
+# ── amendments ─────────────────────────────────────────────────────────────────
+
+_PARAGRAPH_BREAK = re.compile(r"\n[ \t]*\n")
+
+
+def _paragraph_spans(text: str) -> list[tuple[int, int]]:
+    spans = []
+    start = 0
+    for m in _PARAGRAPH_BREAK.finditer(text):
+        spans.append((start, m.start()))
+        start = m.end()
+    spans.append((start, len(text)))
+    return spans
+
+
+def diff_paragraphs(old_text: str, new_text: str) -> tuple[list, list]:
+    """Paragraph-level diff of two document versions.
+
+    Paragraphs are compared on normalized text. Returns (old_spans,
+    new_spans): sorted (start, end) offsets of the paragraphs that were
+    removed/replaced in old_text and inserted/replaced in new_text.
+    """
+    old_sp = _paragraph_spans(old_text)
+    new_sp = _paragraph_spans(new_text)
+    sm = difflib.SequenceMatcher(
+        None,
+        [normalize_req_text(old_text[a:b]) for a, b in old_sp],
+        [normalize_req_text(new_text[a:b]) for a, b in new_sp],
+        autojunk=False,
+    )
+    old_changed, new_changed = [], []
+    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+        if tag != "equal":
+            old_changed.extend(old_sp[i1:i2])
+            new_changed.extend(new_sp[j1:j2])
+    return old_changed, new_changed
+
+
+def extract_amendment(doc_id: str, prior_doc_id: str,
                       proposal_id: Optional[str] = None) -> dict:
-    """Full pipeline: load doc text, extract, store requirements.
+    """Incrementally carry requirements from ``prior_doc_id`` to its new version.
 
-    Returns summary dict with counts by section and priority.
+    Requirements in unchanged paragraphs move to doc_id untouched. Only
+    changed paragraphs are re-extracted; their requirements are diffed by
+    text hash against the prior requirements from the old changed
+    paragraphs (so reworded punctuation or moved text keeps its status),
+    and requirements that disappeared are marked removed.
     """
     conn = _conn()
     try:
-        row = conn.execute(
-            "SELECT content FROM rfx_documents WHERE id = ?", (doc_id,)
-        ).fetchone()
+        docs = {r["id"]: r["content"] or "" for r in conn.execute(
+            "SELECT id, content FROM rfx_documents WHERE id IN (?, ?)",
+            (doc_id, prior_doc_id))}
+        if doc_id not in docs or prior_doc_id not in docs:
+            return {"error": "Document not found", "doc_id": doc_id,
+                    "prior_doc_id": prior_doc_id}
+        old_text, new_text = docs[prior_doc_id], docs[doc_id]
+        old_spans, new_spans = diff_paragraphs(old_text, new_text)
+
+        # Prior requirements that came from the changed paragraphs
+        touched = Counter(req_text_hash(r["req_text"]) for r in
+                          iter_requirements(old_text, prior_doc_id, spans=old_spans))
+
+        now = datetime.now(timezone.utc).isoformat()
+        with conn:
+            prior = _active_requirements(conn, prior_doc_id)
+            candidates, unchanged = [], []
+            for r in prior:
+                if r["extracted_by"] == "ai" and touched[r["text_hash"]] > 0:
+                    touched[r["text_hash"]] -= 1
+                    candidates.append(r)
+                else:
+                    unchanged.append((doc_id, r["id"]))
+            last = max((int(r["req_number"][4:]) for r in prior
+                        if (r["req_number"] or "").startswith("REQ-")
+                        and r["req_number"][4:].isdigit()), default=0)
+            requirements = list(iter_requirements(
+                new_text, doc_id, proposal_id, spans=new_spans,
+                start_number=last + 1))
+
+            conn.executemany(
+                "UPDATE rfx_requirements SET document_id = ? WHERE id = ?", unchanged)
+            diff = _apply_requirement_diff(conn, requirements, candidates,
+                                           proposal_id, now)
     finally:
         conn.close()
 
-    if not row or not row["content"]:
-        return {"error": "Document not found or has no text", "doc_id": doc_id}
+    diff.update(doc_id=doc_id, prior_doc_id=prior_doc_id,
+                unchanged=len(unchanged), reextracted=len(requirements),
+                changed_paragraphs=len(new_spans))
+    return diff
 
-    requirements = extract_regex(row["content"], doc_id, proposal_id)
-    stored = store_requirements(requirements, proposal_id)
 
-    # Summarize
+def _summary(doc_id: str, proposal_id: Optional[str],
+             requirements: Iterable, stored: int) -> dict:
     by_section: dict[str, int] = {}
     by_priority: dict[str, int] = {}
+    total = 0
     for r in requirements:
+        total += 1
         by_section[r["section"]] = by_section.get(r["section"], 0) + 1
         by_priority[r["priority"]] = by_priority.get(r["priority"], 0) + 1
-
     return {
         "doc_id": doc_id,
         "proposal_id": proposal_id,
-        "total_extracted": len(requirements),
+        "total_extracted": total,
         "stored": stored,
         "by_section": by_section,
         "by_priority": by_priority,
     }
 
 
+def extract_and_store(doc_id: str,
+                      proposal_id: Optional[str] = None,
+                      prior_doc_id: Optional[str] = None) -> dict:
+    """Full pipeline: load doc text, extract, store requirements.
+
+    With prior_doc_id (the superseded RFP), only changed paragraphs are
+    re-extracted and diffed against the prior requirements (see
+    extract_amendment). Returns summary dict with counts by section and
+    priority; for an amendment the counts cover the document's active
+    requirements, ``stored`` is the number added, and the
+    extract_amendment diff keys are included.
+    """
+    if prior_doc_id:
+        diff = extract_amendment(doc_id, prior_doc_id, proposal_id)
+        if "error" in diff:
+            return diff
+        conn = _conn()
+        try:
+            active = conn.execute(
+                "SELECT section, priority FROM rfx_requirements "
+                "WHERE document_id = ? AND removed_at IS NULL", (doc_id,)
+            ).fetchall()
+        finally:
+            conn.close()
+        summary = _summary(doc_id, proposal_id, active, diff["added"])
+        summary.update(diff)
+        return summary
+
+    conn = _conn()
+    try:
+        row = conn.execute(
+            "SELECT content FROM rfx_documents WHERE id = ?", (doc_id,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+    if not row or not row["content"]:
+        return {"error": "Document not found or has no text", "doc_id": doc_id}
+
+    requirements = extract_regex(row["content"], doc_id, proposal_id)
+    stored = store_requirements(requirements, proposal_id)
+    return _summary(doc_id, proposal_id, requirements, stored)
+
+
 # ── queries ────────────────────────────────────────────────────────────────────
 
 def get_requirements(proposal_id: Optional[str] = None,
                      doc_id: Optional[str] = None,
                      section: Optional[str] = None,
-                     priority: Optional[str] = None) -> list[dict]:
-    """Retrieve requirements with optional filters."""
+                     priority: Optional[str] = None,
+                     include_removed: bool = False) -> list[dict]:
+    """Retrieve requirements with optional filters.
+
+    Requirements dropped by an amendment are excluded unless include_removed.
+    """
     conn = _conn()
     try:
         sql = "SELECT * FROM rfx_requirements WHERE 1=1"
         params: list = []
+        if not include_removed:
+            sql += " AND removed_at IS NULL"
         if proposal_id:
             sql += " AND proposal_id = ?"
             params.append(proposal_id)
@@ -278,12 +560,14 @@ def get_compliance_status(proposal_id: str) -> dict:
         rows = conn.execute("""
             SELECT rs.status, COUNT(*) as cnt
             FROM rfx_requirement_status rs
-            WHERE rs.proposal_id = ?
+            JOIN rfx_requirements r ON r.id = rs.requirement_id
+            WHERE rs.proposal_id = ? AND r.removed_at IS NULL
             GROUP BY rs.status
         """, (proposal_id,)).fetchall()
 
         total = conn.execute(
-            "SELECT COUNT(*) as n FROM rfx_requirements WHERE proposal_id = ?",
+            "SELECT COUNT(*) as n FROM rfx_requirements "
+            "WHERE proposal_id = ? AND removed_at IS NULL",
             (proposal_id,)
         ).fetchone()["n"]
 
@@ -18,7 +18,6 @@ SAM.gov uses the public API (no key required for basic search).
 import hashlib
 import json
 import os
-import sqlite3
 import uuid
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -38,10 +37,8 @@ _HEADERS = {
 
 
 def _conn():
-    c = sqlite3.connect(str(DB_PATH))
-    c.row_factory = sqlite3.Row
-    c.execute("PRAGMA journal_mode=WAL")
-    return c
+    from tools.db.pool import connect
+    return connect(DB_PATH)
 
 
 def _query_hash(query: str, cache_type: str) -> str:
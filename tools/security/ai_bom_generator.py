@@ -301,7 +301,8 @@ class AIBOMGenerator:
         if not self.db_path.exists():
             return 0
 
-        conn = sqlite3.connect(str(self.db_path))
+        from tools.db.pool import connect
+        conn = connect(self.db_path, row_factory=None)
         now = datetime.now(timezone.utc).isoformat()
         stored = 0
 
@@ -342,8 +343,8 @@ class AIBOMGenerator:
             blocking.append("ai_bom_missing: Database not found")
             return {"pass": False, "gate": "ai_bom", "blocking_issues": blocking, "warnings": warnings}
 
-        conn = sqlite3.connect(str(self.db_path))
-        conn.row_factory = sqlite3.Row
+        from tools.db.pool import connect
+        conn = connect(self.db_path)
 
         row = conn.execute("SELECT COUNT(*) as cnt FROM ai_bom").fetchone()
         bom_count = row["cnt"] if row else 0
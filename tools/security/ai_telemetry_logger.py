@@ -19,7 +19,6 @@ CLI:
 import argparse
 import hashlib
 import json
-import sqlite3
 import uuid
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
@@ -69,8 +68,8 @@ class AITelemetryLogger:
         logged_at = datetime.now(timezone.utc).isoformat()
 
         try:
-            conn = sqlite3.connect(str(self._db_path))
-            conn.execute(
+            from tools.db.write_queue import write
+            write((
                 """INSERT INTO ai_telemetry
                    (id, project_id, user_id, agent_id, model_id, provider,
                     function, prompt_hash, response_hash,
@@ -86,9 +85,7 @@ class AITelemetryLogger:
                     latency_ms, cost_usd, classification, api_key_source,
                     injection_scan_result, logged_at,
                 ),
-            )
-            conn.commit()
-            conn.close()
+            ), self._db_path)
             return entry_id
         except Exception:
             return None
@@ -102,7 +99,8 @@ class AITelemetryLogger:
         cutoff = (datetime.now(timezone.utc) - timedelta(hours=window_hours)).isoformat()
 
         try:
-            conn = sqlite3.connect(str(self._db_path))
+            from tools.db.pool import connect
+            conn = connect(self._db_path, row_factory=None)
 
             row = conn.execute(
                 "SELECT COUNT(*), COALESCE(SUM(cost_usd), 0), "
@@ -186,7 +184,8 @@ class AITelemetryLogger:
         cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
 
         try:
-            conn = sqlite3.connect(str(self._db_path))
+            from tools.db.pool import connect
+            conn = connect(self._db_path, row_factory=None)
 
             where_parts = ["logged_at >= ?"]
             params = [cutoff]
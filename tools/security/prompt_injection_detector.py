@@ -27,7 +27,6 @@ import base64
 import hashlib
 import json
 import re
-import sqlite3
 import sys
 import uuid
 from datetime import datetime, timezone
@@ -379,7 +378,8 @@ class PromptInjectionDetector:
 
         entry_id = str(uuid.uuid4())
         try:
-            conn = sqlite3.connect(str(self._db_path))
+            from tools.db.pool import connect
+            conn = connect(self._db_path, row_factory=None)
             conn.execute(
                 """INSERT INTO prompt_injection_log
                    (id, project_id, user_id, source, text_hash,
@@ -418,7 +418,8 @@ class PromptInjectionDetector:
 
         if self._db_path.exists():
             try:
-                conn = sqlite3.connect(str(self._db_path))
+                from tools.db.pool import connect
+                conn = connect(self._db_path, row_factory=None)
                 cursor = conn.execute(
                     """SELECT action, COUNT(*) FROM prompt_injection_log
                        WHERE project_id = ? AND action IN ('block', 'flag')